@@ -1,25 +1,260 @@
-from flask import Flask, request, render_template, jsonify
-import numpy as np
+import hmac
+import math
+import os
+from flask import Flask, request, render_template, jsonify, g, Response, send_file
 import pandas as pd
-import pickle
 from pathlib import Path
+from time import perf_counter
+from heartpipeline.serving import metrics
+from heartpipeline.serving.metrics import stage_timer
+from heartpipeline.serving.cache import PredictionCache, artifact_version, build_backend, canonical_key
+from heartpipeline.serving.intervals import ConformalIntervals
+from heartpipeline.serving.lookup import RiskLookupTable
+from heartpipeline.monitoring.history import MonitoringHistory
+from heartpipeline.serving.predictor import RiskPredictor
+from heartpipeline.serving.reports import ReportCache, render_text_report
+from heartpipeline.serving.request_schema import RequestSchema, RequestValidationError
+from heartpipeline.serving.model_store import ModelStore, ServingBundle
+from heartpipeline.serving.shadow import ShadowScorer
+from heartpipeline.serving.traffic_sketch import TrafficSketcher
 
 app = Flask(__name__)
 
 MODEL_PATH = Path("artifacts/model_trainer/model.pkl")
+COMPACT_MODEL_PATH = Path(os.environ.get("COMPACT_MODEL_PATH", "artifacts/model_trainer/model_compact.pkl"))
+COMPACT_CONFORMAL_PATH = Path(os.environ.get("COMPACT_CONFORMAL_PATH", "artifacts/model_trainer/conformal_compact.npz"))
+SERVE_COMPACT_MODEL = os.environ.get("SERVE_COMPACT_MODEL", "1") == "1"
 SCALER_PATH = Path("artifacts/data_transformation/scaler.pkl")
-LABEL_ENCODERS_PATH = Path("artifacts/data_transformation/label_encoders.pkl")
+ENCODER_PATH = Path("artifacts/data_transformation/categorical_encoder.pkl")
+# Read instead of ENCODER_PATH while only the older per-column encoders exist
+LEGACY_ENCODER_PATH = Path("artifacts/data_transformation/label_encoders.pkl")
+FEATURE_STATS_PATH = Path("artifacts/feature_engineering/feature_stats.json")
+SCHEMA_PATH = Path("config/schema.yaml")
+CONFORMAL_PATH = Path(os.environ.get("CONFORMAL_PATH", "artifacts/model_trainer/conformal.npz"))
+INTERVAL_COVERAGE = float(os.environ.get("INTERVAL_COVERAGE", "0.9"))
 
-with open(MODEL_PATH, 'rb') as f:
-    model = pickle.load(f)
+RISK_LOOKUP_TABLE_PATH = Path(os.environ.get("RISK_LOOKUP_TABLE", "artifacts/risk_lookup/risk_table.npy"))
+RISK_LOOKUP_METADATA_PATH = RISK_LOOKUP_TABLE_PATH.with_suffix('.json')
+# Compared with the max error over the table's random error samples, not a bound over every cell
+RISK_LOOKUP_MAX_ERROR = float(os.environ.get("RISK_LOOKUP_MAX_ERROR", "0.02"))
 
-with open(SCALER_PATH, 'rb') as f:
-    scaler = pickle.load(f)
+GOLDEN_INPUTS_PATH = Path(os.environ.get("GOLDEN_INPUTS_PATH", "config/golden_inputs.json"))
+SHADOW_MODEL_PATH = Path(os.environ.get("SHADOW_MODEL_PATH", "artifacts/model_trainer/candidate_model.pkl"))
+SHADOW_LOG_PATH = Path(os.environ.get("SHADOW_LOG_PATH", "artifacts/monitoring/shadow_predictions.jsonl"))
+SHADOW_SAMPLE_RATE = float(os.environ.get("SHADOW_SAMPLE_RATE", "0"))
+MODEL_RELOAD_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", "30"))
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "0") == "1"
+EXPLAIN_TOP_K = int(os.environ.get("EXPLAIN_TOP_K", "5"))
+EXPLAIN_MAX_BATCH = int(os.environ.get("EXPLAIN_MAX_BATCH", "100"))
 
-with open(LABEL_ENCODERS_PATH, 'rb') as f:
-    label_encoders = pickle.load(f)
+DRIFT_REPORT_PATH = Path("artifacts/monitoring/data_drift_report.html")
+PERFORMANCE_REPORT_PATH = Path("artifacts/monitoring/evidently_report.txt")
+REPORT_CACHE_DIR = Path(os.environ.get("REPORT_CACHE_DIR", "artifacts/monitoring/report_cache"))
+MONITORING_HISTORY_PATH = Path(os.environ.get("MONITORING_HISTORY_PATH", "artifacts/monitoring/history.sqlite"))
+TRAFFIC_SKETCH_DIR = Path(os.environ.get("TRAFFIC_SKETCH_DIR", "artifacts/monitoring/sketches"))
+TRAFFIC_SKETCH_INTERVAL = float(os.environ.get("TRAFFIC_SKETCH_INTERVAL", "60"))
+
+
+def load_risk_lookup(version: str):
+    if os.environ.get("RISK_LOOKUP_ENABLED", "1") != "1" or not RISK_LOOKUP_TABLE_PATH.exists():
+        return None
+    table = RiskLookupTable.load(RISK_LOOKUP_TABLE_PATH, RISK_LOOKUP_METADATA_PATH)
+    if table.model_version != version:
+        app.logger.warning("Risk lookup table was built for another model version; using exact model")
+        return None
+    if table.max_abs_error is None or table.max_abs_error > RISK_LOOKUP_MAX_ERROR:
+        app.logger.warning(f"Risk lookup max error {table.max_abs_error} exceeds {RISK_LOOKUP_MAX_ERROR}; using exact model")
+        return None
+    return table
+
+
+def load_shadow_candidate():
+    if SHADOW_SAMPLE_RATE <= 0 or not SHADOW_MODEL_PATH.exists():
+        return None
+    return RiskPredictor.load(SHADOW_MODEL_PATH, SCALER_PATH, ENCODER_PATH, record_metrics=False,
+                              feature_stats_path=FEATURE_STATS_PATH)
+
+
+def serving_model_paths() -> tuple:
+    """(model, conformal scores) to serve: the compact model while it is at least as new as model.pkl"""
+    if (SERVE_COMPACT_MODEL and COMPACT_MODEL_PATH.exists() and MODEL_PATH.exists()
+            and COMPACT_MODEL_PATH.stat().st_mtime >= MODEL_PATH.stat().st_mtime):
+        return COMPACT_MODEL_PATH, COMPACT_CONFORMAL_PATH
+    return MODEL_PATH, CONFORMAL_PATH
+
+
+def load_intervals(predictor: RiskPredictor, conformal_path: Path):
+    if not conformal_path.exists():
+        return None
+    try:
+        intervals = ConformalIntervals.load(conformal_path, predictor.model)
+    except ValueError as e:
+        app.logger.warning(f"Prediction intervals disabled: {str(e)}")
+        return None
+    if intervals.normalized is not None:
+        # The per-tree gather tables are built before the swap
+        predictor.forest_spread
+    return intervals
+
+
+def load_serving_bundle() -> ServingBundle:
+    model_path, conformal_path = serving_model_paths()
+    if model_path != MODEL_PATH:
+        app.logger.info(f"Serving compact model {model_path}")
+    predictor = RiskPredictor.load(model_path, SCALER_PATH, ENCODER_PATH,
+                                   feature_stats_path=FEATURE_STATS_PATH)
+    try:
+        # Attribution tables are built before the swap, not on the first explain request
+        predictor.attributor
+    except ValueError as e:
+        app.logger.warning(f"Explanations disabled: {str(e)}")
+    risk_lookup = load_risk_lookup(predictor.version)
+    intervals = load_intervals(predictor, conformal_path)
+    # A rebuilt lookup table or recalibrated intervals must trigger a swap even when the model is unchanged
+    auxiliary_paths = ([RISK_LOOKUP_TABLE_PATH, RISK_LOOKUP_METADATA_PATH] if risk_lookup is not None else []) + \
+                      ([conformal_path] if intervals is not None else [])
+    # Compiled against this bundle's encoder so accepted categories always match the model
+    return ServingBundle(predictor=predictor, risk_lookup=risk_lookup,
+                         candidate=load_shadow_candidate(),
+                         request_schema=RequestSchema.load(SCHEMA_PATH, predictor.encoder),
+                         intervals=intervals,
+                         auxiliary_version=artifact_version(auxiliary_paths) if auxiliary_paths else None)
+
+
+model_store = ModelStore(
+    loader=load_serving_bundle,
+    artifact_paths=[MODEL_PATH, SCALER_PATH],
+    optional_paths=[ENCODER_PATH, LEGACY_ENCODER_PATH, FEATURE_STATS_PATH, RISK_LOOKUP_METADATA_PATH, SHADOW_MODEL_PATH, CONFORMAL_PATH,
+                    COMPACT_MODEL_PATH, COMPACT_CONFORMAL_PATH],
+    golden_inputs_path=GOLDEN_INPUTS_PATH,
+    max_prediction_shift=float(os.environ.get("MODEL_RELOAD_MAX_SHIFT", "0.5")),
+    on_swap=lambda bundle: prediction_cache.set_version(bundle.version)
+)
+
+prediction_cache = PredictionCache(
+    max_size=int(os.environ.get("PREDICTION_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.environ.get("PREDICTION_CACHE_TTL", "3600")),
+    version=model_store.current.version,
+    backend=build_backend(os.environ.get("PREDICTION_CACHE_BACKEND", "memory"),
+                          os.environ.get("PREDICTION_CACHE_URL"),
+                          max_rows=int(os.environ.get("PREDICTION_CACHE_MAX_ROWS", "100000")))
+)
+
+shadow_scorer = ShadowScorer(SHADOW_LOG_PATH, sample_rate=SHADOW_SAMPLE_RATE)
+
+traffic_sketcher = TrafficSketcher(TRAFFIC_SKETCH_DIR, reference_path=TRAFFIC_SKETCH_DIR / "reference_raw.json",
+                                   flush_interval=TRAFFIC_SKETCH_INTERVAL)
+
+report_cache = ReportCache(REPORT_CACHE_DIR)
+report_cache.register('drift', DRIFT_REPORT_PATH)
+report_cache.register('performance', PERFORMANCE_REPORT_PATH, render=render_text_report)
+
+monitoring_history = MonitoringHistory(MONITORING_HISTORY_PATH, readonly=True)
+
+model_store.start_watcher(MODEL_RELOAD_INTERVAL)
+
+
+def score_records(bundle: ServingBundle, records: list) -> tuple:
+    """Score validated records: cache, then lookup table, then one model call for the rest
+
+    Returns the predictions and, for records the forest scored when
+    normalized intervals are loaded, the per-tree spread (None elsewhere).
+    """
+    predictions = [None] * len(records)
+    spreads = [None] * len(records)
+    keys = [canonical_key(data) for data in records] if prediction_cache.enabled else None
+    misses, computed = [], []
+    for i, data in enumerate(records):
+        if keys is not None:
+            predictions[i] = prediction_cache.get(keys[i])
+            metrics.observe_cache(predictions[i] is not None)
+            if predictions[i] is not None:
+                continue
+        computed.append(i)
+        if bundle.risk_lookup is not None:
+            predictions[i] = bundle.risk_lookup.lookup(data)
+            metrics.observe_lookup(predictions[i] is not None)
+        if predictions[i] is None:
+            misses.append(i)
+
+    if misses:
+        frame = pd.DataFrame([records[i] for i in misses])
+        if bundle.intervals is not None and bundle.intervals.normalized is not None:
+            scored, spread = bundle.predictor.predict_with_spread(frame)
+        else:
+            scored, spread = bundle.predictor.predict(frame), None
+        for j, (i, prediction) in enumerate(zip(misses, scored)):
+            predictions[i] = float(prediction)
+            if spread is not None:
+                spreads[i] = float(spread[j])
+
+    if keys is not None and bundle.version == prediction_cache.version:
+        for i in computed:
+            prediction_cache.set(keys[i], predictions[i])
+    for data, prediction in zip(records, predictions):
+        shadow_scorer.submit(bundle.candidate, bundle.version, data, prediction)
+    traffic_sketcher.submit(records, predictions)
+    return predictions, spreads
+
+
+def predict_records(bundle: ServingBundle, records: list) -> list:
+    return score_records(bundle, records)[0]
+
+
+def prediction_intervals(bundle: ServingBundle, predictions: list, spreads: list, coverage: float) -> list:
+    if bundle.intervals is None:
+        return [None] * len(predictions)
+    widths, methods = bundle.intervals.half_widths(spreads, coverage)
+    # Too few calibration rows for the requested coverage: the interval is unbounded
+    return [{'lower': prediction - width if math.isfinite(width) else None,
+             'upper': prediction + width if math.isfinite(width) else None,
+             'coverage': coverage, 'method': method}
+            for prediction, width, method in zip(predictions, widths, methods)]
+
+
+def cached_predict(data: dict) -> float:
+    return predict_records(model_store.current, [data])[0]
+
+
+def parse_coverage(value) -> float:
+    try:
+        coverage = float(value)
+    except (TypeError, ValueError):
+        coverage = math.nan
+    if not 0 < coverage < 1:
+        raise RequestValidationError([{'field': 'coverage', 'error': 'must be a number between 0 and 1'}])
+    return coverage
+
+
+def explain_records(bundle: ServingBundle, records: list) -> list:
+    """Top feature contributions per record; base_value plus all contributions is the model output"""
+    base_values, contributions = bundle.predictor.explain(pd.DataFrame(records))
+    top = bundle.predictor.attributor.top_contributions(contributions, EXPLAIN_TOP_K)
+    return [{'base_value': float(base), 'model_output': float(base + row.sum()), 'top_features': features}
+            for base, row, features in zip(base_values, contributions, top)]
+
+
+def risk_level_for(prediction: float) -> str:
+    return 'Low' if prediction < 0.3 else 'Medium' if prediction < 0.6 else 'High'
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = perf_counter()
+    if SERVER_TIMING:
+        metrics.start_request_stages()
+
+
+@app.after_request
+def record_request_metrics(response):
+    if request.endpoint not in (None, 'static', 'metrics_endpoint'):
+        elapsed = perf_counter() - g.request_start
+        metrics.observe_request(request.endpoint, response.status_code, elapsed)
+        if SERVER_TIMING:
+            response.headers['Server-Timing'] = metrics.server_timing_header(elapsed)
+    return response
 
-CATEGORICAL_FEATURES = ['road_type', 'lighting', 'weather', 'time_of_day']
 
 @app.route('/')
 def index():
@@ -31,50 +266,26 @@ def predict():
         return render_template('predict.html')
     
     try:
-        data = {
-            'road_type': request.form.get('road_type', 'highway'),
-            'num_lanes': int(request.form.get('num_lanes', 2)),
-            'curvature': float(request.form.get('curvature', 0.2)),
-            'speed_limit': int(request.form.get('speed_limit', 60)),
-            'lighting': request.form.get('lighting', 'daylight'),
-            'weather': request.form.get('weather', 'clear'),
-            'road_signs_present': 1 if request.form.get('road_signs_present', 'yes') == 'yes' else 0,
-            'public_road': 1 if request.form.get('public_road', 'yes') == 'yes' else 0,
-            'time_of_day': request.form.get('time_of_day', 'morning'),
-            'holiday': 1 if request.form.get('holiday', 'no') == 'yes' else 0,
-            'school_season': 1 if request.form.get('school_season', 'yes') == 'yes' else 0,
-            'num_reported_accidents': int(request.form.get('num_reported_accidents', 0))
-        }
-        
-        for field in ['road_type', 'lighting', 'weather', 'time_of_day']:
-            if data[field] is None or data[field] == '':
-                raise ValueError(f"Field '{field}' is required")
-        
-        df = pd.DataFrame([data])
-        
-        df['lanes_speed'] = df['num_lanes'] * df['speed_limit']
-        df['curvature_speed'] = df['curvature'] * df['speed_limit']
-        df['lanes_curvature'] = df['num_lanes'] * df['curvature']
-        df['high_speed'] = (df['speed_limit'] > 60).astype(int)
-        df['high_curvature'] = (df['curvature'] > 0.5).astype(int)
-        df['few_lanes'] = (df['num_lanes'] <= 2).astype(int)
-        df['no_signs'] = (df['road_signs_present'] == 0).astype(int)
-        df['holiday_risk'] = (df['holiday'] == 1).astype(int)
-        
-        speed_bins = [0, 40, 60, 120]
-        df['speed_category'] = pd.cut(df['speed_limit'], bins=speed_bins, labels=['low', 'medium', 'high'])
+        # One bundle for the whole request, so a concurrent reload cannot mix models
+        bundle = model_store.current
+        explain = request.form.get('explain') == 'yes'
+        with stage_timer('parse'):
+            # Raw form strings go to the schema, which coerces them and reports
+            # every bad field; blank inputs fall back to the schema defaults
+            data = {name: value for name, value in request.form.items() if name != 'explain' and value.strip()}
+            data = bundle.request_schema.validate_one(data)
         
-        curv_bins = [-0.1, 0.3, 0.6, 1.0]
-        df['curvature_category'] = pd.cut(df['curvature'], bins=curv_bins, labels=['low', 'medium', 'high'])
+        predictions, spreads = score_records(bundle, [data])
+        prediction = predictions[0]
+        interval = prediction_intervals(bundle, predictions, spreads, INTERVAL_COVERAGE)[0]
+        metrics.observe_predictions([prediction], [risk_level_for(prediction)])
+        factors = []
+        if explain:
+            try:
+                factors = explain_records(bundle, [data])[0]['top_features']
+            except ValueError:
+                pass
         
-        all_categorical = CATEGORICAL_FEATURES + ['speed_category', 'curvature_category']
-        for col in all_categorical:
-            if col in label_encoders:
-                df[col] = label_encoders[col].transform(df[col])
-        
-        scaled_features = scaler.transform(df)
-        
-        prediction = model.predict(scaled_features)[0]
         if prediction < 0.3:
             risk_level = "Low Risk"
             risk_color = "#4CAF50"
@@ -97,80 +308,180 @@ def predict():
             'risk_color': risk_color,
             'risk_icon': risk_icon,
             'risk_message': risk_msg,
-            'confidence': round((1 - abs(prediction - 0.5)) * 100, 2)
+            'factors': factors,
+            'interval': interval
         }
         
         return render_template('predict.html', result=result, input_data=data)
     
+    except RequestValidationError as e:
+        metrics.record_error('predict')
+        return render_template('predict.html', error="Invalid input", field_errors=e.errors), 400
     except Exception as e:
+        metrics.record_error('predict')
         error_msg = f"Prediction Error: {str(e)}"
         return render_template('predict.html', error=error_msg)
 
 @app.route('/api/predict', methods=['POST'])
 def api_predict():
+    """Score one JSON record, a list of records or {"instances": [...]}
+
+    Missing fields take the defaults from config/schema.yaml. Invalid input
+    is rejected with per-field errors before any feature work. With
+    ?explain=true each prediction carries its top feature contributions;
+    batches above EXPLAIN_MAX_BATCH records are rejected to bound latency.
+    """
     try:
-        data = request.json
-        defaults = {
-            'road_type': 'highway', 'lighting': 'daylight', 'weather': 'clear',
-            'time_of_day': 'morning', 'num_lanes': 2, 'curvature': 0.2,
-            'speed_limit': 60, 'road_signs_present': 1, 'public_road': 1,
-            'holiday': 0, 'school_season': 1, 'num_reported_accidents': 0
-        }
-        for key, default_val in defaults.items():
-            if key not in data:
-                data[key] = default_val
-        
-        df = pd.DataFrame([data])
+        bundle = model_store.current
+        explain = request.args.get('explain', 'false').lower() == 'true'
+        coverage = parse_coverage(request.args.get('coverage', INTERVAL_COVERAGE))
+        with stage_timer('parse'):
+            records, is_batch = bundle.request_schema.validate_batch(request.get_json(silent=True))
+        if explain and len(records) > EXPLAIN_MAX_BATCH:
+            raise RequestValidationError([{'field': 'explain',
+                                           'error': f"at most {EXPLAIN_MAX_BATCH} records per explained request"}])
         
-        df['lanes_speed'] = df['num_lanes'] * df['speed_limit']
-        df['curvature_speed'] = df['curvature'] * df['speed_limit']
-        df['lanes_curvature'] = df['num_lanes'] * df['curvature']
-        df['high_speed'] = (df['speed_limit'] > 60).astype(int)
-        df['high_curvature'] = (df['curvature'] > 0.5).astype(int)
-        df['few_lanes'] = (df['num_lanes'] <= 2).astype(int)
-        df['no_signs'] = (df['road_signs_present'] == 0).astype(int)
-        df['holiday_risk'] = (df['holiday'] == 1).astype(int)
-        
-        df['speed_category'] = pd.cut(df['speed_limit'], bins=[0, 40, 60, 120], labels=['low', 'medium', 'high'])
-        df['curvature_category'] = pd.cut(df['curvature'], bins=[-0.1, 0.3, 0.6, 1.0], labels=['low', 'medium', 'high'])
-        all_categorical = CATEGORICAL_FEATURES + ['speed_category', 'curvature_category']
-        for col in all_categorical:
-            if col in label_encoders:
-                df[col] = label_encoders[col].transform(df[col])
-        
-        scaled_features = scaler.transform(df)
-        prediction = model.predict(scaled_features)[0]
+        predictions, spreads = score_records(bundle, records)
+        risk_levels = [risk_level_for(prediction) for prediction in predictions]
+        metrics.observe_predictions(predictions, risk_levels)
+        results = [{'prediction': float(prediction), 'risk_level': level}
+                   for prediction, level in zip(predictions, risk_levels)]
+        for result, interval in zip(results, prediction_intervals(bundle, predictions, spreads, coverage)):
+            if interval is not None:
+                result['prediction_interval'] = interval
+        if explain:
+            for result, explanation in zip(results, explain_records(bundle, records)):
+                result['explanation'] = explanation
         
+        if not is_batch:
+            return jsonify({'success': True, **results[0]})
         return jsonify({
             'success': True,
-            'prediction': float(prediction),
-            'risk_level': 'Low' if prediction < 0.3 else 'Medium' if prediction < 0.6 else 'High'
+            'count': len(predictions),
+            'predictions': results
         })
     
+    except RequestValidationError as e:
+        metrics.record_error('api_predict')
+        return jsonify({'success': False, 'error': 'invalid request', 'errors': e.errors}), 400
     except Exception as e:
+        metrics.record_error('api_predict')
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/dashboard')
 def dashboard():
     return render_template('dashboard.html')
 
+def send_report(name: str, missing_message: str):
+    entry = report_cache.get(name)
+    if entry is None:
+        return missing_message, 404
+    encoding = report_cache.choose_encoding(entry, request.headers.get('Accept-Encoding'))
+    # conditional=True answers If-None-Match/If-Modified-Since with 304 and serves Range requests
+    response = send_file(entry.variants[encoding], mimetype='text/html', conditional=True,
+                         etag=f"{entry.etag}-{encoding}", max_age=0)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 @app.route('/reports/drift')
 def drift_report():
-    try:
-        with open('artifacts/monitoring/data_drift_report.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        return html_content
-    except FileNotFoundError:
-        return "Drift report not found. Please run the monitoring pipeline first.", 404
+    return send_report('drift', "Drift report not found. Please run the monitoring pipeline first.")
 
 @app.route('/reports/performance')
 def performance_report():
+    return send_report('performance', "Performance report not found. Please run the monitoring pipeline first.")
+
+@app.route('/api/monitoring/runs')
+def monitoring_runs():
+    try:
+        return jsonify(monitoring_history.runs(request.args.get('since'), request.args.get('until'),
+                                               limit=min(int(request.args.get('limit', 100)), 10000)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/monitoring/metrics/<metric>')
+def monitoring_metric_series(metric):
+    try:
+        return jsonify({
+            'metric': metric,
+            'dataset': request.args.get('dataset', 'current'),
+            'points': monitoring_history.metric_series(metric, request.args.get('dataset', 'current'),
+                                                       request.args.get('since'), request.args.get('until'))
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/monitoring/features')
+def monitoring_features():
+    return jsonify(monitoring_history.latest_feature_stats())
+
+@app.route('/api/monitoring/features/<feature>')
+def monitoring_feature_series(feature):
     try:
-        with open('artifacts/monitoring/evidently_report.txt', 'r', encoding='utf-8') as f:
-            content = f.read()
-        return f"<pre style='padding: 20px; background: #f5f5f5; font-family: monospace;'>{content}</pre>"
-    except FileNotFoundError:
-        return "Performance report not found. Please run the monitoring pipeline first.", 404
+        statistic = request.args.get('statistic', 'psi')
+        return jsonify({
+            'feature': feature,
+            'statistic': statistic,
+            'points': monitoring_history.feature_series(feature, statistic,
+                                                        request.args.get('since'), request.args.get('until'))
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    return jsonify(prediction_cache.stats())
+
+@app.route('/api/lookup/info')
+def lookup_info():
+    risk_lookup = model_store.current.risk_lookup
+    if risk_lookup is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **risk_lookup.info()})
+
+@app.route('/api/shadow/stats')
+def shadow_stats():
+    return jsonify(shadow_scorer.stats())
+
+@app.route('/api/traffic/stats')
+def traffic_stats():
+    return jsonify(traffic_sketcher.stats())
+
+def admin_denied():
+    """Error response for an admin request, or None when it carries ADMIN_TOKEN
+
+    Without ADMIN_TOKEN the admin endpoints are disabled rather than open.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'admin endpoints are disabled; set ADMIN_TOKEN to enable them'}), 403
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({'error': 'unauthorized'}), 401
+    return None
+
+@app.route('/admin/model', methods=['GET'])
+def admin_model_status():
+    denied = admin_denied()
+    if denied is not None:
+        return denied
+    return jsonify(model_store.status())
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    denied = admin_denied()
+    if denied is not None:
+        return denied
+    if request.args.get('wait') == 'true':
+        return jsonify(model_store.reload(force=request.args.get('force') == 'true'))
+    model_store.reload_async(force=request.args.get('force') == 'true')
+    return jsonify({'status': 'scheduled', 'version': model_store.current.version}), 202
+
+@app.route('/metrics')
+def metrics_endpoint():
+    payload, content_type = metrics.render_metrics()
+    return Response(payload, mimetype=content_type)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
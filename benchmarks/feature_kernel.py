@@ -0,0 +1,73 @@
+"""Micro-benchmark: fused feature kernel vs. the per-column pandas expressions
+
+Usage:
+    python benchmarks/feature_kernel.py --rows 1000000 --repeat 5
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from heartpipeline.features.kernel import compute_features, add_engineered_features
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'num_lanes': rng.integers(1, 5, rows),
+        'curvature': np.round(rng.uniform(0, 1, rows), 2),
+        'speed_limit': rng.choice([25, 35, 45, 60, 70], rows),
+        'road_signs_present': rng.integers(0, 2, rows).astype(bool),
+        'holiday': rng.integers(0, 2, rows).astype(bool)
+    })
+
+
+def pandas_features(df: pd.DataFrame, medians: dict) -> pd.DataFrame:
+    """The column-at-a-time implementation the kernel replaced"""
+    df['lanes_speed'] = df['num_lanes'] * df['speed_limit']
+    df['curvature_speed'] = df['curvature'] * df['speed_limit']
+    df['lanes_curvature'] = df['num_lanes'] * df['curvature']
+    df['high_speed'] = (df['speed_limit'] > medians['speed_limit']).astype(int)
+    df['high_curvature'] = (df['curvature'] > medians['curvature']).astype(int)
+    df['few_lanes'] = (df['num_lanes'] <= 2).astype(int)
+    df['no_signs'] = (df['road_signs_present'] == False).astype(int)
+    df['holiday_risk'] = (df['holiday'] == True).astype(int)
+    df['speed_category'] = pd.cut(df['speed_limit'], bins=[0, 40, 60, 80, 120],
+                                  labels=['low', 'medium', 'high', 'very_high'])
+    df['curvature_category'] = pd.cut(df['curvature'], bins=[-0.1, 0.3, 0.6, 1.0],
+                                      labels=['low', 'medium', 'high'])
+    return df
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 1000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    medians = {'speed_limit': 45.0, 'curvature': 0.5}
+    print(f"{'rows':>10} {'variant':<22} {'seconds':>10} {'rows/s':>14}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        columns = [df[col].to_numpy() for col in
+                   ['num_lanes', 'speed_limit', 'curvature', 'road_signs_present', 'holiday']]
+        variants = {
+            'pandas expressions': lambda: pandas_features(df.copy(), medians),
+            'kernel -> DataFrame': lambda: add_engineered_features(df.copy(), medians),
+            'kernel matrix only': lambda: compute_features(*columns, medians['speed_limit'], medians['curvature'])
+        }
+        for name, fn in variants.items():
+            seconds = best_of(fn, args.repeat)
+            print(f"{rows:>10} {name:<22} {seconds:>10.6f} {rows / seconds:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+"""Open-loop HTTP load test for the serving endpoints
+
+Starts app.py under the Flask dev server or gunicorn (or targets a running
+server with --url), replays synthetic road records against /api/predict
+and the /predict form at a target rate, and reports throughput, error rate,
+end-to-end latency percentiles and per-phase server latency from the
+Server-Timing header.
+
+Arrivals follow a Poisson process fixed in advance, and latency is measured
+from each request's scheduled send time. A server that falls behind
+therefore shows up as queueing latency, instead of quietly lowering the
+offered rate the way a closed-loop client would.
+
+Usage:
+    python benchmarks/load_test.py --server gunicorn --rps 100 --duration 30
+    python benchmarks/load_test.py --server dev --rps 20 --mix api=0.7,form=0.2,batch=0.1
+    python benchmarks/load_test.py --rps 100 --baseline benchmarks/results/load_base.json --max-regression 0.2
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from urllib.request import urlopen
+import numpy as np
+from synthetic_data import generate_chunk, load_domains
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+PERCENTILES = {'p50': 50, 'p95': 95, 'p99': 99, 'p999': 99.9}
+PHASES = ['parse', 'feature_engineering', 'encoding', 'scaling', 'predict', 'total']
+FORM_FLAGS = ['road_signs_present', 'public_road', 'holiday', 'school_season']
+# Regressions smaller than this are treated as noise
+MIN_REGRESSION_MS = 1.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, port: int, workers: int, threads: int, cache: bool) -> subprocess.Popen:
+    env = dict(os.environ, SERVER_TIMING="1", MODEL_RELOAD_INTERVAL="0", PORT=str(port),
+               GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads),
+               # Synthetic traffic must not end up in the serving drift sketches
+               TRAFFIC_SKETCH_DIR=tempfile.mkdtemp(prefix='load-test-sketches-'))
+    if not cache:
+        env['PREDICTION_CACHE_SIZE'] = "0"
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(REPO_ROOT / "src"), env.get('PYTHONPATH')]))
+    if kind == 'dev':
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run',
+                   '--host', '127.0.0.1', '--port', str(port), '--with-threads']
+    else:
+        command = ['gunicorn', '-c', 'gunicorn.conf.py', '-b', f'127.0.0.1:{port}', 'app:app']
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(url: str, process: subprocess.Popen = None, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with urlopen(f"{url}/", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} not ready after {timeout}s")
+
+
+def build_payloads(count: int, batch_size: int, seed: int) -> dict:
+    """Encoded request bodies per scenario, drawn from the synthetic data generator"""
+    rng = np.random.default_rng(seed)
+    domains = load_domains(str(REPO_ROOT / "config" / "schema.yaml"))
+    df = generate_chunk(count * max(batch_size, 1), 0, rng, domains).drop(columns=['id', 'accident_risk'])
+    for col in FORM_FLAGS:
+        df[col] = df[col].astype(int)
+    records = json.loads(df.to_json(orient='records'))
+
+    forms = []
+    for record in records[:count]:
+        form = {key: str(value) for key, value in record.items()}
+        for col in FORM_FLAGS:
+            form[col] = 'yes' if record[col] else 'no'
+        forms.append(form)
+
+    json_body = lambda body: (json.dumps(body).encode(), 'application/json')
+    return {
+        'api': [json_body(record) for record in records[:count]],
+        'form': [(urlencode(form).encode(), 'application/x-www-form-urlencoded') for form in forms],
+        'batch': [json_body({'instances': records[i * batch_size:(i + 1) * batch_size]}) for i in range(count)]
+    }
+
+
+def parse_server_timing(header: str) -> dict:
+    timings = {}
+    for entry in filter(None, (part.strip() for part in (header or '').split(','))):
+        name, _, params = entry.partition(';')
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'dur':
+                try:
+                    timings[name.strip()] = float(value)
+                except ValueError:
+                    continue
+    return timings
+
+
+class LoadGenerator:
+    """Sends requests on a fixed Poisson schedule from a pool of sender threads"""
+
+    ENDPOINTS = {'api': '/api/predict', 'batch': '/api/predict', 'form': '/predict'}
+
+    def __init__(self, url: str, payloads: dict, mix: dict, max_concurrency: int, timeout: float):
+        self.address = urlsplit(url)
+        self.payloads = payloads
+        self.mix = mix
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        # One keep-alive connection per sender thread, reopened after errors
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(
+                self.address.hostname, self.address.port, timeout=self.timeout)
+        return connection
+
+    def _post(self, path: str, body: bytes, content_type: str) -> tuple:
+        connection = self._connection()
+        try:
+            connection.request('POST', path, body=body, headers={'Content-Type': content_type})
+            response = connection.getresponse()
+            content = response.read()
+            return response.status, response.getheader('Server-Timing'), content
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+
+    def _send(self, scenario: str, payload: tuple, scheduled: float) -> dict:
+        result = {'scenario': scenario, 'scheduled': scheduled}
+        try:
+            status, server_timing, content = self._post(self.ENDPOINTS[scenario], *payload)
+            ok = status < 400
+            # The form reports failures inside a 200 page
+            if scenario == 'form' and b'Prediction Error' in content:
+                ok = False
+            result.update(status=status, ok=ok, phases=parse_server_timing(server_timing))
+        except (OSError, http.client.HTTPException) as e:
+            result.update(status=None, ok=False, error=type(e).__name__)
+        result['latency'] = time.perf_counter() - scheduled
+        return result
+
+    def run(self, rps: float, duration: float, seed: int) -> tuple:
+        rng = np.random.default_rng(seed)
+        arrivals = np.cumsum(rng.exponential(1.0 / rps, int(rps * duration * 1.5) + 10))
+        arrivals = arrivals[arrivals < duration]
+        scenarios = list(self.mix)
+        choices = rng.choice(len(scenarios), len(arrivals), p=np.array(list(self.mix.values())) / sum(self.mix.values()))
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            start = time.perf_counter()
+            for i, offset in enumerate(arrivals):
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                scenario = scenarios[choices[i]]
+                bodies = self.payloads[scenario]
+                futures.append(executor.submit(self._send, scenario, bodies[i % len(bodies)], scheduled))
+            results = [future.result() for future in futures]
+        return results, time.perf_counter() - start
+
+
+def percentiles_ms(values) -> dict:
+    if len(values) == 0:
+        return {name: None for name in PERCENTILES}
+    values = np.asarray(values) * 1000
+    return {name: round(float(np.percentile(values, q)), 3) for name, q in PERCENTILES.items()}
+
+
+def summarize(results: list, elapsed: float, warmup: float) -> dict:
+    measured = [r for r in results if r['scheduled'] - results[0]['scheduled'] >= warmup] if results else []
+    ok = [r for r in measured if r['ok']]
+    window = max(elapsed - warmup, 1e-9)
+
+    def phase_stats(rows: list) -> dict:
+        phases = {}
+        for phase in PHASES:
+            values = [r['phases'][phase] / 1000 for r in rows if phase in r.get('phases', {})]
+            if values:
+                phases[phase] = dict(percentiles_ms(values), mean=round(float(np.mean(values)) * 1000, 3))
+        return phases
+
+    summary = {
+        'requests': len(measured),
+        'throughput_rps': round(len(ok) / window, 2),
+        'error_rate': round(1 - len(ok) / len(measured), 5) if measured else None,
+        'latency_ms': percentiles_ms([r['latency'] for r in ok]),
+        'phases_ms': phase_stats(ok),
+        'scenarios': {}
+    }
+    for scenario in sorted({r['scenario'] for r in measured}):
+        rows = [r for r in measured if r['scenario'] == scenario]
+        rows_ok = [r for r in rows if r['ok']]
+        summary['scenarios'][scenario] = {
+            'requests': len(rows),
+            'error_rate': round(1 - len(rows_ok) / len(rows), 5),
+            'latency_ms': percentiles_ms([r['latency'] for r in rows_ok]),
+            'phases_ms': phase_stats(rows_ok)
+        }
+    return summary
+
+
+def find_regressions(baseline: dict, current: dict, max_regression: float) -> list:
+    """Percentiles (overall and per scenario) that grew past the allowed ratio, plus error-rate increases"""
+    regressions = []
+    pairs = [('overall', baseline['summary'], current['summary'])]
+    pairs += [(name, baseline['summary']['scenarios'][name], stats)
+              for name, stats in current['summary']['scenarios'].items()
+              if name in baseline['summary'].get('scenarios', {})]
+    for name, old, new in pairs:
+        for key in PERCENTILES:
+            before, after = old['latency_ms'].get(key), new['latency_ms'].get(key)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + max_regression) and after - before > MIN_REGRESSION_MS:
+                regressions.append(f"{name} {key}: {before:.2f}ms -> {after:.2f}ms")
+        if (new['error_rate'] or 0) > (old['error_rate'] or 0) + 0.001:
+            regressions.append(f"{name} error rate: {old['error_rate']:.4f} -> {new['error_rate']:.4f}")
+    return regressions
+
+
+def print_summary(summary: dict):
+    latency = summary['latency_ms']
+    print(f"requests={summary['requests']} throughput={summary['throughput_rps']} rps "
+          f"errors={summary['error_rate'] or 0:.2%}")
+    print(f"{'':<22}" + "".join(f"{name:>10}" for name in PERCENTILES))
+    print(f"{'end-to-end (ms)':<22}" + "".join(f"{latency[name] or 0:>10.2f}" for name in PERCENTILES))
+    for phase, stats in summary['phases_ms'].items():
+        print(f"{'  ' + phase:<22}" + "".join(f"{stats[name] or 0:>10.3f}" for name in PERCENTILES))
+    for scenario, stats in summary['scenarios'].items():
+        print(f"{scenario + ' (ms)':<22}" + "".join(f"{stats['latency_ms'][name] or 0:>10.2f}" for name in PERCENTILES)
+              + f"   n={stats['requests']} errors={stats['error_rate']:.2%}")
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in LoadGenerator.ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}'")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight '{weight}' for scenario '{name}'")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"negative weight for scenario '{name}'")
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("the scenario weights sum to zero")
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--server', choices=['dev', 'gunicorn'], default='gunicorn')
+    parser.add_argument('--url', help='target an already running server instead of starting one')
+    parser.add_argument('--rps', type=float, default=50)
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load, including warmup')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds excluded from the statistics')
+    parser.add_argument('--mix', type=parse_mix, default={'api': 1.0}, help='e.g. api=0.7,form=0.2,batch=0.1')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    parser.add_argument('--cache', action='store_true', help='keep the prediction cache enabled')
+    parser.add_argument('--max-concurrency', type=int, default=128)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--baseline', type=Path, help='fail when latency regresses against this result file')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        process = start_server(args.server, port, args.workers, args.threads, args.cache)
+    try:
+        wait_ready(url, process)
+        generator = LoadGenerator(url, build_payloads(2000, args.batch_size, args.seed), args.mix,
+                                  args.max_concurrency, args.timeout)
+        print(f"Offering {args.rps} rps for {args.duration}s to {url} ({args.server if process else 'external'})")
+        results, elapsed = generator.run(args.rps, args.duration, args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    summary = summarize(results, elapsed, args.warmup)
+    print_summary(summary)
+    report = {
+        'benchmark': 'load',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'server': args.server if process else args.url,
+        'rps': args.rps,
+        'duration': args.duration,
+        'warmup': args.warmup,
+        'mix': args.mix,
+        'batch_size': args.batch_size,
+        'workers': args.workers,
+        'threads': args.threads,
+        'cache': args.cache,
+        'summary': summary
+    }
+    output = args.output or RESULTS_DIR / f"load_{args.server if process else 'external'}_{int(args.rps)}rps.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(json.load(f), report, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.max_regression:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
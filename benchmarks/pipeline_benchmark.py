@@ -0,0 +1,353 @@
+"""Pipeline benchmark: wall time and peak memory per stage on synthetic data
+
+Each run generates a synthetic dataset (benchmarks/synthetic_data.py) in a
+throwaway workspace with a copy of config/, points MLflow at a local file
+store and runs every stage the way main.py does, followed by the serving
+paths (predictor load, single-record and batch predictions, request
+validation). Results are written as JSON named after the commit, and
+``compare`` flags stages that got slower or hungrier than a baseline.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py run --rows 10000 1000000 --models Ridge XGBoost
+    python benchmarks/pipeline_benchmark.py run --rows 1000000 --set data_transformation.chunk_rows=200000
+    python benchmarks/pipeline_benchmark.py compare benchmarks/results/base.json benchmarks/results/new.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import yaml
+from synthetic_data import generate
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+SERVING_BATCH_ROWS = 1000
+SERVING_CALLS = 200
+
+
+def git_commit() -> tuple:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def parse_override(text: str) -> tuple:
+    key, _, value = text.partition('=')
+    if '.' not in key or not _:
+        raise argparse.ArgumentTypeError(f"expected section.key=value, got '{text}'")
+    section, field = key.split('.', 1)
+    return section, field, yaml.safe_load(value)
+
+
+def prepare_workspace(workspace: Path, rows: int, seed: int, overrides: list) -> float:
+    """Copy config/ into the workspace, point it at synthetic data and return the generation time"""
+    shutil.copytree(REPO_ROOT / "config", workspace / "config")
+    config_path = workspace / "config" / "config.yaml"
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+
+    # Use every generated row and keep MLflow runs local to the workspace
+    config['data_ingestion']['sample_size'] = None
+    # MLflow 3 no longer accepts the file store, so runs go to a local SQLite database
+    mlflow_uri = f"sqlite:///{workspace / 'mlflow.db'}"
+    config['model_evaluation']['mlflow_uri'] = mlflow_uri
+    os.environ['MLFLOW_TRACKING_URI'] = mlflow_uri
+    for section, field, value in overrides:
+        config[section][field] = value
+    with open(config_path, 'w') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+
+    ingestion = config['data_ingestion']
+    source = workspace / ingestion['root_dir'] / ingestion['source_file']
+    source.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    generate(rows, str(source), seed=seed, schema_path=str(workspace / "config" / "schema.yaml"))
+    return time.perf_counter() - start
+
+
+def current_rss() -> int:
+    """Resident set size in bytes, or 0 where /proc (and psutil) are unavailable"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        try:
+            import psutil
+            return psutil.Process().memory_info().rss
+        except ImportError:
+            return 0
+
+
+class RssSampler:
+    """Samples RSS on a background thread to find a stage's peak without slowing it down"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.baseline = current_rss()
+        self.peak = self.baseline
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def measure(results: dict, name: str, fn, memory: str = 'rss'):
+    """Run ``fn`` and record its wall time and peak memory
+
+    ``rss`` samples the process resident set (includes native allocations,
+    negligible overhead); ``tracemalloc`` reports the exact Python/NumPy
+    allocation peak but slows allocation-heavy stages several times over.
+    Process-pool workers (sharded feature engineering) are not included.
+    """
+    gc.collect()
+    sampler = RssSampler() if memory == 'rss' else None
+    if memory == 'tracemalloc':
+        tracemalloc.start()
+    start = time.perf_counter()
+    if sampler is not None:
+        with sampler:
+            value = fn()
+    else:
+        value = fn()
+    seconds = time.perf_counter() - start
+
+    entry = {'seconds': round(seconds, 4)}
+    if sampler is not None and sampler.baseline:
+        entry['peak_mb'] = round((sampler.peak - sampler.baseline) / 2 ** 20, 2)
+        entry['peak_rss_mb'] = round(sampler.peak / 2 ** 20, 1)
+    elif memory == 'tracemalloc':
+        entry['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    results[name] = entry
+    print(f"  {name:<24} {seconds:>10.3f}s {entry.get('peak_mb', float('nan')):>10.1f} MB peak")
+    return value
+
+
+def latency_summary(timings: list) -> dict:
+    timings = np.asarray(timings)
+    return {
+        'seconds': round(float(timings.mean()), 6),
+        'p50_ms': round(float(np.percentile(timings, 50)) * 1000, 3),
+        'p95_ms': round(float(np.percentile(timings, 95)) * 1000, 3),
+        'calls': len(timings)
+    }
+
+
+def time_calls(fn, args: list) -> dict:
+    timings = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return latency_summary(timings)
+
+
+def run_stages(models: list, memory: str) -> dict:
+    from heartpipeline.config.configuration import ConfigurationManager
+    from heartpipeline.components.data_ingestion import DataIngestion
+    from heartpipeline.components.data_validation import DataValidation
+    from heartpipeline.components.feature_engineering import FeatureEngineering
+    from heartpipeline.components.data_transformation import DataTransformation
+    from heartpipeline.components.model_trainer import ModelTrainer
+    from heartpipeline.components.model_evaluation import ModelEvaluation
+    from heartpipeline.components.monitoring import ModelMonitoring
+
+    cm = ConfigurationManager()
+    stages = {}
+    measure(stages, 'data_ingestion', DataIngestion(cm.get_data_ingestion_config()).ingest, memory)
+    measure(stages, 'data_validation', DataValidation(cm.get_data_validation_config()).validate, memory)
+    measure(stages, 'feature_engineering',
+            FeatureEngineering(cm.get_feature_engineering_config()).engineer_features, memory)
+    measure(stages, 'data_transformation',
+            DataTransformation(cm.get_data_transformation_config()).transform, memory)
+
+    trainer = ModelTrainer(cm.get_model_trainer_config())
+    for model_name in models:
+        measure(stages, f"train_{model_name}", lambda: trainer.train_candidate(model_name), memory)
+    measure(stages, 'select_best', lambda: trainer.select_best(models), memory)
+
+    measure(stages, 'model_evaluation', ModelEvaluation(cm.get_model_evaluation_config()).evaluate, memory)
+    measure(stages, 'monitoring', ModelMonitoring(cm.get_monitoring_config()).generate_report, memory)
+    return stages
+
+
+def run_serving(memory: str) -> dict:
+    from heartpipeline.config.configuration import ConfigurationManager
+    from heartpipeline.serving.predictor import RiskPredictor
+    from heartpipeline.serving.request_schema import RequestSchema
+
+    cm = ConfigurationManager()
+    lookup_config = cm.get_risk_lookup_config()
+    data_path = cm.get_data_ingestion_config().local_data_file
+    serving = {}
+
+    predictor = measure(serving, 'predictor_load', lambda: RiskPredictor.load(
+        lookup_config.model_path, lookup_config.scaler_path, lookup_config.encoder_path,
+        record_metrics=False, feature_stats_path=lookup_config.feature_stats_path), memory)
+
+    sample = pd.read_csv(data_path, nrows=SERVING_BATCH_ROWS).drop(columns=['id', cm.schema.target_column])
+    records = sample.to_dict(orient='records')
+    schema = RequestSchema.load("config/schema.yaml", predictor.encoder)
+
+    single = [records[i % len(records)] for i in range(SERVING_CALLS)]
+    serving['request_validation'] = time_calls(schema.validate, single)
+    serving['predict_single'] = time_calls(lambda record: predictor.predict(pd.DataFrame([record])), single)
+    serving['predict_batch'] = dict(time_calls(lambda df: predictor.predict(df.copy()), [sample] * 20),
+                                    rows=len(sample))
+    for name in ('request_validation', 'predict_single', 'predict_batch'):
+        print(f"  {name:<24} {serving[name]['p50_ms']:>10.3f}ms p50 {serving[name]['p95_ms']:>9.3f}ms p95")
+    return serving
+
+
+def run_benchmark(rows: int, models: list, seed: int, overrides: list,
+                  memory: str, keep: bool) -> dict:
+    workspace = Path(tempfile.mkdtemp(prefix=f"heartpipeline-bench-{rows}-"))
+    cwd = os.getcwd()
+    print(f"Benchmarking {rows:,} rows in {workspace}")
+    try:
+        generate_seconds = prepare_workspace(workspace, rows, seed, overrides)
+        print(f"  {'generate_data':<24} {generate_seconds:>10.3f}s")
+        os.chdir(workspace)
+        start = time.perf_counter()
+        stages = run_stages(models, memory)
+        total = time.perf_counter() - start
+        serving = run_serving(memory)
+    finally:
+        os.chdir(cwd)
+        if not keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    commit, dirty = git_commit()
+    return {
+        'benchmark': 'pipeline',
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'rows': rows,
+        'seed': seed,
+        'models': models,
+        'overrides': {f"{section}.{field}": value for section, field, value in overrides},
+        'memory': memory,
+        'platform': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'generate_seconds': round(generate_seconds, 4),
+        'total_seconds': round(total, 4),
+        'stages': stages,
+        'serving': serving
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_seconds: float) -> list:
+    """Print a side-by-side table and return the regressions
+
+    A stage regresses when its time grows by more than ``threshold`` (time
+    changes below ``min_seconds`` are noise), or its peak memory does when
+    both runs measured memory the same way.
+    """
+    if baseline.get('rows') != current.get('rows'):
+        print(f"Warning: comparing {baseline.get('rows')} rows against {current.get('rows')} rows")
+
+    same_memory = baseline.get('memory') == current.get('memory')
+    regressions = []
+    print(f"{'section':<8} {'stage':<24} {'base s':>10} {'new s':>10} {'ratio':>7} {'base MB':>9} {'new MB':>9}")
+    for section in ('stages', 'serving'):
+        for name, new in current.get(section, {}).items():
+            old = baseline.get(section, {}).get(name)
+            if old is None:
+                continue
+            ratio = new['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+            flags = []
+            if ratio > 1 + threshold and new['seconds'] - old['seconds'] > min_seconds:
+                flags.append('time')
+            if same_memory and 'peak_mb' in old and 'peak_mb' in new and new['peak_mb'] > old['peak_mb'] * (1 + threshold) \
+                    and new['peak_mb'] - old['peak_mb'] > 1:
+                flags.append('memory')
+            print(f"{section:<8} {name:<24} {old['seconds']:>10.4f} {new['seconds']:>10.4f} {ratio:>7.2f} "
+                  f"{old.get('peak_mb', float('nan')):>9.1f} {new.get('peak_mb', float('nan')):>9.1f}"
+                  f"{'  REGRESSION: ' + ', '.join(flags) if flags else ''}")
+            if flags:
+                regressions.append({'section': section, 'stage': name, 'ratio': ratio, 'kinds': flags})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='benchmark the pipeline on synthetic data')
+    run_parser.add_argument('--rows', type=int, nargs='+', default=[10000])
+    run_parser.add_argument('--models', nargs='+', default=None,
+                            help='models to train (default: every model in MODEL_REGISTRY)')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--set', dest='overrides', type=parse_override, action='append', default=[],
+                            metavar='SECTION.KEY=VALUE', help='override a config.yaml value')
+    run_parser.add_argument('--output', type=Path, default=RESULTS_DIR)
+    run_parser.add_argument('--memory', choices=['rss', 'tracemalloc', 'none'], default='rss',
+                            help='peak memory measurement (see measure())')
+    run_parser.add_argument('--keep', action='store_true', help='keep the workspace for inspection')
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('current', type=Path)
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+    compare_parser.add_argument('--min-seconds', type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.min_seconds)
+        print(f"{len(regressions)} regression(s) against {baseline.get('commit')}")
+        sys.exit(1 if regressions else 0)
+
+    from heartpipeline.components.model_trainer import MODEL_REGISTRY
+    models = args.models or list(MODEL_REGISTRY)
+    args.output.mkdir(parents=True, exist_ok=True)
+    for rows in args.rows:
+        result = run_benchmark(rows, models, args.seed, args.overrides, args.memory, args.keep)
+        path = args.output / f"pipeline_{rows}_{result['commit']}{'-dirty' if result['dirty'] else ''}.json"
+        with open(path, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Synthetic road accident data matching config/schema.yaml
+
+Categorical domains are read from the schema constraints, and
+accident_risk is a noisy function of the road conditions (curvature, speed,
+lighting, weather, past accidents...) so models have real signal to learn.
+Rows are generated and written in chunks, so 50M rows need no more memory
+than one chunk.
+
+Usage:
+    python benchmarks/synthetic_data.py --rows 1000000 --output artifacts/data_ingestion/train.csv
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import yaml
+
+
+SCHEMA_PATH = "config/schema.yaml"
+CHUNK_ROWS = 500000
+
+# Additive risk contributions per category
+LIGHTING_RISK = {'daylight': 0.0, 'dim': 0.06, 'night': 0.15}
+WEATHER_RISK = {'clear': 0.0, 'rainy': 0.07, 'foggy': 0.11}
+ROAD_TYPE_RISK = {'highway': 0.03, 'rural': 0.05, 'urban': 0.0}
+TIME_OF_DAY_RISK = {'morning': 0.0, 'afternoon': 0.01, 'evening': 0.04}
+
+
+def load_domains(schema_path: str = SCHEMA_PATH) -> dict:
+    with open(schema_path, 'r') as f:
+        constraints = yaml.safe_load(f).get('constraints', {})
+    return {col: rules['allowed'] for col, rules in constraints.items() if 'allowed' in rules}
+
+
+def _category_risk(values: np.ndarray, risk: dict) -> np.ndarray:
+    return pd.Series(values).map(risk).fillna(0.0).to_numpy()
+
+
+def generate_chunk(rows: int, start_id: int, rng: np.random.Generator, domains: dict) -> pd.DataFrame:
+    df = pd.DataFrame({
+        'id': np.arange(start_id, start_id + rows, dtype=np.int64),
+        'road_type': rng.choice(domains['road_type'], rows),
+        'num_lanes': rng.integers(1, 5, rows),
+        'curvature': np.round(rng.beta(2.0, 2.5, rows), 2),
+        'speed_limit': rng.choice(domains['speed_limit'], rows, p=[0.15, 0.2, 0.25, 0.25, 0.15]),
+        'lighting': rng.choice(domains['lighting'], rows, p=[0.5, 0.25, 0.25]),
+        'weather': rng.choice(domains['weather'], rows, p=[0.55, 0.3, 0.15]),
+        'road_signs_present': rng.random(rows) < 0.5,
+        'public_road': rng.random(rows) < 0.5,
+        'time_of_day': rng.choice(domains['time_of_day'], rows),
+        'holiday': rng.random(rows) < 0.5,
+        'school_season': rng.random(rows) < 0.5,
+        'num_reported_accidents': np.minimum(rng.poisson(1.2, rows), 7)
+    })
+
+    risk = (
+        0.05
+        + 0.35 * df['curvature'].to_numpy()
+        + 0.003 * (df['speed_limit'].to_numpy() - 25)
+        + _category_risk(df['lighting'].to_numpy(), LIGHTING_RISK)
+        + _category_risk(df['weather'].to_numpy(), WEATHER_RISK)
+        + _category_risk(df['road_type'].to_numpy(), ROAD_TYPE_RISK)
+        + _category_risk(df['time_of_day'].to_numpy(), TIME_OF_DAY_RISK)
+        + 0.025 * df['num_reported_accidents'].to_numpy()
+        - 0.02 * df['road_signs_present'].to_numpy()
+        + 0.02 * df['holiday'].to_numpy()
+        - 0.005 * (df['num_lanes'].to_numpy() - 1)
+        + rng.normal(0.0, 0.05, rows)
+    )
+    df['accident_risk'] = np.round(np.clip(risk, 0.0, 1.0), 2)
+    return df
+
+
+def generate(rows: int, output_path: str, seed: int = 42, schema_path: str = SCHEMA_PATH,
+             chunk_rows: int = CHUNK_ROWS) -> str:
+    """Write ``rows`` synthetic rows to ``output_path`` as CSV, one chunk at a time"""
+    rng = np.random.default_rng(seed)
+    domains = load_domains(schema_path)
+    written = 0
+    while written < rows:
+        chunk = generate_chunk(min(chunk_rows, rows - written), written, rng, domains)
+        chunk.to_csv(output_path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+        written += len(chunk)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--schema', default=SCHEMA_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate(args.rows, args.output, args.seed, args.schema)
+    print(f"Wrote {args.rows:,} rows to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+import os
+from heartpipeline.serving.metrics import mark_process_dead, reset_multiprocess_dir
+from heartpipeline.serving.traffic_sketch import remove_worker_sketch
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+
+
+def on_starting(server):
+    reset_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    mark_process_dead(worker.pid)
+    # A replacement worker starts a new file; the old one would otherwise be merged forever
+    remove_worker_sketch(os.environ.get("TRAFFIC_SKETCH_DIR", "artifacts/monitoring/sketches"), worker.pid)
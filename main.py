@@ -1,3 +1,4 @@
+import sys
 from heartpipeline.logging import logger
 from heartpipeline.pipeline.stage_01_data_ingestion import DataIngestionTrainingPipeline
 from heartpipeline.pipeline.stage_02_data_validation import DataValidationTrainingPipeline
@@ -6,12 +7,32 @@ from heartpipeline.pipeline.stage_04_data_transformation import DataTransformati
 from heartpipeline.pipeline.stage_05_model_trainer import ModelTrainerTrainingPipeline
 from heartpipeline.pipeline.stage_06_model_evaluation import ModelEvaluationPipeline
 from heartpipeline.pipeline.stage_07_monitoring import ModelMonitoringPipeline
+from heartpipeline.pipeline.stage_08_risk_lookup import RiskLookupTablePipeline
+from heartpipeline.pipeline.stage_09_retraining_trigger import RetrainingTriggerPipeline
+from heartpipeline.pipeline.stage_10_model_compression import ModelCompressionPipeline
+from heartpipeline.pipeline.in_memory_runner import InMemoryPipelineRunner
+from heartpipeline.pipeline.scheduler import PipelineScheduler
+from heartpipeline.pipeline.training_stages import pipeline_stages
 
 
 STAGE_NAME = "Complete ML Pipeline"
 
 if __name__ == "__main__":
     try:
+        if "--in-memory" in sys.argv:
+            result = InMemoryPipelineRunner().run(force_retrain="--force-retrain" in sys.argv)
+            if not result['retrain']:
+                logger.info("No drift or degradation beyond thresholds, keeping the current model")
+                sys.exit(0)
+            metrics = result['metrics']
+            logger.info(f"Evaluation Metrics: R2={metrics['r2_score']:.4f}, RMSE={metrics['rmse']:.4f}, MAE={metrics['mae']:.4f}")
+            logger.info(f"Monitoring Report: {result['report']['summary']}")
+            sys.exit(0)
+        
+        if "--parallel" in sys.argv:
+            PipelineScheduler(pipeline_stages(force_retrain="--force-retrain" in sys.argv)).run()
+            sys.exit(0)
+        
         logger.info("=" * 80)
         logger.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
         logger.info("=" * 80)
@@ -32,6 +53,16 @@ if __name__ == "__main__":
         logger.info("=" * 80)
         logger.info("STAGE 2: Data Validation - COMPLETED\n")
         
+        logger.info("=" * 80)
+        logger.info("STAGE 9: Retraining Trigger")
+        logger.info("=" * 80)
+        retraining_trigger = RetrainingTriggerPipeline()
+        if not retraining_trigger.main(force="--force-retrain" in sys.argv):
+            logger.info("No drift or degradation beyond thresholds, keeping the current model")
+            sys.exit(0)
+        logger.info("=" * 80)
+        logger.info("STAGE 9: Retraining Trigger - COMPLETED\n")
+        
         logger.info("=" * 80)
         logger.info("STAGE 3: Feature Engineering")
         logger.info("=" * 80)
@@ -74,17 +105,38 @@ if __name__ == "__main__":
         logger.info("=" * 80)
         logger.info("STAGE 7: Model Monitoring - COMPLETED\n")
         
+        retraining_trigger.update_reference()
+        
+        logger.info("=" * 80)
+        logger.info("STAGE 8: Risk Lookup Table")
+        logger.info("=" * 80)
+        risk_lookup = RiskLookupTablePipeline()
+        risk_lookup.main()
+        logger.info("=" * 80)
+        logger.info("STAGE 8: Risk Lookup Table - COMPLETED\n")
+        
+        logger.info("=" * 80)
+        logger.info("STAGE 10: Model Compression")
+        logger.info("=" * 80)
+        model_compression = ModelCompressionPipeline()
+        model_compression.main()
+        logger.info("=" * 80)
+        logger.info("STAGE 10: Model Compression - COMPLETED\n")
+        
         logger.info("\n" + "=" * 80)
         logger.info("ALL PIPELINE STAGES COMPLETED SUCCESSFULLY!")
         logger.info("=" * 80)
         logger.info("\nPipeline Summary:")
         logger.info("  Stage 1: Data Ingestion")
         logger.info("  Stage 2: Data Validation")
+        logger.info("  Stage 9: Retraining Trigger")
         logger.info("  Stage 3: Feature Engineering")
         logger.info("  Stage 4: Data Transformation")
         logger.info("  Stage 5: Model Training")
         logger.info("  Stage 6: Model Evaluation")
         logger.info("  Stage 7: Model Monitoring")
+        logger.info("  Stage 8: Risk Lookup Table")
+        logger.info("  Stage 10: Model Compression")
         logger.info("=" * 80)
         
     except Exception as e:
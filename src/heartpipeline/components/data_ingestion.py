@@ -6,11 +6,13 @@ from pathlib import Path
 from heartpipeline.logging import logger
 from heartpipeline.exception import CustomException
 from heartpipeline.entity.config_entity import DataIngestionConfig
+from heartpipeline.utils.common import AsyncArtifactWriter, save_csv
 
 
 class DataIngestion:
-    def __init__(self, config: DataIngestionConfig):
+    def __init__(self, config: DataIngestionConfig, writer: AsyncArtifactWriter = None):
         self.config = config
+        self.writer = writer
 
     def download_from_kaggle(self):
         try:
@@ -75,7 +77,7 @@ class DataIngestion:
                 logger.info(f"Sampled data to {len(df)} rows")
             
             # Save processed data
-            df.to_csv(self.config.local_data_file, index=False)
+            save_csv(df, self.config.local_data_file, self.writer)
             logger.info(f"Processed data saved to {self.config.local_data_file}")
             
             return df
@@ -83,6 +85,16 @@ class DataIngestion:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def ingest_frame(self) -> pd.DataFrame:
+        try:
+            logger.info("Starting in-memory data ingestion...")
+            
+            df = self.load_data()
+            return self.process_data(df, sample_size=self.config.sample_size)
+            
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def ingest(self) -> Path:
         try:
             logger.info("Starting data ingestion...")
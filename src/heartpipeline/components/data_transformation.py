@@ -1,61 +1,83 @@
 ﻿import os
 import sys
+import json
+import hashlib
+from datetime import datetime
+import numpy as np
 import pandas as pd
-import pickle
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from heartpipeline.logging import logger
 from heartpipeline.exception import CustomException
 from heartpipeline.entity.config_entity import DataTransformationConfig
+from heartpipeline.features.encoder import CategoricalEncoder
+from heartpipeline.utils.common import AsyncArtifactWriter, save_csv, dump_pickle
+
+
+def hash_test_mask(ids, test_size: float, salt: str) -> np.ndarray:
+    """Stable split: a row is test iff its salted id hash lands in the lowest ``test_size`` of the hash space
+
+    The assignment depends only on the id, so it is identical across chunks,
+    runs and dataset growth for the same salt and test_size.
+    """
+    if not 0 <= test_size <= 1:
+        raise ValueError(f"test_size must be between 0 and 1, got {test_size}")
+    if test_size == 1:
+        # 2 ** 64 itself does not fit a uint64 threshold
+        return np.ones(len(ids), dtype=bool)
+    salt_key = np.uint64(int.from_bytes(hashlib.sha1(salt.encode()).digest()[:8], 'little'))
+    hashed = pd.util.hash_array(np.asarray(ids).astype(np.uint64) ^ salt_key)
+    return hashed < np.uint64(test_size * 2 ** 64)
 
 
 class DataTransformation:
-    def __init__(self, config: DataTransformationConfig):
+    def __init__(self, config: DataTransformationConfig, writer: AsyncArtifactWriter = None):
         self.config = config
-        self.label_encoders = {}
+        self.writer = writer
+        self.encoder = CategoricalEncoder()
+        self.test_ids = []
 
     def encode_categorical_features(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
             logger.info("Encoding categorical features...")
             
-            categorical_cols = ['road_type', 'lighting', 'weather', 'time_of_day', 
-                              'speed_category', 'curvature_category']
-            
-            for col in categorical_cols:
-                if col in df.columns:
-                    le = LabelEncoder()
-                    df[col] = le.fit_transform(df[col].astype(str))
-                    self.label_encoders[col] = le
-                    logger.info(f"Encoded {col}")
+            df = self.encoder.fit_transform(df)
+            for col in self.encoder.columns:
+                logger.info(f"Encoded {col} ({len(self.encoder.vocabulary[col])} categories)")
             
-            encoders_path = os.path.join(self.config.root_dir, 'label_encoders.pkl')
-            with open(encoders_path, 'wb') as f:
-                pickle.dump(self.label_encoders, f)
-            logger.info(f"Label encoders saved to {encoders_path}")
+            dump_pickle(self.encoder, self.config.encoder_path, self.writer)
+            logger.info(f"Categorical encoder saved to {self.config.encoder_path}")
             
             return df
             
         except Exception as e:
             raise CustomException(e, sys)
 
+    def separate_target(self, df: pd.DataFrame) -> tuple:
+        if 'id' in df.columns:
+            df = df.drop('id', axis=1)
+        if 'accident_risk' in df.columns:
+            return df.drop('accident_risk', axis=1), df['accident_risk']
+        if 'target' in df.columns:
+            return df.drop('target', axis=1), df['target']
+        raise ValueError("Target column not found")
+
     def split_data(self, df: pd.DataFrame) -> tuple:
         try:
             logger.info("Splitting data into train and test sets...")
             
-            if 'id' in df.columns:
-                df = df.drop('id', axis=1)
-            if 'accident_risk' in df.columns:
-                X = df.drop('accident_risk', axis=1)
-                y = df['accident_risk']
-            elif 'target' in df.columns:
-                X = df.drop('target', axis=1)
-                y = df['target']
+            if self.config.split_method == 'hash':
+                is_test = self.test_mask(df)
+                X, y = self.separate_target(df)
+                X_train, X_test = X[~is_test], X[is_test]
+                y_train, y_test = y[~is_test], y[is_test]
             else:
-                raise ValueError("Target column not found")
-            
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
-            )
+                X, y = self.separate_target(df)
+                X_train, X_test, y_train, y_test = train_test_split(
+                    X, y, test_size=self.config.test_size, random_state=42
+                )
+            if 'id' in df.columns:
+                self.test_ids.append(df['id'].loc[X_test.index].to_numpy())
             
             logger.info(f"Train set size: {len(X_train)}, Test set size: {len(X_test)}")
             
@@ -74,8 +96,7 @@ class DataTransformation:
             
             X_train_scaled = pd.DataFrame(X_train_scaled, columns=X_train.columns)
             X_test_scaled = pd.DataFrame(X_test_scaled, columns=X_test.columns)
-            with open(self.config.scaler_path, 'wb') as f:
-                pickle.dump(scaler, f)
+            dump_pickle(scaler, self.config.scaler_path, self.writer)
             logger.info(f"Scaler saved to {self.config.scaler_path}")
             
             return X_train_scaled, X_test_scaled
@@ -83,27 +104,148 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
-    def transform(self):
+    def read_chunks(self):
+        return pd.read_csv(self.config.data_path, chunksize=self.config.chunk_rows)
+
+    @property
+    def split_method(self) -> str:
+        """The split actually used: chunked mode always hashes so chunk_rows never moves rows"""
+        return 'hash' if self.config.chunk_rows > 0 else self.config.split_method
+
+    def test_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Rows of ``df`` that belong to the hash test split; deterministic for every pass over a chunk"""
+        if 'id' not in df.columns:
+            raise ValueError("Hash split requires an 'id' column")
+        return hash_test_mask(df['id'].to_numpy(), self.config.test_size, self.config.split_salt)
+
+    def write_split_manifest(self, train_rows: int):
+        """Record the split and compare its test ids with the previous run's"""
+        try:
+            test_ids = np.concatenate(self.test_ids) if self.test_ids else np.array([], dtype=np.int64)
+            manifest = {
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'split_method': self.split_method,
+                'split_salt': self.config.split_salt,
+                'test_size': self.config.test_size,
+                'train_rows': int(train_rows),
+                'test_rows': int(len(test_ids)),
+                'test_ids_path': str(self.config.test_ids_path),
+                'previous_test_rows': None,
+                'retained_test_rows': None,
+                'new_test_rows': None,
+                'consistent_with_previous': None
+            }
+            
+            if os.path.exists(self.config.split_manifest_path) and os.path.exists(self.config.test_ids_path):
+                with open(self.config.split_manifest_path, 'r') as f:
+                    previous = json.load(f)
+                previous_ids = pd.read_csv(self.config.test_ids_path)['id'].to_numpy()
+                retained = int(np.isin(previous_ids, test_ids).sum())
+                same_split = (manifest['split_method'] == previous.get('split_method') == 'hash'
+                              and manifest['split_salt'] == previous.get('split_salt')
+                              and manifest['test_size'] == previous.get('test_size'))
+                manifest.update({
+                    'previous_test_rows': int(len(previous_ids)),
+                    'retained_test_rows': retained,
+                    'new_test_rows': int(len(test_ids)) - retained,
+                    'consistent_with_previous': bool(same_split)
+                })
+                if same_split:
+                    logger.info(f"Test split extends the previous run: {retained} retained, "
+                                f"{manifest['new_test_rows']} new test rows")
+                else:
+                    logger.warning("Split settings changed since the previous run; earlier test rows "
+                                   "may now be in train, so results are not comparable")
+            
+            pd.DataFrame({'id': test_ids}).to_csv(self.config.test_ids_path, index=False)
+            with open(self.config.split_manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            logger.info(f"Split manifest saved to {self.config.split_manifest_path}")
+            
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform_chunked(self):
+        """Out-of-core transform: only one chunk of data_path is in memory at a time
+
+        Pass 1 builds the category vocabularies, pass 2 fits the scaler with
+        partial_fit on the training rows, pass 3 encodes, scales and appends each
+        chunk to the train/test CSVs.
+        """
+        try:
+            logger.info(f"Chunked transformation: {self.config.chunk_rows} rows per chunk")
+            if self.config.split_method != 'hash':
+                logger.warning(f"split_method '{self.config.split_method}' is not chunk-invariant; "
+                               "using the hash split in chunked mode")
+            
+            for chunk in self.read_chunks():
+                self.encoder.partial_fit(chunk)
+            dump_pickle(self.encoder, self.config.encoder_path, self.writer)
+            logger.info(f"Categorical encoder saved to {self.config.encoder_path}")
+            
+            scaler = StandardScaler()
+            for chunk_index, chunk in enumerate(self.read_chunks()):
+                chunk = self.encoder.transform(chunk)
+                X, _ = self.separate_target(chunk)
+                X_train = X[~self.test_mask(chunk)]
+                if len(X_train):
+                    scaler.partial_fit(X_train)
+            dump_pickle(scaler, self.config.scaler_path, self.writer)
+            logger.info(f"Scaler saved to {self.config.scaler_path}")
+            
+            rows = {'train': 0, 'test': 0}
+            paths = {'train': self.config.train_data_path, 'test': self.config.test_data_path}
+            for chunk_index, chunk in enumerate(self.read_chunks()):
+                is_test = self.test_mask(chunk)
+                if 'id' in chunk.columns:
+                    self.test_ids.append(chunk['id'].to_numpy()[is_test])
+                X, y = self.separate_target(self.encoder.transform(chunk))
+                scaled = scaler.transform(X)
+                for split, mask in (('train', ~is_test), ('test', is_test)):
+                    part = pd.DataFrame(scaled[mask], columns=X.columns)
+                    part[y.name] = y.to_numpy()[mask]
+                    part.to_csv(paths[split], mode='w' if chunk_index == 0 else 'a',
+                                header=chunk_index == 0, index=False)
+                    rows[split] += int(mask.sum())
+            
+            logger.info(f"Train set size: {rows['train']}, Test set size: {rows['test']}")
+            self.write_split_manifest(rows['train'])
+            logger.info(f"Train data saved to {self.config.train_data_path}")
+            logger.info(f"Test data saved to {self.config.test_data_path}")
+            logger.info("Data transformation completed")
+            
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform(self, df: pd.DataFrame = None) -> tuple:
+        """Encode, split and scale; returns (train_df, test_df), or (None, None) in chunked mode"""
         try:
             logger.info("Starting data transformation...")
             
-            df = pd.read_csv(self.config.data_path)
+            if df is None and self.config.chunk_rows > 0:
+                self.transform_chunked()
+                return None, None
+            if df is None:
+                df = pd.read_csv(self.config.data_path)
             logger.info(f"Loaded data shape: {df.shape}")
             
             df = self.encode_categorical_features(df)
             
             X_train, X_test, y_train, y_test = self.split_data(df)
+            self.write_split_manifest(len(X_train))
             
             X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
             
             train_df = pd.concat([X_train_scaled, y_train.reset_index(drop=True)], axis=1)
             test_df = pd.concat([X_test_scaled, y_test.reset_index(drop=True)], axis=1)
-            train_df.to_csv(self.config.train_data_path, index=False)
-            test_df.to_csv(self.config.test_data_path, index=False)
+            save_csv(train_df, self.config.train_data_path, self.writer)
+            save_csv(test_df, self.config.test_data_path, self.writer)
             
             logger.info(f"Train data saved to {self.config.train_data_path}")
             logger.info(f"Test data saved to {self.config.test_data_path}")
             logger.info("Data transformation completed")
             
+            return train_df, test_df
+            
         except Exception as e:
             raise CustomException(e, sys)
@@ -1,52 +1,194 @@
-﻿import os
+import os
 import sys
+import json
+import time
+from datetime import datetime
+import numpy as np
 import pandas as pd
 from heartpipeline.logging import logger
 from heartpipeline.exception import CustomException
 from heartpipeline.entity.config_entity import DataValidationConfig
 
 
+NUMERIC_TYPES = ('int', 'float')
+BOOL_VALUES = [True, False, 'True', 'False', 'true', 'false', 0, 1]
+# Distinct unexpected values kept per column in the report
+MAX_REPORTED_VALUES = 20
+
+
+class ColumnProfile:
+    """Running statistics and rule violations for one column, updated chunk by chunk"""
+
+    def __init__(self, name: str, dtype: str, rules: dict):
+        self.name = name
+        self.dtype = dtype
+        self.rules = rules or {}
+        self.allowed = self.rules.get('allowed')
+        self.rows = 0
+        self.nulls = 0
+        self.invalid_type = 0
+        self.out_of_range = 0
+        self.unexpected = {}
+        self.minimum = None
+        self.maximum = None
+        self.total = 0.0
+        self.counted = 0
+        # Unique check fast path: ids arriving strictly increasing are unique
+        self.last_value = None
+        self.sorted_run = True
+
+    def _record_unexpected(self, values: pd.Series):
+        for value, count in values.value_counts().items():
+            key = str(value)
+            if key in self.unexpected or len(self.unexpected) < MAX_REPORTED_VALUES:
+                self.unexpected[key] = self.unexpected.get(key, 0) + int(count)
+            self.out_of_range += int(count)
+
+    def update(self, series: pd.Series):
+        self.rows += len(series)
+        missing = series.isna().to_numpy()
+        self.nulls += int(missing.sum())
+        values = series[~missing] if missing.any() else series
+        if self.dtype in NUMERIC_TYPES:
+            self._update_numeric(values)
+        elif self.dtype == 'bool':
+            if values.dtype != bool:
+                self.invalid_type += int((~values.isin(BOOL_VALUES)).sum())
+        elif self.allowed is not None:
+            self._record_unexpected(values[~values.isin(self.allowed)])
+
+    def _update_numeric(self, values: pd.Series):
+        if not pd.api.types.is_numeric_dtype(values) or values.dtype == bool:
+            values = pd.to_numeric(values, errors='coerce')
+            bad = values.isna().to_numpy()
+            self.invalid_type += int(bad.sum())
+            values = values[~bad]
+        array = values.to_numpy()
+        if self.dtype == 'int' and array.dtype.kind == 'f':
+            fractional = np.mod(array, 1) != 0
+            self.invalid_type += int(fractional.sum())
+        if len(array) == 0:
+            return
+
+        low, high = array.min(), array.max()
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        self.total += float(array.sum(dtype=np.float64))
+        self.counted += len(array)
+
+        if 'min' in self.rules and low < self.rules['min']:
+            self._record_unexpected(values[array < self.rules['min']])
+        if 'max' in self.rules and high > self.rules['max']:
+            self._record_unexpected(values[array > self.rules['max']])
+        if self.allowed is not None:
+            self._record_unexpected(values[~values.isin(self.allowed)])
+
+        if self.rules.get('unique') and self.sorted_run:
+            increasing = len(array) < 2 or bool((np.diff(array) > 0).all())
+            if not increasing or (self.last_value is not None and array[0] <= self.last_value):
+                self.sorted_run = False
+            self.last_value = array[-1]
+
+    def null_ratio_exceeded(self) -> bool:
+        return self.rows > 0 and self.nulls / self.rows > self.rules.get('max_null_ratio', 0.0)
+
+    def summary(self) -> dict:
+        summary = {
+            'expected_type': self.dtype,
+            'rows': self.rows,
+            'nulls': self.nulls,
+            'null_ratio': self.nulls / self.rows if self.rows else 0.0,
+            'invalid_type': self.invalid_type,
+            'out_of_range': self.out_of_range,
+            'unexpected_values': self.unexpected
+        }
+        if self.counted:
+            summary.update({
+                'min': self.minimum.item() if hasattr(self.minimum, 'item') else self.minimum,
+                'max': self.maximum.item() if hasattr(self.maximum, 'item') else self.maximum,
+                'mean': self.total / self.counted
+            })
+        return summary
+
+
 class DataValidation:
     def __init__(self, config: DataValidationConfig):
         self.config = config
 
-    def validate_columns(self, df: pd.DataFrame) -> bool:
+    def validate_columns(self, columns: list) -> list:
+        """Schema errors for missing columns; extra columns are only logged"""
         try:
-            all_cols = list(df.columns)
-            missing_cols = [col for col in self.config.required_columns if col not in all_cols]
-            
+            missing_cols = [col for col in self.config.required_columns if col not in columns]
+            extra_cols = [col for col in columns if col not in self.config.required_columns]
+
+            if extra_cols:
+                logger.warning(f"Columns not in schema: {extra_cols}")
             if missing_cols:
                 logger.error(f"Missing columns: {missing_cols}")
-                return False
-            
+                return [f"Missing columns: {missing_cols}"]
+
             logger.info("All required columns present")
-            return True
-            
+            return []
+
         except Exception as e:
             raise CustomException(e, sys)
 
-    def validate_nulls(self, df: pd.DataFrame) -> bool:
+    def iter_chunks(self, df: pd.DataFrame = None, usecols: list = None):
+        if df is not None:
+            yield df if usecols is None else df[usecols]
+            return
+        yield from pd.read_csv(self.config.data_dir, chunksize=self.config.chunk_rows, usecols=usecols)
+
+    def profile_columns(self, df: pd.DataFrame = None) -> tuple:
+        """One pass over the data (or ``df``) updating a ColumnProfile per schema column"""
         try:
-            null_counts = df.isnull().sum()
-            total_nulls = null_counts.sum()
-            
-            if total_nulls > 0:
-                logger.warning(f"Found {total_nulls} null values")
-                logger.warning(f"Null counts per column:\n{null_counts[null_counts > 0]}")
-                return False
-            
-            logger.info("No null values found")
-            return True
-            
+            profiles, columns = None, []
+            for chunk in self.iter_chunks(df):
+                if profiles is None:
+                    columns = list(chunk.columns)
+                    profiles = {
+                        col: ColumnProfile(col, dtype, self.config.constraints.get(col))
+                        for col, dtype in self.config.column_types.items() if col in chunk.columns
+                    }
+                for col, profile in profiles.items():
+                    profile.update(chunk[col])
+            return columns, profiles or {}
+
         except Exception as e:
             raise CustomException(e, sys)
 
-    def validate_data_types(self, df: pd.DataFrame) -> bool:
+    def count_duplicates(self, column: str, df: pd.DataFrame = None) -> int:
+        """Slow path for unique columns that did not arrive in strictly increasing order"""
         try:
-            logger.info("Data types validation:")
-            logger.info(f"\n{df.dtypes}")
-            return True
-            
+            parts = [chunk[column].dropna().to_numpy() for chunk in self.iter_chunks(df, usecols=[column])]
+            values = np.sort(np.concatenate(parts)) if parts else np.array([])
+            return int((values[1:] == values[:-1]).sum())
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def check_rules(self, profiles: dict, df: pd.DataFrame = None) -> tuple:
+        try:
+            errors, warnings = [], []
+            for col, profile in profiles.items():
+                rules = profile.rules
+                problems = []
+                if profile.null_ratio_exceeded():
+                    problems.append(f"{col}: null ratio {profile.nulls / profile.rows:.4%} "
+                                    f"exceeds {rules.get('max_null_ratio', 0.0):.4%}")
+                if profile.invalid_type:
+                    problems.append(f"{col}: {profile.invalid_type} values are not {profile.dtype}")
+                if profile.rows and profile.out_of_range / profile.rows > rules.get('max_invalid_ratio', 0.0):
+                    limits = {k: list(v) if k == 'allowed' else v
+                              for k, v in rules.items() if k in ('min', 'max', 'allowed')}
+                    problems.append(f"{col}: {profile.out_of_range} values violate {limits}")
+                if rules.get('unique'):
+                    duplicates = 0 if profile.sorted_run else self.count_duplicates(col, df)
+                    if duplicates:
+                        problems.append(f"{col}: {duplicates} duplicate values")
+                (warnings if rules.get('severity') == 'warning' else errors).extend(problems)
+            return errors, warnings
+
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -55,32 +197,64 @@ class DataValidation:
             status_file = os.path.join(self.config.root_dir, self.config.STATUS_FILE)
             with open(status_file, 'w') as f:
                 f.write(f"Validation Status: {status}")
-            
+
             logger.info(f"Validation status saved to {status_file}")
-            
+
         except Exception as e:
             raise CustomException(e, sys)
 
-    def validate(self) -> bool:
+    def save_report(self, report: dict):
+        with open(self.config.report_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info(f"Validation report saved to {self.config.report_path}")
+
+    def validate(self, df: pd.DataFrame = None) -> bool:
+        """Check data_dir (or ``df``) against config/schema.yaml in one chunked pass
+
+        Writes status.txt and a JSON report with per-column statistics.
+
+        Raises:
+            ValueError: If any error-severity check fails and fail_on_error is set
+        """
         try:
             logger.info("Starting data validation...")
-            
-            df = pd.read_csv(self.config.data_dir)
-            logger.info(f"Loaded data shape: {df.shape}")
-            
-            cols_valid = self.validate_columns(df)
-            nulls_valid = self.validate_nulls(df)
-            types_valid = self.validate_data_types(df)
-            validation_status = all([cols_valid, nulls_valid, types_valid])
-            
+            start = time.perf_counter()
+
+            columns, profiles = self.profile_columns(df)
+            errors = self.validate_columns(columns)
+            rule_errors, warnings = self.check_rules(profiles, df)
+            errors += rule_errors
+            rows = max((profile.rows for profile in profiles.values()), default=0)
+            logger.info(f"Validated {rows} rows x {len(columns)} columns in {time.perf_counter() - start:.2f}s")
+
+            for warning in warnings:
+                logger.warning(warning)
+            for error in errors:
+                logger.error(error)
+
+            validation_status = not errors
+            status = "PASSED" if validation_status else "FAILED"
+            self.save_report({
+                'status': status,
+                'validated_at': datetime.now().isoformat(timespec='seconds'),
+                'data_path': str(self.config.data_dir) if df is None else None,
+                'rows': rows,
+                'duration_seconds': time.perf_counter() - start,
+                'errors': errors,
+                'warnings': warnings,
+                'columns': {col: profile.summary() for col, profile in profiles.items()}
+            })
+            self.save_validation_status(status)
+
             if validation_status:
-                self.save_validation_status("PASSED")
                 logger.info("Data validation PASSED")
             else:
-                self.save_validation_status("FAILED")
                 logger.error("Data validation FAILED")
-            
+                if self.config.fail_on_error:
+                    raise ValueError(f"Data validation failed with {len(errors)} errors, "
+                                     f"see {self.config.report_path}")
+
             return validation_status
-            
+
         except Exception as e:
             raise CustomException(e, sys)
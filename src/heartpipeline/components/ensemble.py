@@ -0,0 +1,60 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import r2_score
+
+
+class StackedEnsemble:
+    """Non-negative linear blend of fitted regressors, served like a single model
+
+    prediction = intercept + sum(weight * member.predict(X)). The weights are
+    fitted on out-of-fold member predictions, so a member only earns weight
+    for what it adds on rows it was not trained on.
+    """
+
+    def __init__(self, members: dict, weights, intercept: float):
+        self.members = dict(members)
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = float(intercept)
+
+    def predict(self, X) -> np.ndarray:
+        predictions = np.full(len(X), self.intercept)
+        for weight, member in zip(self.weights, self.members.values()):
+            predictions += weight * member.predict(X)
+        return predictions
+
+    def describe(self) -> dict:
+        return {'intercept': self.intercept,
+                'weights': {name: float(weight) for name, weight in zip(self.members, self.weights)}}
+
+
+def fit_meta_learner(oof: np.ndarray, y) -> tuple:
+    """(meta-learner, R2 of its out-of-fold blend)"""
+    meta = LinearRegression(positive=True).fit(oof, y)
+    return meta, float(r2_score(y, meta.predict(oof)))
+
+
+def prune_members(oof: np.ndarray, y, names: list, latency_ms: dict, min_gain_per_ms: float) -> tuple:
+    """Greedy backward elimination of members that do not pay for their latency
+
+    Each round drops the member whose removal costs the least out-of-fold
+    R2 per millisecond saved, as long as that cost is below
+    ``min_gain_per_ms``. With 0 only members that add nothing are dropped.
+
+    Returns:
+        tuple: (kept names, dropped [{'model', 'r2_gain', 'latency_ms'}])
+    """
+    kept = list(names)
+    dropped = []
+    while len(kept) > 1:
+        columns = [names.index(name) for name in kept]
+        _, full_r2 = fit_meta_learner(oof[:, columns], y)
+        gains = {}
+        for name in kept:
+            reduced = [names.index(other) for other in kept if other != name]
+            gains[name] = full_r2 - fit_meta_learner(oof[:, reduced], y)[1]
+        weakest = min(kept, key=lambda name: gains[name] / max(latency_ms[name], 1e-3))
+        if gains[weakest] / max(latency_ms[weakest], 1e-3) > min_gain_per_ms:
+            break
+        kept.remove(weakest)
+        dropped.append({'model': weakest, 'r2_gain': float(gains[weakest]), 'latency_ms': latency_ms[weakest]})
+    return kept, dropped
@@ -1,77 +1,143 @@
 ﻿import os
 import sys
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import pandas as pd
 from heartpipeline.logging import logger
 from heartpipeline.exception import CustomException
 from heartpipeline.entity.config_entity import FeatureEngineeringConfig
+from heartpipeline.features.kernel import add_engineered_features
+from heartpipeline.utils.common import AsyncArtifactWriter, save_csv
+
+
+MEDIAN_FEATURES = ['speed_limit', 'curvature']
+
+
+def median_from_counts(counts: pd.Series) -> float:
+    """Exact median of the values described by a value -> count Series"""
+    counts = counts.sort_index()
+    cumulative = counts.cumsum().to_numpy()
+    total = int(cumulative[-1])
+    values = counts.index.to_numpy()
+    lower = values[cumulative.searchsorted(total // 2 + (total % 2) - 1, side='right')]
+    upper = values[cumulative.searchsorted(total // 2, side='right')]
+    return float((lower + upper) / 2)
+
+
+def engineer_shard(config: FeatureEngineeringConfig, shard_index: int, df: pd.DataFrame,
+                   medians: dict) -> Path:
+    """Process-pool entry point: engineer one row chunk and write it as a shard CSV"""
+    df = FeatureEngineering(config).create_features(df, medians)
+    shard_path = Path(config.shard_dir) / f"road_features_{shard_index:05d}.csv"
+    df.to_csv(shard_path, index=False)
+    return shard_path
 
 
 class FeatureEngineering:
-    def __init__(self, config: FeatureEngineeringConfig):
+    def __init__(self, config: FeatureEngineeringConfig, writer: AsyncArtifactWriter = None):
         self.config = config
+        self.writer = writer
 
-    def create_interaction_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def create_features(self, df: pd.DataFrame, medians: dict = None) -> pd.DataFrame:
         try:
-            logger.info("Creating interaction features...")
+            logger.info("Creating interaction, risk indicator and categorical features...")
             
-            df['lanes_speed'] = df['num_lanes'] * df['speed_limit']
+            # Sharded runs pass the global medians so every chunk uses the same thresholds
+            if medians is None:
+                medians = {col: float(df[col].median()) for col in MEDIAN_FEATURES}
             
-            df['curvature_speed'] = df['curvature'] * df['speed_limit']
-            df['lanes_curvature'] = df['num_lanes'] * df['curvature']
+            # Same kernel and float64 output as RiskPredictor, so training and serving features match
+            df = add_engineered_features(df, medians)
             
-            logger.info("Interaction features created")
+            logger.info("Engineered features created")
             return df
             
         except Exception as e:
             raise CustomException(e, sys)
 
-    def create_risk_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_feature_stats(self) -> dict:
+        """First pass over the input: exact medians from streamed value counts"""
         try:
-            logger.info("Creating risk indicator features...")
-            
-            df['high_speed'] = (df['speed_limit'] > df['speed_limit'].median()).astype(int)
-            
-            df['high_curvature'] = (df['curvature'] > df['curvature'].median()).astype(int)
-            
-            df['few_lanes'] = (df['num_lanes'] <= 2).astype(int)
-            
-            df['no_signs'] = (df['road_signs_present'] == False).astype(int)
-            df['holiday_risk'] = (df['holiday'] == True).astype(int)
-            
-            logger.info("Risk indicator features created")
-            return df
+            counts = {col: pd.Series(dtype='int64') for col in MEDIAN_FEATURES}
+            rows = 0
+            for chunk in pd.read_csv(self.config.data_path, usecols=MEDIAN_FEATURES,
+                                     chunksize=self.config.shard_rows):
+                rows += len(chunk)
+                for col in MEDIAN_FEATURES:
+                    counts[col] = counts[col].add(chunk[col].value_counts(), fill_value=0)
+            
+            stats = {'rows': rows, 'medians': {col: median_from_counts(counts[col]) for col in MEDIAN_FEATURES}}
+            logger.info(f"Feature stats from {rows} rows: {stats['medians']}")
+            return stats
             
         except Exception as e:
             raise CustomException(e, sys)
 
-    def create_categorical_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def save_feature_stats(self, stats: dict):
+        with open(self.config.stats_path, 'w') as f:
+            json.dump(stats, f, indent=2)
+        logger.info(f"Feature stats saved to {self.config.stats_path}")
+
+    def engineer_features_sharded(self, medians: dict) -> Path:
+        """Engineer row chunks in a process pool, then concatenate the shard CSVs into output_path"""
         try:
-            logger.info("Creating categorical features...")
-            
-            df['speed_category'] = pd.cut(df['speed_limit'], 
-                                         bins=[0, 40, 60, 80, 120], 
-                                         labels=['low', 'medium', 'high', 'very_high'])
-            df['curvature_category'] = pd.cut(df['curvature'], 
-                                              bins=[-0.1, 0.3, 0.6, 1.0], 
-                                              labels=['low', 'medium', 'high'])
-            
-            logger.info("Categorical features created")
-            return df
+            logger.info(f"Sharded feature engineering: {self.config.shard_rows} rows per shard, "
+                        f"{self.config.num_workers} workers")
+            if os.path.exists(self.config.shard_dir):
+                shutil.rmtree(self.config.shard_dir)
+            os.makedirs(self.config.shard_dir)
+            
+            # Bound the chunks in flight so the parent never holds the whole file
+            max_pending = self.config.num_workers * 2
+            pending, shard_paths = [], []
+            with ProcessPoolExecutor(max_workers=self.config.num_workers) as executor:
+                chunks = pd.read_csv(self.config.data_path, chunksize=self.config.shard_rows)
+                for shard_index, chunk in enumerate(chunks):
+                    pending.append(executor.submit(engineer_shard, self.config, shard_index, chunk, medians))
+                    if len(pending) >= max_pending:
+                        shard_paths.append(pending.pop(0).result())
+                shard_paths.extend(future.result() for future in pending)
+            
+            with open(self.config.output_path, 'w', newline='') as out:
+                for shard_index, shard_path in enumerate(shard_paths):
+                    with open(shard_path, 'r', newline='') as shard:
+                        if shard_index > 0:
+                            shard.readline()
+                        shutil.copyfileobj(shard, out)
+            
+            logger.info(f"Merged {len(shard_paths)} shards from {self.config.shard_dir}")
+            return self.config.output_path
             
         except Exception as e:
             raise CustomException(e, sys)
 
-    def engineer_features(self) -> pd.DataFrame:
+    def engineer_features(self, df: pd.DataFrame = None) -> pd.DataFrame:
+        """Engineer features for ``df``, or for data_path when no frame is given
+
+        Reading from disk runs a stats pass first. Inputs larger than one shard
+        are processed by engineer_features_sharded when num_workers > 1; that
+        path returns None instead of the full frame.
+        """
         try:
             logger.info("Starting feature engineering...")
             
-            df = pd.read_csv(self.config.data_path)
+            if df is None:
+                stats = self.compute_feature_stats()
+                self.save_feature_stats(stats)
+                if self.config.num_workers > 1 and stats['rows'] > self.config.shard_rows:
+                    self.engineer_features_sharded(stats['medians'])
+                    logger.info(f"Engineered data saved to {self.config.output_path}")
+                    return None
+                df = pd.read_csv(self.config.data_path)
+            else:
+                stats = {'rows': len(df), 'medians': {col: float(df[col].median()) for col in MEDIAN_FEATURES}}
+                self.save_feature_stats(stats)
             logger.info(f"Loaded data shape: {df.shape}")
             
-            df = self.create_interaction_features(df)
-            df = self.create_risk_indicators(df)
-            df = self.create_categorical_features(df)
-            df.to_csv(self.config.output_path, index=False)
+            df = self.create_features(df, stats['medians'])
+            save_csv(df, self.config.output_path, self.writer)
             logger.info(f"Feature engineering completed. Output shape: {df.shape}")
             logger.info(f"Engineered data saved to {self.config.output_path}")
             
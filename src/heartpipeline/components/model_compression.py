@@ -0,0 +1,197 @@
+import os
+import sys
+import copy
+import json
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.entity.config_entity import ModelCompressionConfig
+from heartpipeline.components.model_costs import measure_costs
+from heartpipeline.serving.intervals import ConformalIntervals
+from heartpipeline.utils.common import save_pickle
+
+
+class ModelCompression:
+    """Builds a lighter stand-in for the serving model
+
+    Variants of the teacher (model.pkl) are scored for accuracy, size and
+    latency:
+
+    - pruned forests keep the k trees picked by greedy forward selection,
+      each step adding the tree that most reduces the averaged error;
+    - gradient boosting and XGBoost keep their first k stages;
+    - distilled students (depth-capped GBMs and a Ridge on pairwise feature
+      products) are fitted to the teacher's predictions on the training rows.
+
+    Test rows are split in three: the first third selects trees, the second
+    scores every variant and the last calibrates the winner's conformal
+    scores. The fastest variant within ``max_r2_loss`` of the teacher is
+    written to ``compact_model_path`` with those scores; app.py serves it
+    while it is newer than model.pkl.
+    """
+
+    def __init__(self, config: ModelCompressionConfig):
+        self.config = config
+
+    def load_data(self):
+        try:
+            train_data = pd.read_csv(self.config.train_data_path)
+            test_data = pd.read_csv(self.config.test_data_path)
+            X_train = train_data.drop(self.config.target_column, axis=1)
+            X_test = test_data.drop(self.config.target_column, axis=1)
+            return (X_train, train_data[self.config.target_column].values,
+                    X_test, test_data[self.config.target_column].values)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_teacher(self):
+        with open(self.config.model_path, 'rb') as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def teacher_input(teacher, X: pd.DataFrame):
+        """``X`` in the form the teacher was fitted on, so students see the same input"""
+        return X if hasattr(teacher, 'feature_names_in_') else X.to_numpy(dtype=float)
+
+    @staticmethod
+    def replace_fitted(model, **fitted):
+        """Deep copy of ``model`` with ``fitted`` attributes swapped in, without copying the ones replaced"""
+        memo = {id(getattr(model, name)): None for name in fitted}
+        variant = copy.deepcopy(model, memo)
+        for name, value in fitted.items():
+            setattr(variant, name, copy.deepcopy(value))
+        return variant
+
+    @staticmethod
+    def select_trees(model, X, y, max_trees: int) -> list:
+        """Indices of forest trees in greedy forward-selection order"""
+        # The individual trees are fitted without feature names
+        X = np.asarray(X, dtype=float)
+        per_tree = np.column_stack([tree.predict(X) for tree in model.estimators_])
+        remaining = list(range(per_tree.shape[1]))
+        chosen = []
+        total = np.zeros(len(y))
+        while remaining and len(chosen) < max_trees:
+            means = (total[:, None] + per_tree[:, remaining]) / (len(chosen) + 1)
+            best = remaining[int(np.argmin(((means - y[:, None]) ** 2).mean(axis=0)))]
+            chosen.append(best)
+            remaining.remove(best)
+            total += per_tree[:, best]
+        return chosen
+
+    def pruned_variants(self, teacher, X_select, y_select) -> dict:
+        name = type(teacher).__name__
+        counts = sorted(self.config.tree_counts)
+        variants = {}
+        if name in ('RandomForestRegressor', 'ExtraTreesRegressor'):
+            order = self.select_trees(teacher, X_select, y_select, counts[-1])
+            for k in counts:
+                if k < len(teacher.estimators_):
+                    pruned = self.replace_fitted(teacher, estimators_=[teacher.estimators_[i] for i in order[:k]])
+                    pruned.n_estimators = k
+                    variants[f"pruned_{k}_trees"] = pruned
+        elif name == 'GradientBoostingRegressor':
+            for k in counts:
+                if k < teacher.n_estimators_:
+                    pruned = self.replace_fitted(teacher, estimators_=teacher.estimators_[:k])
+                    pruned.n_estimators = pruned.n_estimators_ = k
+                    variants[f"first_{k}_stages"] = pruned
+        elif name == 'XGBRegressor':
+            booster = teacher.get_booster()
+            for k in counts:
+                if k < booster.num_boosted_rounds():
+                    pruned = self.replace_fitted(teacher, _Booster=booster[:k])
+                    pruned.n_estimators = k
+                    variants[f"first_{k}_stages"] = pruned
+        return variants
+
+    def distilled_variants(self, teacher, X_train) -> dict:
+        soft_targets = teacher.predict(X_train)
+        variants = {}
+        for depth in self.config.student_depths:
+            student = GradientBoostingRegressor(n_estimators=self.config.student_estimators, max_depth=depth,
+                                                learning_rate=0.1, random_state=42)
+            variants[f"student_gbm_depth_{depth}"] = student.fit(X_train, soft_targets)
+        ridge = make_pipeline(PolynomialFeatures(degree=2, include_bias=False), Ridge(alpha=1.0))
+        variants['student_ridge_pairwise'] = ridge.fit(X_train, soft_targets)
+        return variants
+
+    def score(self, model, X, y, teacher_predictions) -> dict:
+        predictions = model.predict(X)
+        return {
+            'r2_score': float(r2_score(y, predictions)),
+            'rmse': float(np.sqrt(mean_squared_error(y, predictions))),
+            # How closely the variant reproduces the teacher
+            'teacher_r2': float(r2_score(teacher_predictions, predictions)),
+            **measure_costs(model, X, self.config.cost_batch_rows)
+        }
+
+    def compress(self) -> dict:
+        try:
+            teacher = self.load_teacher()
+            X_train, y_train, X_test, y_test = self.load_data()
+            # Calibrating on the rows that ranked the variants would understate the winner's error
+            select_end, eval_end = len(X_test) // 3, 2 * len(X_test) // 3
+            X_train, X_test = self.teacher_input(teacher, X_train), self.teacher_input(teacher, X_test)
+            X_select, y_select = X_test[:select_end], y_test[:select_end]
+            X_eval, y_eval = X_test[select_end:eval_end], y_test[select_end:eval_end]
+            X_calibrate, y_calibrate = X_test[eval_end:], y_test[eval_end:]
+            teacher_predictions = teacher.predict(X_eval)
+
+            variants = self.pruned_variants(teacher, X_select, y_select)
+            variants.update(self.distilled_variants(teacher, X_train))
+
+            curve = [{'variant': 'teacher', **self.score(teacher, X_eval, y_eval, teacher_predictions)}]
+            for name, model in variants.items():
+                curve.append({'variant': name, **self.score(model, X_eval, y_eval, teacher_predictions)})
+                logger.info(f"{name} - R2: {curve[-1]['r2_score']:.4f}, latency: {curve[-1]['latency_ms']:.2f} ms, "
+                            f"size: {curve[-1]['size_bytes'] / 1024:.1f} KB")
+            curve.sort(key=lambda point: point['latency_ms'])
+
+            teacher_point = next(point for point in curve if point['variant'] == 'teacher')
+            eligible = [point for point in curve
+                        if point['variant'] != 'teacher'
+                        and point['r2_score'] >= teacher_point['r2_score'] - self.config.max_r2_loss
+                        and point['latency_ms'] < teacher_point['latency_ms']]
+            # Latencies closer than 0.1 ms are timing noise, so the smaller model wins those ties
+            selected = min(eligible, key=lambda point: (round(point['latency_ms'], 1), point['size_bytes'])) if eligible else None
+
+            if selected is not None:
+                compact = variants[selected['variant']]
+                # Scores first, so a reload triggered by the new model finds matching intervals
+                ConformalIntervals.calibrate(compact, X_calibrate, y_calibrate).save(self.config.compact_conformal_path)
+                save_pickle(compact, self.config.compact_model_path)
+                logger.info(f"Compact model {selected['variant']} saved to {self.config.compact_model_path} "
+                            f"(R2 {selected['r2_score']:.4f} vs {teacher_point['r2_score']:.4f}, "
+                            f"{teacher_point['latency_ms'] / selected['latency_ms']:.1f}x faster)")
+            else:
+                # A compact model of the previous teacher must not outlive it
+                for path in (self.config.compact_model_path, self.config.compact_conformal_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                        logger.info(f"Withdrew {path}, built for an earlier teacher")
+                logger.info(f"No variant within {self.config.max_r2_loss} R2 of the teacher is faster; "
+                            f"serving {self.config.model_path}")
+
+            report = {
+                'teacher': type(teacher).__name__,
+                'max_r2_loss': self.config.max_r2_loss,
+                'evaluation_rows': len(y_eval),
+                'calibration_rows': len(y_calibrate),
+                'selected': selected['variant'] if selected else None,
+                'curve': curve
+            }
+            with open(self.config.report_path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+            return report
+
+        except Exception as e:
+            raise CustomException(e, sys)
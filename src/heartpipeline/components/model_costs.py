@@ -0,0 +1,65 @@
+import pickle
+import time
+import numpy as np
+
+
+def measure_latency(model, X, repeats: int = 30) -> float:
+    """Median single-row predict time in milliseconds"""
+    row = X[:1]
+    model.predict(row)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def measure_costs(model, X, batch_rows: int = 1000, repeats: int = 3) -> dict:
+    """Serialized size, load time, single-row latency and batch throughput of a fitted model"""
+    payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    load_timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pickle.loads(payload)
+        load_timings.append(time.perf_counter() - start)
+
+    batch = X[:batch_rows]
+    batch_timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(batch)
+        batch_timings.append(time.perf_counter() - start)
+
+    return {
+        'size_bytes': len(payload),
+        'load_ms': float(np.median(load_timings) * 1000),
+        'latency_ms': measure_latency(model, X),
+        'throughput_rows_per_s': float(len(batch) / max(np.median(batch_timings), 1e-9))
+    }
+
+
+def objective_score(r2: float, costs: dict, objective: str, max_latency_ms: float, latency_penalty: float) -> tuple:
+    """Sort key for model selection, higher is better
+
+    - ``accuracy``: test R2 alone;
+    - ``max_latency``: test R2 among models within ``max_latency_ms``; when
+      none fits, the fastest model wins;
+    - ``tradeoff``: R2 - latency_penalty * latency_ms.
+    """
+    if objective == 'accuracy':
+        return (r2,)
+    if objective == 'max_latency':
+        feasible = costs['latency_ms'] <= max_latency_ms
+        return (feasible, r2 if feasible else -costs['latency_ms'])
+    if objective == 'tradeoff':
+        return (r2 - latency_penalty * costs['latency_ms'],)
+    raise ValueError(f"Unknown selection objective {objective!r}; expected accuracy, max_latency or tradeoff")
+
+
+def rank_by_objective(results: list, costs: dict, objective: str, max_latency_ms: float,
+                      latency_penalty: float) -> list:
+    """(score, name, model) results sorted best first; ``costs`` maps each name to its measure_costs dict"""
+    return sorted(results, reverse=True,
+                  key=lambda result: objective_score(result[0], costs[result[1]], objective,
+                                                     max_latency_ms, latency_penalty))
@@ -90,14 +90,20 @@ class ModelEvaluation:
         except Exception as e:
             logger.warning(f"Failed to log to MLflow: {str(e)}")
 
-    def evaluate(self) -> dict:
+    def evaluate(self, model=None, X_test: pd.DataFrame = None, y_test: pd.Series = None,
+                 y_pred=None) -> dict:
         try:
             logger.info("Starting model evaluation...")
             
-            model = self.load_model()
-            X_test, y_test = self.load_test_data()
+            if X_test is None or y_test is None:
+                X_test, y_test = self.load_test_data()
             
-            y_pred = model.predict(X_test)
+            if y_pred is None:
+                if model is None:
+                    model = self.load_model()
+                y_pred = model.predict(X_test)
+            else:
+                logger.info("Reusing test predictions from model training")
             
             metrics = self.calculate_metrics(y_test, y_pred)
             logger.info(f"RMSE: {metrics['rmse']:.4f}")
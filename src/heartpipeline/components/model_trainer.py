@@ -1,28 +1,49 @@
 ﻿import os
 import sys
-import pandas as pd
+import json
 import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import time
 import mlflow
 import mlflow.sklearn
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.linear_model import Ridge
+from sklearn.base import clone
+from sklearn.model_selection import KFold
 from xgboost import XGBRegressor
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from heartpipeline.logging import logger
 from heartpipeline.exception import CustomException
 from heartpipeline.entity.config_entity import ModelTrainerConfig
+from heartpipeline.components.ensemble import StackedEnsemble, fit_meta_learner, prune_members
+from heartpipeline.components.model_costs import measure_costs, measure_latency, rank_by_objective
+from heartpipeline.serving.intervals import ConformalIntervals, calibration_split
+from heartpipeline.utils.common import AsyncArtifactWriter, dump_pickle
+
+
+# Model name -> (params.yaml section, estimator factory)
+MODEL_REGISTRY = {
+    'RandomForest': ('RandomForestRegressor', lambda: RandomForestRegressor(random_state=42)),
+    'GradientBoosting': ('GradientBoostingRegressor', lambda: GradientBoostingRegressor(random_state=42)),
+    'XGBoost': ('XGBRegressor', lambda: XGBRegressor(random_state=42, objective='reg:squarederror')),
+    'Ridge': ('Ridge', lambda: Ridge(random_state=42))
+}
 
 
 class ModelTrainer:
-    def __init__(self, config: ModelTrainerConfig):
+    def __init__(self, config: ModelTrainerConfig, writer: AsyncArtifactWriter = None):
         self.config = config
+        self.writer = writer
+        self.predictions = {}
+        self.experiment_id = None
         
-    def load_data(self):
+    def split_features(self, train_data: pd.DataFrame, test_data: pd.DataFrame):
         try:
-            train_data = pd.read_csv(self.config.train_data_path)
-            test_data = pd.read_csv(self.config.test_data_path)
-            
-            # Separate features and target
             X_train = train_data.drop(self.config.target_column, axis=1)
             y_train = train_data[self.config.target_column]
             X_test = test_data.drop(self.config.target_column, axis=1)
@@ -35,9 +56,19 @@ class ModelTrainer:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def load_data(self):
+        try:
+            train_data = pd.read_csv(self.config.train_data_path)
+            test_data = pd.read_csv(self.config.test_data_path)
+            
+            # Separate features and target
+            return self.split_features(train_data, test_data)
+            
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def evaluate_model(self, y_true, y_pred) -> dict:
         try:
-            import numpy as np
             mse = mean_squared_error(y_true, y_pred)
             rmse = np.sqrt(mse)
             mae = mean_absolute_error(y_true, y_pred)
@@ -56,10 +87,19 @@ class ModelTrainer:
             raise CustomException(e, sys)
 
     def train_model(self, X_train, X_test, y_train, y_test, model_name: str, model, params: dict):
+        """Fit one model and log it as its own MLflow run
+
+        The run is addressed by id through MlflowClient rather than the
+        fluent active run, so candidates trained on parallel scheduler
+        threads never log into each other's runs.
+        """
         try:
             logger.info(f"Training {model_name}...")
             
-            with mlflow.start_run(run_name=model_name):
+            client = MlflowClient()
+            run_id = client.create_run(self.experiment_id, run_name=model_name).info.run_id
+            status = 'FAILED'
+            try:
                 model.set_params(**params)
                 
                 model.fit(X_train, y_train)
@@ -69,62 +109,259 @@ class ModelTrainer:
                 
                 train_metrics = self.evaluate_model(y_train, y_train_pred)
                 test_metrics = self.evaluate_model(y_test, y_test_pred)
+                self.predictions[model_name] = {'train': y_train_pred, 'test': y_test_pred}
                 
-                mlflow.log_params(params)
-                mlflow.log_metric("train_rmse", train_metrics['rmse'])
-                mlflow.log_metric("train_mae", train_metrics['mae'])
-                mlflow.log_metric("train_r2", train_metrics['r2_score'])
-                mlflow.log_metric("test_rmse", test_metrics['rmse'])
-                mlflow.log_metric("test_mae", test_metrics['mae'])
-                mlflow.log_metric("test_r2", test_metrics['r2_score'])
-                
-                logger.info(f"{model_name} - Test RMSE: {test_metrics['rmse']:.4f}, Test R2: {test_metrics['r2_score']:.4f}")
-                
-                return model, test_metrics['r2_score']
+                timestamp = int(time.time() * 1000)
+                client.log_batch(
+                    run_id,
+                    metrics=[Metric(f"{split}_{name}", float(metrics[key]), timestamp, 0)
+                             for split, metrics in (('train', train_metrics), ('test', test_metrics))
+                             for name, key in (('rmse', 'rmse'), ('mae', 'mae'), ('r2', 'r2_score'))],
+                    params=[Param(key, str(value)) for key, value in params.items()]
+                )
+                status = 'FINISHED'
+            finally:
+                client.set_terminated(run_id, status)
+            
+            logger.info(f"{model_name} - Test RMSE: {test_metrics['rmse']:.4f}, Test R2: {test_metrics['r2_score']:.4f}")
+            
+            return model, test_metrics['r2_score']
                 
         except Exception as e:
             raise CustomException(e, sys)
 
-    def train(self):
+    def build_model(self, model_name: str):
+        params_key, factory = MODEL_REGISTRY[model_name]
+        return factory(), self.config.params.get(params_key, {})
+
+    def out_of_fold(self, model_name: str, X_train, y_train) -> np.ndarray:
+        """K-fold out-of-fold predictions, cached in oof_dir until the training data or params change"""
+        model, params = self.build_model(model_name)
+        model.set_params(**params)
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(X_train, index=False).values.tobytes())
+        digest.update(np.asarray(y_train, dtype=float).tobytes())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        digest.update(str(self.config.cv_folds).encode())
+        fingerprint = digest.hexdigest()
+        
+        path = Path(self.config.oof_dir) / f"{model_name}.npz"
+        if path.exists():
+            with np.load(path) as cached:
+                if str(cached['fingerprint']) == fingerprint:
+                    logger.info(f"Using cached out-of-fold predictions for {model_name}")
+                    return cached['predictions']
+        
+        logger.info(f"Computing {self.config.cv_folds}-fold out-of-fold predictions for {model_name}...")
+        predictions = np.zeros(len(y_train))
+        folds = KFold(n_splits=self.config.cv_folds, shuffle=True, random_state=42)
+        for fit_rows, held_out_rows in folds.split(X_train):
+            fold_model = clone(model)
+            fold_model.fit(X_train.iloc[fit_rows], y_train.iloc[fit_rows])
+            predictions[held_out_rows] = fold_model.predict(X_train.iloc[held_out_rows])
+        
+        os.makedirs(self.config.oof_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(f, predictions=predictions, fingerprint=np.array(fingerprint))
+        return predictions
+
+    def fit_ensemble(self, models: dict, X_train, X_test, y_train, y_test) -> tuple:
+        """Stack the trained models on their out-of-fold predictions, pruning members not worth their latency
+        
+        Only the meta-learner is fitted here; with cached out-of-fold
+        predictions a re-fit takes seconds.
+        
+        Returns:
+            tuple: (test R2, StackedEnsemble)
+        """
+        names = list(models)
+        oof = np.column_stack([self.out_of_fold(name, X_train, y_train) for name in names])
+        latency_ms = {name: measure_latency(models[name], X_test) for name in names}
+        
+        kept, dropped = prune_members(oof, y_train, names, latency_ms, self.config.min_gain_per_ms)
+        meta, oof_r2 = fit_meta_learner(oof[:, [names.index(name) for name in kept]], y_train)
+        ensemble = StackedEnsemble({name: models[name] for name in kept}, meta.coef_, meta.intercept_)
+        
+        y_train_pred = ensemble.predict(X_train)
+        y_test_pred = ensemble.predict(X_test)
+        test_metrics = self.evaluate_model(y_test, y_test_pred)
+        self.predictions['StackedEnsemble'] = {'train': y_train_pred, 'test': y_test_pred}
+        
+        report = {
+            **ensemble.describe(),
+            'dropped': dropped,
+            'oof_r2': oof_r2,
+            'member_oof_r2': {name: float(r2_score(y_train, oof[:, i])) for i, name in enumerate(names)},
+            'latency_ms': latency_ms,
+            'ensemble_latency_ms': sum(latency_ms[name] for name in kept),
+            'test_rmse': float(test_metrics['rmse']),
+            'test_r2': float(test_metrics['r2_score'])
+        }
+        with open(self.config.ensemble_report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        logger.info(f"StackedEnsemble of {', '.join(kept)} - Test R2: {test_metrics['r2_score']:.4f}, "
+                    f"dropped: {[member['model'] for member in dropped] or 'none'}")
+        return test_metrics['r2_score'], ensemble
+
+    def setup_mlflow(self):
+        mlflow.set_tracking_uri(os.environ.get("MLFLOW_TRACKING_URI", "https://dagshub.com/abheshith7/ML-Pipeline-Evidently.mlflow"))
+        self.experiment_id = mlflow.set_experiment("Road Accident Risk Prediction").experiment_id
+
+    def save_calibration(self, model, X_test, y_test):
+        """Store the served model's sorted conformal scores on rows held out from training and selection"""
+        intervals = ConformalIntervals.calibrate(model, X_test, y_test)
+        intervals.save(self.config.conformal_path)
+        logger.info(f"Conformal calibration on {len(intervals.absolute)} rows saved to {self.config.conformal_path} "
+                    f"(90% half-width {intervals.quantile(intervals.absolute, 0.9):.4f})")
+
+    def rank_by_cost(self, results: list, X_test):
+        """Order (score, name, model) results by the selection objective, logging each model's serving costs"""
+        costs = {}
+        for score, name, model in results:
+            costs[name] = measure_costs(model, X_test, self.config.cost_batch_rows)
+            logger.info(f"{name} - R2: {score:.4f}, size: {costs[name]['size_bytes'] / 1024:.1f} KB, "
+                        f"load: {costs[name]['load_ms']:.1f} ms, latency: {costs[name]['latency_ms']:.2f} ms, "
+                        f"throughput: {costs[name]['throughput_rows_per_s']:.0f} rows/s")
+        
+        results[:] = rank_by_objective(results, costs, self.config.selection_objective,
+                                       self.config.max_latency_ms, self.config.latency_penalty)
+        
+        report = {
+            'objective': self.config.selection_objective,
+            'max_latency_ms': self.config.max_latency_ms,
+            'latency_penalty': self.config.latency_penalty,
+            'selected': results[0][1],
+            'models': {name: {'r2_score': float(score), **costs[name], 'rank': rank}
+                       for rank, (score, name, _) in enumerate(results, start=1)}
+        }
+        with open(self.config.cost_report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Model costs saved to {self.config.cost_report_path}")
+
+    def calibration_split(self, X_test, y_test) -> tuple:
+        """(X_select, y_select, X_calibrate, y_calibrate): a fixed random share of the test rows for calibration"""
+        select, calibrate = calibration_split(len(X_test), self.config.calibration_fraction)
+        return X_test.iloc[select], y_test.iloc[select], X_test.iloc[calibrate], y_test.iloc[calibrate]
+
+    def save_selection(self, results: list, X_test=None, y_test=None):
+        """Save the top (score, name, model) result as the serving model and the runner-up as the shadow candidate
+        
+        With test rows the results are re-scored and ranked by the configured
+        selection objective on one part of them; the intervals are calibrated
+        on the other, so the coverage is not inflated by the selection.
+        Otherwise the results are ranked by R2.
+        """
+        if X_test is not None:
+            X_test, y_test, X_calibrate, y_calibrate = self.calibration_split(X_test, y_test)
+            results[:] = [(float(r2_score(y_test, model.predict(X_test))), name, model) for _, name, model in results]
+            self.rank_by_cost(results, X_test)
+        else:
+            results.sort(key=lambda result: result[0], reverse=True)
+        best_score, best_model_name, best_model = results[0]
+        
+        model_path = os.path.join(self.config.root_dir, self.config.model_name)
+        dump_pickle(best_model, model_path, self.writer)
+        
+        logger.info(f"Best model by {self.config.selection_objective if X_test is not None else 'accuracy'}: {best_model_name} with R2 Score: {best_score:.4f}")
+        logger.info(f"Model saved to {model_path}")
+        if X_test is not None:
+            self.save_calibration(best_model, X_calibrate, y_calibrate)
+        
+        # The runner-up is kept as the shadow candidate scored on live traffic
+        if len(results) > 1:
+            candidate_score, candidate_name, candidate_model = results[1]
+            candidate_path = os.path.join(self.config.root_dir, self.config.candidate_model_name)
+            dump_pickle(candidate_model, candidate_path, self.writer)
+            logger.info(f"Candidate model: {candidate_name} with R2 Score: {candidate_score:.4f} saved to {candidate_path}")
+        
+        return best_score, best_model_name, best_model
+
+    def train_candidate(self, model_name: str) -> Path:
+        """Train a single model and save it with its test score under candidates_dir"""
+        try:
+            logger.info(f"Starting candidate training for {model_name}...")
+            self.setup_mlflow()
+            
+            X_train, X_test, y_train, y_test = self.load_data()
+            model, params = self.build_model(model_name)
+            trained_model, score = self.train_model(
+                X_train, X_test, y_train, y_test,
+                model_name, model, params
+            )
+            
+            os.makedirs(self.config.candidates_dir, exist_ok=True)
+            model_path = Path(self.config.candidates_dir) / f"{model_name}.pkl"
+            dump_pickle(trained_model, model_path, self.writer)
+            with open(Path(self.config.candidates_dir) / f"{model_name}.json", 'w') as f:
+                json.dump({'model_name': model_name, 'r2_score': float(score)}, f, indent=2)
+            # Filled here, in parallel per candidate, so select_best only fits the meta-learner
+            if self.config.ensemble_mode == 'stack':
+                self.out_of_fold(model_name, X_train, y_train)
+            
+            return model_path
+            
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def select_best(self, model_names: list = None) -> dict:
+        """Promote the best model trained by train_candidate to the serving model path"""
+        try:
+            results = []
+            for model_name in model_names or list(MODEL_REGISTRY):
+                with open(Path(self.config.candidates_dir) / f"{model_name}.json", 'r') as f:
+                    score = json.load(f)['r2_score']
+                with open(Path(self.config.candidates_dir) / f"{model_name}.pkl", 'rb') as f:
+                    results.append((score, model_name, pickle.load(f)))
+            
+            X_train, X_test, y_train, y_test = self.load_data()
+            if self.config.ensemble_mode == 'stack':
+                score, ensemble = self.fit_ensemble(
+                    {name: model for _, name, model in results}, X_train, X_test, y_train, y_test)
+                results.append((score, 'StackedEnsemble', ensemble))
+            best_score, best_model_name, _ = self.save_selection(results, X_test, y_test)
+            return {'model_name': best_model_name, 'r2_score': best_score}
+            
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def train(self, train_data: pd.DataFrame = None, test_data: pd.DataFrame = None) -> dict:
         try:
             logger.info("Starting model training...")
             
-            mlflow.set_tracking_uri(os.environ.get("MLFLOW_TRACKING_URI", "https://dagshub.com/abheshith7/ML-Pipeline-Evidently.mlflow"))
-            mlflow.set_experiment("Road Accident Risk Prediction")
+            self.setup_mlflow()
             
-            X_train, X_test, y_train, y_test = self.load_data()
-            models = {
-                'RandomForest': (RandomForestRegressor(random_state=42), 
-                               self.config.params.get('RandomForestRegressor', {})),
-                'GradientBoosting': (GradientBoostingRegressor(random_state=42), 
-                                   self.config.params.get('GradientBoostingRegressor', {})),
-                'XGBoost': (XGBRegressor(random_state=42, objective='reg:squarederror'), 
-                          self.config.params.get('XGBRegressor', {})),
-                'Ridge': (Ridge(random_state=42), 
-                        self.config.params.get('Ridge', {}))
-            }
+            if train_data is not None and test_data is not None:
+                X_train, X_test, y_train, y_test = self.split_features(train_data, test_data)
+            else:
+                X_train, X_test, y_train, y_test = self.load_data()
             
-            best_model = None
-            best_score = -float('inf')
-            best_model_name = None
+            results = []
             
-            for model_name, (model, params) in models.items():
+            for model_name in MODEL_REGISTRY:
+                model, params = self.build_model(model_name)
                 trained_model, score = self.train_model(
                     X_train, X_test, y_train, y_test,
                     model_name, model, params
                 )
-                
-                if score > best_score:
-                    best_score = score
-                    best_model = trained_model
-                    best_model_name = model_name
+                results.append((score, model_name, trained_model))
             
-            model_path = os.path.join(self.config.root_dir, self.config.model_name)
-            with open(model_path, 'wb') as f:
-                pickle.dump(best_model, f)
+            if self.config.ensemble_mode == 'stack':
+                score, ensemble = self.fit_ensemble(
+                    {name: model for _, name, model in results}, X_train, X_test, y_train, y_test)
+                results.append((score, 'StackedEnsemble', ensemble))
             
-            logger.info(f"Best model: {best_model_name} with R2 Score: {best_score:.4f}")
-            logger.info(f"Model saved to {model_path}")
+            best_score, best_model_name, best_model = self.save_selection(results, X_test, y_test)
+            
+            return {
+                'model': best_model,
+                'model_name': best_model_name,
+                'r2_score': best_score,
+                'X_test': X_test,
+                'y_test': y_test,
+                'train_predictions': self.predictions[best_model_name]['train'],
+                'test_predictions': self.predictions[best_model_name]['test']
+            }
             
         except Exception as e:
             raise CustomException(e, sys)
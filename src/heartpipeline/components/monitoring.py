@@ -1,16 +1,20 @@
 ﻿import os
 import sys
+import glob
+import json
 import pandas as pd
 import pickle
 import numpy as np
 from pathlib import Path
-from evidently import Report
-from evidently.presets import DataDriftPreset, RegressionPreset
-from evidently.metrics.regression import RegressionQualityMetric
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from heartpipeline.logging import logger
 from heartpipeline.exception import CustomException
 from heartpipeline.entity.config_entity import MonitoringConfig
+from heartpipeline.components.data_transformation import hash_test_mask
+from heartpipeline.monitoring.attribution import FeatureAttributor, attribution_drift
+from heartpipeline.monitoring.history import MonitoringHistory
+from heartpipeline.monitoring.sketches import DatasetSketch, ErrorTotals, RowSample, compare
+from heartpipeline.serving.predictor import RiskPredictor
 
 
 class ModelMonitoring:
@@ -40,52 +44,320 @@ class ModelMonitoring:
         except Exception as e:
             raise CustomException(e, sys)
 
-    def generate_report(self):
+    def compare_shadow_predictions(self):
         try:
-            logger.info("Generating Evidently monitoring reports...")
+            if not os.path.exists(self.config.shadow_log_path):
+                return None
             
-            model = self.load_model()
-            reference_data, current_data = self.load_data()
-            if self.config.target_column in reference_data.columns:
-                X_ref = reference_data.drop(self.config.target_column, axis=1)
-                X_cur = current_data.drop(self.config.target_column, axis=1)
+            shadow = pd.read_json(self.config.shadow_log_path, lines=True,
+                                  dtype={'primary_version': str, 'candidate_version': str})
+            if shadow.empty:
+                return None
+            logger.info(f"Comparing {len(shadow)} paired shadow predictions")
+            
+            comparisons = {}
+            for (primary_version, candidate_version), group in shadow.groupby(['primary_version', 'candidate_version']):
+                primary = group['prediction'].to_numpy()
+                candidate = group['shadow_prediction'].to_numpy()
+                abs_diff = np.abs(candidate - primary)
+                primary_level = np.digitize(primary, [0.3, 0.6])
+                candidate_level = np.digitize(candidate, [0.3, 0.6])
+                comparisons[f"{primary_version} vs {candidate_version}"] = {
+                    'pairs': len(group),
+                    'mean_primary': float(primary.mean()),
+                    'mean_candidate': float(candidate.mean()),
+                    'mean_abs_diff': float(abs_diff.mean()),
+                    'p95_abs_diff': float(np.quantile(abs_diff, 0.95)),
+                    'correlation': float(np.corrcoef(primary, candidate)[0, 1]) if len(group) > 1 else float('nan'),
+                    'risk_level_agreement': float((primary_level == candidate_level).mean())
+                }
+            return comparisons
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def split_chunks(self, frame: pd.DataFrame, path):
+        """Chunks of an in-memory split, or of its CSV when no frame was passed"""
+        if frame is None:
+            yield from pd.read_csv(path, chunksize=self.config.sketch_chunk_rows)
+            return
+        for start in range(0, len(frame), self.config.sketch_chunk_rows):
+            yield frame.iloc[start:start + self.config.sketch_chunk_rows]
+
+    def score_chunks(self, chunks, model, predictions, totals: ErrorTotals, sample: RowSample):
+        """Yield each chunk's predictions, feeding the running error totals and the row sample
+
+        ``predictions`` for the whole split are sliced instead of calling the model.
+        """
+        offset = 0
+        for chunk in chunks:
+            if predictions is None:
+                scored = np.asarray(model.predict(chunk.drop(columns=[self.config.target_column], errors='ignore')),
+                                    dtype=float)
+            else:
+                scored = np.asarray(predictions[offset:offset + len(chunk)], dtype=float)
+            offset += len(chunk)
+            if self.config.target_column in chunk.columns:
+                totals.update(chunk[self.config.target_column], scored)
+            sample.update(chunk.assign(prediction=scored))
+            yield scored
+
+    def test_membership(self):
+        """Function from an array of ids to its test-split mask
+
+        A hash split is recomputed per chunk from the split manifest, in
+        constant memory. A random split needs its test ids, read in chunks
+        into one sorted int64 array.
+        """
+        if os.path.exists(self.config.split_manifest_path):
+            with open(self.config.split_manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('split_method') == 'hash':
+                return lambda ids: hash_test_mask(ids, manifest['test_size'], manifest['split_salt'])
+        chunks = pd.read_csv(self.config.test_ids_path, usecols=['id'], chunksize=self.config.sketch_chunk_rows)
+        test_ids = np.sort(np.concatenate([np.empty(0, dtype=np.int64)] +
+                                          [chunk['id'].to_numpy(dtype=np.int64) for chunk in chunks]))
+        return lambda ids: np.isin(ids, test_ids)
+
+    def sketch_split(self, sketch: DatasetSketch, is_test, current: bool, predictions) -> DatasetSketch:
+        """Stream the training (or test) rows of the feature file and the model's prediction chunks into ``sketch``"""
+        for chunk in pd.read_csv(self.config.feature_data_path, chunksize=self.config.sketch_chunk_rows):
+            rows = chunk[is_test(chunk['id'].to_numpy()) == current]
+            sketch.update(rows.drop(columns=['id']))
+        for scored in predictions:
+            sketch.update(pd.DataFrame({'prediction': scored}))
+        return sketch
+
+    def build_sketches(self, reference_predictions, current_predictions) -> tuple:
+        """Reference (training rows) and current (test rows) sketches of the unencoded features
+
+        The prediction arguments are iterables of prediction chunks. The
+        feature file is streamed twice, so memory does not grow with its
+        size: the reference pass fixes the histogram edges that the current
+        pass reuses. Categorical columns keep their labels, so they are
+        tested with chi-square rather than KS on integer codes.
+        """
+        try:
+            is_test = self.test_membership()
+            reference_sketch = self.sketch_split(DatasetSketch(), is_test, False, reference_predictions).set_edges()
+            current_sketch = self.sketch_split(DatasetSketch.empty_like(reference_sketch), is_test, True,
+                                               current_predictions)
+            reference_sketch.save(os.path.join(self.config.sketch_dir, 'reference.json'))
+            current_sketch.save(os.path.join(self.config.sketch_dir, 'current.json'))
+            return reference_sketch, current_sketch
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def sketch_raw_reference(self, prediction_sketch=None) -> DatasetSketch:
+        """Sketch of the raw training data that serving traffic is compared against
+
+        Serving replicas read this file at start-up for its histogram edges.
+        The raw data is only streamed again when its size or modification
+        time differs from the copy the saved sketch was built from.
+        """
+        try:
+            path = os.path.join(self.config.sketch_dir, 'reference_raw.json')
+            source_path = os.path.join(self.config.sketch_dir, 'reference_raw.source.json')
+            stat = os.stat(self.config.raw_reference_data_path)
+            source = {'path': str(self.config.raw_reference_data_path), 'size': stat.st_size,
+                      'mtime_ns': stat.st_mtime_ns}
+            cached = None
+            if os.path.exists(path) and os.path.exists(source_path):
+                with open(source_path, 'r') as f:
+                    cached = json.load(f)
+            if cached == source:
+                sketch = DatasetSketch.load(path)
+                sketch.columns.pop('prediction', None)
+                logger.info(f"Reusing the raw reference sketch in {path}")
             else:
-                X_ref = reference_data
-                X_cur = current_data
+                sketch = DatasetSketch()
+                for chunk in pd.read_csv(self.config.raw_reference_data_path, chunksize=self.config.sketch_chunk_rows):
+                    sketch.update(chunk.drop(columns=['id', self.config.target_column], errors='ignore'))
+                sketch.set_edges()
+            if prediction_sketch is not None:
+                sketch.columns['prediction'] = prediction_sketch
+            sketch.save(path)
+            with open(source_path, 'w') as f:
+                json.dump(source, f)
+            return sketch
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def serving_drift(self, prediction_sketch=None):
+        """Merge the traffic sketches written by every serving replica and test them for drift"""
+        try:
+            paths = sorted(glob.glob(os.path.join(self.config.sketch_dir, 'serving-*.json')))
+            if not paths or not os.path.exists(self.config.raw_reference_data_path):
+                return None
+            traffic = DatasetSketch.load(paths[0])
+            for path in paths[1:]:
+                traffic.merge(DatasetSketch.load(path))
+            reference = self.sketch_raw_reference(prediction_sketch)
+            logger.info(f"Merged serving sketches from {len(paths)} replicas ({traffic.rows} requests)")
+            return {
+                'replicas': len(paths),
+                'requests': traffic.rows,
+                'tests': compare(reference, traffic, self.config.psi_threshold, self.config.ks_threshold)
+            }
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def attribution_drift(self, model, X_ref: pd.DataFrame, X_cur: pd.DataFrame):
+        """Change in mean |attribution| per feature between reference and current samples"""
+        try:
+            attributor = FeatureAttributor(model, X_ref.columns)
+        except ValueError as e:
+            logger.warning(f"Skipping attribution drift: {str(e)}")
+            return None
+        try:
+            sample = lambda X: X.sample(n=min(len(X), self.config.attribution_sample_rows), random_state=42)
+            drift = attribution_drift(attributor.importance(sample(X_ref).to_numpy()),
+                                      attributor.importance(sample(X_cur).to_numpy()))
+            drift.update(method=attributor.method,
+                         drift=drift['total_variation'] > self.config.attribution_drift_threshold)
+            return drift
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def feature_statistics(reference_sketch: DatasetSketch, current_sketch: DatasetSketch,
+                           drift_tests: dict) -> dict:
+        """Per numeric column: means, standard deviations, the absolute mean change and the drift test results
+
+        The change is absolute rather than relative: standardized features
+        have means near 0, where a percentage is meaningless.
+        """
+        stats = {}
+        for col, ref in reference_sketch.columns.items():
+            cur = current_sketch.columns.get(col)
+            if ref.kind != 'numeric' or cur is None:
+                continue
+            stats[col] = {
+                'mean_reference': ref.mean, 'mean_current': cur.mean,
+                'std_reference': ref.std, 'std_current': cur.std,
+                'mean_change': abs(cur.mean - ref.mean)
+            }
+            if col in drift_tests:
+                stats[col].update(psi=drift_tests[col]['psi'], ks_statistic=drift_tests[col]['statistic'],
+                                  p_value=drift_tests[col]['p_value'])
+        return stats
+
+    def record_history(self, reference_rows: int, current_rows: int,
+                       dataset_drift: bool, drift_ratio: float, metrics: dict,
+                       feature_stats: dict) -> int:
+        """Append this run's metrics and per-feature statistics to the history store"""
+        try:
+            model_version = None
+            if os.path.exists(self.config.model_path):
+                # Same version the serving app reports for this model, so runs can be joined to it
+                model_version = RiskPredictor.bundle_version(self.config.model_path, self.config.scaler_path,
+                                                             self.config.encoder_path, self.config.feature_stats_path)
+            run_id = MonitoringHistory(self.config.history_db_path).record_run(
+                model_version=model_version,
+                reference_rows=reference_rows,
+                current_rows=current_rows,
+                dataset_drift=dataset_drift,
+                drift_ratio=drift_ratio,
+                metrics=metrics,
+                feature_stats=feature_stats
+            )
+            logger.info(f"Monitoring run {run_id} recorded in {self.config.history_db_path}")
+            return run_id
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def format_drift_tests(drift_tests: dict) -> str:
+        lines = [f"{'Feature':<30} {'Test':<11} {'PSI':>8} {'Statistic':>10} {'p-value':>9}  Drift"]
+        for col, result in sorted(drift_tests.items(), key=lambda item: -np.nan_to_num(item[1]['psi'])):
+            lines.append(f"{col:<30} {result['test']:<11} {result['psi']:>8.4f} {result['statistic']:>10.4f} "
+                         f"{result['p_value']:>9.4f}  {'YES' if result['drift'] else 'no'}")
+        return '\n'.join(lines) + '\n'
+
+    def save_drift_html(self, reference_sample: pd.DataFrame, current_sample: pd.DataFrame):
+        """Evidently's interactive drift report on at most ``drift_report_sample_rows`` rows per split
+
+        Returns the HTML path, or None when the report is disabled or Evidently is not installed.
+        """
+        rows = self.config.drift_report_sample_rows
+        if rows <= 0:
+            return None
+        try:
+            from evidently import Report
+            from evidently.presets import DataDriftPreset
+        except ImportError:
+            logger.warning("Evidently is not installed, skipping the HTML drift report")
+            return None
+        snapshot = Report(metrics=[DataDriftPreset()]).run(current_data=current_sample.head(rows),
+                                                           reference_data=reference_sample.head(rows))
+        drift_html = os.path.join(self.config.root_dir, 'data_drift_report.html')
+        snapshot.save_html(drift_html)
+        logger.info(f"Data drift report on {min(rows, len(reference_sample))} reference and "
+                    f"{min(rows, len(current_sample))} current rows saved: {drift_html}")
+        return drift_html
+
+    def generate_report(self, model=None, reference_data: pd.DataFrame = None, current_data: pd.DataFrame = None,
+                        reference_predictions=None, current_predictions=None) -> dict:
+        """Drift, performance and attribution report in memory bounded by the chunk and sample sizes
+
+        The splits (frames when given, else their CSVs) are streamed in
+        ``sketch_chunk_rows`` chunks into the drift sketches, running error
+        totals and fixed-size row samples; Evidently and attribution only see
+        the samples.
+        """
+        # The fallback reuses the caller's frames rather than CSVs that may still be being written
+        inputs = (model, reference_data, current_data)
+        try:
+            logger.info("Generating monitoring reports...")
             
-            reference_data['prediction'] = model.predict(X_ref)
-            current_data['prediction'] = model.predict(X_cur)
+            model = model if model is not None else self.load_model()
+            if reference_predictions is None or current_predictions is None:
+                reference_predictions = current_predictions = None
+            else:
+                logger.info("Reusing predictions from model training")
+            sample_rows = max(self.config.drift_report_sample_rows, self.config.attribution_sample_rows)
+            totals = {'reference': ErrorTotals(), 'current': ErrorTotals()}
+            samples = {'reference': RowSample(sample_rows, seed=0), 'current': RowSample(sample_rows, seed=1)}
+            reference_scores = self.score_chunks(self.split_chunks(reference_data, self.config.reference_data_path),
+                                                 model, reference_predictions, totals['reference'], samples['reference'])
+            current_scores = self.score_chunks(self.split_chunks(current_data, self.config.current_data_path),
+                                               model, current_predictions, totals['current'], samples['current'])
             
-            logger.info(f"Reference data shape: {reference_data.shape}")
-            logger.info(f"Current data shape: {current_data.shape}")
+            # Drift tests run on fixed-size sketches; the splits are streamed once as they fill
+            reference_sketch, current_sketch = self.build_sketches(reference_scores, current_scores)
+            drift_tests = compare(reference_sketch, current_sketch, self.config.psi_threshold, self.config.ks_threshold)
+            serving_drift = self.serving_drift(reference_sketch.columns.get('prediction'))
+            reference_rows, current_rows = samples['reference'].rows, samples['current'].rows
+            logger.info(f"Reference rows: {reference_rows}, current rows: {current_rows}")
             
-            numerical_features = X_ref.select_dtypes(include=['int64', 'float64']).columns.tolist()
+            reference_sample, current_sample = samples['reference'].sample(), samples['current'].sample()
+            drift_html = self.save_drift_html(reference_sample, current_sample)
+            X_ref = reference_sample.drop(columns=[self.config.target_column, 'prediction'], errors='ignore')
+            X_cur = current_sample.drop(columns=[self.config.target_column, 'prediction'], errors='ignore')
+            numerical_features = X_ref.select_dtypes(include=['number']).columns.tolist()
             categorical_features = X_ref.select_dtypes(include=['object', 'category']).columns.tolist()
-            logger.info("Generating Data Drift Report...")
-            data_drift_report = Report(metrics=[DataDriftPreset()])
-            drift_snapshot = data_drift_report.run(
-                current_data=current_data,
-                reference_data=reference_data
-            )
-            drift_html = os.path.join(self.config.root_dir, 'data_drift_report.html')
-            drift_snapshot.save_html(drift_html)
-            logger.info(f"Data drift report saved: {drift_html}")
-            ref_mean = reference_data.select_dtypes(include=['number']).mean()
-            cur_mean = current_data.select_dtypes(include=['number']).mean()
-            drift_pct = ((cur_mean - ref_mean) / ref_mean * 100).abs()
-            
-            ref_mae = mean_absolute_error(reference_data[self.config.target_column], reference_data['prediction'])
-            ref_rmse = np.sqrt(mean_squared_error(reference_data[self.config.target_column], reference_data['prediction']))
-            ref_r2 = r2_score(reference_data[self.config.target_column], reference_data['prediction'])
             
-            cur_mae = mean_absolute_error(current_data[self.config.target_column], current_data['prediction'])
-            cur_rmse = np.sqrt(mean_squared_error(current_data[self.config.target_column], current_data['prediction']))
-            cur_r2 = r2_score(current_data[self.config.target_column], current_data['prediction'])
+            performance = {name: totals[name].metrics() for name in ('reference', 'current')}
+            ref_mae, ref_rmse, ref_r2 = (performance['reference'][key] for key in ('MAE', 'RMSE', 'R2'))
+            cur_mae, cur_rmse, cur_r2 = (performance['current'][key] for key in ('MAE', 'RMSE', 'R2'))
             
-            significant_drift_features = (drift_pct > 10).sum()
-            total_features = len(drift_pct)
+            feature_tests = {col: result for col, result in drift_tests.items()
+                             if col not in (self.config.target_column, 'prediction')}
+            significant_drift_features = sum(result['drift'] for result in feature_tests.values())
+            total_features = len(feature_tests)
             drift_ratio = significant_drift_features / total_features if total_features > 0 else 0
-            dataset_drift = drift_ratio > 0.3
+            dataset_drift = drift_ratio > self.config.drift_share_threshold
+            
+            shadow_comparison = self.compare_shadow_predictions()
+            attribution = self.attribution_drift(model, X_ref, X_cur) if len(X_ref) and len(X_cur) else None
+            feature_stats = self.feature_statistics(reference_sketch, current_sketch, drift_tests)
+            history_metrics = dict(performance)
+            if attribution:
+                history_metrics['attribution'] = {'total_variation': attribution['total_variation'],
+                                                  'rank_correlation': attribution['rank_correlation']}
+                for feature, values in attribution['features'].items():
+                    feature_stats.setdefault(feature, {}).update(values)
+            run_id = self.record_history(reference_rows, current_rows, dataset_drift, drift_ratio, history_metrics,
+                                         feature_stats)
             
             with open(self.config.evidently_report_path, 'w', encoding='utf-8') as f:
                 f.write("=" * 80 + "\n")
@@ -94,8 +366,8 @@ class ModelMonitoring:
                 
                 f.write("DATASET INFORMATION\n")
                 f.write("-" * 80 + "\n")
-                f.write(f"Reference Data Size: {len(reference_data)} rows × {len(reference_data.columns)} columns\n")
-                f.write(f"Current Data Size: {len(current_data)} rows × {len(current_data.columns)} columns\n")
+                f.write(f"Reference Data Size: {reference_rows} rows × {len(reference_sample.columns)} columns\n")
+                f.write(f"Current Data Size: {current_rows} rows × {len(current_sample.columns)} columns\n")
                 f.write(f"Target Column: {self.config.target_column}\n")
                 f.write(f"Numerical Features: {len(numerical_features)}\n")
                 f.write(f"Categorical Features: {len(categorical_features)}\n\n")
@@ -117,21 +389,52 @@ class ModelMonitoring:
                 f.write("DRIFT DETECTION SUMMARY\n")
                 f.write("=" * 80 + "\n")
                 f.write(f"Dataset Drift Detected: {'YES' if dataset_drift else 'NO'}\n")
-                f.write(f"Features with >10% change: {significant_drift_features}/{total_features} ({drift_ratio:.1%})\n")
-                f.write(f"Drift Threshold: 30% of features\n\n")
+                f.write(f"Drifted features: {significant_drift_features}/{total_features} ({drift_ratio:.1%})\n")
+                f.write(f"Feature Threshold: PSI > {self.config.psi_threshold} or KS > {self.config.ks_threshold}\n")
+                f.write(f"Drift Threshold: {self.config.drift_share_threshold:.0%} of features\n\n")
                 
                 f.write("=" * 80 + "\n")
-                f.write("FEATURE DRIFT ANALYSIS (Mean % Change)\n")
+                f.write("FEATURE DRIFT ANALYSIS (Sketch-based Tests)\n")
                 f.write("=" * 80 + "\n")
-                drift_sorted = drift_pct.sort_values(ascending=False)
-                for col in drift_sorted.index[:15]:
-                    status = "" if drift_sorted[col] > 10 else "" if drift_sorted[col] > 5 else ""
-                    f.write(f"{col:.<50} {drift_sorted[col]:>6.2f}%\n")
+                f.write(self.format_drift_tests(drift_tests))
+                
+                if serving_drift:
+                    f.write("\n" + "=" * 80 + "\n")
+                    f.write(f"SERVING TRAFFIC DRIFT ({serving_drift['requests']} requests "
+                            f"from {serving_drift['replicas']} replicas)\n")
+                    f.write("=" * 80 + "\n")
+                    f.write(self.format_drift_tests(serving_drift['tests']))
+                
+                if attribution:
+                    f.write("\n" + "=" * 80 + "\n")
+                    f.write(f"ATTRIBUTION DRIFT (mean |contribution|, {attribution['method']})\n")
+                    f.write("=" * 80 + "\n")
+                    f.write(f"Importance Shift (total variation): {attribution['total_variation']:.4f} "
+                            f"(threshold {self.config.attribution_drift_threshold}) "
+                            f"{'- DRIFT' if attribution['drift'] else ''}\n")
+                    f.write(f"Importance Rank Correlation: {attribution['rank_correlation']:.4f}\n")
+                    f.write(f"{'Feature':<30} {'Reference':>12} {'Current':>12} {'Share Change':>13}\n")
+                    ranked = sorted(attribution['features'].items(), key=lambda item: -item[1]['importance_reference'])
+                    for feature, values in ranked[:15]:
+                        f.write(f"{feature:<30} {values['importance_reference']:>12.5f} "
+                                f"{values['importance_current']:>12.5f} {values['share_change']:>+13.2%}\n")
+                
+                if shadow_comparison:
+                    f.write("\n" + "=" * 80 + "\n")
+                    f.write("SHADOW MODEL COMPARISON (Live Traffic)\n")
+                    f.write("=" * 80 + "\n")
+                    for versions, stats in shadow_comparison.items():
+                        f.write(f"Primary vs Candidate: {versions}\n")
+                        f.write(f"  Paired Predictions: {stats['pairs']}\n")
+                        f.write(f"  Mean Prediction: {stats['mean_primary']:.4f} vs {stats['mean_candidate']:.4f}\n")
+                        f.write(f"  Mean Abs Difference: {stats['mean_abs_diff']:.4f} (p95 {stats['p95_abs_diff']:.4f})\n")
+                        f.write(f"  Correlation: {stats['correlation']:.4f}\n")
+                        f.write(f"  Risk Level Agreement: {stats['risk_level_agreement']:.1%}\n")
                 
                 f.write("\n" + "=" * 80 + "\n")
                 f.write("GENERATED REPORTS\n")
                 f.write("=" * 80 + "\n")
-                f.write(f"1. Data Drift Report: {drift_html}\n")
+                f.write(f"1. Data Drift Report: {drift_html or 'skipped'}\n")
                 f.write(f"2. Text Summary: {self.config.evidently_report_path}\n\n")
                 
                 f.write("RECOMMENDATIONS\n")
@@ -141,7 +444,7 @@ class ModelMonitoring:
                     f.write("   - Retraining the model with recent data\n")
                     f.write("   - Investigating root causes of drift\n")
                     f.write("   - Adjusting feature engineering pipeline\n")
-                    f.write("   - Setting up automated retraining triggers\n")
+                    f.write("   - The retraining trigger will retrain on the next pipeline run if thresholds are crossed\n")
                 else:
                     f.write("No significant drift detected\n")
                     f.write("   - Continue monitoring periodically\n")
@@ -154,8 +457,9 @@ class ModelMonitoring:
                 f.write("\n" + "=" * 80 + "\n")
                 f.write("HOW TO VIEW REPORTS\n")
                 f.write("=" * 80 + "\n")
-                f.write("1. Open HTML file in your browser for interactive visualizations:\n")
-                f.write(f"   - Data Drift: {drift_html}\n")
+                if drift_html:
+                    f.write("1. Open HTML file in your browser for interactive visualizations:\n")
+                    f.write(f"   - Data Drift: {drift_html}\n")
                 f.write("2. Use monitoring/evidently_dashboard.ipynb for detailed analysis\n")
                 f.write("3. Use monitoring/generate_reports.py to regenerate reports\n")
                 f.write("4. Set up automated report generation in production\n\n")
@@ -172,10 +476,13 @@ class ModelMonitoring:
                 'drift_html': drift_html,
                 'dataset_drift': dataset_drift,
                 'drift_ratio': drift_ratio,
-                'performance': {
-                    'reference': {'MAE': ref_mae, 'RMSE': ref_rmse, 'R2': ref_r2},
-                    'current': {'MAE': cur_mae, 'RMSE': cur_rmse, 'R2': cur_r2}
-                }
+                'drift_tests': drift_tests,
+                'attribution_drift': attribution,
+                'serving_drift': serving_drift,
+                'shadow_comparison': shadow_comparison,
+                'performance': performance,
+                'history_run_id': run_id,
+                'fallback': False
             }
             
         except Exception as e:
@@ -183,33 +490,63 @@ class ModelMonitoring:
             logger.info("Falling back to basic statistics report...")
             
             try:
-                model = self.load_model()
-                reference_data, current_data = self.load_data()
-                
-                X_ref = reference_data.drop(self.config.target_column, axis=1) if self.config.target_column in reference_data.columns else reference_data
-                X_cur = current_data.drop(self.config.target_column, axis=1) if self.config.target_column in current_data.columns else current_data
-                
-                reference_data['prediction'] = model.predict(X_ref)
-                current_data['prediction'] = model.predict(X_cur)
-                
-                ref_mean = reference_data.select_dtypes(include=['number']).mean()
-                cur_mean = current_data.select_dtypes(include=['number']).mean()
-                drift_pct = ((cur_mean - ref_mean) / ref_mean * 100).abs()
-                
-                with open(self.config.evidently_report_path, 'w', encoding='utf-8') as f:
-                    f.write("=" * 80 + "\n")
-                    f.write("BASIC MONITORING SUMMARY (Fallback Mode)\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(f"Reference Data: {len(reference_data)} rows\n")
-                    f.write(f"Current Data: {len(current_data)} rows\n\n")
-                    f.write("Feature Drift (Mean % Change):\n")
-                    f.write("-" * 80 + "\n")
-                    for col in drift_pct.sort_values(ascending=False).index[:10]:
-                        f.write(f"{col}: {drift_pct[col]:.2f}%\n")
-                    f.write("\n" + "=" * 80 + "\n")
-                
-                logger.info(f"Basic report saved to {self.config.evidently_report_path}")
-                return str(self.config.evidently_report_path)
+                return self.basic_report(*inputs)
             except Exception as fallback_error:
                 logger.error(f"Fallback also failed: {str(fallback_error)}")
                 raise CustomException(e, sys)
+
+    def basic_report(self, model=None, reference_data: pd.DataFrame = None,
+                     current_data: pd.DataFrame = None) -> dict:
+        """Summary without Evidently or sketches; same result keys as generate_report"""
+        if reference_data is None or current_data is None:
+            reference_data, current_data = self.load_data()
+        else:
+            reference_data = reference_data.copy(deep=False)
+            current_data = current_data.copy(deep=False)
+        model = model if model is not None else self.load_model()
+        
+        X_ref = reference_data.drop(self.config.target_column, axis=1) if self.config.target_column in reference_data.columns else reference_data
+        X_cur = current_data.drop(self.config.target_column, axis=1) if self.config.target_column in current_data.columns else current_data
+        
+        reference_data['prediction'] = model.predict(X_ref)
+        current_data['prediction'] = model.predict(X_cur)
+        
+        performance = {}
+        if self.config.target_column in reference_data.columns and self.config.target_column in current_data.columns:
+            for name, data in (('reference', reference_data), ('current', current_data)):
+                y_true, y_pred = data[self.config.target_column], data['prediction']
+                performance[name] = {'MAE': mean_absolute_error(y_true, y_pred),
+                                     'RMSE': np.sqrt(mean_squared_error(y_true, y_pred)),
+                                     'R2': r2_score(y_true, y_pred)}
+        
+        ref_numeric = reference_data.select_dtypes(include=['number'])
+        cur_numeric = current_data.select_dtypes(include=['number'])
+        # Features are standardized, so the shift is measured in reference standard deviations
+        mean_shift = ((cur_numeric.mean() - ref_numeric.mean()).abs() / ref_numeric.std().replace(0, np.nan)).fillna(0.0)
+        
+        with open(self.config.evidently_report_path, 'w', encoding='utf-8') as f:
+            f.write("=" * 80 + "\n")
+            f.write("BASIC MONITORING SUMMARY (Fallback Mode)\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(f"Reference Data: {len(reference_data)} rows\n")
+            f.write(f"Current Data: {len(current_data)} rows\n\n")
+            f.write("Feature Drift (Mean Shift in Reference Std):\n")
+            f.write("-" * 80 + "\n")
+            for col in mean_shift.sort_values(ascending=False).index[:10]:
+                f.write(f"{col}: {mean_shift[col]:.4f}\n")
+            f.write("\n" + "=" * 80 + "\n")
+        
+        logger.info(f"Basic report saved to {self.config.evidently_report_path}")
+        return {
+            'summary': str(self.config.evidently_report_path),
+            'drift_html': None,
+            'dataset_drift': None,
+            'drift_ratio': None,
+            'drift_tests': {},
+            'attribution_drift': None,
+            'serving_drift': None,
+            'shadow_comparison': None,
+            'performance': performance,
+            'history_run_id': None,
+            'fallback': True
+        }
@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.entity.config_entity import RetrainingTriggerConfig
+from heartpipeline.serving.predictor import RiskPredictor
+
+
+class RetrainingTrigger:
+    """Decides whether newly ingested data warrants retraining
+
+    When a model is promoted, ``save_reference`` profiles the data it was
+    trained on (per-column mean/std or category frequencies) together with
+    the served model's error on its test rows. On the next run ``decide``
+    compares the freshly ingested data against that profile and scores the
+    served model on the rows it was not trained on. Retraining is requested only when the share of
+    drifted columns or the relative RMSE increase crosses the thresholds in
+    config.yaml, when there is no model or profile yet, or when forced.
+    """
+
+    def __init__(self, config: RetrainingTriggerConfig):
+        self.config = config
+
+    def load_data(self) -> pd.DataFrame:
+        try:
+            df = pd.read_csv(self.config.data_path)
+            logger.info(f"Loaded {len(df)} rows from {self.config.data_path}")
+            return df
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_predictor(self) -> RiskPredictor:
+        return RiskPredictor.load(self.config.model_path, self.config.scaler_path, self.config.encoder_path,
+                                  record_metrics=False, feature_stats_path=self.config.feature_stats_path)
+
+    def input_columns(self, df: pd.DataFrame) -> list:
+        return [col for col in df.columns if col not in ('id', self.config.target_column)]
+
+    def profile(self, df: pd.DataFrame) -> dict:
+        columns = {}
+        for col in self.input_columns(df):
+            series = df[col]
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                values = series.astype(float)
+                columns[col] = {'type': 'numeric', 'mean': float(values.mean()), 'std': float(values.std())}
+            else:
+                frequencies = series.astype(str).value_counts(normalize=True)
+                columns[col] = {'type': 'categorical', 'frequencies': {k: float(v) for k, v in frequencies.items()}}
+        return columns
+
+    @staticmethod
+    def column_drift(reference: dict, series: pd.Series) -> float:
+        """Standardized mean shift for numeric columns, total variation distance for categorical ones"""
+        if reference['type'] == 'numeric':
+            shift = abs(float(series.astype(float).mean()) - reference['mean'])
+            return shift / reference['std'] if reference['std'] > 0 else float(shift > 0)
+        current = series.astype(str).value_counts(normalize=True).to_dict()
+        categories = set(reference['frequencies']) | set(current)
+        return 0.5 * sum(abs(current.get(c, 0.0) - reference['frequencies'].get(c, 0.0)) for c in categories)
+
+    def score(self, predictor: RiskPredictor, df: pd.DataFrame) -> dict:
+        labelled = df.dropna(subset=[self.config.target_column])
+        if labelled.empty:
+            return {}
+        y_true = labelled[self.config.target_column].to_numpy()
+        y_pred = predictor.predict(labelled[self.input_columns(labelled)].copy())
+        return {
+            'rows': int(len(labelled)),
+            'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+            'mae': float(mean_absolute_error(y_true, y_pred)),
+            'r2': float(r2_score(y_true, y_pred))
+        }
+
+    def save_reference(self) -> dict:
+        """Profile the training data of the model that was just promoted"""
+        try:
+            df = self.load_data()
+            predictor = self.load_predictor()
+            # Score on the held-out rows only, so the baseline error is not optimistic;
+            # without them there is no honest baseline and RMSE checks are skipped
+            performance = {}
+            if os.path.exists(self.config.test_ids_path) and 'id' in df.columns:
+                test_ids = pd.read_csv(self.config.test_ids_path)['id'].to_numpy()
+                is_test = df['id'].isin(test_ids)
+                performance = self.score(predictor, df[is_test])
+                # Later decisions score every row the model was not fitted on
+                np.save(self.config.training_ids_path, df.loc[~is_test, 'id'].to_numpy())
+            else:
+                logger.warning(f"No test ids at {self.config.test_ids_path} or no 'id' column; "
+                               "skipping the performance baseline")
+                if os.path.exists(self.config.training_ids_path):
+                    os.remove(self.config.training_ids_path)
+
+            reference = {
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'model_version': predictor.version,
+                'rows': int(len(df)),
+                'columns': self.profile(df),
+                'performance': performance
+            }
+            with open(self.config.reference_profile_path, 'w') as f:
+                json.dump(reference, f, indent=2)
+            logger.info(f"Reference profile for model {predictor.version} saved to {self.config.reference_profile_path}")
+            return reference
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def unseen_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows the served model was not trained on: its test rows and anything ingested since"""
+        if 'id' not in df.columns or not os.path.exists(self.config.training_ids_path):
+            logger.warning(f"No training ids at {self.config.training_ids_path}, scoring all {len(df)} rows")
+            return df
+        return df[~df['id'].isin(np.load(self.config.training_ids_path))]
+
+    def save_decision(self, decision: dict):
+        with open(self.config.decision_path, 'w') as f:
+            json.dump(decision, f, indent=2)
+        logger.info(f"Retraining decision saved to {self.config.decision_path}")
+
+    def decide(self, force: bool = False, df: pd.DataFrame = None) -> dict:
+        """Compare the ingested data with the reference profile and write decision.json
+
+        ``df`` is the ingested data when the caller already holds it;
+        otherwise it is read from ``data_path``.
+        """
+        try:
+            decision = {'decided_at': datetime.now().isoformat(timespec='seconds'), 'reasons': []}
+            if force or self.config.force_retrain:
+                decision['reasons'].append("retraining forced")
+            if not os.path.exists(self.config.model_path):
+                decision['reasons'].append("no trained model")
+            if not os.path.exists(self.config.reference_profile_path):
+                decision['reasons'].append("no reference profile")
+
+            if not decision['reasons']:
+                with open(self.config.reference_profile_path, 'r') as f:
+                    reference = json.load(f)
+                df = self.load_data() if df is None else df
+                predictor = self.load_predictor()
+                decision['model_version'] = predictor.version
+                if reference.get('model_version') != predictor.version:
+                    decision['reasons'].append("reference profile belongs to another model version")
+
+                drift = {col: self.column_drift(stats, df[col])
+                         for col, stats in reference['columns'].items() if col in df.columns}
+                drifted = sorted(col for col, value in drift.items() if value > self.config.column_drift_threshold)
+                drift_share = len(drifted) / len(drift) if drift else 0.0
+                decision['drift'] = {
+                    'columns': drift, 'drifted_columns': drifted, 'drift_share': drift_share,
+                    'column_threshold': self.config.column_drift_threshold,
+                    'share_threshold': self.config.drift_share_threshold
+                }
+                if drift_share > self.config.drift_share_threshold:
+                    decision['reasons'].append(f"{len(drifted)}/{len(drift)} columns drifted: {drifted}")
+
+                # Training rows would make the served model look better than it is
+                performance = self.score(predictor, self.unseen_rows(df))
+                baseline_rmse = reference.get('performance', {}).get('rmse')
+                decision['performance'] = {'current': performance, 'reference': reference.get('performance', {})}
+                if performance and baseline_rmse:
+                    increase = performance['rmse'] / baseline_rmse - 1
+                    decision['performance']['rmse_increase'] = increase
+                    if increase > self.config.max_rmse_increase:
+                        decision['reasons'].append(
+                            f"RMSE rose {increase:.1%} ({baseline_rmse:.4f} -> {performance['rmse']:.4f})")
+
+            decision['retrain'] = bool(decision['reasons'])
+            self.save_decision(decision)
+            if decision['retrain']:
+                logger.info(f"Retraining required: {'; '.join(decision['reasons'])}")
+            else:
+                logger.info("No drift or degradation beyond thresholds, skipping retraining")
+            return decision
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.entity.config_entity import RiskLookupConfig
+from heartpipeline.serving.predictor import RiskPredictor, CATEGORICAL_FEATURES
+from heartpipeline.serving.lookup import RiskLookupTable
+
+
+FLAG_FEATURES = ['road_signs_present', 'public_road', 'holiday', 'school_season']
+
+
+class RiskLookup:
+    def __init__(self, config: RiskLookupConfig):
+        self.config = config
+
+    def build_axes(self, predictor: RiskPredictor) -> list:
+        try:
+            axes = []
+            for col in CATEGORICAL_FEATURES:
+                axes.append({'name': col, 'values': [str(v) for v in predictor.encoder.vocabulary[col]]})
+            axes.append({'name': 'num_lanes', 'values': [int(v) for v in self.config.num_lanes]})
+            axes.append({'name': 'speed_limit', 'values': [int(v) for v in self.config.speed_limits]})
+            for col in FLAG_FEATURES:
+                axes.append({'name': col, 'values': [0, 1]})
+            axes.append({'name': 'num_reported_accidents',
+                         'values': list(range(self.config.max_reported_accidents + 1))})
+            return axes
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def grid_frame(self, axes: list, cells: np.ndarray, curvature: np.ndarray) -> pd.DataFrame:
+        shape = tuple(len(axis['values']) for axis in axes)
+        positions = np.unravel_index(cells, shape)
+        n_curv = len(curvature)
+
+        data = {}
+        for axis, pos in zip(axes, positions):
+            values = np.asarray(axis['values'])
+            data[axis['name']] = np.repeat(values[pos], n_curv)
+        data['curvature'] = np.tile(curvature, len(cells))
+        return pd.DataFrame(data)
+
+    def build_table(self, predictor: RiskPredictor, axes: list, curvature: np.ndarray) -> np.ndarray:
+        try:
+            n_cells = int(np.prod([len(axis['values']) for axis in axes]))
+            n_curv = len(curvature)
+            logger.info(f"Evaluating model over {n_cells} cells x {n_curv} curvature points "
+                        f"({n_cells * n_curv} rows)")
+
+            table = np.lib.format.open_memmap(
+                self.config.table_path, mode='w+', dtype=np.float32, shape=(n_cells, n_curv)
+            )
+            cells_per_batch = max(1, self.config.batch_rows // n_curv)
+            for start in range(0, n_cells, cells_per_batch):
+                cells = np.arange(start, min(start + cells_per_batch, n_cells))
+                df = self.grid_frame(axes, cells, curvature)
+                table[cells] = predictor.predict(df).reshape(len(cells), n_curv)
+                logger.info(f"Evaluated cells {start}-{cells[-1]} of {n_cells}")
+            table.flush()
+            return table
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def estimate_error(self, predictor: RiskPredictor, lookup_table: RiskLookupTable, axes: list) -> dict:
+        """Lookup vs exact model on ``error_samples`` random cells and curvatures
+
+        ``max_abs_error`` is the largest error among those samples, an
+        estimate of the worst case rather than a bound over the whole grid.
+        """
+        try:
+            rng = np.random.default_rng(42)
+            n_cells = lookup_table.table.shape[0]
+            n_samples = self.config.error_samples
+            cells = rng.integers(0, n_cells, size=n_samples)
+
+            df = self.grid_frame(axes, cells, np.zeros(1))
+            df['curvature'] = np.round(rng.uniform(0.0, 1.0, size=n_samples), 4)
+            records = df.to_dict('records')
+            approx = np.array([lookup_table.lookup(record) for record in records])
+            exact = predictor.predict(df.copy())
+
+            errors = np.abs(approx - exact)
+            return {
+                'max_abs_error': float(errors.max()),
+                'mean_abs_error': float(errors.mean()),
+                'p99_abs_error': float(np.quantile(errors, 0.99)),
+                'error_samples': int(n_samples)
+            }
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def build(self) -> dict:
+        try:
+            logger.info("Building precomputed risk lookup table...")
+
+            predictor = RiskPredictor.load(
+                self.config.model_path, self.config.scaler_path, self.config.encoder_path,
+                record_metrics=False, feature_stats_path=self.config.feature_stats_path
+            )
+            axes = self.build_axes(predictor)
+            curvature = np.linspace(0.0, 1.0, self.config.curvature_points)
+
+            self.build_table(predictor, axes, curvature)
+
+            metadata = {
+                'model_version': predictor.version,
+                'axes': axes,
+                'curvature': {'min': 0.0, 'max': 1.0, 'points': int(self.config.curvature_points)}
+            }
+            lookup_table = RiskLookupTable(np.load(self.config.table_path, mmap_mode='r'), metadata)
+            metadata.update(self.estimate_error(predictor, lookup_table, axes))
+
+            with open(self.config.metadata_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
+
+            logger.info(f"Lookup table saved to {self.config.table_path} "
+                        f"({os.path.getsize(self.config.table_path) / 1e6:.1f} MB)")
+            logger.info(f"Max approximation error: {metadata['max_abs_error']:.6f}, "
+                        f"mean: {metadata['mean_abs_error']:.6f}")
+            return metadata
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -7,7 +7,10 @@ from heartpipeline.entity.config_entity import (
     DataTransformationConfig,
     ModelTrainerConfig,
     ModelEvaluationConfig,
-    MonitoringConfig
+    MonitoringConfig,
+    RiskLookupConfig,
+    RetrainingTriggerConfig,
+    ModelCompressionConfig
 )
 from pathlib import Path
 
@@ -49,7 +52,12 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             STATUS_FILE=config.STATUS_FILE,
             data_dir=Path(config.data_dir),
-            required_columns=list(schema.keys())
+            required_columns=list(schema.keys()),
+            column_types=dict(schema),
+            constraints=self.schema.get('constraints', {}),
+            report_path=Path(config.report_path),
+            chunk_rows=config.chunk_rows,
+            fail_on_error=config.fail_on_error
         )
 
         return data_validation_config
@@ -62,7 +70,11 @@ class ConfigurationManager:
         feature_engineering_config = FeatureEngineeringConfig(
             root_dir=Path(config.root_dir),
             data_path=Path(config.data_path),
-            output_path=Path(config.output_path)
+            output_path=Path(config.output_path),
+            stats_path=Path(config.stats_path),
+            shard_dir=Path(config.shard_dir),
+            shard_rows=config.shard_rows,
+            num_workers=config.num_workers
         )
 
         return feature_engineering_config
@@ -77,7 +89,14 @@ class ConfigurationManager:
             data_path=Path(config.data_path),
             train_data_path=Path(config.train_data_path),
             test_data_path=Path(config.test_data_path),
-            scaler_path=Path(config.scaler_path)
+            scaler_path=Path(config.scaler_path),
+            encoder_path=Path(config.encoder_path),
+            chunk_rows=config.chunk_rows,
+            split_method=config.split_method,
+            test_size=config.test_size,
+            split_salt=config.split_salt,
+            split_manifest_path=Path(config.split_manifest_path),
+            test_ids_path=Path(config.test_ids_path)
         )
 
         return data_transformation_config
@@ -94,6 +113,20 @@ class ConfigurationManager:
             train_data_path=Path(config.train_data_path),
             test_data_path=Path(config.test_data_path),
             model_name=config.model_name,
+            candidate_model_name=config.candidate_model_name,
+            candidates_dir=Path(config.candidates_dir),
+            conformal_path=Path(config.conformal_path),
+            calibration_fraction=config.calibration_fraction,
+            ensemble_mode=config.ensemble_mode,
+            cv_folds=config.cv_folds,
+            oof_dir=Path(config.oof_dir),
+            ensemble_report_path=Path(config.ensemble_report_path),
+            min_gain_per_ms=config.min_gain_per_ms,
+            cost_report_path=Path(config.cost_report_path),
+            selection_objective=config.selection_objective,
+            max_latency_ms=config.max_latency_ms,
+            latency_penalty=config.latency_penalty,
+            cost_batch_rows=config.cost_batch_rows,
             target_column=target_col,
             params=params
         )
@@ -128,8 +161,99 @@ class ConfigurationManager:
             reference_data_path=Path(config.reference_data_path),
             current_data_path=Path(config.current_data_path),
             model_path=Path(config.model_path),
+            scaler_path=Path(config.scaler_path),
+            encoder_path=Path(config.encoder_path),
+            feature_stats_path=Path(config.feature_stats_path),
             evidently_report_path=Path(config.evidently_report_path),
+            shadow_log_path=Path(config.shadow_log_path),
+            history_db_path=Path(config.history_db_path),
+            sketch_dir=Path(config.sketch_dir),
+            raw_reference_data_path=Path(config.raw_reference_data_path),
+            feature_data_path=Path(config.feature_data_path),
+            test_ids_path=Path(config.test_ids_path),
+            split_manifest_path=Path(config.split_manifest_path),
+            sketch_chunk_rows=config.sketch_chunk_rows,
+            drift_report_sample_rows=config.drift_report_sample_rows,
+            psi_threshold=config.psi_threshold,
+            ks_threshold=config.ks_threshold,
+            drift_share_threshold=config.drift_share_threshold,
+            attribution_sample_rows=config.attribution_sample_rows,
+            attribution_drift_threshold=config.attribution_drift_threshold,
             target_column=target_col
         )
 
         return monitoring_config
+
+    def get_risk_lookup_config(self) -> RiskLookupConfig:
+        config = self.config.risk_lookup
+
+        create_directories([config.root_dir])
+
+        risk_lookup_config = RiskLookupConfig(
+            root_dir=Path(config.root_dir),
+            model_path=Path(config.model_path),
+            scaler_path=Path(config.scaler_path),
+            encoder_path=Path(config.encoder_path),
+            feature_stats_path=Path(config.feature_stats_path),
+            table_path=Path(config.table_path),
+            metadata_path=Path(config.metadata_path),
+            curvature_points=config.curvature_points,
+            num_lanes=list(config.num_lanes),
+            speed_limits=list(config.speed_limits),
+            max_reported_accidents=config.max_reported_accidents,
+            batch_rows=config.batch_rows,
+            error_samples=config.error_samples
+        )
+
+        return risk_lookup_config
+
+    def get_retraining_trigger_config(self) -> RetrainingTriggerConfig:
+        config = self.config.retraining_trigger
+        target_col = self.schema.target_column
+
+        create_directories([config.root_dir])
+
+        retraining_trigger_config = RetrainingTriggerConfig(
+            root_dir=Path(config.root_dir),
+            data_path=Path(config.data_path),
+            model_path=Path(config.model_path),
+            scaler_path=Path(config.scaler_path),
+            encoder_path=Path(config.encoder_path),
+            feature_stats_path=Path(config.feature_stats_path),
+            test_ids_path=Path(config.test_ids_path),
+            reference_profile_path=Path(config.reference_profile_path),
+            training_ids_path=Path(config.training_ids_path),
+            decision_path=Path(config.decision_path),
+            column_drift_threshold=config.column_drift_threshold,
+            drift_share_threshold=config.drift_share_threshold,
+            max_rmse_increase=config.max_rmse_increase,
+            force_retrain=config.force_retrain,
+            target_column=target_col
+        )
+
+        return retraining_trigger_config
+
+    def get_model_compression_config(self) -> ModelCompressionConfig:
+        config = self.config.model_compression
+        target_col = self.schema.target_column
+
+        create_directories([config.root_dir])
+
+        model_compression_config = ModelCompressionConfig(
+            root_dir=Path(config.root_dir),
+            train_data_path=Path(config.train_data_path),
+            test_data_path=Path(config.test_data_path),
+            model_path=Path(config.model_path),
+            compact_model_path=Path(config.compact_model_path),
+            compact_conformal_path=Path(config.compact_conformal_path),
+            report_path=Path(config.report_path),
+            enabled=config.enabled,
+            max_r2_loss=config.max_r2_loss,
+            tree_counts=list(config.tree_counts),
+            student_depths=list(config.student_depths),
+            student_estimators=config.student_estimators,
+            cost_batch_rows=config.cost_batch_rows,
+            target_column=target_col
+        )
+
+        return model_compression_config
@@ -16,6 +16,11 @@ class DataValidationConfig:
     STATUS_FILE: str
     data_dir: Path
     required_columns: list
+    column_types: dict
+    constraints: dict
+    report_path: Path
+    chunk_rows: int
+    fail_on_error: bool
 
 
 @dataclass(frozen=True)
@@ -23,6 +28,10 @@ class FeatureEngineeringConfig:
     root_dir: Path
     data_path: Path
     output_path: Path
+    stats_path: Path
+    shard_dir: Path
+    shard_rows: int
+    num_workers: int
 
 
 @dataclass(frozen=True)
@@ -32,6 +41,13 @@ class DataTransformationConfig:
     train_data_path: Path
     test_data_path: Path
     scaler_path: Path
+    encoder_path: Path
+    chunk_rows: int
+    split_method: str
+    test_size: float
+    split_salt: str
+    split_manifest_path: Path
+    test_ids_path: Path
 
 
 @dataclass(frozen=True)
@@ -40,6 +56,20 @@ class ModelTrainerConfig:
     train_data_path: Path
     test_data_path: Path
     model_name: str
+    candidate_model_name: str
+    candidates_dir: Path
+    conformal_path: Path
+    calibration_fraction: float
+    ensemble_mode: str
+    cv_folds: int
+    oof_dir: Path
+    ensemble_report_path: Path
+    min_gain_per_ms: float
+    cost_report_path: Path
+    selection_objective: str
+    max_latency_ms: float
+    latency_penalty: float
+    cost_batch_rows: int
     target_column: str
     params: dict
 
@@ -60,5 +90,76 @@ class MonitoringConfig:
     reference_data_path: Path
     current_data_path: Path
     model_path: Path
+    scaler_path: Path
+    encoder_path: Path
+    feature_stats_path: Path
     evidently_report_path: Path
+    shadow_log_path: Path
+    history_db_path: Path
+    sketch_dir: Path
+    raw_reference_data_path: Path
+    feature_data_path: Path
+    test_ids_path: Path
+    split_manifest_path: Path
+    sketch_chunk_rows: int
+    drift_report_sample_rows: int
+    psi_threshold: float
+    ks_threshold: float
+    drift_share_threshold: float
+    attribution_sample_rows: int
+    attribution_drift_threshold: float
+    target_column: str
+
+
+@dataclass(frozen=True)
+class RiskLookupConfig:
+    root_dir: Path
+    model_path: Path
+    scaler_path: Path
+    encoder_path: Path
+    feature_stats_path: Path
+    table_path: Path
+    metadata_path: Path
+    curvature_points: int
+    num_lanes: list
+    speed_limits: list
+    max_reported_accidents: int
+    batch_rows: int
+    error_samples: int
+
+
+@dataclass(frozen=True)
+class RetrainingTriggerConfig:
+    root_dir: Path
+    data_path: Path
+    model_path: Path
+    scaler_path: Path
+    encoder_path: Path
+    feature_stats_path: Path
+    test_ids_path: Path
+    reference_profile_path: Path
+    training_ids_path: Path
+    decision_path: Path
+    column_drift_threshold: float
+    drift_share_threshold: float
+    max_rmse_increase: float
+    force_retrain: bool
+    target_column: str
+
+
+@dataclass(frozen=True)
+class ModelCompressionConfig:
+    root_dir: Path
+    train_data_path: Path
+    test_data_path: Path
+    model_path: Path
+    compact_model_path: Path
+    compact_conformal_path: Path
+    report_path: Path
+    enabled: bool
+    max_r2_loss: float
+    tree_counts: list
+    student_depths: list
+    student_estimators: int
+    cost_batch_rows: int
     target_column: str
@@ -0,0 +1,152 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+CATEGORICAL_COLUMNS = ['road_type', 'lighting', 'weather', 'time_of_day',
+                       'speed_category', 'curvature_category']
+# Dict of per-column LabelEncoders written before categorical_encoder.pkl
+LEGACY_ENCODERS_FILE = 'label_encoders.pkl'
+
+
+def resolve_encoder_path(path) -> str:
+    """``path``, or the legacy label_encoders.pkl next to it when only that file exists"""
+    legacy = os.path.join(os.path.dirname(str(path)), LEGACY_ENCODERS_FILE)
+    if not os.path.exists(path) and os.path.exists(legacy):
+        return legacy
+    return str(path)
+
+
+class CategoricalEncoder:
+    """Encodes several categorical columns against sorted vocabularies in one call
+
+    Codes are the positions in each column's sorted string vocabulary, the
+    same codes ``LabelEncoder().fit(df[col].astype(str))`` produced before
+    pandas 3 (missing values as the string 'nan', sorted with the other
+    categories), so models trained with either encoder are interchangeable.
+    Values not seen during ``fit`` are encoded as the column's most frequent
+    training category instead of raising.
+    """
+
+    # Below this many rows a dict lookup beats factorize + get_indexer
+    SMALL_BATCH = 32
+
+    def __init__(self, columns: list = None):
+        self.columns = list(columns or CATEGORICAL_COLUMNS)
+        self.vocabulary = {}
+        self.fallback = {}
+        self._indexes = {}
+        self._positions = {}
+
+    @classmethod
+    def from_label_encoders(cls, label_encoders: dict) -> "CategoricalEncoder":
+        """Wrap a legacy dict of fitted LabelEncoders (fallback: first category)"""
+        encoder = cls(list(label_encoders))
+        for col, le in label_encoders.items():
+            encoder.vocabulary[col] = np.asarray(le.classes_).astype(str)
+            encoder.fallback[col] = 0
+        return encoder
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_indexes'] = {}
+        state['_positions'] = {}
+        state.pop('_counts', None)
+        return state
+
+    def _index(self, col: str) -> pd.Index:
+        index = self._indexes.get(col)
+        if index is None:
+            index = self._indexes[col] = pd.Index(self.vocabulary[col])
+        return index
+
+    def _position_map(self, col: str) -> dict:
+        positions = self._positions.get(col)
+        if positions is None:
+            positions = self._positions[col] = {value: i for i, value in enumerate(self.vocabulary[col])}
+        return positions
+
+    def _nan_code(self, col: str) -> int:
+        return self._position_map(col).get('nan', -1)
+
+    def _translate(self, col: str, row_codes: np.ndarray, uniques) -> np.ndarray:
+        # Missing values factorize to -1, which picks the appended NaN code
+        lookup = np.empty(len(uniques) + 1, dtype=np.intp)
+        lookup[:-1] = self._index(col).get_indexer(pd.Index(uniques).astype(str))
+        lookup[-1] = self._nan_code(col)
+        lookup[lookup < 0] = self.fallback[col]
+        return lookup[row_codes]
+
+    def fit(self, df: pd.DataFrame) -> "CategoricalEncoder":
+        self._fit(df)
+        return self
+
+    def _fit(self, df: pd.DataFrame) -> np.ndarray:
+        self.columns = [col for col in self.columns if col in df.columns]
+        self._indexes, self._positions = {}, {}
+        codes = np.empty((len(df), len(self.columns)), dtype=np.int32, order='F')
+        for i, col in enumerate(self.columns):
+            # One hash pass per column; only the distinct values are sorted
+            row_codes, uniques = pd.factorize(df[col])
+            names = set(pd.Index(uniques).astype(str))
+            # Missing values become the string 'nan' and sort among the categories, as in LabelEncoder on astype(str)
+            if (row_codes < 0).any():
+                names.add('nan')
+            self.vocabulary[col] = np.array(sorted(names))
+            self.fallback[col] = 0
+            codes[:, i] = self._translate(col, row_codes, uniques)
+            self.fallback[col] = int(np.bincount(codes[:, i]).argmax())
+        return codes
+
+    def partial_fit(self, df: pd.DataFrame) -> "CategoricalEncoder":
+        """Accumulate category counts from one chunk; gives the same result as fit on all chunks"""
+        if not hasattr(self, '_counts'):
+            self.columns = [col for col in self.columns if col in df.columns]
+            self._counts = {col: {} for col in self.columns}
+        self._indexes, self._positions = {}, {}
+        for col in self.columns:
+            counts = self._counts[col]
+            for value, count in df[col].value_counts(dropna=False).items():
+                # Categorical columns also list unused categories, which fit never sees
+                if count == 0:
+                    continue
+                name = 'nan' if pd.isna(value) else str(value)
+                counts[name] = counts.get(name, 0) + int(count)
+
+            names = sorted(counts)
+            self.vocabulary[col] = np.array(names)
+            # Ties resolve to the lowest code, as np.bincount(...).argmax() does in fit
+            self.fallback[col] = max(range(len(names)), key=lambda i: (counts[names[i]], -i))
+        return self
+
+    def column_codes(self, col: str, values) -> np.ndarray:
+        """Vocabulary positions for one column; unseen values get the fallback code"""
+        if len(values) <= self.SMALL_BATCH:
+            positions, fallback = self._position_map(col), self.fallback[col]
+            nan_code = positions.get('nan', fallback)
+            return np.array([nan_code if pd.isna(value) else positions.get(str(value), fallback)
+                             for value in values], dtype=np.intp)
+        row_codes, uniques = pd.factorize(values)
+        return self._translate(col, row_codes, uniques)
+
+    def encode(self, df: pd.DataFrame) -> np.ndarray:
+        """All configured columns as one (n_rows, n_columns) int32 code matrix"""
+        out = np.empty((len(df), len(self.columns)), dtype=np.int32, order='F')
+        for i, col in enumerate(self.columns):
+            out[:, i] = self.column_codes(col, df[col])
+        return out
+
+    def transform(self, df: pd.DataFrame, codes: np.ndarray = None) -> pd.DataFrame:
+        if codes is None:
+            codes = self.encode(df)
+        for i, col in enumerate(self.columns):
+            df[col] = codes[:, i].astype(np.int64)
+        return df
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.transform(df, self._fit(df))
+
+    def unknown_mask(self, col: str, values) -> np.ndarray:
+        """True where a value is not part of the column's vocabulary"""
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        return self._index(col).get_indexer(series.astype(str).to_numpy()) < 0
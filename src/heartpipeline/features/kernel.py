@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+
+SPEED_BINS = np.array([0, 40, 60, 80, 120], dtype=np.float64)
+SPEED_LABELS = ['low', 'medium', 'high', 'very_high']
+CURVATURE_BINS = np.array([-0.1, 0.3, 0.6, 1.0], dtype=np.float64)
+CURVATURE_LABELS = ['low', 'medium', 'high']
+
+ENGINEERED_FEATURES = [
+    'lanes_speed', 'curvature_speed', 'lanes_curvature',
+    'high_speed', 'high_curvature', 'few_lanes', 'no_signs', 'holiday_risk',
+    'speed_category', 'curvature_category'
+]
+# Columns that are whole numbers by construction; frames keep them as int64 unless an input is missing
+INTEGER_FEATURES = ['lanes_speed', 'high_speed', 'high_curvature', 'few_lanes', 'no_signs', 'holiday_risk']
+CATEGORY_FEATURES = {
+    'speed_category': SPEED_LABELS,
+    'curvature_category': CURVATURE_LABELS
+}
+
+
+def bin_codes(values: np.ndarray, bins: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Interval index matching ``pd.cut(values, bins)`` (right-closed), -1 outside the bins or for NaN"""
+    codes = np.digitize(values, bins, right=True)
+    codes -= 1
+    codes[codes >= len(bins) - 1] = -1
+    if out is None:
+        return codes
+    out[:] = codes
+    return out
+
+
+def compute_features(num_lanes, speed_limit, curvature, road_signs_present, holiday,
+                     speed_median: float, curvature_median: float, dtype=np.float64) -> np.ndarray:
+    """Build every engineered feature in one pass into a preallocated matrix
+
+    Returns an (n_rows, len(ENGINEERED_FEATURES)) column-major array, so each
+    feature column is contiguous. The two category columns hold bin indices
+    into SPEED_LABELS / CURVATURE_LABELS (-1 when out of range).
+
+    Comparisons and bins are evaluated on float64 inputs and only the results
+    are stored as ``dtype``, so thresholds behave exactly like the pandas
+    expressions they replace.
+    """
+    lanes = np.asarray(num_lanes, dtype=np.float64)
+    speed = np.asarray(speed_limit, dtype=np.float64)
+    curv = np.asarray(curvature, dtype=np.float64)
+
+    out = np.empty((len(speed), len(ENGINEERED_FEATURES)), dtype=dtype, order='F')
+    np.multiply(lanes, speed, out=out[:, 0])
+    np.multiply(curv, speed, out=out[:, 1])
+    np.multiply(lanes, curv, out=out[:, 2])
+    np.greater(speed, speed_median, out=out[:, 3])
+    np.greater(curv, curvature_median, out=out[:, 4])
+    np.less_equal(lanes, 2, out=out[:, 5])
+    np.equal(np.asarray(road_signs_present), 0, out=out[:, 6])
+    np.equal(np.asarray(holiday), 1, out=out[:, 7])
+    bin_codes(speed, SPEED_BINS, out=out[:, 8])
+    bin_codes(curv, CURVATURE_BINS, out=out[:, 9])
+    return out
+
+
+def add_engineered_features(df: pd.DataFrame, medians: dict, dtype=np.float64) -> pd.DataFrame:
+    """Attach the kernel output to ``df`` as columns, categories as ordered Categoricals"""
+    matrix = compute_features(
+        df['num_lanes'].to_numpy(), df['speed_limit'].to_numpy(), df['curvature'].to_numpy(),
+        df['road_signs_present'].to_numpy(), df['holiday'].to_numpy(),
+        medians['speed_limit'], medians['curvature'], dtype=dtype
+    )
+    for i, name in enumerate(ENGINEERED_FEATURES):
+        column = matrix[:, i]
+        if name in CATEGORY_FEATURES:
+            df[name] = pd.Categorical.from_codes(column.astype(np.int8), CATEGORY_FEATURES[name], ordered=True)
+        elif name in INTEGER_FEATURES and not np.isnan(column).any():
+            df[name] = column.astype(np.int64)
+        else:
+            df[name] = column
+    return df
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class FeatureAttributor:
+    """Additive per-feature attribution for the serving model
+
+    ``explain(X)`` returns a base value and one contribution per feature such
+    that base + contributions.sum(axis=1) equals the model output:
+
+    - forests and single trees: Saabas path attribution. Every node stores
+      the change in node value its split caused; one sparse product of the
+      batch's decision paths with that node-by-feature matrix gives all rows;
+    - gradient boosting: the same deltas, accumulated per node, so a row's
+      attribution is a lookup of its leaf in each tree;
+    - XGBoost: the booster's exact TreeSHAP (``pred_contribs``);
+    - linear models: coef * (x - mean), with the training mean at zero
+      because inputs are standardized; for a linear model on polynomial
+      features each term's contribution is split between its features in
+      proportion to their powers;
+    - stacked ensembles: the weighted sum of their members' attributions.
+
+    The tables are built once per model, so the predictor for a model
+    version holds a single attributor.
+    """
+
+    def __init__(self, model, feature_names: list):
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.method = self._prepare()
+
+    @staticmethod
+    def _node_deltas(tree) -> tuple:
+        """(feature split on to reach each node, value change at that node) with -1/0 for the root"""
+        values = tree.value[:, 0, 0]
+        parent = np.full(tree.node_count, -1)
+        for children in (tree.children_left, tree.children_right):
+            split = children >= 0
+            parent[children[split]] = np.nonzero(split)[0]
+        has_parent = parent >= 0
+        feature = np.where(has_parent, tree.feature[np.maximum(parent, 0)], -1)
+        delta = np.where(has_parent, values - values[np.maximum(parent, 0)], 0.0)
+        return parent, feature, delta
+
+    def _prepare(self) -> str:
+        model = self.model
+        n_features = len(self.feature_names)
+        name = type(model).__name__
+
+        if name.startswith('XGB'):
+            return 'tree_shap'
+
+        if name == 'StackedEnsemble':
+            self.members = [FeatureAttributor(member, self.feature_names) for member in model.members.values()]
+            return 'blend'
+
+        if name == 'Pipeline' and len(model.steps) == 2 and hasattr(model[0], 'powers_') and hasattr(model[-1], 'coef_'):
+            powers = model[0].powers_
+            self.expansion = model[0]
+            self.term_shares = np.ravel(model[-1].coef_)[:, None] * powers / powers.sum(axis=1, keepdims=True)
+            self.base_value = float(np.ravel(model[-1].intercept_)[0])
+            return 'polynomial'
+
+        if hasattr(model, 'coef_'):
+            self.coef = np.ravel(model.coef_)
+            self.base_value = float(np.ravel(model.intercept_)[0]) if np.ndim(model.intercept_) else float(model.intercept_)
+            return 'linear'
+
+        if name.startswith('GradientBoosting'):
+            trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+            self.scale = model.learning_rate
+            # A zero row gives the constant initial prediction (the training mean for squared error)
+            init = 0.0 if model.init_ == 'zero' else float(model.init_.predict(np.zeros((1, n_features)))[0])
+            self.leaf_tables = []
+            for tree in trees:
+                parent, feature, delta = self._node_deltas(tree)
+                # sklearn numbers children after their parent, so one forward pass accumulates paths
+                table = np.zeros((tree.node_count, n_features))
+                for node in range(1, tree.node_count):
+                    table[node] = table[parent[node]]
+                    table[node, feature[node]] += delta[node]
+                self.leaf_tables.append(table)
+            self.base_value = init + self.scale * sum(tree.value[0, 0, 0] for tree in trees)
+            return 'leaf_table'
+
+        if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+            trees = [estimator.tree_ for estimator in model.estimators_] if hasattr(model, 'estimators_') else [model.tree_]
+            rows, cols, data = [], [], []
+            offset = 0
+            for tree in trees:
+                _, feature, delta = self._node_deltas(tree)
+                nodes = np.nonzero(feature >= 0)[0]
+                rows.append(nodes + offset)
+                cols.append(feature[nodes])
+                data.append(delta[nodes])
+                offset += tree.node_count
+            self.node_matrix = sparse.csr_matrix(
+                (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=(offset, n_features))
+            self.scale = 1.0 / len(trees)
+            self.base_value = self.scale * sum(tree.value[0, 0, 0] for tree in trees)
+            return 'decision_path'
+
+        raise ValueError(f"No attribution method for model type {name}")
+
+    def explain(self, X) -> tuple:
+        """(base values, contributions) for a 2-D batch of model inputs"""
+        X = np.asarray(X, dtype=float)
+        if len(X) == 0:
+            # sklearn's predict-side helpers reject empty batches
+            return np.zeros(0), np.zeros((0, len(self.feature_names)))
+        if self.method == 'blend':
+            base = np.full(len(X), self.model.intercept)
+            contributions = np.zeros((len(X), len(self.feature_names)))
+            for weight, member in zip(self.model.weights, self.members):
+                member_base, member_contributions = member.explain(X)
+                base += weight * member_base
+                contributions += weight * member_contributions
+            return base, contributions
+        if self.method == 'linear':
+            contributions = X * self.coef
+        elif self.method == 'polynomial':
+            contributions = self.expansion.transform(X) @ self.term_shares
+        elif self.method == 'decision_path':
+            indicator = self.model.decision_path(X)
+            if isinstance(indicator, tuple):
+                # Forests also return the per-tree node offsets, which match the matrix layout
+                indicator = indicator[0]
+            contributions = (indicator @ self.node_matrix).toarray() * self.scale
+        elif self.method == 'leaf_table':
+            leaves = self.model.apply(X).reshape(len(X), -1).astype(np.intp)
+            contributions = sum(table[leaves[:, i]] for i, table in enumerate(self.leaf_tables)) * self.scale
+        else:
+            import xgboost as xgb
+
+            booster = self.model.get_booster()
+            data = pd.DataFrame(X, columns=booster.feature_names) if booster.feature_names else X
+            shap = booster.predict(xgb.DMatrix(data), pred_contribs=True)
+            return shap[:, -1].astype(float), shap[:, :-1].astype(float)
+        return np.full(len(X), self.base_value), contributions
+
+    def top_contributions(self, contributions: np.ndarray, k: int = 5) -> list:
+        """The k largest contributions by magnitude, per row"""
+        order = np.argsort(-np.abs(contributions), axis=1)[:, :k]
+        return [[{'feature': self.feature_names[j], 'contribution': float(row[j])} for j in indices]
+                for row, indices in zip(contributions, order)]
+
+    def importance(self, X) -> pd.Series:
+        """Mean absolute contribution per feature over a batch"""
+        _, contributions = self.explain(X)
+        return pd.Series(np.abs(contributions).mean(axis=0), index=self.feature_names)
+
+
+def attribution_drift(reference: pd.Series, current: pd.Series) -> dict:
+    """Compare two importance profiles: total variation of their shares and rank correlation"""
+    reference_share = reference / reference.sum() if reference.sum() > 0 else reference
+    current_share = current / current.sum() if current.sum() > 0 else current
+    shift = current_share - reference_share
+    return {
+        'total_variation': float(0.5 * shift.abs().sum()),
+        'rank_correlation': float(reference.rank().corr(current.rank())),
+        'features': {
+            feature: {'importance_reference': float(reference[feature]),
+                      'importance_current': float(current[feature]),
+                      'share_change': float(shift[feature])}
+            for feature in reference.index
+        }
+    }
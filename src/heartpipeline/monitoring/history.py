@@ -0,0 +1,165 @@
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "run_id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, created_at TEXT NOT NULL, "
+    "model_version TEXT, reference_rows INTEGER, current_rows INTEGER, "
+    "dataset_drift INTEGER, drift_ratio REAL)",
+    "CREATE INDEX IF NOT EXISTS runs_ts ON runs (ts)",
+    # Long format, clustered on (series, time): a time-series slice is one
+    # contiguous range scan, and new statistics need no schema change
+    "CREATE TABLE IF NOT EXISTS metrics ("
+    "metric TEXT NOT NULL, dataset TEXT NOT NULL, ts REAL NOT NULL, run_id INTEGER NOT NULL, value REAL, "
+    "PRIMARY KEY (metric, dataset, ts, run_id)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS feature_stats ("
+    "feature TEXT NOT NULL, statistic TEXT NOT NULL, ts REAL NOT NULL, run_id INTEGER NOT NULL, value REAL, "
+    "PRIMARY KEY (feature, statistic, ts, run_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS feature_stats_ts ON feature_stats (ts)",
+]
+
+
+def parse_time(value) -> float:
+    """Epoch seconds from an epoch number or an ISO-8601 string (None passes through)"""
+    if value is None or value == '':
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    if math.isnan(seconds):
+        raise ValueError(f"Invalid time: {value}")
+    return seconds
+
+
+def _finite(value):
+    # NaN/inf (e.g. a % change against a zero mean) are stored as NULL so the API emits valid JSON
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class MonitoringHistory:
+    """Append-only SQLite store of monitoring runs
+
+    Every monitoring run adds one ``runs`` row, its performance metrics and
+    per-feature drift statistics. The serving app reads time-series slices
+    from the same file, so trends are charted without re-running monitoring.
+    """
+
+    def __init__(self, path, readonly: bool = False):
+        self.path = Path(path)
+        self.readonly = readonly
+        self._local = threading.local()
+        if not readonly:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connection() as conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self.readonly:
+                conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True,
+                                       timeout=1.0, check_same_thread=False)
+            else:
+                conn = sqlite3.connect(str(self.path), timeout=5.0)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def available(self) -> bool:
+        return self.path.exists()
+
+    def record_run(self, model_version: str, reference_rows: int, current_rows: int,
+                   dataset_drift: bool, drift_ratio: float, metrics: dict, feature_stats: dict,
+                   ts: float = None) -> int:
+        """Append one monitoring run
+
+        Args:
+            metrics (dict): {dataset: {metric: value}}, e.g. {'current': {'MAE': 0.05}}
+            feature_stats (dict): {feature: {statistic: value}}
+
+        Returns:
+            int: The new run_id
+        """
+        ts = time.time() if ts is None else ts
+        created_at = datetime.fromtimestamp(ts).isoformat(timespec='seconds')
+        conn = self._connection()
+        with conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (ts, created_at, model_version, reference_rows, current_rows, "
+                "dataset_drift, drift_ratio) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ts, created_at, model_version, reference_rows, current_rows, int(dataset_drift), _finite(drift_ratio))
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO metrics (metric, dataset, ts, run_id, value) VALUES (?, ?, ?, ?, ?)",
+                [(metric, dataset, ts, run_id, _finite(value))
+                 for dataset, values in metrics.items() for metric, value in values.items()]
+            )
+            conn.executemany(
+                "INSERT INTO feature_stats (feature, statistic, ts, run_id, value) VALUES (?, ?, ?, ?, ?)",
+                [(feature, statistic, ts, run_id, _finite(value))
+                 for feature, values in feature_stats.items() for statistic, value in values.items()]
+            )
+        return run_id
+
+    @staticmethod
+    def _range(since, until) -> tuple:
+        since, until = parse_time(since), parse_time(until)
+        return (float('-inf') if since is None else since, float('inf') if until is None else until)
+
+    def runs(self, since=None, until=None, limit: int = 100) -> list:
+        # SQLite reads a negative LIMIT as no limit at all
+        if limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        if not self.available():
+            return []
+        rows = self._connection().execute(
+            "SELECT run_id, ts, created_at, model_version, reference_rows, current_rows, dataset_drift, drift_ratio "
+            "FROM runs WHERE ts BETWEEN ? AND ? ORDER BY ts DESC, run_id DESC LIMIT ?",
+            (*self._range(since, until), limit)
+        ).fetchall()
+        keys = ('run_id', 'ts', 'created_at', 'model_version', 'reference_rows', 'current_rows',
+                'dataset_drift', 'drift_ratio')
+        return [dict(zip(keys, row), dataset_drift=bool(row[6])) for row in rows]
+
+    def metric_series(self, metric: str, dataset: str = 'current', since=None, until=None) -> list:
+        if not self.available():
+            return []
+        rows = self._connection().execute(
+            "SELECT ts, run_id, value FROM metrics WHERE metric = ? AND dataset = ? AND ts BETWEEN ? AND ? "
+            "ORDER BY ts, run_id",
+            (metric, dataset, *self._range(since, until))
+        ).fetchall()
+        return [{'ts': ts, 'run_id': run_id, 'value': value} for ts, run_id, value in rows]
+
+    def feature_series(self, feature: str, statistic: str, since=None, until=None) -> list:
+        if not self.available():
+            return []
+        rows = self._connection().execute(
+            "SELECT ts, run_id, value FROM feature_stats WHERE feature = ? AND statistic = ? AND ts BETWEEN ? AND ? "
+            "ORDER BY ts, run_id",
+            (feature, statistic, *self._range(since, until))
+        ).fetchall()
+        return [{'ts': ts, 'run_id': run_id, 'value': value} for ts, run_id, value in rows]
+
+    def latest_feature_stats(self) -> dict:
+        """{feature: {statistic: value}} of the most recent run"""
+        if not self.available():
+            return {}
+        conn = self._connection()
+        latest = conn.execute("SELECT run_id, ts FROM runs ORDER BY ts DESC, run_id DESC LIMIT 1").fetchone()
+        if latest is None:
+            return {}
+        stats = {}
+        for feature, statistic, value in conn.execute(
+                "SELECT feature, statistic, value FROM feature_stats WHERE ts = ? AND run_id = ?", (latest[1], latest[0])):
+            stats.setdefault(feature, {})[statistic] = value
+        return stats
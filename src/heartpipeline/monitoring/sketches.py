@@ -0,0 +1,559 @@
+import base64
+import json
+import math
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang & Liberty)
+
+    Items live in levels; an item at level h stands for 2**h inputs. When a
+    level outgrows its capacity it is sorted and every other item, from a
+    random offset, is promoted to the next level. Capacities shrink by 2/3
+    per level below the top, so memory is O(k log(n/k)) and the rank error
+    is about 1.7/k whatever the number of rows.
+    """
+
+    def __init__(self, k: int = 200, seed: int = None):
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                items = self.levels[level]
+                if len(items) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the promoted pairs stay unbiased
+                keep = len(items) % 2
+                promoted = items[keep + self._rng.integers(2)::2]
+                self.levels[level] = items[:keep]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                compacted = True
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self) -> tuple:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def cdf(self, x):
+        """Estimated fraction of inputs <= x (vectorized over x)"""
+        items, cumulative = self._weighted()
+        if len(items) == 0:
+            return np.zeros_like(np.asarray(x, dtype=float))
+        positions = np.searchsorted(items, np.asarray(x, dtype=float), side='right')
+        return np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0.0) / cumulative[-1]
+
+    def quantile(self, q):
+        items, cumulative = self._weighted()
+        if len(items) == 0:
+            return np.full_like(np.asarray(q, dtype=float), np.nan)
+        positions = np.searchsorted(cumulative / cumulative[-1], np.asarray(q, dtype=float), side='left')
+        return items[np.minimum(positions, len(items) - 1)]
+
+    def support(self) -> np.ndarray:
+        return np.unique(np.concatenate(self.levels))
+
+    def to_dict(self) -> dict:
+        return {'k': self.k, 'n': self.n, 'min': self.min, 'max': self.max,
+                'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sketch = cls(data['k'])
+        sketch.n, sketch.min, sketch.max = data['n'], data['min'], data['max']
+        sketch.levels = [np.asarray(items, dtype=float) for items in data['levels']]
+        return sketch
+
+
+class Histogram:
+    """Counts over fixed bin edges, plus one underflow and one overflow bin
+
+    Bins are right-closed, (edges[i-1], edges[i]], matching the quantile
+    sketch's CDF so estimated and counted histograms line up.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side='left'),
+                                   minlength=len(self.counts))
+
+    def merge(self, other: "Histogram"):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms with different bin edges cannot be merged")
+        self.counts += other.counts
+        return self
+
+    def to_dict(self) -> dict:
+        return {'edges': self.edges.tolist(), 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls(data['edges'])
+        histogram.counts = np.asarray(data['counts'], dtype=np.int64)
+        return histogram
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2**p one-byte registers (about 1.04/sqrt(2**p) relative error)"""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        length = np.zeros(len(values), dtype=np.int64)
+        values = values.copy()
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = values >> np.uint64(shift)
+            moved = high > 0
+            length[moved] += shift
+            values[moved] = high[moved]
+        return length + (values > 0)
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        # pandas' hash is keyed and stable across processes, so replicas agree on every value
+        hashes = pd.util.hash_array(np.asarray(values))
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        rank = np.minimum(64 - self._bit_length(rest) + 1, 64 - self.p + 1)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog"):
+        if self.p != other.p:
+            raise ValueError("HyperLogLog sketches with different precision cannot be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    def to_dict(self) -> dict:
+        return {'p': self.p, 'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(data['p'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class FrequencyTable:
+    """Category counts; categories beyond ``capacity`` are pooled under OTHER"""
+
+    OTHER = '__other__'
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.counts = {}
+
+    def _add(self, category: str, count: int):
+        if category not in self.counts and len(self.counts) >= self.capacity:
+            category = self.OTHER
+        self.counts[category] = self.counts.get(category, 0) + int(count)
+
+    def update(self, values):
+        for category, count in pd.Series(values).dropna().astype(str).value_counts().items():
+            self._add(category, count)
+
+    def merge(self, other: "FrequencyTable"):
+        for category, count in other.counts.items():
+            self._add(category, count)
+        return self
+
+    def to_dict(self) -> dict:
+        return {'capacity': self.capacity, 'counts': self.counts}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FrequencyTable":
+        table = cls(data['capacity'])
+        table.counts = dict(data['counts'])
+        return table
+
+
+class ColumnSketch:
+    """Everything kept for one column: counts, moments and the kind-specific sketches"""
+
+    def __init__(self, kind: str, edges=None, k: int = 200):
+        self.kind = kind
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch(k) if kind == 'numeric' else None
+        self.histogram = Histogram(edges) if kind == 'numeric' and edges is not None else None
+        self.frequencies = FrequencyTable() if kind == 'categorical' else None
+
+    @classmethod
+    def empty_like(cls, other: "ColumnSketch") -> "ColumnSketch":
+        edges = other.histogram.edges if other.histogram is not None else None
+        k = other.quantiles.k if other.quantiles is not None else 200
+        return cls(other.kind, edges, k)
+
+    def update(self, series: pd.Series):
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+        if len(values) == 0:
+            return
+        if self.kind == 'numeric':
+            values = values.to_numpy(dtype=float)
+            self._merge_moments(len(values), float(values.mean()), float(((values - values.mean()) ** 2).sum()))
+            self.quantiles.update(values)
+            if self.histogram is not None:
+                self.histogram.update(values)
+        else:
+            values = values.astype(str).to_numpy(dtype=object)
+            self.count += len(values)
+            self.frequencies.update(values)
+        self.distinct.update(values)
+
+    def _merge_moments(self, count: int, mean: float, m2: float):
+        # Chan et al. parallel update, so shard merges give the same mean and variance as one pass
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def merge(self, other: "ColumnSketch"):
+        if self.kind != other.kind:
+            raise ValueError(f"Cannot merge a {other.kind} column sketch into a {self.kind} one")
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if self.kind == 'numeric':
+            if other.count:
+                self._merge_moments(other.count, other.mean, other.m2)
+            self.quantiles.merge(other.quantiles)
+            if self.histogram is not None and other.histogram is not None \
+                    and np.array_equal(self.histogram.edges, other.histogram.edges):
+                self.histogram.merge(other.histogram)
+            else:
+                # Replicas started against different references; PSI falls back to the quantile sketch
+                self.histogram = None
+        else:
+            self.count += other.count
+            self.frequencies.merge(other.frequencies)
+        return self
+
+    def set_edges(self, bins: int = 10):
+        """Bin edges at the sketch's own quantiles, with counts estimated from the quantile sketch"""
+        if self.kind != 'numeric' or self.histogram is not None or self.quantiles.n == 0:
+            return
+        edges = np.unique(self.quantiles.quantile(np.linspace(0, 1, bins + 1)[1:-1]))
+        self.histogram = Histogram(edges)
+        cumulative = np.concatenate([[0.0], self.quantiles.cdf(edges), [1.0]])
+        self.histogram.counts = np.round(np.diff(cumulative) * self.quantiles.n).astype(np.int64)
+
+    def summary(self) -> dict:
+        summary = {'kind': self.kind, 'count': self.count, 'nulls': self.nulls,
+                   'distinct': round(self.distinct.estimate())}
+        if self.kind == 'numeric' and self.count:
+            p05, p50, p95 = self.quantiles.quantile([0.05, 0.5, 0.95])
+            summary.update(mean=self.mean, std=self.std, min=self.quantiles.min, max=self.quantiles.max,
+                           p05=float(p05), p50=float(p50), p95=float(p95))
+        return summary
+
+    def to_dict(self) -> dict:
+        data = {'kind': self.kind, 'count': self.count, 'nulls': self.nulls,
+                'distinct': self.distinct.to_dict()}
+        if self.kind == 'numeric':
+            data.update(mean=self.mean, m2=self.m2, quantiles=self.quantiles.to_dict(),
+                        histogram=self.histogram.to_dict() if self.histogram is not None else None)
+        else:
+            data['frequencies'] = self.frequencies.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnSketch":
+        sketch = cls(data['kind'])
+        sketch.count, sketch.nulls = data['count'], data['nulls']
+        sketch.distinct = HyperLogLog.from_dict(data['distinct'])
+        if sketch.kind == 'numeric':
+            sketch.mean, sketch.m2 = data['mean'], data['m2']
+            sketch.quantiles = KLLSketch.from_dict(data['quantiles'])
+            if data.get('histogram') is not None:
+                sketch.histogram = Histogram.from_dict(data['histogram'])
+        else:
+            sketch.frequencies = FrequencyTable.from_dict(data['frequencies'])
+        return sketch
+
+
+class DatasetSketch:
+    """Column sketches for a whole dataset, updated chunk by chunk and merged across shards
+
+    Memory per column is fixed by the sketch parameters, not by the number of
+    rows. Sketches built on different replicas or data shards combine with
+    ``merge``. A current-data sketch made with ``empty_like(reference)`` uses
+    the reference's histogram edges, so PSI compares identical bins.
+    """
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.columns = {}
+
+    @classmethod
+    def empty_like(cls, reference: "DatasetSketch") -> "DatasetSketch":
+        sketch = cls(reference.k)
+        sketch.columns = {name: ColumnSketch.empty_like(column) for name, column in reference.columns.items()}
+        return sketch
+
+    @property
+    def rows(self) -> int:
+        return max((column.count + column.nulls for column in self.columns.values()), default=0)
+
+    def update(self, frame: pd.DataFrame):
+        for name in frame.columns:
+            series = frame[name]
+            if name not in self.columns:
+                numeric = pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+                self.columns[name] = ColumnSketch('numeric' if numeric else 'categorical', k=self.k)
+            column = self.columns[name]
+            if column.kind == 'numeric' and pd.api.types.is_bool_dtype(series):
+                series = series.astype(float)
+            column.update(series)
+        return self
+
+    def merge(self, other: "DatasetSketch"):
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = ColumnSketch.empty_like(column).merge(column)
+        return self
+
+    def set_edges(self, bins: int = 10):
+        for column in self.columns.values():
+            column.set_edges(bins)
+        return self
+
+    def summary(self) -> dict:
+        return {name: column.summary() for name, column in self.columns.items()}
+
+    def to_dict(self) -> dict:
+        return {'k': self.k, 'columns': {name: column.to_dict() for name, column in self.columns.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DatasetSketch":
+        sketch = cls(data.get('k', 200))
+        sketch.columns = {name: ColumnSketch.from_dict(column) for name, column in data['columns'].items()}
+        return sketch
+
+    def save(self, path):
+        path = str(path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Readers may merge sketch files at any time; the rename is atomic
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "DatasetSketch":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class ErrorTotals:
+    """Running MAE, RMSE and R2 of a regression, updated chunk by chunk and mergeable
+
+    The target's variance uses the same parallel update as ColumnSketch, so
+    the totals match sklearn's full-array metrics however the rows are split.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.abs_error = 0.0
+        self.squared_error = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=float)
+        residuals = y_true - np.asarray(y_pred, dtype=float)
+        if len(y_true) == 0:
+            return self
+        self._merge(len(y_true), float(np.abs(residuals).sum()), float((residuals ** 2).sum()),
+                    float(y_true.mean()), float(((y_true - y_true.mean()) ** 2).sum()))
+        return self
+
+    def merge(self, other: "ErrorTotals"):
+        if other.count:
+            self._merge(other.count, other.abs_error, other.squared_error, other.mean, other.m2)
+        return self
+
+    def _merge(self, count: int, abs_error: float, squared_error: float, mean: float, m2: float):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.abs_error += abs_error
+        self.squared_error += squared_error
+        self.count = total
+
+    def metrics(self) -> dict:
+        if self.count == 0:
+            return {'MAE': float('nan'), 'RMSE': float('nan'), 'R2': float('nan')}
+        # sklearn's convention for a constant target
+        r2 = 1 - self.squared_error / self.m2 if self.m2 > 0 else (1.0 if self.squared_error == 0 else 0.0)
+        return {'MAE': self.abs_error / self.count, 'RMSE': math.sqrt(self.squared_error / self.count), 'R2': r2}
+
+
+class RowSample:
+    """Uniform sample of at most ``capacity`` rows from a stream of DataFrame chunks
+
+    Every row draws a random key and the rows with the smallest keys are
+    kept (bottom-k sampling), so memory is bounded by ``capacity`` and the
+    first n rows of the sample are themselves a uniform sample of n rows.
+    """
+
+    def __init__(self, capacity: int, seed: int = 42):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self.frame = None
+        self.keys = np.empty(0)
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        if self.capacity <= 0 or len(chunk) == 0:
+            return self
+        keys = np.concatenate([self.keys, self.rng.random(len(chunk))])
+        frame = chunk.reset_index(drop=True) if self.frame is None else \
+            pd.concat([self.frame, chunk], ignore_index=True)
+        keep = np.argsort(keys, kind='stable')[:self.capacity]
+        self.frame, self.keys = frame.iloc[keep].reset_index(drop=True), keys[keep]
+        return self
+
+    def sample(self, rows: int = None) -> pd.DataFrame:
+        if self.frame is None:
+            return pd.DataFrame()
+        return self.frame if rows is None else self.frame.head(rows)
+
+
+def population_stability_index(expected, actual, epsilon: float = 1e-4) -> float:
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return float('nan')
+    expected = np.clip(expected / expected.sum(), epsilon, None)
+    actual = np.clip(actual / actual.sum(), epsilon, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def numeric_drift(reference: ColumnSketch, current: ColumnSketch) -> dict:
+    """PSI over the reference bins and a two-sample KS test on the quantile sketches"""
+    from scipy.special import kolmogorov
+
+    if reference.quantiles.n == 0 or current.quantiles.n == 0:
+        return {'test': 'ks', 'psi': float('nan'), 'statistic': float('nan'), 'p_value': float('nan')}
+    if reference.histogram is not None and current.histogram is not None \
+            and np.array_equal(reference.histogram.edges, current.histogram.edges):
+        psi = population_stability_index(reference.histogram.counts, current.histogram.counts)
+    else:
+        edges = np.unique(reference.quantiles.quantile(np.linspace(0.1, 0.9, 9)))
+        bins = lambda sketch: np.diff(np.concatenate([[0.0], sketch.quantiles.cdf(edges), [1.0]]))
+        psi = population_stability_index(bins(reference), bins(current))
+
+    points = np.union1d(reference.quantiles.support(), current.quantiles.support())
+    statistic = float(np.max(np.abs(reference.quantiles.cdf(points) - current.quantiles.cdf(points))))
+    n, m = reference.quantiles.n, current.quantiles.n
+    p_value = float(kolmogorov(statistic * math.sqrt(n * m / (n + m))))
+    return {'test': 'ks', 'psi': psi, 'statistic': statistic, 'p_value': p_value}
+
+
+def categorical_drift(reference: ColumnSketch, current: ColumnSketch) -> dict:
+    """PSI and a chi-square test of homogeneity on the frequency tables"""
+    from scipy.stats import chi2_contingency
+
+    categories = sorted(set(reference.frequencies.counts) | set(current.frequencies.counts))
+    expected = np.array([reference.frequencies.counts.get(c, 0) for c in categories], dtype=float)
+    actual = np.array([current.frequencies.counts.get(c, 0) for c in categories], dtype=float)
+    psi = population_stability_index(expected, actual)
+    if len(categories) < 2 or expected.sum() == 0 or actual.sum() == 0:
+        return {'test': 'chi_square', 'psi': psi, 'statistic': 0.0, 'p_value': 1.0}
+    statistic, p_value, _, _ = chi2_contingency(np.vstack([expected, actual]))
+    return {'test': 'chi_square', 'psi': psi, 'statistic': float(statistic), 'p_value': float(p_value)}
+
+
+def compare(reference: DatasetSketch, current: DatasetSketch,
+            psi_threshold: float = 0.2, ks_threshold: float = 0.1) -> dict:
+    """Per-column drift tests between two dataset sketches
+
+    With hundreds of thousands of rows any difference is statistically
+    significant, so drift is flagged on effect size: PSI above
+    ``psi_threshold``, or for numeric columns a KS distance above
+    ``ks_threshold``. p-values are reported alongside.
+    """
+    results = {}
+    for name, ref_column in reference.columns.items():
+        cur_column = current.columns.get(name)
+        if cur_column is None or cur_column.kind != ref_column.kind:
+            continue
+        if ref_column.kind == 'numeric':
+            result = numeric_drift(ref_column, cur_column)
+            drift = result['psi'] > psi_threshold or result['statistic'] > ks_threshold
+        else:
+            result = categorical_drift(ref_column, cur_column)
+            drift = result['psi'] > psi_threshold
+        result.update(drift=bool(drift), reference_rows=ref_column.count, current_rows=cur_column.count)
+        results[name] = result
+    return results
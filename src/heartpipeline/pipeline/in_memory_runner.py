@@ -0,0 +1,133 @@
+import sys
+import time
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.config.configuration import ConfigurationManager
+from heartpipeline.components.data_ingestion import DataIngestion
+from heartpipeline.components.data_validation import DataValidation
+from heartpipeline.components.feature_engineering import FeatureEngineering
+from heartpipeline.components.data_transformation import DataTransformation
+from heartpipeline.components.model_trainer import ModelTrainer
+from heartpipeline.components.model_evaluation import ModelEvaluation
+from heartpipeline.components.monitoring import ModelMonitoring
+from heartpipeline.components.risk_lookup import RiskLookup
+from heartpipeline.components.retraining_trigger import RetrainingTrigger
+from heartpipeline.components.model_compression import ModelCompression
+from heartpipeline.utils.common import AsyncArtifactWriter
+
+STAGE_NAME = "In-Memory ML Pipeline"
+
+
+class InMemoryPipelineRunner:
+    """Runs all stages in one process, handing outputs directly to the next stage
+
+    The configuration is read once, each stage receives the previous stage's
+    DataFrames/models instead of re-reading them, and artifacts are written
+    behind the pipeline by an AsyncArtifactWriter. Evaluation and monitoring
+    reuse the predictions computed during training. The retraining gate, the
+    risk lookup table and the optional compression stage run as in the
+    sequential pipeline.
+    """
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        self.config_manager = config_manager or ConfigurationManager()
+        self.writer = AsyncArtifactWriter()
+        self.timings = {}
+
+    def _timed(self, name: str, fn, *args, **kwargs):
+        logger.info(f">>>>>> Stage: {name} started <<<<<<")
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.timings[name] = time.perf_counter() - start
+        logger.info(f">>>>>> Stage: {name} completed in {self.timings[name]:.2f}s <<<<<<")
+        return result
+
+    def run(self, force_retrain: bool = False) -> dict:
+        try:
+            logger.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
+            cm = self.config_manager
+
+            ingestion = DataIngestion(cm.get_data_ingestion_config(), writer=self.writer)
+            raw_df = self._timed("Data Ingestion", ingestion.ingest_frame)
+
+            validation = DataValidation(cm.get_data_validation_config())
+            validation_status = self._timed("Data Validation", validation.validate, raw_df)
+
+            retraining_trigger = RetrainingTrigger(cm.get_retraining_trigger_config())
+            decision = self._timed("Retraining Trigger", retraining_trigger.decide, force_retrain, raw_df)
+            if not decision['retrain']:
+                self.writer.close()
+                return {
+                    'validation_status': validation_status,
+                    'retrain': False,
+                    'decision': decision,
+                    'timings': self.timings
+                }
+
+            feature_engineering = FeatureEngineering(cm.get_feature_engineering_config(), writer=self.writer)
+            features_df = self._timed("Feature Engineering", feature_engineering.engineer_features, raw_df)
+            del raw_df
+
+            transformation = DataTransformation(cm.get_data_transformation_config(), writer=self.writer)
+            train_df, test_df = self._timed("Data Transformation", transformation.transform, features_df)
+            del features_df
+
+            trainer = ModelTrainer(cm.get_model_trainer_config(), writer=self.writer)
+            training = self._timed("Model Training", trainer.train, train_df, test_df)
+
+            evaluation = ModelEvaluation(cm.get_model_evaluation_config())
+            metrics = self._timed(
+                "Model Evaluation", evaluation.evaluate,
+                model=training['model'], X_test=training['X_test'], y_test=training['y_test'],
+                y_pred=training['test_predictions']
+            )
+
+            # Monitoring and the stages after it read model.pkl and the splits back from disk
+            self.writer.wait()
+
+            monitoring = ModelMonitoring(cm.get_monitoring_config())
+            report = self._timed(
+                "Model Monitoring", monitoring.generate_report,
+                model=training['model'], reference_data=train_df, current_data=test_df,
+                reference_predictions=training['train_predictions'],
+                current_predictions=training['test_predictions']
+            )
+
+            self._timed("Update Reference Profile", retraining_trigger.save_reference)
+
+            # Rebuilt for every new model; app.py ignores a table of another model version
+            risk_lookup = RiskLookup(cm.get_risk_lookup_config())
+            lookup_metadata = self._timed("Risk Lookup Table", risk_lookup.build)
+
+            compression_report = None
+            compression_config = cm.get_model_compression_config()
+            if compression_config.enabled:
+                compression = ModelCompression(compression_config)
+                compression_report = self._timed("Model Compression", compression.compress)
+
+            # Surface any failed background write before reporting success
+            self.writer.close()
+            logger.info("Stage timings: " + ", ".join(f"{k}={v:.2f}s" for k, v in self.timings.items()))
+
+            return {
+                'validation_status': validation_status,
+                'retrain': True,
+                'model_name': training['model_name'],
+                'metrics': metrics,
+                'report': report,
+                'risk_lookup': lookup_metadata,
+                'compression': compression_report,
+                'timings': self.timings
+            }
+
+        except Exception as e:
+            logger.error(f">>>>>> {STAGE_NAME} failed <<<<<<")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        InMemoryPipelineRunner().run(force_retrain="--force-retrain" in sys.argv)
+    except Exception as e:
+        logger.exception(e)
+        sys.exit(1)
@@ -0,0 +1,182 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Callable
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable
+    inputs: tuple = ()
+    outputs: tuple = ()
+    # A gate stage returns a bool; False skips every stage downstream of it
+    gate: bool = False
+
+
+class PipelineScheduler:
+    """Runs pipeline stages as a dependency graph instead of a fixed sequence
+
+    Each stage declares the artifacts it reads and writes; a stage depends on
+    whichever stages produce its inputs. Ready stages run concurrently on a
+    thread pool, and the same graph can be turned into Airflow tasks. A gate
+    stage that returns False short-circuits everything downstream of it.
+    """
+
+    def __init__(self, stages: list, max_workers: int = 4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.dependencies = self.build_graph()
+        self.durations = {}
+
+    def build_graph(self) -> dict:
+        try:
+            producers = {}
+            for stage in self.stages.values():
+                for output in stage.outputs:
+                    if output in producers:
+                        raise ValueError(f"Artifact '{output}' is produced by both "
+                                         f"'{producers[output]}' and '{stage.name}'")
+                    producers[output] = stage.name
+
+            # Inputs nobody produces (e.g. the raw dataset) are external
+            dependencies = {
+                stage.name: sorted({producers[i] for i in stage.inputs if i in producers})
+                for stage in self.stages.values()
+            }
+            self.order = self.topological_order(dependencies)
+            return dependencies
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def topological_order(dependencies: dict) -> list:
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        order = []
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                raise ValueError(f"Cycle between stages: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+            order.extend(ready)
+        return order
+
+    def downstream(self, name: str) -> set:
+        """Every stage that transitively depends on ``name``"""
+        found = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for stage, deps in self.dependencies.items():
+                if current in deps and stage not in found:
+                    found.add(stage)
+                    frontier.append(stage)
+        return found
+
+    def run(self) -> dict:
+        try:
+            logger.info(f"Scheduling {len(self.stages)} stages on {self.max_workers} workers")
+            waiting = {name: set(deps) for name, deps in self.dependencies.items()}
+            running = {}
+            skipped = set()
+            failure = None
+            start = time.perf_counter()
+
+            def launch(executor, name):
+                logger.info(f">>>>>> Scheduler: {name} started <<<<<<")
+                running[executor.submit(self._timed, name)] = name
+                del waiting[name]
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for name in [n for n in self.order if not waiting[n]]:
+                    launch(executor, name)
+
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        if future.exception() is not None:
+                            logger.error(f">>>>>> Scheduler: {name} failed <<<<<<")
+                            failure = failure or future.exception()
+                            continue
+                        logger.info(f">>>>>> Scheduler: {name} completed in {self.durations[name]:.2f}s <<<<<<")
+                        if self.stages[name].gate and not future.result():
+                            gated = self.downstream(name) & set(waiting)
+                            logger.info(f">>>>>> Scheduler: {name} short-circuited {sorted(gated)} <<<<<<")
+                            for gated_name in gated:
+                                del waiting[gated_name]
+                            skipped |= gated
+                        for deps in waiting.values():
+                            deps.discard(name)
+                    # After a failure, let running stages finish but start nothing new
+                    if failure is None:
+                        for name in [n for n in self.order if n in waiting and not waiting[n]]:
+                            launch(executor, name)
+
+            if failure is not None:
+                raise failure
+
+            wall_time = time.perf_counter() - start
+            path, path_time = self.critical_path()
+            logger.info(f"Pipeline finished in {wall_time:.2f}s "
+                        f"(sequential total {sum(self.durations.values()):.2f}s)")
+            logger.info(f"Critical path ({path_time:.2f}s): {' -> '.join(path)}")
+
+            return {
+                'wall_time': wall_time,
+                'durations': dict(self.durations),
+                'skipped': sorted(skipped),
+                'critical_path': path,
+                'critical_path_time': path_time
+            }
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        result = self.stages[name].run()
+        self.durations[name] = time.perf_counter() - start
+        return result
+
+    def critical_path(self, durations: dict = None) -> tuple:
+        """Longest chain of dependent stages, weighted by measured (or given) durations"""
+        durations = durations if durations is not None else self.durations
+        finish, previous = {}, {}
+        for name in self.order:
+            upstream = max(self.dependencies[name], key=lambda dep: finish[dep], default=None)
+            finish[name] = durations.get(name, 0.0) + (finish[upstream] if upstream else 0.0)
+            previous[name] = upstream
+
+        node = max(finish, key=finish.get)
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return path[::-1], total
+
+    def to_airflow(self, dag) -> dict:
+        """Create one PythonOperator per stage on ``dag`` and wire the dependency edges
+
+        Gate stages become ShortCircuitOperators, so Airflow marks their
+        downstream tasks as skipped when the gate returns False.
+        """
+        from airflow.operators.python import PythonOperator, ShortCircuitOperator
+
+        tasks = {
+            name: (ShortCircuitOperator if self.stages[name].gate else PythonOperator)(
+                task_id=name, python_callable=self.stages[name].run, dag=dag)
+            for name in self.order
+        }
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                tasks[dep] >> tasks[name]
+        return tasks
@@ -1,3 +1,4 @@
+import os
 import sys
 import dagshub
 from heartpipeline.logging import logger
@@ -5,7 +6,9 @@ from heartpipeline.exception import CustomException
 from heartpipeline.config.configuration import ConfigurationManager
 from heartpipeline.components.model_trainer import ModelTrainer
 
-dagshub.init(repo_owner='abheshith7', repo_name='ML-Pipeline-Evidently', mlflow=True)
+# With MLFLOW_TRACKING_URI set (e.g. a local file store for tests and benchmarks) no DagsHub login is needed
+if "MLFLOW_TRACKING_URI" not in os.environ:
+    dagshub.init(repo_owner='abheshith7', repo_name='ML-Pipeline-Evidently', mlflow=True)
 
 STAGE_NAME = "Model Trainer Stage"
 
@@ -33,6 +36,31 @@ class ModelTrainerTrainingPipeline:
             logger.error(f">>>>>> Stage: {STAGE_NAME} failed <<<<<<")
             raise CustomException(e, sys)
 
+    def train_candidate(self, model_name: str):
+        try:
+            logger.info(f">>>>>> Stage: {STAGE_NAME} ({model_name}) started <<<<<<")
+            
+            config_manager = ConfigurationManager()
+            model_trainer = ModelTrainer(config=config_manager.get_model_trainer_config())
+            model_path = model_trainer.train_candidate(model_name)
+            
+            logger.info(f">>>>>> Stage: {STAGE_NAME} ({model_name}) completed <<<<<<")
+            return model_path
+            
+        except Exception as e:
+            logger.error(f">>>>>> Stage: {STAGE_NAME} ({model_name}) failed <<<<<<")
+            raise CustomException(e, sys)
+
+    def select_best(self):
+        try:
+            config_manager = ConfigurationManager()
+            model_trainer = ModelTrainer(config=config_manager.get_model_trainer_config())
+            return model_trainer.select_best()
+            
+        except Exception as e:
+            logger.error(f">>>>>> Stage: {STAGE_NAME} (model selection) failed <<<<<<")
+            raise CustomException(e, sys)
+
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,39 @@
+import sys
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.config.configuration import ConfigurationManager
+from heartpipeline.components.risk_lookup import RiskLookup
+
+STAGE_NAME = "Risk Lookup Table Stage"
+
+
+class RiskLookupTablePipeline:
+    def __init__(self):
+        pass
+    
+    def main(self):
+        try:
+            logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
+            
+            config_manager = ConfigurationManager()
+            risk_lookup_config = config_manager.get_risk_lookup_config()
+            risk_lookup = RiskLookup(config=risk_lookup_config)
+            metadata = risk_lookup.build()
+            
+            logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<")
+            logger.info(f"Lookup table: {risk_lookup_config.table_path}")
+            
+            return metadata
+            
+        except Exception as e:
+            logger.error(f">>>>>> Stage: {STAGE_NAME} failed <<<<<<")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        pipeline = RiskLookupTablePipeline()
+        pipeline.main()
+    except Exception as e:
+        logger.exception(e)
+        sys.exit(1)
@@ -0,0 +1,51 @@
+import sys
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.config.configuration import ConfigurationManager
+from heartpipeline.components.retraining_trigger import RetrainingTrigger
+
+STAGE_NAME = "Retraining Trigger Stage"
+
+
+class RetrainingTriggerPipeline:
+    def __init__(self):
+        pass
+    
+    def main(self, force: bool = False) -> bool:
+        try:
+            logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
+            
+            config_manager = ConfigurationManager()
+            retraining_trigger_config = config_manager.get_retraining_trigger_config()
+            retraining_trigger = RetrainingTrigger(config=retraining_trigger_config)
+            decision = retraining_trigger.decide(force=force)
+            
+            logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<")
+            logger.info(f"Retrain: {decision['retrain']} ({retraining_trigger_config.decision_path})")
+            
+            return decision['retrain']
+            
+        except Exception as e:
+            logger.error(f">>>>>> Stage: {STAGE_NAME} failed <<<<<<")
+            raise CustomException(e, sys)
+    
+    def update_reference(self) -> dict:
+        """Profile the data behind the newly promoted model for the next decision"""
+        try:
+            config_manager = ConfigurationManager()
+            retraining_trigger = RetrainingTrigger(config=config_manager.get_retraining_trigger_config())
+            return retraining_trigger.save_reference()
+            
+        except Exception as e:
+            logger.error(f">>>>>> Stage: {STAGE_NAME} failed to update the reference profile <<<<<<")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        pipeline = RetrainingTriggerPipeline()
+        retrain = pipeline.main(force="--force" in sys.argv)
+        sys.exit(0 if retrain else 99)
+    except Exception as e:
+        logger.exception(e)
+        sys.exit(1)
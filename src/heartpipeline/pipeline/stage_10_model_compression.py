@@ -0,0 +1,41 @@
+import sys
+from heartpipeline.logging import logger
+from heartpipeline.exception import CustomException
+from heartpipeline.config.configuration import ConfigurationManager
+from heartpipeline.components.model_compression import ModelCompression
+
+STAGE_NAME = "Model Compression Stage"
+
+
+class ModelCompressionPipeline:
+    def __init__(self):
+        pass
+    
+    def main(self, force: bool = False):
+        try:
+            config_manager = ConfigurationManager()
+            model_compression_config = config_manager.get_model_compression_config()
+            if not (model_compression_config.enabled or force):
+                logger.info(f"{STAGE_NAME} disabled in config.yaml, skipping")
+                return None
+            
+            logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
+            model_compression = ModelCompression(config=model_compression_config)
+            report = model_compression.compress()
+            logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<")
+            logger.info(f"Compact model: {report['selected']} ({model_compression_config.report_path})")
+            
+            return report
+            
+        except Exception as e:
+            logger.error(f">>>>>> Stage: {STAGE_NAME} failed <<<<<<")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        obj = ModelCompressionPipeline()
+        obj.main(force="--force" in sys.argv)
+    except Exception as e:
+        logger.exception(e)
+        raise e
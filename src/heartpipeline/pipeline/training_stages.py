@@ -0,0 +1,58 @@
+from heartpipeline.components.model_trainer import MODEL_REGISTRY
+from heartpipeline.pipeline.scheduler import Stage
+from heartpipeline.pipeline.stage_01_data_ingestion import DataIngestionTrainingPipeline
+from heartpipeline.pipeline.stage_02_data_validation import DataValidationTrainingPipeline
+from heartpipeline.pipeline.stage_03_feature_engineering import FeatureEngineeringTrainingPipeline
+from heartpipeline.pipeline.stage_04_data_transformation import DataTransformationTrainingPipeline
+from heartpipeline.pipeline.stage_05_model_trainer import ModelTrainerTrainingPipeline
+from heartpipeline.pipeline.stage_06_model_evaluation import ModelEvaluationPipeline
+from heartpipeline.pipeline.stage_07_monitoring import ModelMonitoringPipeline
+from heartpipeline.pipeline.stage_08_risk_lookup import RiskLookupTablePipeline
+from heartpipeline.pipeline.stage_09_retraining_trigger import RetrainingTriggerPipeline
+from heartpipeline.pipeline.stage_10_model_compression import ModelCompressionPipeline
+
+
+def pipeline_stages(force_retrain: bool = False) -> list:
+    """Stage declarations for the training pipeline, shared by main.py --parallel and airflow_dag.py"""
+    trainer = ModelTrainerTrainingPipeline()
+    retraining_trigger = RetrainingTriggerPipeline()
+    stages = [
+        Stage('data_ingestion', DataIngestionTrainingPipeline().main,
+              inputs=('raw_data',), outputs=('road_data',)),
+        Stage('data_validation', DataValidationTrainingPipeline().main,
+              inputs=('road_data',), outputs=('validation_status',)),
+        # Everything from feature engineering on is skipped unless drift or
+        # degradation crosses the retraining_trigger thresholds
+        Stage('retraining_trigger', lambda: retraining_trigger.main(force=force_retrain),
+              inputs=('road_data',), outputs=('retrain_decision',), gate=True),
+        Stage('feature_engineering', FeatureEngineeringTrainingPipeline().main,
+              inputs=('road_data', 'retrain_decision'), outputs=('road_features',)),
+        Stage('data_transformation', DataTransformationTrainingPipeline().main,
+              inputs=('road_features',), outputs=('train_split', 'test_split', 'scaler', 'encoder')),
+    ]
+
+    candidates = []
+    for model_name in MODEL_REGISTRY:
+        output = f"candidate_{model_name}"
+        stages.append(Stage(f"train_{model_name}", lambda name=model_name: trainer.train_candidate(name),
+                            inputs=('train_split', 'test_split'), outputs=(output,)))
+        candidates.append(output)
+
+    # Model promotion waits for validation so an unvalidated dataset never
+    # replaces the serving model
+    stages += [
+        Stage('select_best', trainer.select_best,
+              inputs=tuple(candidates) + ('validation_status',), outputs=('model', 'candidate_model')),
+        Stage('model_evaluation', ModelEvaluationPipeline().main,
+              inputs=('model', 'test_split'), outputs=('evaluation_metrics',)),
+        Stage('monitoring', ModelMonitoringPipeline().main,
+              inputs=('model', 'train_split', 'test_split'), outputs=('monitoring_report',)),
+        Stage('risk_lookup', RiskLookupTablePipeline().main,
+              inputs=('model', 'scaler', 'encoder'), outputs=('risk_lookup_table',)),
+        Stage('update_reference', retraining_trigger.update_reference,
+              inputs=('model', 'test_split'), outputs=('reference_profile',)),
+        # No-op unless enabled under model_compression in config.yaml
+        Stage('model_compression', ModelCompressionPipeline().main,
+              inputs=('model', 'train_split', 'test_split'), outputs=('compact_model',)),
+    ]
+    return stages
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from heartpipeline.logging import logger
+from heartpipeline.serving import metrics
+
+
+INPUT_FEATURES = [
+    'road_type', 'num_lanes', 'curvature', 'speed_limit', 'lighting', 'weather',
+    'road_signs_present', 'public_road', 'time_of_day', 'holiday',
+    'school_season', 'num_reported_accidents'
+]
+
+
+def artifact_version(paths: list) -> str:
+    """Fingerprint the serving artifacts
+
+    Args:
+        paths (list): Artifact files that together define a model version
+
+    Returns:
+        str: Short hex digest that changes whenever any artifact changes
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def canonical_key(record: dict) -> tuple:
+    """Canonicalize an input record so equivalent requests share a key
+
+    Numbers are compared by value (60, 60.0 and True/1 collapse) and strings
+    are stripped, so formatting differences between clients do not miss.
+    """
+    key = []
+    for field in INPUT_FEATURES:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        elif isinstance(value, (bool, int, float)) or hasattr(value, 'item'):
+            value = round(float(value), 6)
+        key.append(value)
+    return tuple(key)
+
+
+class SQLiteCacheBackend:
+    """Shared cache tier stored in a SQLite file (e.g. on a shared volume)
+
+    ``prune`` keeps the table bounded: it deletes expired rows, rows keyed
+    on another model version and the oldest rows past ``max_rows``.
+    """
+
+    def __init__(self, path, max_rows: int = 100000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_rows = max_rows
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_cache ("
+                "key TEXT PRIMARY KEY, value REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS prediction_cache_expires ON prediction_cache (expires_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM prediction_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: float, ttl: float):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO prediction_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl)
+        )
+
+    def prune(self, version: str) -> int:
+        """Delete expired rows, rows of other model versions and the oldest rows past max_rows"""
+        prefix = f"{version}:"
+        conn = self._connection()
+        deleted = conn.execute("DELETE FROM prediction_cache WHERE expires_at < ?", (time.time(),)).rowcount
+        deleted += conn.execute("DELETE FROM prediction_cache WHERE substr(key, 1, ?) != ?",
+                                (len(prefix), prefix)).rowcount
+        # Every row has the same TTL, so the earliest expiry is the oldest write
+        deleted += conn.execute(
+            "DELETE FROM prediction_cache WHERE key IN "
+            "(SELECT key FROM prediction_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+        ).rowcount
+        return deleted
+
+
+class RedisCacheBackend:
+    """Shared cache tier on any Redis-protocol server"""
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05)
+
+    def get(self, key: str):
+        value = self.client.get(key)
+        return None if value is None else float(value)
+
+    def set(self, key: str, value: float, ttl: float):
+        self.client.set(key, value, ex=max(int(ttl), 1))
+
+    def prune(self, version: str) -> int:
+        # Redis expires keys itself and bounds memory with its eviction policy;
+        # keys of older versions age out with their TTL
+        return 0
+
+
+class PredictionCache:
+    """LRU + TTL cache of predictions keyed on the canonical input vector
+
+    Entries are scoped to a model version: calling set_version() with a new
+    artifact fingerprint drops the local entries, and shared-backend keys
+    embed the version so stale predictions are never returned. The shared
+    tier is pruned on every version change and at most every
+    ``prune_interval`` seconds while writing. Shared-tier failures degrade to
+    local misses; they are logged and counted in ``backend_errors``.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600,
+                 version: str = '', backend=None, prune_interval: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self.backend = backend
+        self.prune_interval = prune_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_prune = time.monotonic() + prune_interval
+        self._last_error_log = {}
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.backend_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def set_version(self, version: str):
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self._entries.clear()
+        self._prune_backend()
+
+    def _backend_error(self, operation: str, error: Exception):
+        metrics.observe_cache_backend_error(operation)
+        now = time.monotonic()
+        with self._lock:
+            self.backend_errors += 1
+            # One log line per operation per minute, so an outage does not flood the log
+            if now - self._last_error_log.get(operation, float('-inf')) < 60:
+                return
+            self._last_error_log[operation] = now
+            errors = self.backend_errors
+        logger.warning(f"Shared prediction cache {operation} failed ({errors} backend errors so far): {str(error)}")
+
+    def _prune_backend(self):
+        self._next_prune = time.monotonic() + self.prune_interval
+        try:
+            deleted = self.backend.prune(self.version) if self.backend is not None else 0
+            if deleted:
+                logger.info(f"Pruned {deleted} rows from the shared prediction cache")
+        except Exception as e:
+            self._backend_error('prune', e)
+
+    def _shared_key(self, key: tuple) -> str:
+        return f"{self.version}:{json.dumps(key, separators=(',', ':'))}"
+
+    def get(self, key: tuple):
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+        if self.backend is not None:
+            try:
+                value = self.backend.get(self._shared_key(key))
+            except Exception as e:
+                # A slow or unavailable shared tier degrades to a local miss
+                self._backend_error('get', e)
+                value = None
+            if value is not None:
+                self._store(key, value, now)
+                with self._lock:
+                    self.shared_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key: tuple, value: float, now: float):
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set(self, key: tuple, value: float):
+        if not self.enabled:
+            return
+        value = float(value)
+        self._store(key, value, time.monotonic())
+        if self.backend is not None:
+            try:
+                self.backend.set(self._shared_key(key), value, self.ttl_seconds)
+            except Exception as e:
+                self._backend_error('set', e)
+            if time.monotonic() >= self._next_prune:
+                self._prune_backend()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'version': self.version,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'backend': type(self.backend).__name__ if self.backend is not None else None,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'backend_errors': self.backend_errors,
+                'hit_ratio': (self.hits + self.shared_hits) / lookups if lookups else 0.0
+            }
+
+
+def build_backend(kind: str, url: str = None, max_rows: int = 100000):
+    """Create the shared cache tier named by PREDICTION_CACHE_BACKEND"""
+    kind = (kind or 'memory').lower()
+    if kind == 'memory':
+        return None
+    if kind == 'sqlite':
+        return SQLiteCacheBackend(url or 'artifacts/serving/prediction_cache.db', max_rows=max_rows)
+    if kind == 'redis':
+        return RedisCacheBackend(url or 'redis://localhost:6379/0')
+    raise ValueError(f"Unknown prediction cache backend: {kind}")
@@ -0,0 +1,125 @@
+import math
+import os
+import numpy as np
+
+
+def calibration_split(n_rows: int, fraction: float, seed: int = 42) -> tuple:
+    """Sorted (selection, calibration) row positions; a fixed random ``fraction`` is held out for calibration"""
+    order = np.random.default_rng(seed).permutation(n_rows)
+    n_calibrate = int(round(n_rows * fraction))
+    return np.sort(order[n_calibrate:]), np.sort(order[:n_calibrate])
+
+
+class ForestSpread:
+    """Per-tree predictions of a random forest from one ``apply`` call
+
+    Leaf values of every tree are concatenated into one flat array, so the
+    (rows x trees) matrix of per-tree predictions is a single gather at
+    ``offsets + leaves``. Its mean is the forest's prediction and its
+    standard deviation the spread used by normalized conformal intervals.
+    """
+
+    def __init__(self, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        self.model = model
+        self.values = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+        self.offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+
+    @staticmethod
+    def supports(model) -> bool:
+        return type(model).__name__ in ('RandomForestRegressor', 'ExtraTreesRegressor')
+
+    def predict(self, X) -> tuple:
+        """(predictions, per-tree standard deviation)"""
+        per_tree = self.values[self.model.apply(X) + self.offsets]
+        return per_tree.mean(axis=1), per_tree.std(axis=1)
+
+
+class ConformalIntervals:
+    """Split conformal prediction intervals from stored calibration scores
+
+    Scores are nonconformity values on held-out rows, kept sorted as
+    float32, so the quantile for any coverage is one index lookup:
+    ``absolute`` scores are |y - prediction|, giving a constant-width
+    interval; for forests ``normalized`` scores are |y - prediction| /
+    (spread + beta), giving intervals that widen where the trees disagree.
+    A few probe rows and their predictions are stored with the scores, so
+    scores from another model are detected on load.
+    """
+
+    PROBE_ROWS = 8
+
+    def __init__(self, absolute: np.ndarray, normalized: np.ndarray = None, beta: float = 0.0,
+                 probe_inputs: np.ndarray = None, probe_predictions: np.ndarray = None):
+        self.absolute = absolute
+        self.normalized = normalized
+        self.beta = beta
+        self.probe_inputs = probe_inputs
+        self.probe_predictions = probe_predictions
+
+    @classmethod
+    def calibrate(cls, model, X_calibration, y_calibration) -> "ConformalIntervals":
+        X = np.asarray(X_calibration, dtype=float)
+        y = np.asarray(y_calibration, dtype=float)
+        normalized, beta = None, 0.0
+        if ForestSpread.supports(model):
+            predictions, spread = ForestSpread(model).predict(X)
+            # beta keeps rows where every tree agrees from getting zero-width intervals
+            beta = float(0.1 * np.median(spread)) or 1e-6
+            normalized = np.sort(np.abs(y - predictions) / (spread + beta)).astype(np.float32)
+        else:
+            predictions = model.predict(X)
+        absolute = np.sort(np.abs(y - predictions)).astype(np.float32)
+        return cls(absolute, normalized, beta, X[:cls.PROBE_ROWS], np.asarray(predictions[:cls.PROBE_ROWS]))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(str(path)) or '.', exist_ok=True)
+        arrays = {'absolute': self.absolute, 'beta': np.float64(self.beta),
+                  'probe_inputs': self.probe_inputs, 'probe_predictions': self.probe_predictions}
+        if self.normalized is not None:
+            arrays['normalized'] = self.normalized
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path, model=None) -> "ConformalIntervals":
+        with np.load(path) as data:
+            intervals = cls(data['absolute'], data['normalized'] if 'normalized' in data else None,
+                            float(data['beta']), data['probe_inputs'], data['probe_predictions'])
+        if model is not None and not intervals.matches(model):
+            raise ValueError(f"Calibration scores in {path} were computed for a different model")
+        return intervals
+
+    def matches(self, model) -> bool:
+        if self.probe_inputs is None or len(self.probe_inputs) == 0:
+            return True
+        return bool(np.allclose(model.predict(self.probe_inputs), self.probe_predictions, atol=1e-6))
+
+    @staticmethod
+    def quantile(scores: np.ndarray, coverage: float) -> float:
+        # ceil((n + 1) * coverage)-th smallest score; infinite when there are too few rows
+        rank = math.ceil((len(scores) + 1) * coverage)
+        return float(scores[rank - 1]) if rank <= len(scores) else math.inf
+
+    def half_widths(self, spreads: list, coverage: float) -> tuple:
+        """Half-width per prediction and the method used; spreads are None where no forest pass ran"""
+        q_absolute = self.quantile(self.absolute, coverage)
+        if self.normalized is None:
+            return [q_absolute] * len(spreads), ['absolute'] * len(spreads)
+        q_normalized = self.quantile(self.normalized, coverage)
+        widths, methods = [], []
+        for spread in spreads:
+            if spread is None:
+                widths.append(q_absolute)
+                methods.append('absolute')
+            else:
+                widths.append(q_normalized * (spread + self.beta))
+                methods.append('normalized')
+        return widths, methods
+
+    def info(self) -> dict:
+        return {
+            'calibration_rows': len(self.absolute),
+            'normalized': self.normalized is not None,
+            'absolute_q90': self.quantile(self.absolute, 0.9)
+        }
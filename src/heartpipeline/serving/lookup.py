@@ -0,0 +1,79 @@
+import json
+import numpy as np
+
+
+class RiskLookupTable:
+    """Precomputed risk scores over the quantized input space
+
+    The table is a memory-mapped float32 array with one row per combination
+    of the discrete inputs and one column per curvature grid point. Lookups
+    interpolate linearly along curvature; inputs outside the grid return
+    None so the caller can fall back to the exact model.
+    """
+
+    def __init__(self, table: np.ndarray, metadata: dict):
+        self.table = table
+        self.metadata = metadata
+        self.model_version = metadata['model_version']
+        self.max_abs_error = metadata.get('max_abs_error')
+
+        self._axes = []
+        stride = 1
+        for axis in reversed(metadata['axes']):
+            index = {value: pos for pos, value in enumerate(axis['values'])}
+            self._axes.append((axis['name'], index, stride))
+            stride *= len(axis['values'])
+        self._axes.reverse()
+
+        curvature = metadata['curvature']
+        self._curv_min = float(curvature['min'])
+        self._curv_max = float(curvature['max'])
+        self._curv_points = int(curvature['points'])
+        self._inv_step = (self._curv_points - 1) / (self._curv_max - self._curv_min)
+
+    @classmethod
+    def load(cls, table_path, metadata_path) -> "RiskLookupTable":
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+        table = np.load(table_path, mmap_mode='r')
+        return cls(table, metadata)
+
+    def lookup(self, record: dict):
+        """Approximate the model output for one input record
+
+        Args:
+            record (dict): Raw input fields as accepted by the API
+
+        Returns:
+            float | None: Interpolated risk, or None when any field is off-grid
+        """
+        cell = 0
+        for name, index, stride in self._axes:
+            pos = index.get(record.get(name))
+            if pos is None:
+                return None
+            cell += pos * stride
+
+        try:
+            curvature = float(record.get('curvature'))
+        except (TypeError, ValueError):
+            return None
+        if not self._curv_min <= curvature <= self._curv_max:
+            return None
+
+        x = (curvature - self._curv_min) * self._inv_step
+        i = min(int(x), self._curv_points - 2)
+        frac = x - i
+        lower = self.table[cell, i]
+        upper = self.table[cell, i + 1]
+        return float(lower + (upper - lower) * frac)
+
+    def info(self) -> dict:
+        return {
+            'model_version': self.model_version,
+            'cells': int(self.table.shape[0]),
+            'curvature_points': self._curv_points,
+            'max_abs_error': self.max_abs_error,
+            'mean_abs_error': self.metadata.get('mean_abs_error'),
+            'error_samples': self.metadata.get('error_samples')
+        }
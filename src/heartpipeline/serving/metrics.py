@@ -0,0 +1,216 @@
+import os
+from contextvars import ContextVar
+from time import perf_counter
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess
+)
+
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+PREDICTION_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+STAGES = ['parse', 'feature_engineering', 'encoding', 'scaling', 'predict', 'explain']
+RISK_LEVELS = ['Low', 'Medium', 'High']
+
+REQUESTS = Counter(
+    'heartpipeline_requests_total',
+    'HTTP requests handled by the serving app',
+    ['endpoint', 'status']
+)
+REQUEST_LATENCY = Histogram(
+    'heartpipeline_request_latency_seconds',
+    'End-to-end request latency',
+    ['endpoint'],
+    buckets=LATENCY_BUCKETS
+)
+PREDICTION_ERRORS = Counter(
+    'heartpipeline_prediction_errors_total',
+    'Prediction requests that failed',
+    ['endpoint']
+)
+STAGE_LATENCY = Histogram(
+    'heartpipeline_stage_latency_seconds',
+    'Latency of each prediction stage',
+    ['stage'],
+    buckets=LATENCY_BUCKETS
+)
+BATCH_SIZE = Histogram(
+    'heartpipeline_batch_size_rows',
+    'Rows scored per prediction request',
+    buckets=BATCH_SIZE_BUCKETS
+)
+PREDICTIONS = Counter(
+    'heartpipeline_predictions_total',
+    'Predictions served by risk level',
+    ['risk_level']
+)
+PREDICTION_VALUE = Histogram(
+    'heartpipeline_prediction_value',
+    'Distribution of predicted accident risk',
+    buckets=PREDICTION_BUCKETS
+)
+CACHE_LOOKUPS = Counter(
+    'heartpipeline_prediction_cache_lookups_total',
+    'Prediction cache lookups by result',
+    ['result']
+)
+CACHE_BACKEND_ERRORS = Counter(
+    'heartpipeline_prediction_cache_backend_errors_total',
+    'Failed calls to the shared prediction cache tier',
+    ['operation']
+)
+RISK_LOOKUPS = Counter(
+    'heartpipeline_risk_lookup_total',
+    'Risk lookup table queries by result',
+    ['result']
+)
+
+# Resolve label children once so the hot path is a dict lookup plus observe().
+_STAGE_HISTOGRAMS = {stage: STAGE_LATENCY.labels(stage) for stage in STAGES}
+_RISK_COUNTERS = {level: PREDICTIONS.labels(level) for level in RISK_LEVELS}
+_CACHE_COUNTERS = {result: CACHE_LOOKUPS.labels(result) for result in ('hit', 'miss')}
+_LOOKUP_COUNTERS = {result: RISK_LOOKUPS.labels(result) for result in ('hit', 'fallback')}
+
+# Stage durations of the current request, reported in the Server-Timing header
+_REQUEST_STAGES = ContextVar('heartpipeline_request_stages', default=None)
+
+
+class StageTimer:
+    """Context manager recording the wall time of one prediction stage"""
+
+    __slots__ = ('_stage', '_histogram', '_start')
+
+    def __init__(self, stage: str):
+        self._stage = stage
+        self._histogram = _STAGE_HISTOGRAMS[stage]
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = perf_counter() - self._start
+        self._histogram.observe(seconds)
+        stages = _REQUEST_STAGES.get()
+        if stages is not None:
+            stages[self._stage] = stages.get(self._stage, 0.0) + seconds
+        return False
+
+
+def stage_timer(stage: str) -> StageTimer:
+    """Time a prediction stage
+
+    Args:
+        stage (str): One of STAGES
+
+    Returns:
+        StageTimer: Context manager observing into the stage histogram
+    """
+    return StageTimer(stage)
+
+
+def observe_stage(stage: str, seconds: float):
+    """Record a stage duration measured by the caller"""
+    _STAGE_HISTOGRAMS[stage].observe(seconds)
+
+
+def start_request_stages():
+    """Start collecting stage durations for the request running in this context"""
+    _REQUEST_STAGES.set({})
+
+
+def server_timing_header(total_seconds: float) -> str:
+    """Server-Timing header value with the current request's stage durations in ms"""
+    stages = _REQUEST_STAGES.get() or {}
+    entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in stages.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.3f}")
+    return ", ".join(entries)
+
+
+def observe_request(endpoint: str, status: int, seconds: float):
+    """Record one finished HTTP request"""
+    REQUESTS.labels(endpoint, str(status)).inc()
+    REQUEST_LATENCY.labels(endpoint).observe(seconds)
+
+
+def observe_predictions(predictions, risk_levels):
+    """Record batch size and the distribution of served predictions
+
+    Args:
+        predictions (Iterable[float]): Predicted risk scores
+        risk_levels (Iterable[str]): Risk level per prediction
+    """
+    count = 0
+    for value, level in zip(predictions, risk_levels):
+        PREDICTION_VALUE.observe(float(value))
+        _RISK_COUNTERS[level].inc()
+        count += 1
+    BATCH_SIZE.observe(count)
+
+
+def observe_cache(hit: bool):
+    _CACHE_COUNTERS['hit' if hit else 'miss'].inc()
+
+
+def observe_cache_backend_error(operation: str):
+    CACHE_BACKEND_ERRORS.labels(operation).inc()
+
+
+def observe_lookup(hit: bool):
+    _LOOKUP_COUNTERS['hit' if hit else 'fallback'].inc()
+
+
+def record_error(endpoint: str):
+    PREDICTION_ERRORS.labels(endpoint).inc()
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def render_metrics() -> tuple:
+    """Render all metrics in the Prometheus text exposition format
+
+    In multiprocess mode (PROMETHEUS_MULTIPROC_DIR set before the workers
+    start) the samples written by every worker are aggregated.
+
+    Returns:
+        tuple: (payload bytes, content type)
+    """
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir():
+    """Remove metric files left by an earlier server run (gunicorn on_starting hook)
+
+    Counters from a previous container or a crashed master would otherwise
+    be summed into this run's totals.
+    """
+    if not multiprocess_enabled():
+        return
+    directory = os.environ[MULTIPROC_DIR_ENV]
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith('.db'):
+            os.remove(os.path.join(directory, name))
+
+
+def mark_process_dead(pid: int):
+    """Drop the live gauges of a worker that exited (gunicorn child_exit hook)"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,176 @@
+import gc
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+import pandas as pd
+from heartpipeline.logging import logger
+from heartpipeline.serving.predictor import RiskPredictor
+
+
+@dataclass(frozen=True)
+class ServingBundle:
+    predictor: RiskPredictor
+    risk_lookup: object = None
+    candidate: RiskPredictor = None
+    request_schema: object = None
+    intervals: object = None
+    # artifact_version of the files behind risk_lookup and intervals, which the predictor version does not cover
+    auxiliary_version: str = None
+    loaded_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+    @property
+    def version(self) -> str:
+        return self.predictor.version
+
+    @property
+    def fingerprint(self) -> tuple:
+        candidate_version = self.candidate.version if self.candidate is not None else None
+        return (self.predictor.version, self.risk_lookup is not None, candidate_version, self.auxiliary_version)
+
+
+class ModelStore:
+    """Owns the live serving bundle and swaps in new artifact versions
+
+    Requests read ``store.current`` once and keep that reference, so a swap
+    is a single attribute assignment: in-flight requests finish on the old
+    bundle, new requests see the new one, and the old model is released as
+    soon as the last request holding it returns.
+    """
+
+    # Accident risk is a probability-like score; regressors such as Ridge may
+    # overshoot slightly, anything further out means a broken artifact.
+    PREDICTION_BOUNDS = (-0.25, 1.25)
+
+    def __init__(self, loader, artifact_paths: list, optional_paths: list = None,
+                 golden_inputs_path=None, max_prediction_shift: float = 0.5, on_swap=None):
+        self.loader = loader
+        self.artifact_paths = [str(path) for path in artifact_paths]
+        self.optional_paths = [str(path) for path in optional_paths or []]
+        self.golden_inputs_path = golden_inputs_path
+        self.max_prediction_shift = max_prediction_shift
+        self.on_swap = on_swap
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.last_reload = {'status': 'initial', 'time': None, 'error': None}
+        self.current = loader()
+        self._mtimes = self._artifact_mtimes()
+
+    def _artifact_mtimes(self) -> tuple:
+        return tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else None
+                     for path in self.artifact_paths + self.optional_paths)
+
+    def _required_present(self, mtimes: tuple) -> bool:
+        return None not in mtimes[:len(self.artifact_paths)]
+
+    def load_golden_inputs(self) -> list:
+        if not self.golden_inputs_path or not os.path.exists(self.golden_inputs_path):
+            return []
+        with open(self.golden_inputs_path, 'r') as f:
+            return json.load(f)
+
+    def validate(self, candidate: ServingBundle):
+        """Score the golden inputs with a candidate bundle before it goes live
+
+        Raises:
+            ValueError: If predictions fail, are not finite, fall outside
+                PREDICTION_BOUNDS or move further than max_prediction_shift from the
+                live model
+        """
+        golden = self.load_golden_inputs()
+        if not golden:
+            return
+        new_predictions = candidate.predictor.predict(pd.DataFrame(golden))
+        old_predictions = self.current.predictor.predict(pd.DataFrame(golden))
+        for record, new, old in zip(golden, new_predictions, old_predictions):
+            low, high = self.PREDICTION_BOUNDS
+            if not math.isfinite(new) or not low <= new <= high:
+                raise ValueError(f"Golden input {record} produced invalid prediction {new}")
+            if abs(new - old) > self.max_prediction_shift:
+                raise ValueError(
+                    f"Golden input {record} moved by {abs(new - old):.4f} "
+                    f"(limit {self.max_prediction_shift})"
+                )
+
+    def reload(self, force: bool = False) -> dict:
+        """Load, validate and swap in the artifacts currently on disk"""
+        if not self._reload_lock.acquire(blocking=False):
+            return {'status': 'in_progress'}
+        mtimes = self._artifact_mtimes()
+        try:
+            candidate = self.loader()
+            if candidate.fingerprint == self.current.fingerprint and not force:
+                self._mtimes = mtimes
+                self.last_reload = {'status': 'unchanged', 'time': time.time(), 'error': None}
+                return dict(self.last_reload, version=self.current.version)
+
+            self.validate(candidate)
+            previous = self.current.version
+            self.current = candidate
+            self._mtimes = mtimes
+            if self.on_swap is not None:
+                self.on_swap(candidate)
+            del candidate
+            gc.collect()
+
+            logger.info(f"Serving model reloaded: {previous} -> {self.current.version}")
+            self.last_reload = {'status': 'reloaded', 'time': time.time(), 'error': None}
+            return dict(self.last_reload, version=self.current.version, previous_version=previous)
+
+        except Exception as e:
+            # Remember the rejected files so the watcher does not retry them
+            self._mtimes = mtimes
+            logger.error(f"Model reload rejected, keeping {self.current.version}: {str(e)}")
+            self.last_reload = {'status': 'failed', 'time': time.time(), 'error': str(e)}
+            return dict(self.last_reload, version=self.current.version)
+        finally:
+            self._reload_lock.release()
+
+    def reload_async(self, force: bool = False) -> threading.Thread:
+        thread = threading.Thread(target=self.reload, kwargs={'force': force},
+                                  name='model-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def _watch(self, interval: float):
+        pending = None
+        while not self._stop.wait(interval):
+            try:
+                mtimes = self._artifact_mtimes()
+                if mtimes == self._mtimes or not self._required_present(mtimes):
+                    pending = None
+                    continue
+                # Only reload once the files stopped changing for a full
+                # interval, so a retrain that is still writing is not picked up
+                if mtimes != pending:
+                    pending = mtimes
+                    continue
+                pending = None
+                self.reload()
+            except Exception as e:
+                logger.error(f"Artifact watcher error: {str(e)}")
+
+    def start_watcher(self, interval: float):
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name='artifact-watcher', daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching serving artifacts every {interval}s")
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        return {
+            'version': self.current.version,
+            'loaded_at': self.current.loaded_at,
+            'risk_lookup': self.current.risk_lookup is not None,
+            'candidate_version': self.current.candidate.version if self.current.candidate is not None else None,
+            'watching': self._watcher is not None,
+            'last_reload': self.last_reload
+        }
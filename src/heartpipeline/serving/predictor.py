@@ -0,0 +1,109 @@
+import json
+import os
+import pickle
+from contextlib import nullcontext
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from heartpipeline.logging import logger
+from heartpipeline.features.encoder import CategoricalEncoder, resolve_encoder_path
+from heartpipeline.features.kernel import add_engineered_features
+from heartpipeline.monitoring.attribution import FeatureAttributor
+from heartpipeline.serving.cache import artifact_version
+from heartpipeline.serving.intervals import ForestSpread
+from heartpipeline.serving.metrics import stage_timer
+
+
+CATEGORICAL_FEATURES = ['road_type', 'lighting', 'weather', 'time_of_day']
+# Thresholds the app used before training medians were persisted
+DEFAULT_MEDIANS = {'speed_limit': 60.0, 'curvature': 0.5}
+
+
+class RiskPredictor:
+    """Serving pipeline: feature engineering, encoding, scaling and model"""
+
+    def __init__(self, model, scaler, encoder: CategoricalEncoder, version: str = '',
+                 record_metrics: bool = True, medians: dict = None):
+        self.model = model
+        self.scaler = scaler
+        self.encoder = encoder
+        self.version = version
+        self.medians = medians or DEFAULT_MEDIANS
+        self.feature_columns = list(scaler.feature_names_in_)
+        # Shadow and offline scoring must not skew the serving stage histograms
+        self._timer = stage_timer if record_metrics else (lambda stage: nullcontext())
+
+    @classmethod
+    def load(cls, model_path, scaler_path, encoder_path,
+             record_metrics: bool = True, feature_stats_path=None) -> "RiskPredictor":
+        encoder_path = resolve_encoder_path(encoder_path)
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        with open(scaler_path, 'rb') as f:
+            scaler = pickle.load(f)
+        with open(encoder_path, 'rb') as f:
+            encoder = pickle.load(f)
+        if isinstance(encoder, dict):
+            # label_encoders.pkl written before the single encoder artifact
+            encoder = CategoricalEncoder.from_label_encoders(encoder)
+
+        medians = None
+        if feature_stats_path and os.path.exists(feature_stats_path):
+            with open(feature_stats_path, 'r') as f:
+                medians = json.load(f)['medians']
+        else:
+            logger.warning(f"Feature stats not found at {feature_stats_path}, using default thresholds {DEFAULT_MEDIANS}")
+        version = cls.bundle_version(model_path, scaler_path, encoder_path, feature_stats_path)
+        return cls(model, scaler, encoder, version, record_metrics, medians)
+
+    @staticmethod
+    def bundle_version(model_path, scaler_path, encoder_path, feature_stats_path=None) -> str:
+        """Version ``load`` assigns to these artifacts, without loading them"""
+        paths = [model_path, scaler_path, resolve_encoder_path(encoder_path)]
+        if feature_stats_path and os.path.exists(feature_stats_path):
+            paths.append(feature_stats_path)
+        return artifact_version(paths)
+
+    def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Same kernel and training medians as the feature engineering stage
+        return add_engineered_features(df, self.medians)
+
+    def encode_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.encoder.transform(df)
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        with self._timer('feature_engineering'):
+            df = self.engineer_features(df)
+        with self._timer('encoding'):
+            df = self.encode_features(df)
+        with self._timer('scaling'):
+            return self.scaler.transform(df[self.feature_columns])
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        scaled_features = self.transform(df)
+        with self._timer('predict'):
+            predictions = self.model.predict(scaled_features)
+        return predictions
+
+    @cached_property
+    def forest_spread(self):
+        return ForestSpread(self.model) if ForestSpread.supports(self.model) else None
+
+    def predict_with_spread(self, df: pd.DataFrame) -> tuple:
+        """(predictions, per-tree spread or None); forests get both from the same pass"""
+        scaled_features = self.transform(df)
+        with self._timer('predict'):
+            if self.forest_spread is None:
+                return self.model.predict(scaled_features), None
+            return self.forest_spread.predict(scaled_features)
+
+    @cached_property
+    def attributor(self) -> FeatureAttributor:
+        # Built once per loaded model version
+        return FeatureAttributor(self.model, self.feature_columns)
+
+    def explain(self, df: pd.DataFrame) -> tuple:
+        """(base values, per-feature contributions) that sum to the model's predictions"""
+        scaled_features = self.transform(df)
+        with self._timer('explain'):
+            return self.attributor.explain(scaled_features)
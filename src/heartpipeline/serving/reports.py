@@ -0,0 +1,147 @@
+import glob
+import gzip
+import html
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from heartpipeline.logging import logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def render_text_report(text: str) -> str:
+    """Wrap a plain-text report in the <pre> page /reports/performance serves"""
+    return ("<pre style='padding: 20px; background: #f5f5f5; font-family: monospace;'>"
+            f"{html.escape(text)}</pre>")
+
+
+COMPRESSORS = {'gzip': (lambda data: gzip.compress(data, compresslevel=6, mtime=0), '.gz')}
+if brotli is not None:
+    COMPRESSORS['br'] = (lambda data: brotli.compress(data, quality=9), '.br')
+# Preferred first when the client accepts several encodings
+ENCODING_PREFERENCE = ['br', 'gzip']
+
+
+@dataclass
+class CachedReport:
+    """One version of a report: the file to serve per content encoding"""
+    key: tuple
+    etag: str
+    variants: dict = field(default_factory=dict)
+
+
+class ReportCache:
+    """Serves monitoring reports from disk without reading them per request
+
+    Each report is keyed on its source file's mtime and size. When the source
+    changes, the identity version is available immediately. Text reports are
+    rendered to HTML once; HTML reports are served from the source file as-is.
+    gzip (and brotli, when installed) variants are written to ``cache_dir``
+    by a background thread. Responses are file paths for Flask's send_file,
+    so bodies go out via sendfile with ETag and Range handling and never
+    pass through a Python string.
+    """
+
+    def __init__(self, cache_dir, precompress: bool = True):
+        self.cache_dir = str(cache_dir)
+        self.precompress = precompress
+        self._reports = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def register(self, name: str, path, render=None):
+        """Serve ``path`` as ``name``; ``render`` turns its text into HTML first"""
+        self._reports[name] = (str(path), render)
+
+    def _write(self, filename: str, data: bytes) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        target = os.path.join(self.cache_dir, filename)
+        if not os.path.exists(target):
+            # Workers may build the same variant at once; the rename is atomic
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, target)
+        return target
+
+    def _build(self, name: str, key: tuple) -> CachedReport:
+        path, render = self._reports[name]
+        etag = f"{key[0]:x}-{key[1]:x}"
+        entry = CachedReport(key=key, etag=etag)
+        if render is None:
+            entry.variants['identity'] = path
+        else:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                body = render(f.read()).encode('utf-8')
+            entry.variants['identity'] = self._write(f"{name}-{etag}.html", body)
+        return entry
+
+    def _compress(self, name: str, entry: CachedReport):
+        try:
+            with open(entry.variants['identity'], 'rb') as f:
+                data = f.read()
+            for encoding, (compress, suffix) in COMPRESSORS.items():
+                entry.variants[encoding] = self._write(f"{name}-{entry.etag}.html{suffix}", compress(data))
+            logger.info(f"Precompressed report {name} ({len(data)} bytes, {sorted(entry.variants)})")
+            self._prune(name, entry.etag)
+        except Exception as e:
+            logger.error(f"Report precompression failed for {name}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard((name, entry.etag))
+
+    def _prune(self, name: str, etag: str):
+        # Files of older versions; a worker still pointing at one re-stats on its next request.
+        # The version pattern keeps "drift" from matching another report named "drift-weekly"
+        version = re.compile(rf"{re.escape(name)}-([0-9a-f]+-[0-9a-f]+)\.html")
+        for stale in glob.glob(os.path.join(glob.escape(self.cache_dir), f"{glob.escape(name)}-*")):
+            match = version.match(os.path.basename(stale))
+            if match and match.group(1) != etag:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    def get(self, name: str):
+        """Current version of a report, or None when its source file does not exist"""
+        path, _ = self._reports[name]
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(name)
+        if entry is None or entry.key != key:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is None or entry.key != key:
+                    entry = self._entries[name] = self._build(name, key)
+                    if self.precompress and (name, entry.etag) not in self._pending:
+                        self._pending.add((name, entry.etag))
+                        threading.Thread(target=self._compress, args=(name, entry),
+                                         name=f'report-compress-{name}', daemon=True).start()
+        return entry
+
+    @staticmethod
+    def choose_encoding(entry: CachedReport, accept_encoding: str) -> str:
+        accepted = {}
+        for part in (accept_encoding or '').split(','):
+            coding, _, params = part.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding.strip().lower()] = quality
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in entry.variants and accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+                return encoding
+        return 'identity'
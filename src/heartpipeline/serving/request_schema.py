@@ -0,0 +1,211 @@
+import math
+import yaml
+
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'off'}
+# Largest batch accepted by one /api/predict call
+MAX_BATCH_SIZE = 1000
+
+
+class RequestValidationError(ValueError):
+    """Raised with the per-field errors of every rejected record"""
+
+    def __init__(self, errors: list):
+        self.errors = errors
+        super().__init__("; ".join(
+            (f"[{e['index']}] " if 'index' in e else '') + f"{e['field']}: {e['error']}" for e in errors
+        ))
+
+
+def _parse_int(value):
+    if isinstance(value, bool):
+        # JSON true is not a lane count; booleans go through bool fields
+        raise ValueError("must be an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("must be finite")
+        if value.is_integer():
+            return int(value)
+        raise ValueError("must be a whole number")
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return _parse_int(_parse_float(value))
+    raise ValueError("must be an integer")
+
+
+def _parse_float(value):
+    if isinstance(value, bool):
+        raise ValueError("must be a number")
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str):
+        try:
+            number = float(value.strip())
+        except ValueError:
+            raise ValueError("must be a number")
+    else:
+        raise ValueError("must be a number")
+    if not math.isfinite(number):
+        raise ValueError("must be finite")
+    return number
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_VALUES:
+            return 1
+        if text in FALSE_VALUES:
+            return 0
+    raise ValueError("must be a boolean (true/false, yes/no or 1/0)")
+
+
+def _parse_str(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("must be a non-empty string")
+    return value.strip()
+
+
+def _categorical(allowed: list):
+    allowed_set = frozenset(allowed)
+    message = f"must be one of {sorted(allowed_set)}"
+
+    def parse(value):
+        if not isinstance(value, str):
+            raise ValueError("must be a string")
+        value = value.strip()
+        if value not in allowed_set:
+            raise ValueError(message)
+        return value
+    return parse
+
+
+def _bounded(parse, low, high):
+    if low is None and high is None:
+        return parse
+
+    def check(value):
+        value = parse(value)
+        if (low is not None and value < low) or (high is not None and value > high):
+            raise ValueError(f"must be between {low} and {high}")
+        return value
+    return check
+
+
+PARSERS = {'int': _parse_int, 'float': _parse_float, 'bool': _parse_bool}
+
+
+class RequestSchema:
+    """Validates and coerces prediction requests before any model work
+
+    Compiled once per serving bundle into one plain-Python parser per field:
+    types and ranges come from ``config/schema.yaml`` and categorical values
+    from the encoder vocabularies the model was trained with, so a category
+    the encoder would silently map to its fallback is rejected up front.
+    Records come back with the schema's field order and Python scalars only.
+    """
+
+    def __init__(self, fields: dict, defaults: dict = None, ignored: tuple = ()):
+        self.fields = fields
+        self.defaults = defaults or {}
+        self.ignored = frozenset(ignored)
+
+    @classmethod
+    def from_schema(cls, schema: dict, encoder=None) -> "RequestSchema":
+        columns = dict(schema['columns'])
+        constraints = schema.get('constraints') or {}
+        request_config = schema.get('requests') or {}
+        ranges = request_config.get('ranges') or {}
+        target = schema.get('target_column')
+        ignored = tuple(request_config.get('ignored_fields') or []) + (target,)
+
+        fields = {}
+        for name, dtype in columns.items():
+            if name in ignored:
+                continue
+            if dtype in PARSERS:
+                bounds = ranges.get(name, constraints.get(name) or {})
+                fields[name] = _bounded(PARSERS[dtype], bounds.get('min'), bounds.get('max'))
+            else:
+                vocabulary = getattr(encoder, 'vocabulary', {}).get(name)
+                if vocabulary is not None:
+                    allowed = [str(value) for value in vocabulary if value != 'nan']
+                else:
+                    allowed = [str(value) for value in (constraints.get(name) or {}).get('allowed', [])]
+                fields[name] = _categorical(allowed) if allowed else _parse_str
+        return cls(fields, request_config.get('defaults'), ignored)
+
+    @classmethod
+    def load(cls, schema_path, encoder=None) -> "RequestSchema":
+        with open(schema_path, 'r') as f:
+            return cls.from_schema(yaml.safe_load(f), encoder)
+
+    def validate(self, record) -> tuple:
+        """Coerce one record
+
+        Returns:
+            tuple: (clean record or None, list of {'field', 'error'} dicts)
+        """
+        if not isinstance(record, dict):
+            return None, [{'field': None, 'error': "record must be a JSON object"}]
+
+        clean, errors = {}, []
+        for name, parse in self.fields.items():
+            value = record.get(name)
+            if value is None:
+                if name not in self.defaults:
+                    errors.append({'field': name, 'error': "is required"})
+                    continue
+                value = self.defaults[name]
+            try:
+                clean[name] = parse(value)
+            except ValueError as e:
+                errors.append({'field': name, 'error': str(e)})
+
+        for name in record:
+            if name not in self.fields and name not in self.ignored:
+                errors.append({'field': name, 'error': "unknown field"})
+        return (None if errors else clean), errors
+
+    def validate_one(self, record) -> dict:
+        clean, errors = self.validate(record)
+        if errors:
+            raise RequestValidationError(errors)
+        return clean
+
+    def validate_batch(self, payload) -> tuple:
+        """Coerce a single record, a list of records or ``{"instances": [...]}``
+
+        Returns:
+            tuple: (list of clean records, whether the payload was a batch)
+
+        Raises:
+            RequestValidationError: With every field error, tagged by record index for batches
+        """
+        if isinstance(payload, dict) and 'instances' in payload:
+            payload = payload['instances']
+        elif isinstance(payload, dict):
+            return [self.validate_one(payload)], False
+
+        if not isinstance(payload, list) or not payload:
+            raise RequestValidationError([{'field': None, 'error': "expected a JSON object or a non-empty list"}])
+        if len(payload) > MAX_BATCH_SIZE:
+            raise RequestValidationError([{'field': None, 'error': f"batch exceeds {MAX_BATCH_SIZE} records"}])
+
+        records, errors = [], []
+        for index, record in enumerate(payload):
+            clean, record_errors = self.validate(record)
+            records.append(clean)
+            errors.extend({'index': index, **error} for error in record_errors)
+        if errors:
+            raise RequestValidationError(errors)
+        return records, True
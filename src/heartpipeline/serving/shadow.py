@@ -0,0 +1,108 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+import pandas as pd
+from heartpipeline.logging import logger
+
+
+class ShadowScorer:
+    """Scores a sample of live traffic with a candidate model off the response path
+
+    Requests only pay for a random draw and a non-blocking queue put. A
+    daemon thread drains the queue in batches, scores them with the
+    candidate and appends paired predictions as JSON lines for the
+    monitoring stage. When the queue is full the sample is dropped rather
+    than slowing the primary response.
+    """
+
+    def __init__(self, log_path, sample_rate: float = 0.0, max_queue: int = 10000,
+                 batch_size: int = 64):
+        self.log_path = str(log_path)
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = None
+        self.submitted = 0
+        self.dropped = 0
+        self.scored = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def submit(self, candidate, primary_version: str, record: dict, prediction: float):
+        if candidate is None or not self.enabled or random.random() >= self.sample_rate:
+            return
+        try:
+            self._queue.put_nowait((candidate, primary_version, dict(record), float(prediction), time.time()))
+            self.submitted += 1
+        except queue.Full:
+            self.dropped += 1
+        if self._worker is None:
+            self.start()
+
+    def start(self):
+        if self._worker is not None:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        self._worker = threading.Thread(target=self._run, name='shadow-scorer', daemon=True)
+        self._worker.start()
+
+    def _drain(self) -> list:
+        jobs = [self._queue.get()]
+        while len(jobs) < self.batch_size:
+            try:
+                jobs.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _run(self):
+        while True:
+            jobs = self._drain()
+            try:
+                self.score(jobs)
+            except Exception as e:
+                self.failed += len(jobs)
+                logger.error(f"Shadow scoring failed for {len(jobs)} requests: {str(e)}")
+
+    def score(self, jobs: list):
+        # Jobs queued around a model swap may reference different candidates
+        by_candidate = {}
+        for job in jobs:
+            by_candidate.setdefault(id(job[0]), []).append(job)
+
+        lines = []
+        for group in by_candidate.values():
+            candidate = group[0][0]
+            records = [job[2] for job in group]
+            shadow_predictions = candidate.predict(pd.DataFrame(records))
+            for (_, primary_version, record, prediction, timestamp), shadow in zip(group, shadow_predictions):
+                lines.append(json.dumps({
+                    'timestamp': timestamp,
+                    'primary_version': primary_version,
+                    'candidate_version': candidate.version,
+                    'prediction': prediction,
+                    'shadow_prediction': float(shadow),
+                    'input': record
+                }))
+
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        self.scored += len(lines)
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'queued': self._queue.qsize(),
+            'submitted': self.submitted,
+            'scored': self.scored,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'log_path': self.log_path
+        }
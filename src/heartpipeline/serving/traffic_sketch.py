@@ -0,0 +1,124 @@
+import os
+import queue
+import socket
+import threading
+import time
+import pandas as pd
+from heartpipeline.logging import logger
+from heartpipeline.monitoring.sketches import DatasetSketch
+
+
+def worker_sketch_path(sketch_dir, pid: int) -> str:
+    return os.path.join(str(sketch_dir), f"serving-{socket.gethostname()}-{pid}.json")
+
+
+def remove_worker_sketch(sketch_dir, pid: int):
+    """Delete an exited worker's sketch so later monitoring runs stop merging it"""
+    try:
+        os.remove(worker_sketch_path(sketch_dir, pid))
+    except FileNotFoundError:
+        pass
+
+
+class TrafficSketcher:
+    """Maintains a constant-memory sketch of live requests and predictions
+
+    Requests only pay for a non-blocking queue put. A daemon thread folds
+    queued batches into a DatasetSketch and, every ``flush_interval``
+    seconds, rewrites ``serving-<host>-<pid>.json`` in ``sketch_dir``. Each
+    worker owns its file; the monitoring stage merges them all, and the
+    gunicorn ``child_exit`` hook removes the file of a worker that exits. When a
+    reference sketch exists its histogram edges are reused, so PSI compares
+    identical bins. When the queue is full the batch is dropped.
+    """
+
+    def __init__(self, sketch_dir, reference_path=None, flush_interval: float = 60.0,
+                 max_queue: int = 10000):
+        self.sketch_dir = str(sketch_dir)
+        self.reference_path = str(reference_path) if reference_path else None
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._sketch = None
+        self._worker = None
+        self._pid = None
+        self.recorded = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def path(self) -> str:
+        # Per process: with preload_app the sketcher is built before gunicorn forks
+        return worker_sketch_path(self.sketch_dir, os.getpid())
+
+    @property
+    def enabled(self) -> bool:
+        return self.flush_interval > 0
+
+    def submit(self, records: list, predictions: list):
+        if not self.enabled:
+            return
+        try:
+            self._queue.put_nowait((records, predictions))
+        except queue.Full:
+            self.dropped += len(records)
+        if self._pid != os.getpid():
+            self.start()
+
+    def start(self):
+        # Threads do not survive a fork, so every worker process starts its own
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._worker = threading.Thread(target=self._run, name='traffic-sketch', daemon=True)
+        self._worker.start()
+
+    def _new_sketch(self) -> DatasetSketch:
+        if self.reference_path and os.path.exists(self.reference_path):
+            try:
+                return DatasetSketch.empty_like(DatasetSketch.load(self.reference_path))
+            except Exception as e:
+                logger.warning(f"Could not read reference sketch {self.reference_path}: {str(e)}")
+        return DatasetSketch()
+
+    def _run(self):
+        self._sketch = self._new_sketch()
+        last_flush = time.monotonic()
+        while True:
+            batches = []
+            try:
+                batches.append(self._queue.get(timeout=self.flush_interval))
+                while True:
+                    batches.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self.record(batches)
+                if time.monotonic() - last_flush >= self.flush_interval:
+                    self.flush()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Traffic sketch update failed: {str(e)}")
+
+    def record(self, batches: list):
+        records = [record for batch_records, _ in batches for record in batch_records]
+        if not records:
+            return
+        frame = pd.DataFrame(records)
+        frame['prediction'] = [prediction for _, batch_predictions in batches for prediction in batch_predictions]
+        self._sketch.update(frame)
+        self.recorded += len(records)
+
+    def flush(self):
+        if self._sketch is not None and self._sketch.columns:
+            self._sketch.save(self.path)
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'queued': self._queue.qsize(),
+            'recorded': self.recorded,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'path': self.path
+        }
@@ -1,6 +1,8 @@
 ﻿import os
 import sys
 import yaml
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from box import ConfigBox
 from heartpipeline.logging import logger
@@ -35,3 +37,60 @@ def create_directories(path_to_directories: list, verbose=True):
         os.makedirs(path, exist_ok=True)
         if verbose:
             logger.info(f"Created directory at: {path}")
+
+
+class AsyncArtifactWriter:
+    """Write-behind persistence for artifacts produced by in-process stages
+    
+    DataFrames are snapshotted on submit, so the next stage may keep
+    mutating its input while the previous stage's output is still being
+    written in the background.
+    """
+    
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer")
+        self._futures = []
+    
+    def submit(self, fn, *args, **kwargs):
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._futures.append(future)
+        return future
+    
+    def save_csv(self, df, path: Path):
+        return self.submit(df.copy().to_csv, path, index=False)
+    
+    def save_pickle(self, obj, path: Path):
+        return self.submit(save_pickle, obj, path)
+    
+    def wait(self):
+        """Block until every pending write finished, re-raising the first failure"""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+    
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+
+
+def save_pickle(obj, path: Path):
+    with open(path, 'wb') as f:
+        pickle.dump(obj, f)
+
+
+def save_csv(df, path: Path, writer: AsyncArtifactWriter = None):
+    """Persist a DataFrame now, or through the write-behind writer when given"""
+    if writer is not None:
+        writer.save_csv(df, path)
+    else:
+        df.to_csv(path, index=False)
+
+
+def dump_pickle(obj, path: Path, writer: AsyncArtifactWriter = None):
+    """Pickle an artifact now, or through the write-behind writer when given"""
+    if writer is not None:
+        writer.save_pickle(obj, path)
+    else:
+        save_pickle(obj, path)
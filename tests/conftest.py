@@ -0,0 +1,24 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'src'), ROOT]
+
+from benchmarks.synthetic_data import generate_chunk, load_domains
+
+
+@pytest.fixture(scope='session')
+def root_dir() -> str:
+    return ROOT
+
+
+@pytest.fixture
+def road_data():
+    """Synthetic raw road rows (id, inputs, accident_risk) from the schema's domains"""
+    domains = load_domains(os.path.join(ROOT, 'config', 'schema.yaml'))
+
+    def make(rows: int = 500, seed: int = 0, start_id: int = 0):
+        return generate_chunk(rows, start_id, np.random.default_rng(seed), domains)
+    return make
@@ -0,0 +1,102 @@
+import importlib
+import json
+import os
+import sys
+import pytest
+
+pytest.importorskip('flask')
+
+
+@pytest.fixture(scope='module')
+def app_module(root_dir, tmp_path_factory):
+    """app.py imported against the artifacts committed to the repository"""
+    cwd = os.getcwd()
+    scratch = tmp_path_factory.mktemp('app')
+    overrides = {
+        'MODEL_RELOAD_INTERVAL': '0',
+        'TRAFFIC_SKETCH_INTERVAL': '0',
+        'REPORT_CACHE_DIR': str(scratch / 'report_cache'),
+        'MONITORING_HISTORY_PATH': str(scratch / 'history.sqlite'),
+        'TRAFFIC_SKETCH_DIR': str(scratch / 'sketches'),
+    }
+    previous = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    os.chdir(root_dir)
+    sys.modules.pop('app', None)
+    try:
+        yield importlib.import_module('app')
+    finally:
+        os.chdir(cwd)
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@pytest.fixture
+def golden(root_dir):
+    with open(os.path.join(root_dir, 'config', 'golden_inputs.json')) as f:
+        return json.load(f)
+
+
+def test_app_predicts_with_committed_artifacts(app_module, golden):
+    response = app_module.app.test_client().post('/api/predict', json=golden[0])
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] is True
+    assert 0.0 <= body['prediction'] <= 1.0
+
+
+def test_invalid_requests_get_field_errors(app_module, golden):
+    response = app_module.app.test_client().post('/api/predict', json=dict(golden[0], curvature=2.0))
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'field': 'curvature', 'error': "must be between 0.0 and 1.0"}]
+
+
+def test_admin_endpoints_fail_closed(app_module, monkeypatch):
+    client = app_module.app.test_client()
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', None)
+    assert client.get('/admin/model').status_code == 403
+    assert client.post('/admin/reload?force=true').status_code == 403
+
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secret')
+    assert client.get('/admin/model').status_code == 401
+    assert client.get('/admin/model', headers={'X-Admin-Token': 'guess'}).status_code == 401
+    response = client.get('/admin/model', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200 and response.get_json()['version'] == app_module.model_store.current.version
+
+
+FORM = {'road_type': 'urban', 'num_lanes': '3', 'curvature': '0.45', 'speed_limit': '45',
+        'lighting': 'night', 'weather': 'rainy', 'road_signs_present': 'yes', 'public_road': 'no',
+        'time_of_day': 'evening', 'holiday': 'no', 'school_season': 'yes', 'num_reported_accidents': '1'}
+
+
+def test_form_values_are_validated_by_the_request_schema(app_module):
+    client = app_module.app.test_client()
+    expected = app_module.model_store.current.request_schema.validate_one(FORM)
+    assert expected['public_road'] == 0 and expected['num_lanes'] == 3
+    response = client.post('/predict', data=FORM)
+    assert response.status_code == 200 and b'Risk Score' in response.data
+
+    # Blank fields take the schema defaults instead of failing int('')
+    assert client.post('/predict', data=dict(FORM, num_lanes='', curvature=' ')).status_code == 200
+
+    response = client.post('/predict', data=dict(FORM, num_lanes='two', curvature='1.5', weather='hail'))
+    assert response.status_code == 400
+    for message in (b'num_lanes: must be a number', b'curvature: must be between 0.0 and 1.0', b'weather: must be one of'):
+        assert message in response.data
+
+
+def test_form_explanations_are_opt_in(app_module, monkeypatch):
+    client = app_module.app.test_client()
+    calls = []
+    explain_records = app_module.explain_records
+    monkeypatch.setattr(app_module, 'explain_records', lambda *args: calls.append(args) or explain_records(*args))
+
+    response = client.post('/predict', data=FORM)
+    assert response.status_code == 200 and not calls and b'Main factors' not in response.data
+
+    response = client.post('/predict', data=dict(FORM, explain='yes'))
+    assert response.status_code == 200 and len(calls) == 1 and b'Main factors' in response.data
+    assert calls[0][0] is app_module.model_store.current
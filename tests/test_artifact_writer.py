@@ -0,0 +1,53 @@
+import threading
+import pandas as pd
+import pytest
+from heartpipeline.utils.common import AsyncArtifactWriter, dump_pickle, save_csv
+
+
+def test_frames_are_snapshotted_on_submit(tmp_path):
+    writer = AsyncArtifactWriter()
+    release = threading.Event()
+    # Hold the worker threads so the frame is mutated before its write runs
+    for _ in range(2):
+        writer.submit(release.wait)
+    df = pd.DataFrame({'a': [1, 2, 3]})
+    save_csv(df, tmp_path / 'out.csv', writer=writer)
+    df['a'] = 0
+    release.set()
+    writer.close()
+
+    assert pd.read_csv(tmp_path / 'out.csv')['a'].tolist() == [1, 2, 3]
+
+
+def test_wait_reraises_the_first_failure(tmp_path):
+    writer = AsyncArtifactWriter()
+    dump_pickle({'a': 1}, tmp_path / 'missing' / 'model.pkl', writer=writer)
+    with pytest.raises(FileNotFoundError):
+        writer.wait()
+    # Reported once; later writes go through
+    dump_pickle({'a': 1}, tmp_path / 'model.pkl', writer=writer)
+    writer.close()
+    assert (tmp_path / 'model.pkl').exists()
+
+
+def test_without_a_writer_artifacts_are_written_immediately(tmp_path):
+    save_csv(pd.DataFrame({'a': [1]}), tmp_path / 'out.csv')
+    dump_pickle([1], tmp_path / 'out.pkl')
+    assert (tmp_path / 'out.csv').exists() and (tmp_path / 'out.pkl').exists()
+
+
+def test_edge_cases_of_the_writer(tmp_path):
+    writer = AsyncArtifactWriter(max_workers=1)
+    # Nothing pending
+    writer.wait()
+    save_csv(pd.DataFrame({'a': []}), tmp_path / 'empty.csv', writer=writer)
+    writer.wait()
+    writer.wait()
+    assert pd.read_csv(tmp_path / 'empty.csv').columns.tolist() == ['a']
+
+    # close shuts the pool down even when a write failed
+    dump_pickle([1], tmp_path / 'missing' / 'out.pkl', writer=writer)
+    with pytest.raises(FileNotFoundError):
+        writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(print)
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor, GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.tree import DecisionTreeRegressor
+from heartpipeline.components.ensemble import StackedEnsemble
+from heartpipeline.monitoring.attribution import FeatureAttributor, attribution_drift
+
+FEATURES = ['a', 'b', 'c', 'd']
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, len(FEATURES)))
+    y = 2 * X[:, 0] - X[:, 1] * X[:, 2] + 0.1 * rng.normal(size=300)
+    return X, y
+
+
+MODELS = {
+    'tree': lambda: DecisionTreeRegressor(max_depth=5, random_state=0),
+    'forest': lambda: RandomForestRegressor(n_estimators=10, max_depth=5, random_state=0),
+    'extra_trees': lambda: ExtraTreesRegressor(n_estimators=10, max_depth=5, random_state=0),
+    'gbm': lambda: GradientBoostingRegressor(n_estimators=20, max_depth=3, random_state=0),
+    'linear': lambda: LinearRegression(),
+    'polynomial': lambda: make_pipeline(PolynomialFeatures(degree=2, include_bias=False), Ridge(alpha=1.0)),
+}
+
+
+@pytest.mark.parametrize('name', sorted(MODELS))
+def test_contributions_add_up_to_the_prediction(data, name):
+    X, y = data
+    model = MODELS[name]().fit(X, y)
+    base, contributions = FeatureAttributor(model, FEATURES).explain(X[:50])
+    assert contributions.shape == (50, len(FEATURES))
+    np.testing.assert_allclose(base + contributions.sum(axis=1), model.predict(X[:50]), atol=1e-8)
+
+
+def test_ensemble_attribution_blends_its_members(data):
+    X, y = data
+    members = {'gbm': MODELS['gbm']().fit(X, y), 'linear': MODELS['linear']().fit(X, y)}
+    ensemble = StackedEnsemble(members, [0.7, 0.4], intercept=-0.05)
+    attributor = FeatureAttributor(ensemble, FEATURES)
+    base, contributions = attributor.explain(X[:50])
+
+    assert attributor.method == 'blend'
+    np.testing.assert_allclose(base + contributions.sum(axis=1), ensemble.predict(X[:50]), atol=1e-8)
+
+
+def test_linear_contributions_follow_the_coefficients(data):
+    X, y = data
+    model = LinearRegression().fit(X, y)
+    _, contributions = FeatureAttributor(model, FEATURES).explain(X[:5])
+    np.testing.assert_allclose(contributions, X[:5] * model.coef_)
+
+
+def test_unsupported_models_are_rejected():
+    with pytest.raises(ValueError, match="No attribution method"):
+        FeatureAttributor(object(), FEATURES)
+
+
+def test_top_contributions_and_importance(data):
+    X, y = data
+    attributor = FeatureAttributor(MODELS['forest']().fit(X, y), FEATURES)
+    _, contributions = attributor.explain(X[:3])
+    top = attributor.top_contributions(contributions, k=2)
+
+    assert [len(row) for row in top] == [2, 2, 2]
+    assert abs(top[0][0]['contribution']) >= abs(top[0][1]['contribution'])
+    importance = attributor.importance(X)
+    assert importance.idxmax() == 'a'
+    assert importance['d'] < importance['a']
+
+
+def test_attribution_drift():
+    reference = pd.Series([4.0, 2.0, 1.0, 1.0], index=FEATURES)
+    same = attribution_drift(reference, reference * 3)
+    assert same['total_variation'] == pytest.approx(0.0)
+    assert same['rank_correlation'] == pytest.approx(1.0)
+
+    swapped = attribution_drift(reference, pd.Series([1.0, 2.0, 1.0, 4.0], index=FEATURES))
+    assert swapped['total_variation'] == pytest.approx(0.375)
+    assert swapped['features']['a']['share_change'] == pytest.approx(-0.375)
+    assert swapped['features']['d']['importance_current'] == 4.0
+
+
+@pytest.mark.parametrize('name', sorted(MODELS))
+def test_empty_batches_explain_to_empty_arrays(data, name):
+    X, y = data
+    base, contributions = FeatureAttributor(MODELS[name]().fit(X, y), FEATURES).explain(X[:0])
+    assert base.shape == (0,) and contributions.shape == (0, len(FEATURES))
+
+
+@pytest.mark.parametrize('name', ['tree', 'forest', 'gbm'])
+def test_constant_targets_give_zero_contributions(data, name):
+    X, _ = data
+    model = MODELS[name]().fit(X, np.full(len(X), 0.3))
+    base, contributions = FeatureAttributor(model, FEATURES).explain(X[:10])
+    np.testing.assert_allclose(base, 0.3)
+    np.testing.assert_allclose(contributions, 0.0, atol=1e-12)
+
+
+def test_top_contributions_with_k_beyond_the_feature_count(data):
+    X, y = data
+    attributor = FeatureAttributor(MODELS['linear']().fit(X, y), FEATURES)
+    _, contributions = attributor.explain(X[:2])
+    assert [len(row) for row in attributor.top_contributions(contributions, k=10)] == [4, 4]
+    assert attributor.top_contributions(contributions[:0]) == []
+
+
+def test_attribution_drift_of_zero_importance():
+    zero = pd.Series(0.0, index=FEATURES)
+    drift = attribution_drift(zero, zero)
+    assert drift['total_variation'] == 0.0
+    assert drift['features']['a']['share_change'] == 0.0
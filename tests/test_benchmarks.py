@@ -0,0 +1,76 @@
+import argparse
+import importlib
+import os
+import pandas as pd
+import pytest
+import yaml
+from benchmarks.synthetic_data import generate, load_domains
+
+
+@pytest.fixture
+def pipeline_benchmark(root_dir, monkeypatch):
+    # The benchmark is a script and imports its sibling module directly
+    monkeypatch.syspath_prepend(os.path.join(root_dir, 'benchmarks'))
+    return importlib.import_module('pipeline_benchmark')
+
+
+def test_generated_rows_follow_the_schema(road_data, root_dir):
+    df = road_data(rows=2000)
+    domains = load_domains(os.path.join(root_dir, 'config', 'schema.yaml'))
+
+    for column, allowed in domains.items():
+        assert set(df[column]) <= set(allowed)
+    assert df['accident_risk'].between(0, 1).all()
+    # Risk carries signal from the road conditions
+    assert df['accident_risk'].corr(df['curvature']) > 0.3
+
+
+def test_chunked_generation_is_deterministic(tmp_path, root_dir):
+    schema = os.path.join(root_dir, 'config', 'schema.yaml')
+    first = pd.read_csv(generate(1000, tmp_path / 'a.csv', seed=3, schema_path=schema, chunk_rows=300))
+    second = pd.read_csv(generate(1000, tmp_path / 'b.csv', seed=3, schema_path=schema, chunk_rows=300))
+
+    pd.testing.assert_frame_equal(first, second)
+    assert first['id'].tolist() == list(range(1000))
+
+
+def test_compare_flags_time_and_memory_regressions(pipeline_benchmark):
+    baseline = {'rows': 100, 'memory': 'rss', 'stages': {
+        'ingestion': {'seconds': 1.0, 'peak_mb': 100.0},
+        'training': {'seconds': 10.0, 'peak_mb': 500.0},
+        'validation': {'seconds': 0.001, 'peak_mb': 50.0},
+    }}
+    current = {'rows': 100, 'memory': 'rss', 'stages': {
+        'ingestion': {'seconds': 1.05, 'peak_mb': 300.0},
+        'training': {'seconds': 15.0, 'peak_mb': 500.0},
+        # Doubled, but within timing noise
+        'validation': {'seconds': 0.002, 'peak_mb': 50.0},
+        'new_stage': {'seconds': 5.0},
+    }}
+
+    regressions = pipeline_benchmark.compare(baseline, current, threshold=0.2, min_seconds=0.05)
+
+    assert {(r['stage'], tuple(r['kinds'])) for r in regressions} == {('ingestion', ('memory',)),
+                                                                      ('training', ('time',))}
+    # Peaks measured differently are not compared
+    assert pipeline_benchmark.compare(baseline, dict(current, memory='tracemalloc'), 0.2, 0.05) == [regressions[1]]
+
+
+def test_overrides_are_parsed_as_yaml(pipeline_benchmark):
+    assert pipeline_benchmark.parse_override('data_transformation.chunk_rows=200000') == \
+        ('data_transformation', 'chunk_rows', 200000)
+    with pytest.raises(argparse.ArgumentTypeError):
+        pipeline_benchmark.parse_override('chunk_rows=5')
+
+
+def test_workspace_keeps_mlflow_runs_in_a_local_database(pipeline_benchmark, tmp_path, monkeypatch):
+    monkeypatch.delenv('MLFLOW_TRACKING_URI', raising=False)
+    pipeline_benchmark.prepare_workspace(tmp_path, 50, 0, [('data_transformation', 'chunk_rows', 20)])
+
+    with open(tmp_path / 'config' / 'config.yaml') as f:
+        config = yaml.safe_load(f)
+    assert config['model_evaluation']['mlflow_uri'] == f"sqlite:///{tmp_path / 'mlflow.db'}"
+    assert os.environ['MLFLOW_TRACKING_URI'] == config['model_evaluation']['mlflow_uri']
+    assert config['data_transformation']['chunk_rows'] == 20
+    ingestion = config['data_ingestion']
+    assert len(pd.read_csv(tmp_path / ingestion['root_dir'] / ingestion['source_file'])) == 50
@@ -0,0 +1,116 @@
+import pytest
+from heartpipeline.serving.cache import PredictionCache, SQLiteCacheBackend, artifact_version, build_backend, canonical_key
+
+RECORD = {'road_type': 'urban', 'num_lanes': 2, 'curvature': 0.5, 'speed_limit': 60, 'lighting': 'daylight',
+          'weather': 'clear', 'road_signs_present': True, 'public_road': True, 'time_of_day': 'morning',
+          'holiday': False, 'school_season': True, 'num_reported_accidents': 1}
+
+
+def test_equivalent_records_share_a_key():
+    variant = dict(RECORD, num_lanes=2.0, speed_limit=60.0000001, road_type=' urban ', holiday=0)
+    assert canonical_key(variant) == canonical_key(RECORD)
+    assert canonical_key(dict(RECORD, curvature=0.51)) != canonical_key(RECORD)
+
+
+def test_lru_eviction_and_hit_ratio():
+    cache = PredictionCache(max_size=2)
+    cache.set(('a',), 0.1)
+    cache.set(('b',), 0.2)
+    assert cache.get(('a',)) == 0.1
+    cache.set(('c',), 0.3)
+
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == 0.1 and cache.get(('c',)) == 0.3
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['hit_ratio'] == pytest.approx(3 / 4)
+
+
+def test_expired_entries_miss():
+    cache = PredictionCache(ttl_seconds=-1)
+    cache.set(('a',), 0.1)
+    assert cache.get(('a',)) is None
+
+
+def test_new_version_drops_local_entries_and_scopes_shared_keys(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / 'cache.db')
+    cache = PredictionCache(version='v1', backend=backend)
+    cache.set(('a',), 0.1)
+
+    other_worker = PredictionCache(version='v1', backend=backend)
+    assert other_worker.get(('a',)) == pytest.approx(0.1)
+    assert other_worker.stats()['shared_hits'] == 1
+
+    cache.set_version('v2')
+    assert cache.get(('a',)) is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = PredictionCache(max_size=0)
+    cache.set(('a',), 0.1)
+    assert cache.get(('a',)) is None and cache.stats()['size'] == 0
+
+
+def test_artifact_version_follows_file_contents(tmp_path):
+    path = tmp_path / 'model.pkl'
+    path.write_bytes(b'one')
+    first = artifact_version([path])
+    path.write_bytes(b'two')
+    assert artifact_version([path]) != first and len(first) == 16
+
+
+def test_unknown_backend_is_rejected():
+    assert build_backend('memory') is None
+    with pytest.raises(ValueError):
+        build_backend('memcached')
+
+
+def count_rows(backend):
+    return backend._connection().execute("SELECT COUNT(*) FROM prediction_cache").fetchone()[0]
+
+
+def test_sqlite_prune_drops_expired_old_version_and_excess_rows(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / 'cache.db', max_rows=3)
+    backend.set('v1:a', 0.1, ttl=60)
+    backend.set('v2:expired', 0.2, ttl=-1)
+    for i in range(5):
+        backend.set(f'v2:{i}', float(i), ttl=60 + i)
+
+    assert backend.prune('v2') == 4
+    assert count_rows(backend) == 3
+    assert backend.get('v1:a') is None and backend.get('v2:0') is None
+    assert backend.get('v2:4') == 4.0
+
+
+def test_version_change_prunes_the_shared_tier(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / 'cache.db')
+    cache = PredictionCache(version='v1', backend=backend)
+    cache.set(('a',), 0.1)
+    cache.set_version('v2')
+    assert count_rows(backend) == 0
+
+
+def test_writes_prune_once_the_interval_passes(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / 'cache.db', max_rows=2)
+    cache = PredictionCache(version='v1', backend=backend, prune_interval=0)
+    for key in 'abcd':
+        cache.set((key,), 0.1)
+    assert count_rows(backend) == 2
+
+
+class BrokenBackend:
+    def get(self, *args):
+        raise ConnectionError("shared tier down")
+
+    set = prune = get
+
+
+def test_backend_failures_are_logged_and_counted(caplog):
+    cache = PredictionCache(version='v1', backend=BrokenBackend(), prune_interval=0)
+    cache.set(('a',), 0.1)
+    cache.set(('b',), 0.2)
+    assert cache.get(('c',)) is None
+
+    # Two failed writes, two failed prunes and one failed read, each operation logged once
+    assert cache.stats()['backend_errors'] == 5
+    assert cache.get(('a',)) == 0.1
+    assert sum('shared tier down' in message for message in caplog.messages) == 3
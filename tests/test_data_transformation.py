@@ -0,0 +1,143 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from heartpipeline.components.data_transformation import DataTransformation, hash_test_mask
+from heartpipeline.config.configuration import ConfigurationManager
+from heartpipeline.entity.config_entity import DataTransformationConfig
+from heartpipeline.features.encoder import CategoricalEncoder
+from heartpipeline.features.kernel import add_engineered_features
+
+MEDIANS = {'speed_limit': 45.0, 'curvature': 0.5}
+
+
+def make_config(tmp_path, data_path, **overrides) -> DataTransformationConfig:
+    settings = dict(
+        root_dir=tmp_path, data_path=data_path,
+        train_data_path=tmp_path / 'train.csv', test_data_path=tmp_path / 'test.csv',
+        scaler_path=tmp_path / 'scaler.pkl', encoder_path=tmp_path / 'categorical_encoder.pkl',
+        chunk_rows=0, split_method='hash', test_size=0.2, split_salt='test-salt',
+        split_manifest_path=tmp_path / 'split_manifest.json', test_ids_path=tmp_path / 'test_ids.csv'
+    )
+    settings.update(overrides)
+    return DataTransformationConfig(**settings)
+
+
+@pytest.fixture
+def features_csv(road_data, tmp_path):
+    path = tmp_path / 'road_features.csv'
+    add_engineered_features(road_data(2000), MEDIANS).to_csv(path, index=False)
+    return path
+
+
+def test_hash_split_is_stable_under_growth_and_chunking():
+    ids = np.arange(20000)
+    mask = hash_test_mask(ids, 0.2, 'salt')
+    assert abs(mask.mean() - 0.2) < 0.01
+    # Appending rows or splitting into chunks never moves an existing row
+    np.testing.assert_array_equal(hash_test_mask(ids[:5000], 0.2, 'salt'), mask[:5000])
+    chunks = np.concatenate([hash_test_mask(ids[i:i + 777], 0.2, 'salt') for i in range(0, len(ids), 777)])
+    np.testing.assert_array_equal(chunks, mask)
+    # Growing test_size only adds test rows
+    assert hash_test_mask(ids, 0.3, 'salt')[mask].all()
+    assert not np.array_equal(hash_test_mask(ids, 0.2, 'other-salt'), mask)
+
+
+
+def test_hash_split_edge_inputs():
+    ids = np.arange(1000)
+    assert not hash_test_mask(ids, 0.0, 'salt').any()
+    assert hash_test_mask(ids, 1.0, 'salt').all()
+    assert hash_test_mask(np.array([], dtype=np.int64), 0.2, 'salt').shape == (0,)
+    assert hash_test_mask(np.array([-5, -1, 3]), 0.5, 'salt').shape == (3,)
+    for test_size in (-0.1, 1.5):
+        with pytest.raises(ValueError, match="test_size"):
+            hash_test_mask(ids, test_size, 'salt')
+
+def test_hash_split_test_ids_follow_the_mask(features_csv, tmp_path):
+    config = make_config(tmp_path, features_csv)
+    DataTransformation(config).transform()
+    df = pd.read_csv(features_csv)
+    expected = df['id'].to_numpy()[hash_test_mask(df['id'].to_numpy(), 0.2, 'test-salt')]
+    test_ids = pd.read_csv(config.test_ids_path)['id'].to_numpy()
+    np.testing.assert_array_equal(np.sort(test_ids), np.sort(expected))
+    assert len(pd.read_csv(config.test_data_path)) == len(expected)
+
+
+def test_random_split_is_the_default(root_dir):
+    cwd = os.getcwd()
+    os.chdir(root_dir)
+    try:
+        config = ConfigurationManager().config.data_transformation
+    finally:
+        os.chdir(cwd)
+    assert config.split_method == 'random'
+
+
+def test_chunked_transform_matches_in_memory(features_csv, tmp_path):
+    in_memory = make_config(tmp_path / 'memory', features_csv)
+    chunked = make_config(tmp_path / 'chunked', features_csv, chunk_rows=300)
+    for config in (in_memory, chunked):
+        os.makedirs(config.root_dir)
+        DataTransformation(config).transform()
+
+    for split in ('train_data_path', 'test_data_path'):
+        expected = pd.read_csv(getattr(in_memory, split))
+        actual = pd.read_csv(getattr(chunked, split))
+        pd.testing.assert_frame_equal(actual, expected, check_exact=False, atol=1e-9)
+    np.testing.assert_array_equal(pd.read_csv(chunked.test_ids_path)['id'], pd.read_csv(in_memory.test_ids_path)['id'])
+
+
+def test_chunked_mode_uses_the_hash_split_whatever_the_chunk_size(features_csv, tmp_path):
+    ids = pd.read_csv(features_csv)['id'].to_numpy()
+    expected = np.sort(ids[hash_test_mask(ids, 0.2, 'test-salt')])
+    for chunk_rows in (7, 300, 5000):
+        config = make_config(tmp_path / str(chunk_rows), features_csv,
+                             chunk_rows=chunk_rows, split_method='random')
+        os.makedirs(config.root_dir)
+        DataTransformation(config).transform()
+        np.testing.assert_array_equal(np.sort(pd.read_csv(config.test_ids_path)['id']), expected)
+        assert pd.read_json(config.split_manifest_path, typ='series')['split_method'] == 'hash'
+
+
+def test_chunked_mode_requires_an_id_column(features_csv, tmp_path):
+    path = tmp_path / 'no_id.csv'
+    pd.read_csv(features_csv).drop(columns='id').to_csv(path, index=False)
+    config = make_config(tmp_path, path, chunk_rows=300, split_method='random')
+    with pytest.raises(Exception, match="requires an 'id' column"):
+        DataTransformation(config).transform()
+
+
+def test_chunk_sizes_that_do_not_divide_the_file(features_csv, tmp_path):
+    rows = len(pd.read_csv(features_csv))
+    sizes = {}
+    for chunk_rows in (rows - 1, rows, rows + 1):
+        config = make_config(tmp_path / str(chunk_rows), features_csv, chunk_rows=chunk_rows)
+        os.makedirs(config.root_dir)
+        DataTransformation(config).transform()
+        sizes[chunk_rows] = (len(pd.read_csv(config.train_data_path)), len(pd.read_csv(config.test_data_path)))
+    assert len(set(sizes.values())) == 1 and sum(sizes[rows]) == rows
+
+
+@pytest.mark.parametrize('chunk_rows', [300, 1999, 2000, 5000])
+def test_chunked_transform_keeps_every_row(features_csv, tmp_path, chunk_rows):
+    config = make_config(tmp_path, features_csv, chunk_rows=chunk_rows)
+    assert DataTransformation(config).transform() == (None, None)
+
+    train = pd.read_csv(config.train_data_path)
+    test = pd.read_csv(config.test_data_path)
+    assert len(train) + len(test) == 2000
+    assert 0.15 < len(test) / 2000 < 0.25
+    # The scaler is fitted on the training rows only
+    features = train.drop(columns='accident_risk')
+    np.testing.assert_allclose(features.mean()[features.std() > 0], 0.0, atol=1e-9)
+
+
+def test_chunked_encoder_matches_in_memory_fit(features_csv, tmp_path):
+    config = make_config(tmp_path, features_csv, chunk_rows=300)
+    DataTransformation(config).transform()
+
+    chunked = pd.read_pickle(config.encoder_path)
+    full = CategoricalEncoder().fit(pd.read_csv(features_csv))
+    for col in full.columns:
+        np.testing.assert_array_equal(chunked.vocabulary[col], full.vocabulary[col])
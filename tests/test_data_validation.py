@@ -0,0 +1,114 @@
+import json
+import os
+import pytest
+import yaml
+from heartpipeline.components.data_validation import DataValidation
+from heartpipeline.entity.config_entity import DataValidationConfig
+
+
+@pytest.fixture
+def make_validation(tmp_path, root_dir):
+    with open(os.path.join(root_dir, 'config', 'schema.yaml')) as f:
+        schema = yaml.safe_load(f)
+
+    def make(chunk_rows: int = 1000) -> DataValidation:
+        return DataValidation(DataValidationConfig(
+            root_dir=tmp_path, STATUS_FILE='status.txt', data_dir=tmp_path / 'road_data.csv',
+            required_columns=list(schema['columns']), column_types=schema['columns'],
+            constraints=schema['constraints'], report_path=tmp_path / 'validation_report.json',
+            chunk_rows=chunk_rows, fail_on_error=False
+        ))
+    return make
+
+
+def read_report(validation: DataValidation) -> dict:
+    with open(validation.config.report_path) as f:
+        return json.load(f)
+
+
+def test_chunked_file_and_frame_give_the_same_statistics(make_validation, road_data):
+    df = road_data(1000)
+    validation = make_validation(chunk_rows=128)
+    df.to_csv(validation.config.data_dir, index=False)
+
+    assert validation.validate()
+    from_file = read_report(validation)
+    assert validation.validate(df)
+    from_frame = read_report(validation)
+
+    for col, stats in from_frame['columns'].items():
+        file_stats = dict(from_file['columns'][col])
+        # Summation order differs between chunks and one frame
+        assert file_stats.pop('mean', None) == pytest.approx(stats.pop('mean', None))
+        assert file_stats == stats
+    assert from_file['columns']['curvature']['mean'] == pytest.approx(df['curvature'].mean())
+    assert from_file['columns']['road_type']['unexpected_values'] == {}
+
+
+def test_duplicate_ids_are_found_when_ids_are_not_sorted(make_validation, road_data):
+    df = road_data(500).sample(frac=1.0, random_state=0)
+    df.iloc[10, df.columns.get_loc('id')] = df['id'].iloc[20]
+
+    validation = make_validation()
+    assert not validation.validate(df)
+    assert read_report(validation)['errors'] == ["id: 1 duplicate values"]
+
+
+def test_range_violations_fail_and_warning_rules_only_warn(make_validation, road_data):
+    df = road_data(500)
+    df.loc[0, 'curvature'] = 1.5
+    df.loc[1, 'num_reported_accidents'] = 11
+    df.loc[2, 'weather'] = 'snowy'
+
+    validation = make_validation()
+    assert not validation.validate(df)
+    report = read_report(validation)
+
+    assert len(report['errors']) == 2
+    assert report['columns']['weather']['unexpected_values'] == {'snowy': 1}
+    assert report['warnings'] == ["num_reported_accidents: 1 values violate {'min': 0, 'max': 10}"]
+
+
+def test_missing_columns_fail(make_validation, road_data):
+    validation = make_validation()
+    assert not validation.validate(road_data(100).drop(columns=['lighting']))
+    assert read_report(validation)['errors'] == ["Missing columns: ['lighting']"]
+
+
+def test_header_only_file_passes_with_zero_rows(make_validation, road_data):
+    validation = make_validation(chunk_rows=10)
+    road_data(5).iloc[:0].to_csv(validation.config.data_dir, index=False)
+
+    assert validation.validate()
+    report = read_report(validation)
+    assert report['rows'] == 0 and report['columns']['curvature']['null_ratio'] == 0.0
+    assert 'mean' not in report['columns']['curvature']
+
+
+def test_nulls_bad_types_and_fractional_integers(make_validation, road_data):
+    df = road_data(200)
+    df['num_lanes'] = df['num_lanes'].astype(object)
+    df.loc[0, 'num_lanes'] = 'two'
+    df['speed_limit'] = df['speed_limit'].astype(float)
+    df.loc[1, 'speed_limit'] = 45.5
+    df.loc[2, 'lighting'] = None
+
+    validation = make_validation(chunk_rows=64)
+    assert not validation.validate(df)
+    report = read_report(validation)
+
+    assert "num_lanes: 1 values are not int" in report['errors']
+    assert "speed_limit: 1 values are not int" in report['errors']
+    assert any(error.startswith("lighting: null ratio 0.5000%") for error in report['errors'])
+    assert report['columns']['num_lanes']['invalid_type'] == 1
+
+
+def test_duplicate_across_a_chunk_boundary(make_validation, road_data):
+    df = road_data(256)
+    # Each 128-row chunk is increasing, but the second starts with the first's last id
+    df['id'] = list(range(128)) + list(range(127, 255))
+
+    validation = make_validation(chunk_rows=128)
+    df.to_csv(validation.config.data_dir, index=False)
+    assert not validation.validate()
+    assert read_report(validation)['errors'] == ["id: 1 duplicate values"]
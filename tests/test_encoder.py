@@ -0,0 +1,107 @@
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from heartpipeline.features.encoder import CategoricalEncoder, resolve_encoder_path
+from heartpipeline.features.kernel import add_engineered_features
+
+MEDIANS = {'speed_limit': 45.0, 'curvature': 0.5}
+
+
+def engineered(df):
+    return add_engineered_features(df, MEDIANS)
+
+
+def as_str(values):
+    # What astype(str) gave before pandas 3: missing values become the string 'nan'
+    return np.asarray(values, dtype=str)
+
+
+def label_encoder_codes(df, columns):
+    return np.column_stack([LabelEncoder().fit_transform(as_str(df[col])) for col in columns])
+
+
+def test_fit_matches_label_encoder(road_data):
+    df = engineered(road_data(400))
+    df.loc[::7, 'weather'] = np.nan
+    encoder = CategoricalEncoder().fit(df)
+    np.testing.assert_array_equal(encoder.encode(df), label_encoder_codes(df, encoder.columns))
+
+
+def test_partial_fit_matches_fit_with_unused_categories(road_data):
+    df = engineered(road_data(400))
+    # Out-of-range speeds leave speed_category NaN and 'very_high' unused
+    df.loc[:50, 'speed_limit'] = 200
+    df = engineered(df)
+    assert (df['speed_category'] == 'very_high').sum() == 0
+
+    full = CategoricalEncoder().fit(df)
+    chunked = CategoricalEncoder()
+    for start in range(0, len(df), 90):
+        chunked.partial_fit(df.iloc[start:start + 90])
+
+    for col in full.columns:
+        np.testing.assert_array_equal(chunked.vocabulary[col], full.vocabulary[col])
+        assert chunked.fallback[col] == full.fallback[col]
+    np.testing.assert_array_equal(chunked.encode(df), label_encoder_codes(df, full.columns))
+
+
+def test_unseen_values_use_most_frequent_category(road_data):
+    df = engineered(road_data(300))
+    encoder = CategoricalEncoder().fit(df)
+    unseen = df.head(3).copy()
+    unseen['road_type'] = 'motorway'
+    codes = encoder.column_codes('road_type', unseen['road_type'])
+    assert (codes == encoder.fallback['road_type']).all()
+
+
+def test_small_and_large_batches_agree(road_data):
+    df = engineered(road_data(200))
+    encoder = CategoricalEncoder().fit(df)
+    for col in encoder.columns:
+        small = np.concatenate([encoder.column_codes(col, df[col].iloc[i:i + 10]) for i in range(0, 200, 10)])
+        np.testing.assert_array_equal(small, encoder.column_codes(col, df[col]))
+
+
+def test_legacy_label_encoders_are_wrapped(road_data, tmp_path):
+    df = engineered(road_data(200))
+    label_encoders = {col: LabelEncoder().fit(as_str(df[col])) for col in ['road_type', 'lighting']}
+    encoder = CategoricalEncoder.from_label_encoders(label_encoders)
+    np.testing.assert_array_equal(encoder.encode(df), label_encoder_codes(df, ['road_type', 'lighting']))
+
+
+def test_resolve_encoder_path_falls_back_to_legacy_file(tmp_path):
+    current = tmp_path / 'categorical_encoder.pkl'
+    legacy = tmp_path / 'label_encoders.pkl'
+    legacy.write_bytes(pickle.dumps({}))
+    assert resolve_encoder_path(current) == str(legacy)
+    current.write_bytes(pickle.dumps({}))
+    assert resolve_encoder_path(current) == str(current)
+
+
+def test_missing_values_sort_among_the_categories(road_data):
+    df = engineered(road_data(300))
+    # 'urban' and 'rural' sort after 'nan', so their codes move when it is present
+    df.loc[::5, 'road_type'] = np.nan
+    df.loc[1::11, 'road_type'] = 'nan'
+    df.loc[::3, 'time_of_day'] = None
+
+    full = CategoricalEncoder().fit(df)
+    chunked = CategoricalEncoder()
+    for start in range(0, len(df), 70):
+        chunked.partial_fit(df.iloc[start:start + 70])
+
+    assert list(full.vocabulary['road_type']) == ['highway', 'nan', 'rural', 'urban']
+    expected = label_encoder_codes(df, full.columns)
+    np.testing.assert_array_equal(full.encode(df), expected)
+    np.testing.assert_array_equal(chunked.encode(df), expected)
+    np.testing.assert_array_equal(np.concatenate([full.column_codes('road_type', df['road_type'].iloc[i:i + 10])
+                                                  for i in range(0, 300, 10)]), expected[:, 0])
+
+
+def test_a_column_of_only_missing_values(road_data):
+    df = engineered(road_data(50))
+    df['weather'] = np.nan
+    encoder = CategoricalEncoder().fit(df)
+    assert list(encoder.vocabulary['weather']) == ['nan']
+    assert (encoder.column_codes('weather', pd.Series(['clear', None])) == 0).all()
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from heartpipeline.components.ensemble import StackedEnsemble, fit_meta_learner, prune_members
+
+
+class Constant:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return np.full(len(X), self.value)
+
+
+@pytest.fixture(scope='module')
+def out_of_fold():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=400)
+    oof = np.column_stack([
+        y + 0.3 * rng.normal(size=400),     # strong
+        y + 0.3 * rng.normal(size=400),     # strong, independent errors
+        rng.normal(size=400),               # noise
+    ])
+    return oof, y
+
+
+def test_prediction_is_the_weighted_blend():
+    ensemble = StackedEnsemble({'one': Constant(1.0), 'two': Constant(2.0)}, [0.5, 0.25], intercept=0.1)
+    np.testing.assert_allclose(ensemble.predict(np.zeros((3, 2))), [1.1, 1.1, 1.1])
+    assert ensemble.describe() == {'intercept': 0.1, 'weights': {'one': 0.5, 'two': 0.25}}
+
+
+def test_meta_learner_weights_are_non_negative(out_of_fold):
+    oof, y = out_of_fold
+    # A member anti-correlated with the target would get a negative weight from plain least squares
+    oof = np.column_stack([oof[:, 0], -oof[:, 1]])
+    meta, r2 = fit_meta_learner(oof, y)
+    assert (meta.coef_ >= 0).all()
+    assert meta.coef_[1] == 0.0
+    assert r2 < LinearRegression().fit(oof, y).score(oof, y)
+
+
+def test_members_that_add_nothing_are_dropped(out_of_fold):
+    oof, y = out_of_fold
+    latency = {'first': 1.0, 'second': 1.0, 'noise': 1.0}
+    kept, dropped = prune_members(oof, y, ['first', 'second', 'noise'], latency, min_gain_per_ms=0.0)
+
+    assert kept == ['first', 'second']
+    assert [entry['model'] for entry in dropped] == ['noise']
+    assert dropped[0]['r2_gain'] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_slow_members_must_pay_for_their_latency(out_of_fold):
+    oof, y = out_of_fold
+    latency = {'first': 1.0, 'second': 50.0, 'noise': 1.0}
+    kept, dropped = prune_members(oof, y, ['first', 'second', 'noise'], latency, min_gain_per_ms=0.001)
+
+    assert kept == ['first']
+    assert {entry['model'] for entry in dropped} == {'second', 'noise'}
+
+
+def test_pruning_keeps_at_least_one_member(out_of_fold):
+    oof, y = out_of_fold
+    kept, _ = prune_members(oof, y, ['first', 'second', 'noise'], dict.fromkeys(['first', 'second', 'noise'], 1.0),
+                            min_gain_per_ms=10.0)
+    assert len(kept) == 1
+
+
+def test_empty_inputs_and_an_empty_blend():
+    ensemble = StackedEnsemble({'one': Constant(1.0)}, [0.5], intercept=0.1)
+    assert ensemble.predict(np.zeros((0, 2))).shape == (0,)
+    np.testing.assert_allclose(StackedEnsemble({}, [], intercept=0.3).predict(np.zeros((2, 2))), [0.3, 0.3])
+
+
+def test_single_member_is_never_pruned(out_of_fold):
+    oof, y = out_of_fold
+    kept, dropped = prune_members(oof[:, :1], y, ['first'], {'first': 1000.0}, min_gain_per_ms=10.0)
+    assert (kept, dropped) == (['first'], [])
+
+
+def test_duplicate_and_zero_latency_members(out_of_fold):
+    oof, y = out_of_fold
+    duplicated = np.column_stack([oof[:, 0], oof[:, 0], oof[:, 1]])
+    latency = {'first': 0.0, 'copy': 0.0, 'second': 1.0}
+    kept, dropped = prune_members(duplicated, y, ['first', 'copy', 'second'], latency, min_gain_per_ms=0.0)
+
+    assert len(dropped) == 1 and dropped[0]['model'] in ('first', 'copy')
+    assert 'second' in kept
+
+
+def test_constant_target_gives_a_finite_score():
+    oof = np.column_stack([np.linspace(0, 1, 20), np.ones(20)])
+    meta, r2 = fit_meta_learner(oof, np.full(20, 0.4))
+    assert np.isfinite(r2) and (meta.coef_ >= 0).all()
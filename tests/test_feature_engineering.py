@@ -0,0 +1,74 @@
+import json
+import pandas as pd
+import pytest
+from heartpipeline.components.feature_engineering import FeatureEngineering, median_from_counts
+from heartpipeline.entity.config_entity import FeatureEngineeringConfig
+
+
+def make_config(tmp_path, **overrides) -> FeatureEngineeringConfig:
+    settings = dict(root_dir=tmp_path, data_path=tmp_path / 'road_data.csv', output_path=tmp_path / 'road_features.csv',
+                    stats_path=tmp_path / 'feature_stats.json', shard_dir=tmp_path / 'shards', shard_rows=250,
+                    num_workers=2)
+    settings.update(overrides)
+    return FeatureEngineeringConfig(**settings)
+
+
+@pytest.mark.parametrize('values', [[3, 1, 2], [4, 1, 3, 2], [5, 5, 5, 1], [0.5], [-2.5, -1.0], [7, 7], [1, 2, 2, 3, 3, 3]])
+def test_median_from_counts_is_exact(values):
+    series = pd.Series(values, dtype=float)
+    assert median_from_counts(series.value_counts()) == series.median()
+
+
+def test_sharded_output_matches_single_process(tmp_path, road_data):
+    road_data(1000, seed=3).to_csv(tmp_path / 'road_data.csv', index=False)
+    sharded = make_config(tmp_path)
+    single = make_config(tmp_path, output_path=tmp_path / 'single.csv', stats_path=tmp_path / 'single.json',
+                         num_workers=1)
+
+    assert FeatureEngineering(sharded).engineer_features() is None
+    FeatureEngineering(single).engineer_features()
+
+    pd.testing.assert_frame_equal(pd.read_csv(sharded.output_path), pd.read_csv(single.output_path))
+    assert len(list(sharded.shard_dir.iterdir())) == 4
+    with open(sharded.stats_path) as f:
+        stats = json.load(f)
+    raw = pd.read_csv(tmp_path / 'road_data.csv')
+    assert stats == {'rows': 1000, 'medians': {'speed_limit': raw['speed_limit'].median(),
+                                               'curvature': raw['curvature'].median()}}
+
+
+def test_streamed_counts_merge_like_one_series():
+    # compute_feature_stats adds per-chunk counts with fill_value=0, which makes them float
+    first, second = pd.Series([1.0, 2.0, 2.0]), pd.Series([3.0, 9.0])
+    counts = first.value_counts().add(second.value_counts(), fill_value=0)
+    assert median_from_counts(counts) == pd.concat([first, second]).median()
+
+
+def test_input_within_one_shard_is_engineered_in_process(tmp_path, road_data):
+    road_data(200, seed=4).to_csv(tmp_path / 'road_data.csv', index=False)
+    config = make_config(tmp_path)
+
+    df = FeatureEngineering(config).engineer_features()
+
+    assert len(df) == 200 and not config.shard_dir.exists()
+    assert len(pd.read_csv(config.output_path)) == 200
+
+
+def test_partial_last_shard_and_missing_values(tmp_path, road_data):
+    raw = road_data(1001, seed=5)
+    raw.loc[[3, 600], 'speed_limit'] = None
+    raw.to_csv(tmp_path / 'road_data.csv', index=False)
+    sharded = make_config(tmp_path)
+    single = make_config(tmp_path, output_path=tmp_path / 'single.csv', stats_path=tmp_path / 'single.json',
+                         num_workers=1)
+
+    FeatureEngineering(sharded).engineer_features()
+    FeatureEngineering(single).engineer_features()
+
+    # 1001 rows in 250-row shards: the fifth shard holds a single row
+    assert len(list(sharded.shard_dir.iterdir())) == 5
+    pd.testing.assert_frame_equal(pd.read_csv(sharded.output_path), pd.read_csv(single.output_path))
+    with open(sharded.stats_path) as f:
+        # Missing values are left out of the median, as pandas does
+        assert json.load(f)['medians']['speed_limit'] == raw['speed_limit'].median()
+
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from heartpipeline.features.kernel import ENGINEERED_FEATURES, add_engineered_features
+
+MEDIANS = {'speed_limit': 45.0, 'curvature': 0.5}
+
+
+def pandas_features(df: pd.DataFrame) -> pd.DataFrame:
+    """The column-by-column expressions the kernel replaced"""
+    df['lanes_speed'] = df['num_lanes'] * df['speed_limit']
+    df['curvature_speed'] = df['curvature'] * df['speed_limit']
+    df['lanes_curvature'] = df['num_lanes'] * df['curvature']
+    df['high_speed'] = (df['speed_limit'] > MEDIANS['speed_limit']).astype(int)
+    df['high_curvature'] = (df['curvature'] > MEDIANS['curvature']).astype(int)
+    df['few_lanes'] = (df['num_lanes'] <= 2).astype(int)
+    df['no_signs'] = (df['road_signs_present'] == False).astype(int)
+    df['holiday_risk'] = (df['holiday'] == True).astype(int)
+    df['speed_category'] = pd.cut(df['speed_limit'], bins=[0, 40, 60, 80, 120],
+                                  labels=['low', 'medium', 'high', 'very_high'])
+    df['curvature_category'] = pd.cut(df['curvature'], bins=[-0.1, 0.3, 0.6, 1.0],
+                                      labels=['low', 'medium', 'high'])
+    return df
+
+
+def test_kernel_matches_pandas_expressions(road_data):
+    df = road_data(500)
+    # Bin edges and out-of-range values
+    df.loc[:4, 'speed_limit'] = [0, 40, 60, 120, 130]
+    df.loc[:4, 'curvature'] = [-0.1, 0.3, 0.6, 1.0, 1.2]
+    expected = pandas_features(df.copy())
+    actual = add_engineered_features(df.copy(), MEDIANS)
+    for col in ENGINEERED_FEATURES:
+        if col.endswith('_category'):
+            assert actual[col].astype(str).tolist() == expected[col].astype(str).tolist(), col
+        else:
+            np.testing.assert_array_equal(actual[col].to_numpy(), expected[col].to_numpy(), err_msg=col)
+
+
+def test_serving_default_is_float64(road_data):
+    df = add_engineered_features(road_data(50), MEDIANS)
+    assert df['curvature_speed'].dtype == np.float64
+    assert df['lanes_curvature'].dtype == np.float64
+
+
+def test_empty_frame_keeps_every_feature_column(road_data):
+    df = add_engineered_features(road_data(5).iloc[:0].copy(), MEDIANS)
+    assert len(df) == 0
+    assert set(ENGINEERED_FEATURES) <= set(df.columns)
+    assert df['speed_category'].cat.categories.tolist() == ['low', 'medium', 'high', 'very_high']
+
+
+def test_medians_missing_values_and_bools(road_data):
+    df = road_data(4)
+    # Values at the medians are not "high"; NaN curvature falls outside every bin
+    df['speed_limit'] = [45, 46, 45, 30]
+    df['curvature'] = [0.5, 0.51, np.nan, 0.0]
+    df['road_signs_present'] = [True, False, 1, 0]
+    df['holiday'] = [False, True, 0, 1]
+    actual = add_engineered_features(df.copy(), MEDIANS)
+    expected = pandas_features(df.copy())
+
+    assert actual['high_speed'].tolist() == [0, 1, 0, 0]
+    assert actual['high_curvature'].tolist() == [0, 1, 0, 0]
+    assert actual['curvature_category'].isna().tolist() == [False, False, True, False]
+    assert actual['no_signs'].tolist() == expected['no_signs'].tolist() == [0, 1, 0, 1]
+    assert actual['holiday_risk'].tolist() == expected['holiday_risk'].tolist() == [0, 1, 0, 1]
+    assert np.isnan(actual['curvature_speed'].iloc[2])
+
+
+def test_missing_inputs_stay_missing_in_integer_features(road_data):
+    df = road_data(3)
+    df['speed_limit'] = [40.0, np.nan, 60.0]
+    actual = add_engineered_features(df.copy(), MEDIANS)
+    expected = pandas_features(df.copy())
+
+    np.testing.assert_array_equal(actual['lanes_speed'].to_numpy(), expected['lanes_speed'].to_numpy())
+    assert actual['high_speed'].tolist() == expected['high_speed'].tolist()
+    assert add_engineered_features(road_data(3), MEDIANS)['lanes_speed'].dtype == np.int64
@@ -0,0 +1,81 @@
+import pytest
+from heartpipeline.monitoring.history import MonitoringHistory, parse_time
+
+
+def record(history, ts, mae, psi, version='v1'):
+    return history.record_run(version, 100, 50, dataset_drift=psi > 0.2, drift_ratio=psi, ts=ts,
+                              metrics={'current': {'MAE': mae}, 'reference': {'MAE': 0.05}},
+                              feature_stats={'speed_limit': {'psi': psi, 'mean_change': float('nan')}})
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = MonitoringHistory(tmp_path / 'history.db')
+    for day, (mae, psi) in enumerate([(0.05, 0.01), (0.07, 0.15), (0.09, 0.3)]):
+        record(history, 1_700_000_000 + day * 86400, mae, psi, version=f"v{day}")
+    return history
+
+
+def test_series_are_ordered_and_sliced_by_time(history):
+    assert [point['value'] for point in history.metric_series('MAE')] == [0.05, 0.07, 0.09]
+    assert [point['value'] for point in history.metric_series('MAE', dataset='reference')] == [0.05] * 3
+    assert [point['value'] for point in history.feature_series('speed_limit', 'psi', since=1_700_000_000 + 86400)] == [0.15, 0.3]
+    assert history.metric_series('MAE', until=1_699_999_999) == []
+
+
+def test_runs_are_newest_first(history):
+    runs = history.runs(limit=2)
+    assert [run['model_version'] for run in runs] == ['v2', 'v1']
+    assert runs[0]['dataset_drift'] is True and runs[1]['dataset_drift'] is False
+
+
+def test_latest_statistics_store_non_finite_values_as_null(history):
+    assert history.latest_feature_stats() == {'speed_limit': {'psi': 0.3, 'mean_change': None}}
+
+
+def test_readonly_history_sees_the_writer_and_missing_files_are_empty(tmp_path, history):
+    reader = MonitoringHistory(history.path, readonly=True)
+    record(history, 1_800_000_000, 0.11, 0.4)
+    assert reader.metric_series('MAE')[-1]['value'] == 0.11
+
+    missing = MonitoringHistory(tmp_path / 'none.db', readonly=True)
+    assert (missing.runs(), missing.metric_series('MAE'), missing.latest_feature_stats()) == ([], [], {})
+
+
+def test_parse_time():
+    assert parse_time('1700000000') == 1_700_000_000.0
+    assert parse_time('2023-11-14T22:13:20Z') == 1_700_000_000.0
+    assert parse_time('') is None and parse_time(None) is None
+
+
+def test_runs_sharing_a_timestamp_keep_insertion_order(tmp_path):
+    history = MonitoringHistory(tmp_path / 'history.db')
+    for mae, version in ((0.05, 'first'), (0.08, 'second')):
+        record(history, 1_700_000_000, mae, 0.1, version=version)
+
+    assert [run['model_version'] for run in history.runs()] == ['second', 'first']
+    assert [point['value'] for point in history.metric_series('MAE')] == [0.05, 0.08]
+    assert history.latest_feature_stats()['speed_limit']['psi'] == 0.1
+
+
+def test_runs_without_metrics_or_statistics(tmp_path):
+    history = MonitoringHistory(tmp_path / 'history.db')
+    assert history.latest_feature_stats() == {}
+    history.record_run('v1', 0, 0, dataset_drift=False, drift_ratio=float('nan'), metrics={}, feature_stats={},
+                       ts=1_700_000_000)
+
+    assert history.runs()[0]['drift_ratio'] is None
+    assert history.latest_feature_stats() == {}
+    assert history.metric_series('MAE') == [] and history.feature_series('speed_limit', 'psi') == []
+
+
+def test_invalid_ranges_and_limits_are_rejected(history):
+    with pytest.raises(ValueError):
+        history.runs(limit=-1)
+    with pytest.raises(ValueError):
+        history.metric_series('MAE', since='nan')
+    with pytest.raises(ValueError):
+        history.feature_series('speed_limit', 'psi', until='last tuesday')
+    assert history.runs(limit=0) == []
+    assert history.metric_series('MAE', since='inf') == []
+    assert history.metric_series('MAE', since=1_700_000_000 + 86400, until=1_700_000_000) == []
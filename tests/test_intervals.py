@@ -0,0 +1,65 @@
+import math
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from heartpipeline.serving.intervals import ConformalIntervals, calibration_split
+
+
+def make_regression(rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 3))
+    return X, X @ np.array([0.5, -0.2, 0.1]) + rng.normal(scale=0.1, size=rows)
+
+
+def test_quantile_is_the_finite_sample_rank():
+    scores = np.arange(1, 10, dtype=np.float32)
+
+    # ceil((9 + 1) * 0.8) = 8th smallest
+    assert ConformalIntervals.quantile(scores, 0.8) == 8.0
+    assert ConformalIntervals.quantile(scores, 0.9) == 9.0
+    assert math.isinf(ConformalIntervals.quantile(scores, 0.95))
+
+
+@pytest.mark.parametrize('model', [LinearRegression(), RandomForestRegressor(n_estimators=20, random_state=0)])
+def test_intervals_reach_their_coverage_on_new_rows(model):
+    X_train, y_train = make_regression(2000, seed=0)
+    X_calibration, y_calibration = make_regression(1000, seed=1)
+    X_new, y_new = make_regression(5000, seed=2)
+    model.fit(X_train, y_train)
+
+    intervals = ConformalIntervals.calibrate(model, X_calibration, y_calibration)
+    half_width = intervals.quantile(intervals.absolute, 0.9)
+    covered = np.abs(y_new - model.predict(X_new)) <= half_width
+
+    assert covered.mean() == pytest.approx(0.9, abs=0.03)
+    assert (intervals.normalized is not None) == isinstance(model, RandomForestRegressor)
+
+
+def test_scores_from_another_model_are_rejected(tmp_path):
+    X, y = make_regression(200, seed=0)
+    first = LinearRegression().fit(X, y)
+    second = LinearRegression().fit(X, -y)
+    ConformalIntervals.calibrate(first, X, y).save(tmp_path / 'conformal.npz')
+
+    assert ConformalIntervals.load(tmp_path / 'conformal.npz', first).info()['calibration_rows'] == 200
+    with pytest.raises(ValueError):
+        ConformalIntervals.load(tmp_path / 'conformal.npz', second)
+
+
+def test_calibration_rows_are_held_out_from_selection():
+    select, calibrate = calibration_split(400, 0.5)
+
+    assert (len(select), len(calibrate)) == (200, 200)
+    assert not set(select) & set(calibrate)
+    np.testing.assert_array_equal(np.sort(np.concatenate([select, calibrate])), np.arange(400))
+    assert list(select) == sorted(select) and list(calibrate) == sorted(calibrate)
+    # The split is fixed, so reruns calibrate on the same rows
+    np.testing.assert_array_equal(calibration_split(400, 0.5)[1], calibrate)
+
+
+@pytest.mark.parametrize('rows, fraction, expected', [(0, 0.5, 0), (1, 0.5, 0), (3, 0.5, 2), (10, 0.0, 0), (10, 1.0, 10)])
+def test_calibration_split_edge_sizes(rows, fraction, expected):
+    select, calibrate = calibration_split(rows, fraction)
+    assert len(calibrate) == expected and len(select) == rows - expected
+
@@ -0,0 +1,132 @@
+import argparse
+import importlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import yaml
+from heartpipeline.serving.request_schema import RequestSchema
+
+
+@pytest.fixture
+def load_test(root_dir, monkeypatch):
+    # The harness is a script and imports its sibling module directly
+    monkeypatch.syspath_prepend(os.path.join(root_dir, 'benchmarks'))
+    return importlib.import_module('load_test')
+
+
+@pytest.fixture
+def server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            status = 500 if self.path == '/predict' else 200
+            self.send_response(status)
+            self.send_header('Server-Timing', 'parse;dur=0.2, predict;dur=1.5')
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def result(scenario, scheduled, latency, ok=True, phases=None):
+    return {'scenario': scenario, 'scheduled': scheduled, 'latency': latency, 'ok': ok, 'phases': phases or {}}
+
+
+def test_payloads_pass_request_validation(load_test, root_dir):
+    with open(os.path.join(root_dir, 'config', 'schema.yaml')) as f:
+        schema = RequestSchema.from_schema(yaml.safe_load(f))
+    payloads = load_test.build_payloads(count=5, batch_size=3, seed=0)
+
+    for body, content_type in payloads['api'] + payloads['batch']:
+        assert content_type == 'application/json'
+        schema.validate_batch(json.loads(body))
+    assert all(len(json.loads(body)['instances']) == 3 for body, _ in payloads['batch'])
+    # The form posts its checkboxes as yes/no
+    assert all(b'holiday=yes' in body or b'holiday=no' in body for body, _ in payloads['form'])
+
+
+def test_server_timing_and_mix_parsing(load_test):
+    assert load_test.parse_server_timing('parse;dur=0.4, predict;desc="model";dur=2.5, cache') == \
+        {'parse': 0.4, 'predict': 2.5}
+    assert load_test.parse_server_timing(None) == {}
+    assert load_test.parse_mix('api=0.7,form=0.3,batch') == {'api': 0.7, 'form': 0.3, 'batch': 1.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        load_test.parse_mix('stream=1')
+
+
+def test_summary_skips_warmup_and_counts_errors(load_test):
+    results = [result('api', 0.0, 5.0)]
+    results += [result('api', 1.0 + i / 100, 0.010, phases={'predict': 2.0}) for i in range(90)]
+    results += [result('form', 1.5 + i / 100, 0.020, ok=i > 0) for i in range(10)]
+    summary = load_test.summarize(results, elapsed=3.0, warmup=1.0)
+
+    assert summary['requests'] == 100
+    assert summary['error_rate'] == 0.01
+    assert summary['throughput_rps'] == 49.5
+    assert summary['latency_ms']['p50'] == 10.0
+    assert summary['phases_ms']['predict']['mean'] == 2.0
+    assert summary['scenarios']['form']['error_rate'] == 0.1
+
+
+def test_regressions_need_both_a_ratio_and_an_absolute_change(load_test):
+    def run(p50, p99, error_rate=0.0):
+        stats = {'latency_ms': {'p50': p50, 'p95': p50, 'p99': p99, 'p999': None}, 'error_rate': error_rate}
+        return {'summary': dict(stats, scenarios={'api': stats})}
+
+    assert load_test.find_regressions(run(0.5, 10.0), run(0.9, 11.0), max_regression=0.2) == []
+    regressions = load_test.find_regressions(run(2.0, 10.0), run(2.1, 20.0, error_rate=0.05), max_regression=0.2)
+    assert regressions == ['overall p99: 10.00ms -> 20.00ms', 'overall error rate: 0.0000 -> 0.0500',
+                           'api p99: 10.00ms -> 20.00ms', 'api error rate: 0.0000 -> 0.0500']
+
+
+def test_open_loop_run_against_a_server(load_test, server):
+    payloads = {'api': [(b'{}', 'application/json')], 'form': [(b'a=1', 'application/x-www-form-urlencoded')]}
+    generator = load_test.LoadGenerator(server, payloads, {'api': 3, 'form': 1}, max_concurrency=4, timeout=5)
+    results, elapsed = generator.run(rps=100, duration=0.5, seed=1)
+
+    assert 20 < len(results) < 100 and elapsed >= 0.4
+    assert all(r['ok'] == (r['scenario'] == 'api') for r in results)
+    assert results[0]['phases'] == {'parse': 0.2, 'predict': 1.5}
+
+
+def test_malformed_timings_and_mixes(load_test):
+    assert load_test.parse_server_timing('parse;dur=, predict;dur=abc, total;dur=3') == {'total': 3.0}
+    assert load_test.parse_server_timing('') == {}
+    for text in ('api=abc', 'api=-1', 'api=0,form=0', ''):
+        with pytest.raises(argparse.ArgumentTypeError):
+            load_test.parse_mix(text)
+
+
+def test_summary_of_empty_and_all_failed_runs(load_test, capsys):
+    empty = load_test.summarize([], elapsed=1.0, warmup=0.0)
+    assert empty['requests'] == 0 and empty['error_rate'] is None and empty['scenarios'] == {}
+    assert set(empty['latency_ms'].values()) == {None}
+
+    failed = load_test.summarize([result('api', i / 10, 0.01, ok=False) for i in range(5)], elapsed=1.0, warmup=0.0)
+    assert failed['error_rate'] == 1.0 and failed['throughput_rps'] == 0.0
+    assert failed['scenarios']['api']['latency_ms']['p50'] is None
+
+    load_test.print_summary(empty)
+    load_test.print_summary(failed)
+    assert 'requests=5' in capsys.readouterr().out
+
+
+def test_regressions_ignore_missing_percentiles_and_new_scenarios(load_test):
+    def run(p50, scenarios):
+        stats = {'latency_ms': {'p50': p50, 'p95': None, 'p99': None, 'p999': None}, 'error_rate': None}
+        return {'summary': dict(stats, scenarios={name: stats for name in scenarios})}
+
+    assert load_test.find_regressions(run(None, []), run(50.0, ['api']), max_regression=0.2) == []
+    assert load_test.find_regressions(run(1.0, ['api']), run(50.0, ['api', 'batch']), max_regression=0.2) == \
+        ['overall p50: 1.00ms -> 50.00ms', 'api p50: 1.00ms -> 50.00ms']
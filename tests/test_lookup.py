@@ -0,0 +1,73 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from heartpipeline.components.risk_lookup import RiskLookup
+from heartpipeline.entity.config_entity import RiskLookupConfig
+from heartpipeline.serving.lookup import RiskLookupTable
+from heartpipeline.serving.predictor import RiskPredictor
+
+
+def small_table() -> RiskLookupTable:
+    metadata = {
+        'model_version': 'v1',
+        'axes': [{'name': 'weather', 'values': ['clear', 'rainy']}, {'name': 'num_lanes', 'values': [1, 2, 3]}],
+        'curvature': {'min': 0.0, 'max': 1.0, 'points': 3}
+    }
+    # Row = weather * 3 + num_lanes position; columns are curvature 0, 0.5, 1
+    table = np.arange(18, dtype=np.float32).reshape(6, 3)
+    return RiskLookupTable(table, metadata)
+
+
+def test_cells_are_indexed_row_major_and_curvature_is_interpolated():
+    table = small_table()
+    assert table.lookup({'weather': 'rainy', 'num_lanes': 2, 'curvature': 0.0}) == 12.0
+    assert table.lookup({'weather': 'clear', 'num_lanes': 3, 'curvature': 0.75}) == pytest.approx(7.5)
+    assert table.lookup({'weather': 'clear', 'num_lanes': 1, 'curvature': 1.0}) == 2.0
+
+
+@pytest.mark.parametrize('record', [
+    {'weather': 'foggy', 'num_lanes': 2, 'curvature': 0.5},
+    {'weather': 'clear', 'num_lanes': 4, 'curvature': 0.5},
+    {'weather': 'clear', 'num_lanes': 2, 'curvature': 1.5},
+    {'weather': 'clear', 'num_lanes': 2, 'curvature': 'sharp'},
+    {'weather': 'clear', 'num_lanes': 2, 'curvature': float('nan')},
+    {'weather': 'clear', 'num_lanes': 2, 'curvature': -0.01},
+    {'weather': 'clear', 'num_lanes': 2},
+    {'num_lanes': 2, 'curvature': 0.5},
+    {},
+])
+def test_off_grid_records_fall_back(record):
+    assert small_table().lookup(record) is None
+
+
+def test_grid_edges_and_numeric_strings():
+    table = small_table()
+    # The last curvature interval is closed on the right
+    assert table.lookup({'weather': 'rainy', 'num_lanes': 3, 'curvature': 1.0}) == 17.0
+    assert table.lookup({'weather': 'rainy', 'num_lanes': 3, 'curvature': '0.5'}) == 16.0
+    # Axis values compare like the schema-coerced integers
+    assert table.lookup({'weather': 'clear', 'num_lanes': 2.0, 'curvature': 0.0}) == 3.0
+    assert table.info()['cells'] == 6
+
+
+def test_built_table_matches_the_model_on_grid_points(tmp_path, root_dir):
+    artifacts = os.path.join(root_dir, 'artifacts')
+    config = RiskLookupConfig(
+        root_dir=tmp_path, model_path=os.path.join(artifacts, 'model_trainer', 'model.pkl'),
+        scaler_path=os.path.join(artifacts, 'data_transformation', 'scaler.pkl'),
+        encoder_path=os.path.join(artifacts, 'data_transformation', 'categorical_encoder.pkl'),
+        feature_stats_path=tmp_path / 'feature_stats.json', table_path=tmp_path / 'risk_table.npy',
+        metadata_path=tmp_path / 'risk_table.json', curvature_points=5, num_lanes=[2], speed_limits=[60],
+        max_reported_accidents=1, batch_rows=1000, error_samples=200
+    )
+    metadata = RiskLookup(config).build()
+    table = RiskLookupTable.load(config.table_path, config.metadata_path)
+    predictor = RiskPredictor.load(config.model_path, config.scaler_path, config.encoder_path, record_metrics=False)
+
+    record = {'road_type': 'urban', 'num_lanes': 2, 'curvature': 0.25, 'speed_limit': 60, 'lighting': 'night',
+              'weather': 'rainy', 'road_signs_present': 1, 'public_road': 0, 'time_of_day': 'evening',
+              'holiday': 0, 'school_season': 1, 'num_reported_accidents': 1}
+    assert table.model_version == predictor.version
+    assert table.lookup(record) == pytest.approx(float(predictor.predict(pd.DataFrame([record]))[0]), abs=1e-5)
+    assert metadata['max_abs_error'] >= metadata['mean_abs_error'] >= 0
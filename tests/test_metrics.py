@@ -0,0 +1,69 @@
+import contextvars
+
+import pytest
+
+pytest.importorskip('prometheus_client')
+
+from heartpipeline.serving import metrics
+
+
+def test_stage_timer_feeds_histogram_and_server_timing():
+    metrics.start_request_stages()
+    with metrics.stage_timer('predict'):
+        pass
+    header = metrics.server_timing_header(0.002)
+    assert header.startswith('predict;dur=')
+    assert header.endswith('total;dur=2.000')
+    payload, _ = metrics.render_metrics()
+    assert b'heartpipeline_stage_latency_seconds_count{stage="predict"}' in payload
+
+
+def test_reset_multiprocess_dir_removes_stale_metric_files(tmp_path, monkeypatch):
+    (tmp_path / 'counter_123.db').write_bytes(b'stale')
+    (tmp_path / 'histogram_456.db').write_bytes(b'stale')
+    (tmp_path / 'notes.txt').write_text('kept')
+    monkeypatch.setenv(metrics.MULTIPROC_DIR_ENV, str(tmp_path))
+    metrics.reset_multiprocess_dir()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['notes.txt']
+
+
+def test_reset_multiprocess_dir_is_a_no_op_without_the_env(tmp_path, monkeypatch):
+    monkeypatch.delenv(metrics.MULTIPROC_DIR_ENV, raising=False)
+    metrics.reset_multiprocess_dir()
+
+
+def test_server_timing_without_stages_reports_only_the_total():
+    header = contextvars.Context().run(metrics.server_timing_header, 0.0)
+    assert header == 'total;dur=0.000'
+
+
+def test_repeated_stages_accumulate_in_the_header():
+    def run():
+        metrics.start_request_stages()
+        metrics.observe_stage('parse', 0.5)
+        for _ in range(3):
+            with metrics.stage_timer('encoding'):
+                pass
+        return metrics.server_timing_header(1.0)
+
+    header = contextvars.Context().run(run)
+    assert header.count('encoding;dur=') == 1
+    assert 'parse' not in header
+    assert header.endswith('total;dur=1000.000')
+
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(KeyError):
+        metrics.stage_timer('training')
+
+
+def test_empty_prediction_batch_is_counted_as_size_zero():
+    def samples():
+        (family,) = metrics.BATCH_SIZE.collect()
+        return {s.name: s.value for s in family.samples if not s.labels.get('le')}
+
+    before = samples()
+    metrics.observe_predictions([], [])
+    after = samples()
+    assert after['heartpipeline_batch_size_rows_count'] == before['heartpipeline_batch_size_rows_count'] + 1
+    assert after['heartpipeline_batch_size_rows_sum'] == before['heartpipeline_batch_size_rows_sum']
@@ -0,0 +1,111 @@
+import logging
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from heartpipeline.components.model_compression import ModelCompression
+from heartpipeline.entity.config_entity import ModelCompressionConfig
+from heartpipeline.serving.intervals import ConformalIntervals
+
+
+def make_config(tmp_path, **overrides) -> ModelCompressionConfig:
+    settings = dict(
+        root_dir=tmp_path, train_data_path=tmp_path / 'train.csv', test_data_path=tmp_path / 'test.csv',
+        model_path=tmp_path / 'model.pkl', compact_model_path=tmp_path / 'model_compact.pkl',
+        compact_conformal_path=tmp_path / 'conformal_compact.npz', report_path=tmp_path / 'compression_report.json',
+        enabled=True, max_r2_loss=0.05, tree_counts=[5, 10], student_depths=[2], student_estimators=20,
+        cost_batch_rows=100, target_column='accident_risk'
+    )
+    settings.update(overrides)
+    return ModelCompressionConfig(**settings)
+
+
+@pytest.fixture
+def teacher(tmp_path):
+    rng = np.random.default_rng(0)
+    frames = []
+    for rows in (1500, 600):
+        X = pd.DataFrame(rng.normal(size=(rows, 4)), columns=['a', 'b', 'c', 'd'])
+        frames.append(X.assign(accident_risk=X['a'] - 0.5 * X['b'] ** 2 + rng.normal(scale=0.1, size=rows)))
+    frames[0].to_csv(tmp_path / 'train.csv', index=False)
+    frames[1].to_csv(tmp_path / 'test.csv', index=False)
+    model = RandomForestRegressor(n_estimators=60, random_state=0).fit(frames[0][['a', 'b', 'c', 'd']].to_numpy(),
+                                                                         frames[0]['accident_risk'])
+    with open(tmp_path / 'model.pkl', 'wb') as f:
+        pickle.dump(model, f)
+    return model
+
+
+def test_greedy_selection_starts_with_the_best_single_tree(teacher):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(200, 4))
+    y = X[:, 0] - 0.5 * X[:, 1] ** 2
+    errors = [np.mean((tree.predict(X) - y) ** 2) for tree in teacher.estimators_]
+
+    order = ModelCompression.select_trees(teacher, X, y, max_trees=5)
+
+    assert order[0] == int(np.argmin(errors))
+    assert len(set(order)) == 5
+
+
+def test_selected_variant_is_faster_within_the_r2_budget(tmp_path, teacher):
+    report = ModelCompression(make_config(tmp_path, max_r2_loss=1.0)).compress()
+
+    points = {point['variant']: point for point in report['curve']}
+    selected = points[report['selected']]
+    assert selected['r2_score'] >= points['teacher']['r2_score'] - 1.0
+    assert selected['latency_ms'] < points['teacher']['latency_ms']
+    assert (report['evaluation_rows'], report['calibration_rows']) == (200, 200)
+
+    with open(tmp_path / 'model_compact.pkl', 'rb') as f:
+        compact = pickle.load(f)
+    intervals = ConformalIntervals.load(tmp_path / 'conformal_compact.npz', compact)
+    assert intervals.info()['calibration_rows'] == 200
+
+
+def test_without_an_eligible_variant_the_old_compact_model_is_removed(tmp_path, teacher):
+    (tmp_path / 'model_compact.pkl').write_bytes(b'stale')
+    (tmp_path / 'conformal_compact.npz').write_bytes(b'stale')
+
+    report = ModelCompression(make_config(tmp_path, max_r2_loss=-1.0)).compress()
+
+    assert report['selected'] is None
+    assert not (tmp_path / 'model_compact.pkl').exists()
+    assert not (tmp_path / 'conformal_compact.npz').exists()
+
+
+def test_withdrawing_a_compact_model_is_logged(tmp_path, teacher, caplog):
+    caplog.set_level(logging.INFO)
+    (tmp_path / 'model_compact.pkl').write_bytes(b'stale')
+    ModelCompression(make_config(tmp_path, max_r2_loss=-1.0)).compress()
+    assert any('Withdrew' in message and 'model_compact.pkl' in message for message in caplog.messages)
+
+
+def test_students_are_fitted_on_the_teachers_kind_of_input(tmp_path, teacher):
+    X_train = pd.read_csv(tmp_path / 'train.csv').drop(columns='accident_risk')
+    frame_teacher = RandomForestRegressor(n_estimators=10, random_state=0).fit(X_train, teacher.predict(X_train.to_numpy()))
+    compression = ModelCompression(make_config(tmp_path))
+
+    for model, named in ((teacher, False), (frame_teacher, True)):
+        X = compression.teacher_input(model, X_train)
+        for student in compression.distilled_variants(model, X).values():
+            assert hasattr(student, 'feature_names_in_') is named
+
+
+def test_pruned_variants_do_not_share_state_with_the_teacher(tmp_path, teacher):
+    X = pd.read_csv(tmp_path / 'test.csv')
+    y = X.pop('accident_risk').to_numpy()
+    gbm = GradientBoostingRegressor(n_estimators=30, random_state=0).fit(X.to_numpy(), y)
+    compression = ModelCompression(make_config(tmp_path, tree_counts=[5, 10, 100]))
+
+    for model in (teacher, gbm):
+        before = model.predict(X.to_numpy())
+        variants = compression.pruned_variants(model, X.to_numpy()[:200], y[:200])
+        # 100 exceeds both ensembles, so it yields no variant
+        assert sorted(len(variant.estimators_) for variant in variants.values()) == [5, 10]
+        for variant in variants.values():
+            assert not any(tree is original for tree in np.ravel(variant.estimators_)
+                           for original in np.ravel(model.estimators_))
+            variant.estimators_[0] = None
+        np.testing.assert_array_equal(model.predict(X.to_numpy()), before)
@@ -0,0 +1,66 @@
+import pickle
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from heartpipeline.components.model_costs import measure_costs, measure_latency, objective_score, rank_by_objective
+
+FAST = {'latency_ms': 0.5}
+SLOW = {'latency_ms': 20.0}
+
+
+def test_costs_of_a_fitted_model():
+    X = np.random.default_rng(0).normal(size=(200, 3))
+    model = LinearRegression().fit(X, X.sum(axis=1))
+    costs = measure_costs(model, X, batch_rows=50)
+
+    assert costs['size_bytes'] == len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    assert costs['load_ms'] >= 0 and costs['latency_ms'] > 0
+    assert costs['throughput_rows_per_s'] > 0
+    assert measure_latency(model, X, repeats=5) > 0
+
+
+def test_accuracy_objective_ignores_costs():
+    assert objective_score(0.9, SLOW, 'accuracy', 1.0, 0.1) > objective_score(0.8, FAST, 'accuracy', 1.0, 0.1)
+
+
+def test_latency_budget_prefers_feasible_models():
+    slow, fast = (objective_score(0.9, SLOW, 'max_latency', 1.0, 0.0),
+                  objective_score(0.8, FAST, 'max_latency', 1.0, 0.0))
+    assert fast > slow
+    # With no model inside the budget the fastest one wins
+    assert (objective_score(0.8, {'latency_ms': 5.0}, 'max_latency', 1.0, 0.0) >
+            objective_score(0.9, SLOW, 'max_latency', 1.0, 0.0))
+    # Inside the budget R2 decides
+    assert (objective_score(0.9, FAST, 'max_latency', 1.0, 0.0) >
+            objective_score(0.8, {'latency_ms': 0.1}, 'max_latency', 1.0, 0.0))
+
+
+def test_tradeoff_charges_latency():
+    assert objective_score(0.9, SLOW, 'tradeoff', 1.0, 0.01) == pytest.approx((0.7,))
+    assert objective_score(0.85, FAST, 'tradeoff', 1.0, 0.01) > objective_score(0.9, SLOW, 'tradeoff', 1.0, 0.01)
+
+
+def test_unknown_objective():
+    with pytest.raises(ValueError, match="Unknown selection objective"):
+        objective_score(0.9, FAST, 'cheapest', 1.0, 0.0)
+
+
+def test_results_are_ranked_best_first():
+    results = [(0.9, 'slow', None), (0.8, 'fast', None), (0.85, 'medium', None)]
+    costs = {'slow': SLOW, 'fast': FAST, 'medium': {'latency_ms': 2.0}}
+
+    assert [name for _, name, _ in rank_by_objective(results, costs, 'accuracy', 1.0, 0.0)] == ['slow', 'medium', 'fast']
+    assert [name for _, name, _ in rank_by_objective(results, costs, 'max_latency', 1.0, 0.0)] == ['fast', 'medium', 'slow']
+    assert [name for _, name, _ in rank_by_objective(results, costs, 'tradeoff', 1.0, 0.01)][0] == 'medium'
+    # The input order is left alone
+    assert [name for _, name, _ in results] == ['slow', 'fast', 'medium']
+
+
+def test_ranking_edge_cases():
+    assert rank_by_objective([], {}, 'accuracy', 1.0, 0.0) == []
+    # Equal keys keep their input order
+    tied = [(0.8, 'a', None), (0.8, 'b', None)]
+    assert rank_by_objective(tied, {'a': FAST, 'b': FAST}, 'accuracy', 1.0, 0.0) == tied
+    with pytest.raises(KeyError):
+        rank_by_objective([(0.8, 'unmeasured', None)], {}, 'accuracy', 1.0, 0.0)
+
@@ -0,0 +1,102 @@
+import numpy as np
+from heartpipeline.serving.cache import artifact_version
+from heartpipeline.serving.model_store import ModelStore, ServingBundle
+
+
+class ConstantPredictor:
+    def __init__(self, version: str, value: float = 0.3):
+        self.version = version
+        self.value = value
+
+    def predict(self, df):
+        return np.full(len(df), self.value)
+
+
+def test_recalibrated_intervals_are_swapped_in_with_an_unchanged_model(tmp_path):
+    conformal = tmp_path / 'conformal.npz'
+    conformal.write_bytes(b'scores-v1')
+
+    def loader():
+        return ServingBundle(predictor=ConstantPredictor('model-v1'), intervals=object(),
+                             auxiliary_version=artifact_version([conformal]))
+
+    store = ModelStore(loader, artifact_paths=[conformal])
+    first = store.current
+
+    assert store.reload()['status'] == 'unchanged'
+    conformal.write_bytes(b'scores-v2')
+    assert store.reload()['status'] == 'reloaded'
+    assert store.current is not first and store.current.version == 'model-v1'
+
+
+def test_golden_inputs_guard_the_swap(tmp_path):
+    golden = tmp_path / 'golden.json'
+    golden.write_text('[{"curvature": 0.5}]')
+    predictors = iter([ConstantPredictor('v1'), ConstantPredictor('v2', 5.0), ConstantPredictor('v3', 0.4)])
+    store = ModelStore(lambda: ServingBundle(predictor=next(predictors)), artifact_paths=[golden],
+                       golden_inputs_path=golden, max_prediction_shift=0.5)
+
+    rejected = store.reload()
+    accepted = store.reload()
+
+    assert rejected['status'] == 'failed' and rejected['version'] == 'v1'
+    assert accepted['status'] == 'reloaded' and store.current.version == 'v3'
+
+
+def test_forced_reload_swaps_and_notifies(tmp_path):
+    model = tmp_path / 'model.pkl'
+    model.write_bytes(b'model')
+    swapped = []
+    store = ModelStore(lambda: ServingBundle(predictor=ConstantPredictor('v1')), artifact_paths=[model],
+                       on_swap=lambda bundle: swapped.append(bundle.version))
+    first = store.current
+
+    assert store.reload()['status'] == 'unchanged' and not swapped
+    assert store.reload(force=True)['status'] == 'reloaded'
+    assert store.current is not first and swapped == ['v1']
+
+
+def test_missing_required_artifact_is_not_a_reload_trigger(tmp_path):
+    model, stats = tmp_path / 'model.pkl', tmp_path / 'feature_stats.json'
+    model.write_bytes(b'model')
+    store = ModelStore(lambda: ServingBundle(predictor=ConstantPredictor('v1')), artifact_paths=[model],
+                       optional_paths=[stats])
+
+    assert store._required_present(store._artifact_mtimes())
+    model.unlink()
+    assert not store._required_present(store._artifact_mtimes())
+
+
+def test_failed_loads_and_invalid_predictions_keep_the_live_bundle(tmp_path):
+    golden = tmp_path / 'golden.json'
+    golden.write_text('[{"curvature": 0.5}, {"curvature": 0.9}]')
+    candidates = iter([ConstantPredictor('v1'), RuntimeError('corrupt model.pkl'), ConstantPredictor('nan', np.nan),
+                       ConstantPredictor('high', 1.3)])
+
+    def loader():
+        candidate = next(candidates)
+        if isinstance(candidate, Exception):
+            raise candidate
+        return ServingBundle(predictor=candidate)
+
+    store = ModelStore(loader, artifact_paths=[golden], golden_inputs_path=golden, max_prediction_shift=2.0)
+    for error in ('corrupt model.pkl', 'invalid prediction nan', 'invalid prediction 1.3'):
+        result = store.reload(force=True)
+        assert result['status'] == 'failed' and error in result['error']
+        assert store.current.version == 'v1'
+    assert store.status()['last_reload']['status'] == 'failed'
+
+
+def test_empty_golden_inputs_and_concurrent_reloads(tmp_path):
+    golden = tmp_path / 'golden.json'
+    golden.write_text('[]')
+    store = ModelStore(lambda: ServingBundle(predictor=ConstantPredictor('v1', 5.0)), artifact_paths=[golden],
+                       golden_inputs_path=golden)
+
+    # No golden records: nothing to compare, the reload goes through
+    assert store.reload(force=True)['status'] == 'reloaded'
+    store._reload_lock.acquire()
+    try:
+        assert store.reload(force=True) == {'status': 'in_progress'}
+    finally:
+        store._reload_lock.release()
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip('mlflow')
+pytest.importorskip('xgboost')
+
+import json
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from heartpipeline.components.model_trainer import ModelTrainer
+from heartpipeline.entity.config_entity import ModelTrainerConfig
+from heartpipeline.serving.intervals import ConformalIntervals
+
+
+def make_config(tmp_path, **overrides) -> ModelTrainerConfig:
+    settings = dict(
+        root_dir=tmp_path, train_data_path=tmp_path / 'train.csv', test_data_path=tmp_path / 'test.csv',
+        model_name='model.pkl', candidate_model_name='candidate_model.pkl', candidates_dir=tmp_path / 'candidates',
+        conformal_path=tmp_path / 'conformal.npz', calibration_fraction=0.5, ensemble_mode='none', cv_folds=3,
+        oof_dir=tmp_path / 'oof', ensemble_report_path=tmp_path / 'ensemble.json', min_gain_per_ms=0.0,
+        cost_report_path=tmp_path / 'model_costs.json', selection_objective='accuracy', max_latency_ms=10.0,
+        latency_penalty=0.001, cost_batch_rows=100, target_column='accident_risk', params={}
+    )
+    settings.update(overrides)
+    return ModelTrainerConfig(**settings)
+
+
+@pytest.fixture
+def test_rows():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, 3)), columns=['a', 'b', 'c'])
+    return X, pd.Series(X['a'] - 0.5 * X['b'] + rng.normal(scale=0.1, size=400), name='accident_risk')
+
+
+def test_selection_calibrates_the_winner_on_the_held_out_rows(tmp_path, test_rows):
+    X, y = test_rows
+    good = LinearRegression().fit(X, y)
+    poor = LinearRegression().fit(X[['c']].assign(a=0.0, b=0.0)[['a', 'b', 'c']], y)
+    trainer = ModelTrainer(make_config(tmp_path, calibration_fraction=0.25))
+
+    # Scores passed in are replaced by R2 on the selection rows
+    score, name, _ = trainer.save_selection([(0.99, 'poor', poor), (0.1, 'good', good)], X, y)
+
+    assert name == 'good' and score > 0.9
+    assert ConformalIntervals.load(tmp_path / 'conformal.npz', good).info()['calibration_rows'] == 100
+    assert (tmp_path / 'candidate_model.pkl').exists()
+
+
+def test_models_are_ranked_by_the_selection_objective(tmp_path, test_rows):
+    X, y = test_rows
+    fast = LinearRegression().fit(X, y)
+    trainer = ModelTrainer(make_config(tmp_path, selection_objective='max_latency', max_latency_ms=0.0))
+    results = [(0.9, 'first', fast), (0.8, 'second', fast)]
+
+    trainer.rank_by_cost(results, X)
+
+    # Nothing fits a zero budget, so both fall back to latency and the report lists every model
+    with open(tmp_path / 'model_costs.json') as f:
+        report = json.load(f)
+    assert report['selected'] == results[0][1]
+    assert sorted(report['models']) == ['first', 'second']
+    assert {'size_bytes', 'load_ms', 'latency_ms', 'throughput_rows_per_s', 'rank'} <= set(report['models']['first'])
+
+
+def test_parallel_candidates_log_to_separate_runs(tmp_path, test_rows, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from mlflow.tracking import MlflowClient
+
+    monkeypatch.setenv('MLFLOW_TRACKING_URI', f"sqlite:///{tmp_path / 'mlflow.db'}")
+    X, y = test_rows
+    X.assign(accident_risk=y).to_csv(tmp_path / 'train.csv', index=False)
+    X.assign(accident_risk=y).to_csv(tmp_path / 'test.csv', index=False)
+    trainer = ModelTrainer(make_config(tmp_path, params={'Ridge': {'alpha': 2.0},
+                                                         'RandomForestRegressor': {'n_estimators': 5}}))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(trainer.train_candidate, ['Ridge', 'RandomForest']))
+
+    runs = {run.info.run_name: run for run in MlflowClient().search_runs([trainer.experiment_id])}
+    assert set(runs) == {'Ridge', 'RandomForest'}
+    assert runs['Ridge'].data.params == {'alpha': '2.0'}
+    assert runs['RandomForest'].data.params == {'n_estimators': '5'}
+    assert all(run.info.status == 'FINISHED' and 'test_r2' in run.data.metrics for run in runs.values())
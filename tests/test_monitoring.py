@@ -0,0 +1,247 @@
+import dataclasses
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from heartpipeline.components.monitoring import ModelMonitoring
+from heartpipeline.components.data_transformation import hash_test_mask
+from heartpipeline.entity.config_entity import MonitoringConfig
+from heartpipeline.monitoring.history import MonitoringHistory
+from heartpipeline.monitoring.sketches import DatasetSketch, compare
+from heartpipeline.serving.predictor import RiskPredictor
+
+
+def make_config(tmp_path, **overrides) -> MonitoringConfig:
+    settings = dict(
+        root_dir=tmp_path, reference_data_path=tmp_path / 'train.csv', current_data_path=tmp_path / 'test.csv',
+        model_path=tmp_path / 'model.pkl', scaler_path=tmp_path / 'scaler.pkl',
+        encoder_path=tmp_path / 'categorical_encoder.pkl', feature_stats_path=tmp_path / 'feature_stats.json',
+        evidently_report_path=tmp_path / 'report.txt',
+        shadow_log_path=tmp_path / 'shadow.jsonl', history_db_path=tmp_path / 'history.db',
+        sketch_dir=tmp_path / 'sketches', raw_reference_data_path=tmp_path / 'raw.csv',
+        feature_data_path=tmp_path / 'road_features.csv', test_ids_path=tmp_path / 'test_ids.csv',
+        split_manifest_path=tmp_path / 'split_manifest.json', sketch_chunk_rows=100,
+        drift_report_sample_rows=0, psi_threshold=0.2, ks_threshold=0.05, drift_share_threshold=0.5,
+        attribution_sample_rows=50, attribution_drift_threshold=0.1, target_column='accident_risk'
+    )
+    settings.update(overrides)
+    return MonitoringConfig(**settings)
+
+
+@pytest.fixture
+def scaled_splits():
+    rng = np.random.default_rng(0)
+    frames = []
+    for rows in (300, 100):
+        X = pd.DataFrame(rng.normal(size=(rows, 3)), columns=['a', 'b', 'c'])
+        frames.append(X.assign(accident_risk=0.3 * X['a'] - 0.1 * X['b'] + 0.5))
+    model = LinearRegression().fit(frames[0][['a', 'b', 'c']], frames[0]['accident_risk'])
+    return model, frames[0], frames[1]
+
+
+def test_basic_report_matches_generate_report_keys(tmp_path, scaled_splits):
+    model, train_df, test_df = scaled_splits
+    report = ModelMonitoring(make_config(tmp_path)).basic_report(model, train_df, test_df)
+
+    assert report['fallback'] is True
+    assert set(report) >= {'summary', 'drift_html', 'dataset_drift', 'drift_ratio', 'drift_tests',
+                           'attribution_drift', 'serving_drift', 'shadow_comparison', 'performance',
+                           'history_run_id'}
+    assert report['performance']['current']['R2'] == pytest.approx(1.0)
+    assert 'prediction' not in train_df.columns
+
+
+def test_fallback_uses_the_frames_it_was_given(tmp_path, scaled_splits, monkeypatch):
+    model, train_df, test_df = scaled_splits
+    monitoring = ModelMonitoring(make_config(tmp_path))
+    monkeypatch.setattr(monitoring, 'build_sketches', lambda *args: (_ for _ in ()).throw(RuntimeError('boom')))
+
+    # Neither the split CSVs nor model.pkl exist, so this only works from the in-memory inputs
+    report = monitoring.generate_report(model=model, reference_data=train_df, current_data=test_df)
+
+    assert report['fallback'] is True
+    assert report['summary'] == str(tmp_path / 'report.txt')
+
+
+def test_feature_statistics_report_absolute_mean_change():
+    reference = DatasetSketch().update(pd.DataFrame({'x': np.random.default_rng(0).normal(0, 1, 5000)})).set_edges()
+    current = DatasetSketch.empty_like(reference).update(pd.DataFrame({'x': np.random.default_rng(1).normal(0.5, 1, 5000)}))
+
+    stats = ModelMonitoring.feature_statistics(reference, current, {})
+
+    # A relative change would divide by a reference mean of about 0
+    assert stats['x']['mean_change'] == pytest.approx(0.5, abs=0.05)
+    assert 'mean_change_pct' not in stats['x']
+
+
+def test_history_records_the_serving_version(tmp_path, root_dir):
+    artifacts = os.path.join(root_dir, 'artifacts')
+    config = make_config(
+        tmp_path,
+        model_path=os.path.join(artifacts, 'model_trainer', 'model.pkl'),
+        scaler_path=os.path.join(artifacts, 'data_transformation', 'scaler.pkl'),
+        encoder_path=os.path.join(artifacts, 'data_transformation', 'categorical_encoder.pkl'),
+        feature_stats_path=os.path.join(artifacts, 'feature_engineering', 'feature_stats.json')
+    )
+    frame = pd.DataFrame({'x': [0.0, 1.0]})
+
+    ModelMonitoring(config).record_history(len(frame), len(frame), False, 0.0, {}, {})
+
+    served = RiskPredictor.load(config.model_path, config.scaler_path, config.encoder_path,
+                                record_metrics=False, feature_stats_path=config.feature_stats_path)
+    assert MonitoringHistory(config.history_db_path).runs()[0]['model_version'] == served.version
+
+
+def test_drift_sketches_stream_unencoded_features(tmp_path, road_data):
+    config = make_config(tmp_path, sketch_chunk_rows=64)
+    features = road_data(1000)
+    features.to_csv(config.feature_data_path, index=False)
+    test_ids = features['id'].iloc[::5]
+    test_ids.to_frame().to_csv(config.test_ids_path, index=False)
+
+    reference, current = ModelMonitoring(config).build_sketches([np.zeros(500), np.zeros(300)], [np.ones(200)])
+    drift_tests = compare(reference, current)
+
+    assert reference.columns['road_type'].kind == 'categorical'
+    assert drift_tests['road_type']['test'] == 'chi_square'
+    assert drift_tests['curvature']['test'] == 'ks'
+    assert 'id' not in reference.columns
+    assert (reference.columns['curvature'].count, current.columns['curvature'].count) == (800, 200)
+    assert current.columns['prediction'].mean == pytest.approx(1.0)
+
+
+def test_shadow_pairs_are_compared_per_version_pair(tmp_path):
+    config = make_config(tmp_path)
+    pairs = [('p1', 'c1', 0.2, 0.25), ('p1', 'c1', 0.5, 0.45), ('p1', 'c1', 0.7, 0.4), ('p1', 'c2', 0.2, 0.2)]
+    pd.DataFrame([{'primary_version': p, 'candidate_version': c, 'prediction': a, 'shadow_prediction': b}
+                  for p, c, a, b in pairs]).to_json(config.shadow_log_path, orient='records', lines=True)
+
+    comparisons = ModelMonitoring(config).compare_shadow_predictions()
+
+    assert comparisons['p1 vs c1']['pairs'] == 3
+    assert comparisons['p1 vs c1']['mean_abs_diff'] == pytest.approx(0.4 / 3)
+    # 0.7 is high risk, 0.4 medium
+    assert comparisons['p1 vs c1']['risk_level_agreement'] == pytest.approx(2 / 3)
+    assert comparisons['p1 vs c2']['pairs'] == 1
+
+
+@pytest.fixture
+def pipeline_outputs(tmp_path, road_data):
+    """Feature file, hash split manifest and scaled train/test CSVs as the pipeline leaves them"""
+    config = make_config(tmp_path, sketch_chunk_rows=97, attribution_sample_rows=40)
+    features = road_data(1000, seed=3)
+    features.to_csv(config.feature_data_path, index=False)
+    with open(config.split_manifest_path, 'w') as f:
+        json.dump({'split_method': 'hash', 'split_salt': 'salt', 'test_size': 0.2}, f)
+    is_test = hash_test_mask(features['id'].to_numpy(), 0.2, 'salt')
+    numeric = ['num_lanes', 'curvature', 'speed_limit', 'num_reported_accidents']
+    splits = [features.loc[~is_test, numeric + ['accident_risk']], features.loc[is_test, numeric + ['accident_risk']]]
+    splits[0].to_csv(config.reference_data_path, index=False)
+    splits[1].to_csv(config.current_data_path, index=False)
+    model = LinearRegression().fit(splits[0][numeric], splits[0]['accident_risk'])
+    return config, model, splits
+
+
+def test_report_streams_the_splits_into_exact_error_totals(pipeline_outputs):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    config, model, splits = pipeline_outputs
+
+    # Neither frames nor predictions are passed: both splits are read in 97-row chunks
+    report = ModelMonitoring(config).generate_report(model=model)
+
+    assert report['fallback'] is False and report['drift_html'] is None
+    for name, split in zip(('reference', 'current'), splits):
+        y_pred = model.predict(split.drop(columns='accident_risk'))
+        expected = {'MAE': mean_absolute_error(split['accident_risk'], y_pred),
+                    'RMSE': np.sqrt(mean_squared_error(split['accident_risk'], y_pred)),
+                    'R2': r2_score(split['accident_risk'], y_pred)}
+        assert report['performance'][name] == pytest.approx(expected)
+    run = MonitoringHistory(config.history_db_path).runs()[0]
+    assert (run['reference_rows'], run['current_rows']) == (len(splits[0]), len(splits[1]))
+    assert report['drift_tests']['prediction']['reference_rows'] == len(splits[0])
+    assert report['attribution_drift'] is not None
+
+
+def test_passed_predictions_are_sliced_per_chunk(pipeline_outputs):
+    config, model, splits = pipeline_outputs
+    predictions = [model.predict(split.drop(columns='accident_risk')) for split in splits]
+    monitoring = ModelMonitoring(config)
+
+    report = monitoring.generate_report(model=model, reference_data=splits[0], current_data=splits[1],
+                                        reference_predictions=predictions[0], current_predictions=predictions[1])
+
+    current = DatasetSketch.load(os.path.join(config.sketch_dir, 'current.json'))
+    assert current.columns['prediction'].mean == pytest.approx(predictions[1].mean())
+    assert 'prediction' not in splits[0].columns
+    assert report['performance']['current']['R2'] == pytest.approx(
+        1 - ((splits[1]['accident_risk'] - predictions[1]) ** 2).sum() /
+        ((splits[1]['accident_risk'] - splits[1]['accident_risk'].mean()) ** 2).sum())
+
+
+def test_hash_split_membership_needs_no_test_ids(pipeline_outputs):
+    config, _, _ = pipeline_outputs
+    assert not os.path.exists(config.test_ids_path)
+    ids = np.arange(5000)
+
+    is_test = ModelMonitoring(config).test_membership()
+
+    np.testing.assert_array_equal(is_test(ids), hash_test_mask(ids, 0.2, 'salt'))
+
+
+def test_random_split_membership_reads_the_test_ids(tmp_path):
+    config = make_config(tmp_path, sketch_chunk_rows=3)
+    pd.DataFrame({'id': [9, 2, 7, 4, 11]}).to_csv(config.test_ids_path, index=False)
+    with open(config.split_manifest_path, 'w') as f:
+        json.dump({'split_method': 'random', 'split_salt': 'salt', 'test_size': 0.2}, f)
+
+    is_test = ModelMonitoring(config).test_membership()
+
+    assert list(is_test(np.arange(12))) == [i in (2, 4, 7, 9, 11) for i in range(12)]
+    # An empty test set routes every row to the reference
+    pd.DataFrame({'id': []}).to_csv(config.test_ids_path, index=False)
+    assert not ModelMonitoring(config).test_membership()(np.arange(5)).any()
+
+
+def test_raw_reference_sketch_is_cached_until_the_data_changes(tmp_path, road_data, monkeypatch):
+    config = make_config(tmp_path)
+    road_data(300).to_csv(config.raw_reference_data_path, index=False)
+    monitoring = ModelMonitoring(config)
+    first = monitoring.sketch_raw_reference()
+
+    reads = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: reads.append(args) or read_csv(*args, **kwargs))
+    prediction = DatasetSketch().update(pd.DataFrame({'prediction': np.linspace(0, 1, 50)})).columns['prediction']
+    cached = monitoring.sketch_raw_reference(prediction)
+
+    assert reads == []
+    assert cached.columns['curvature'].count == first.columns['curvature'].count == 300
+    np.testing.assert_array_equal(cached.columns['curvature'].histogram.edges, first.columns['curvature'].histogram.edges)
+    assert cached.columns['prediction'].count == 50
+
+    road_data(400, seed=1).to_csv(config.raw_reference_data_path, index=False)
+    rebuilt = monitoring.sketch_raw_reference()
+    assert len(reads) == 1 and rebuilt.columns['curvature'].count == 400
+    # The prediction column belongs to one model and is not carried over
+    assert 'prediction' not in rebuilt.columns
+
+
+def test_evidently_report_runs_on_the_bounded_sample(pipeline_outputs, monkeypatch):
+    pytest.importorskip('evidently')
+    from evidently import Report
+    config, model, _ = pipeline_outputs
+    config = dataclasses.replace(config, drift_report_sample_rows=150)
+    sizes = []
+    run = Report.run
+    monkeypatch.setattr(Report, 'run', lambda self, current_data, reference_data, *args, **kwargs:
+                        sizes.append((len(reference_data), len(current_data))) or
+                        run(self, current_data, reference_data, *args, **kwargs))
+
+    report = ModelMonitoring(config).generate_report(model=model)
+
+    assert os.path.exists(report['drift_html'])
+    # The current split has about 200 rows, the reference about 800: both are capped at 150
+    assert sizes == [(150, 150)]
+
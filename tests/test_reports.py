@@ -0,0 +1,114 @@
+import gzip
+import os
+import threading
+from heartpipeline.serving.reports import CachedReport, ReportCache, render_text_report
+
+
+def wait_for_compression():
+    for thread in threading.enumerate():
+        if thread.name.startswith('report-compress-'):
+            thread.join(timeout=10)
+
+
+def test_html_reports_are_served_from_the_source_file(tmp_path):
+    source = tmp_path / 'drift.html'
+    source.write_text('<html>drift</html>')
+    cache = ReportCache(tmp_path / 'cache')
+    cache.register('drift', source)
+
+    entry = cache.get('drift')
+    assert entry.variants['identity'] == str(source)
+    wait_for_compression()
+    with open(entry.variants['gzip'], 'rb') as f:
+        assert gzip.decompress(f.read()) == b'<html>drift</html>'
+    assert cache.get('drift') is entry
+
+
+def test_text_reports_are_rendered_once_and_escaped(tmp_path):
+    source = tmp_path / 'performance.txt'
+    source.write_text('R2 < 0.9 & falling')
+    cache = ReportCache(tmp_path / 'cache', precompress=False)
+    cache.register('performance', source, render=render_text_report)
+
+    entry = cache.get('performance')
+    with open(entry.variants['identity'], encoding='utf-8') as f:
+        assert f.read() == render_text_report('R2 < 0.9 & falling')
+    assert 'R2 &lt; 0.9 &amp; falling' in render_text_report('R2 < 0.9 & falling')
+    assert set(entry.variants) == {'identity'}
+
+
+def test_changed_sources_get_a_new_version_and_stale_files_are_pruned(tmp_path):
+    source = tmp_path / 'performance.txt'
+    source.write_text('first')
+    cache = ReportCache(tmp_path / 'cache')
+    cache.register('performance', source, render=render_text_report)
+    first = cache.get('performance')
+    wait_for_compression()
+
+    source.write_text('second run')
+    os.utime(source, ns=(first.key[0] + 10**9, first.key[0] + 10**9))
+    second = cache.get('performance')
+    wait_for_compression()
+
+    assert second.etag != first.etag
+    assert all(name.startswith(f"performance-{second.etag}.") for name in os.listdir(tmp_path / 'cache'))
+
+
+def test_missing_sources_are_none(tmp_path):
+    cache = ReportCache(tmp_path / 'cache')
+    cache.register('drift', tmp_path / 'missing.html')
+    assert cache.get('drift') is None
+
+
+def test_encoding_follows_preference_and_quality():
+    entry = CachedReport(key=(1, 1), etag='1-1', variants={'identity': 'a', 'gzip': 'b', 'br': 'c'})
+    assert ReportCache.choose_encoding(entry, 'gzip, br') == 'br'
+    assert ReportCache.choose_encoding(entry, 'gzip;q=1.0, br;q=0') == 'gzip'
+    assert ReportCache.choose_encoding(entry, '*') == 'br'
+    assert ReportCache.choose_encoding(entry, 'deflate') == 'identity'
+    assert ReportCache.choose_encoding(entry, None) == 'identity'
+    del entry.variants['br']
+    assert ReportCache.choose_encoding(entry, 'br, gzip') == 'gzip'
+
+
+def test_pruning_leaves_reports_with_a_shared_prefix_alone(tmp_path):
+    for name in ('drift', 'drift-weekly'):
+        (tmp_path / f"{name}.txt").write_text(name)
+    cache = ReportCache(tmp_path / 'cache')
+    for name in ('drift', 'drift-weekly'):
+        cache.register(name, tmp_path / f"{name}.txt", render=render_text_report)
+    weekly = cache.get('drift-weekly')
+    wait_for_compression()
+
+    source = tmp_path / 'drift.txt'
+    first = cache.get('drift')
+    wait_for_compression()
+    source.write_text('changed')
+    os.utime(source, ns=(first.key[0] + 10**9, first.key[0] + 10**9))
+    cache.get('drift')
+    wait_for_compression()
+
+    assert all(os.path.exists(path) for path in weekly.variants.values())
+
+
+def test_empty_and_undecodable_text_reports_render(tmp_path):
+    empty = tmp_path / 'empty.txt'
+    empty.write_text('')
+    binary = tmp_path / 'binary.txt'
+    binary.write_bytes(b'R2 \xff\xfe 0.9')
+    cache = ReportCache(tmp_path / 'cache', precompress=False)
+    cache.register('empty', empty, render=render_text_report)
+    cache.register('binary', binary, render=render_text_report)
+
+    with open(cache.get('empty').variants['identity'], encoding='utf-8') as f:
+        assert f.read() == render_text_report('')
+    with open(cache.get('binary').variants['identity'], encoding='utf-8') as f:
+        assert 'R2 �� 0.9' in f.read()
+
+
+def test_malformed_accept_encoding_headers():
+    entry = CachedReport(key=(1, 1), etag='1-1', variants={'identity': 'a', 'gzip': 'b'})
+    assert ReportCache.choose_encoding(entry, 'GZIP') == 'gzip'
+    assert ReportCache.choose_encoding(entry, 'gzip;q=abc') == 'identity'
+    assert ReportCache.choose_encoding(entry, ' , ;q=1,') == 'identity'
+    assert ReportCache.choose_encoding(entry, '*;q=0') == 'identity'
@@ -0,0 +1,118 @@
+import os
+import pytest
+import yaml
+from heartpipeline.serving.request_schema import MAX_BATCH_SIZE, RequestSchema, RequestValidationError
+
+
+@pytest.fixture(scope='module')
+def schema_config(root_dir):
+    with open(os.path.join(root_dir, 'config', 'schema.yaml')) as f:
+        return yaml.safe_load(f)
+
+
+@pytest.fixture
+def schema(schema_config):
+    return RequestSchema.from_schema(schema_config)
+
+
+class Vocabulary:
+    vocabulary = {'road_type': ['highway', 'rural', 'urban', 'nan'], 'weather': ['clear']}
+
+
+def test_values_are_coerced_and_defaults_filled(schema):
+    clean = schema.validate_one({'road_type': ' urban ', 'num_lanes': '3', 'curvature': '0.75',
+                                 'speed_limit': 45.0, 'holiday': 'yes', 'public_road': False, 'id': 7})
+
+    assert list(clean) == list(schema.fields)
+    assert clean['road_type'] == 'urban'
+    assert (clean['num_lanes'], clean['curvature'], clean['speed_limit']) == (3, 0.75, 45)
+    assert (clean['holiday'], clean['public_road'], clean['school_season']) == (1, 0, 1)
+    assert clean['weather'] == 'clear'
+
+
+@pytest.mark.parametrize('field, value, error', [
+    ('num_lanes', 2.5, "must be a whole number"),
+    ('curvature', 'steep', "must be a number"),
+    ('curvature', float('nan'), "must be finite"),
+    ('curvature', 1.5, "must be between 0.0 and 1.0"),
+    ('speed_limit', 200, "must be between 20 and 120"),
+    ('holiday', 'maybe', "must be a boolean (true/false, yes/no or 1/0)"),
+    ('lighting', 'moonlight', "must be one of ['daylight', 'dim', 'night']"),
+    ('weather', 3, "must be a string"),
+    ('colour', 'red', "unknown field"),
+])
+def test_invalid_fields_are_reported(schema, field, value, error):
+    clean, errors = schema.validate({field: value})
+    assert clean is None
+    assert errors == [{'field': field, 'error': error}]
+
+
+def test_required_fields_without_defaults(schema_config):
+    config = dict(schema_config, requests=dict(schema_config['requests'], defaults={}))
+    _, errors = RequestSchema.from_schema(config).validate({})
+    assert {'field': 'road_type', 'error': "is required"} in errors
+
+
+def test_categories_come_from_the_encoder_vocabulary(schema_config):
+    schema = RequestSchema.from_schema(schema_config, Vocabulary())
+    assert schema.validate({'road_type': 'nan'})[1] == [
+        {'field': 'road_type', 'error': "must be one of ['highway', 'rural', 'urban']"}]
+    # The encoder never saw rainy, so it would silently fall back
+    assert schema.validate({'weather': 'rainy'})[1] == [{'field': 'weather', 'error': "must be one of ['clear']"}]
+
+
+def test_batch_errors_carry_the_record_index(schema):
+    with pytest.raises(RequestValidationError) as raised:
+        schema.validate_batch({'instances': [{'num_lanes': 2}, {'num_lanes': 0}, 'text']})
+
+    assert raised.value.errors == [
+        {'index': 1, 'field': 'num_lanes', 'error': "must be between 1 and 8"},
+        {'index': 2, 'field': None, 'error': "record must be a JSON object"}
+    ]
+    assert str(raised.value).startswith("[1] num_lanes: must be between 1 and 8")
+
+
+@pytest.mark.parametrize('payload', [[], 'text', [{}] * (MAX_BATCH_SIZE + 1)])
+def test_malformed_batches_are_rejected(schema, payload):
+    with pytest.raises(RequestValidationError):
+        schema.validate_batch(payload)
+
+
+def test_single_records_and_batches(schema):
+    assert schema.validate_batch({'num_lanes': 2})[1] is False
+    records, is_batch = schema.validate_batch([{'num_lanes': 2}, {'num_lanes': 3}])
+    assert is_batch and [record['num_lanes'] for record in records] == [2, 3]
+
+
+@pytest.mark.parametrize('field, value, expected', [
+    ('num_lanes', ' 4 ', 4),
+    ('num_lanes', '1e0', 1),
+    ('num_lanes', 3.0, 3),
+    ('curvature', '-0', 0.0),
+    ('curvature', '1e-400', 0.0),
+    ('speed_limit', '20', 20),
+    ('speed_limit', 120.0, 120),
+    ('holiday', ' YES ', 1),
+    ('holiday', 1.0, 1),
+    # JSON null counts as a missing field and takes the default
+    ('road_type', None, 'highway'),
+])
+def test_edge_values_are_coerced(schema, field, value, expected):
+    clean, errors = schema.validate({field: value})
+    assert errors == []
+    assert clean[field] == expected
+
+
+@pytest.mark.parametrize('field, value, error', [
+    ('num_lanes', True, "must be an integer"),
+    ('num_lanes', [2], "must be an integer"),
+    ('num_lanes', float('inf'), "must be finite"),
+    ('num_lanes', 'inf', "must be finite"),
+    ('num_lanes', 10**30, "must be between 1 and 8"),
+    ('curvature', True, "must be a number"),
+    ('curvature', '', "must be a number"),
+    ('holiday', 2, "must be a boolean (true/false, yes/no or 1/0)"),
+    ('road_type', '', "must be one of ['highway', 'rural', 'urban']"),
+])
+def test_edge_values_are_rejected(schema, field, value, error):
+    assert schema.validate({field: value})[1] == [{'field': field, 'error': error}]
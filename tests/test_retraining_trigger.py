@@ -0,0 +1,90 @@
+import os
+import json
+import pandas as pd
+import pytest
+from heartpipeline.components.retraining_trigger import RetrainingTrigger
+from heartpipeline.entity.config_entity import RetrainingTriggerConfig
+
+
+def make_config(tmp_path, root_dir, **overrides) -> RetrainingTriggerConfig:
+    artifacts = os.path.join(root_dir, 'artifacts')
+    settings = dict(
+        root_dir=tmp_path, data_path=tmp_path / 'road_data.csv',
+        model_path=os.path.join(artifacts, 'model_trainer', 'model.pkl'),
+        scaler_path=os.path.join(artifacts, 'data_transformation', 'scaler.pkl'),
+        encoder_path=os.path.join(artifacts, 'data_transformation', 'categorical_encoder.pkl'),
+        feature_stats_path=tmp_path / 'feature_stats.json', test_ids_path=tmp_path / 'test_ids.csv',
+        reference_profile_path=tmp_path / 'reference_profile.json', training_ids_path=tmp_path / 'training_ids.npy',
+        decision_path=tmp_path / 'decision.json', column_drift_threshold=0.1, drift_share_threshold=0.3,
+        max_rmse_increase=0.1, force_retrain=False, target_column='accident_risk'
+    )
+    settings.update(overrides)
+    return RetrainingTriggerConfig(**settings)
+
+
+@pytest.fixture
+def promoted(tmp_path, root_dir, road_data):
+    """A trigger whose reference was saved for 600 rows, 100 of them test rows"""
+    config = make_config(tmp_path, root_dir)
+    df = road_data(600, seed=0)
+    df.to_csv(config.data_path, index=False)
+    pd.DataFrame({'id': df['id'].iloc[400:500]}).to_csv(config.test_ids_path, index=False)
+    trigger = RetrainingTrigger(config)
+    trigger.save_reference()
+    return trigger, df
+
+
+def test_reference_is_scored_on_test_rows(promoted):
+    trigger, _ = promoted
+    with open(trigger.config.reference_profile_path) as f:
+        reference = json.load(f)
+    assert reference['rows'] == 600
+    assert reference['performance']['rows'] == 100
+
+
+def test_decision_scores_only_rows_the_model_was_not_trained_on(promoted, road_data):
+    trigger, df = promoted
+    grown = pd.concat([df, road_data(50, seed=1, start_id=600)], ignore_index=True)
+
+    unseen = trigger.unseen_rows(grown)
+    decision = trigger.decide(df=grown)
+
+    assert sorted(unseen['id']) == list(range(400, 500)) + list(range(600, 650))
+    assert decision['performance']['current']['rows'] == 150
+    assert os.path.exists(trigger.config.decision_path)
+
+
+def test_without_training_ids_every_row_is_scored(promoted):
+    trigger, df = promoted
+    os.remove(trigger.config.training_ids_path)
+
+    assert len(trigger.unseen_rows(df)) == len(df)
+
+
+def test_forced_decision_retrains(promoted):
+    trigger, df = promoted
+    decision = trigger.decide(force=True, df=df)
+
+    assert decision['retrain'] is True
+    assert decision['reasons'] == ["retraining forced"]
+
+
+@pytest.mark.parametrize('missing', ['test_ids', 'id_column'])
+def test_reference_without_test_rows_has_no_performance_baseline(tmp_path, root_dir, road_data, missing):
+    config = make_config(tmp_path, root_dir)
+    df = road_data(300, seed=2)
+    if missing == 'id_column':
+        pd.DataFrame({'id': df['id'].iloc[:50]}).to_csv(config.test_ids_path, index=False)
+        df = df.drop(columns='id')
+    df.to_csv(config.data_path, index=False)
+    # A training id file left by an earlier model must not survive
+    config.training_ids_path.write_bytes(b'stale')
+    trigger = RetrainingTrigger(config)
+
+    reference = trigger.save_reference()
+    decision = trigger.decide(df=df)
+
+    assert reference['performance'] == {}
+    assert not os.path.exists(config.training_ids_path)
+    assert 'rmse_increase' not in decision['performance']
+    assert not any('RMSE' in reason for reason in decision['reasons'])
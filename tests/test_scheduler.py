@@ -0,0 +1,104 @@
+import threading
+import pytest
+from heartpipeline.exception import CustomException
+from heartpipeline.pipeline.scheduler import PipelineScheduler, Stage
+
+
+def recording_stage(name, log, inputs=(), outputs=(), gate=False, result=None):
+    def run():
+        log.append(name)
+        return result
+    return Stage(name, run, inputs=inputs, outputs=outputs, gate=gate)
+
+
+def test_dependencies_come_from_declared_artifacts():
+    log = []
+    scheduler = PipelineScheduler([
+        recording_stage('train', log, inputs=('features',), outputs=('model',)),
+        recording_stage('ingest', log, inputs=('raw',), outputs=('data',)),
+        recording_stage('engineer', log, inputs=('data',), outputs=('features',)),
+        recording_stage('report', log, inputs=('model', 'data'))
+    ])
+
+    assert scheduler.dependencies == {'train': ['engineer'], 'ingest': [], 'engineer': ['ingest'],
+                                      'report': ['ingest', 'train']}
+    assert scheduler.order == ['ingest', 'engineer', 'train', 'report']
+    scheduler.run()
+    assert log == scheduler.order
+
+
+def test_cycles_and_duplicate_producers_are_rejected():
+    with pytest.raises(CustomException, match='Cycle'):
+        PipelineScheduler([Stage('a', lambda: None, inputs=('y',), outputs=('x',)),
+                           Stage('b', lambda: None, inputs=('x',), outputs=('y',))])
+    with pytest.raises(CustomException, match='produced by both'):
+        PipelineScheduler([Stage('a', lambda: None, outputs=('x',)), Stage('b', lambda: None, outputs=('x',))])
+
+
+def test_independent_stages_run_concurrently():
+    both_started = threading.Barrier(2, timeout=5)
+    stages = [Stage(name, both_started.wait, outputs=(name,)) for name in ('left', 'right')]
+
+    # Would raise BrokenBarrierError if the two stages ran one after the other
+    assert PipelineScheduler(stages, max_workers=2).run()['skipped'] == []
+
+
+def test_a_false_gate_skips_only_its_downstream_stages():
+    log = []
+    result = PipelineScheduler([
+        recording_stage('ingest', log, outputs=('data',)),
+        recording_stage('gate', log, inputs=('data',), outputs=('decision',), gate=True, result=False),
+        recording_stage('validate', log, inputs=('data',), outputs=('status',)),
+        recording_stage('train', log, inputs=('decision',), outputs=('model',)),
+        recording_stage('evaluate', log, inputs=('model', 'status'))
+    ]).run()
+
+    assert result['skipped'] == ['evaluate', 'train']
+    assert sorted(log) == ['gate', 'ingest', 'validate']
+
+
+def test_a_failed_stage_starts_nothing_downstream():
+    log = []
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(CustomException):
+        PipelineScheduler([Stage('ingest', fail, outputs=('data',)),
+                           recording_stage('train', log, inputs=('data',))]).run()
+    assert log == []
+
+
+def test_critical_path_follows_the_slowest_chain():
+    scheduler = PipelineScheduler([
+        Stage('a', lambda: None, outputs=('x',)),
+        Stage('fast', lambda: None, inputs=('x',), outputs=('y',)),
+        Stage('slow', lambda: None, inputs=('x',), outputs=('z',)),
+        Stage('end', lambda: None, inputs=('y', 'z'))
+    ])
+
+    path, total = scheduler.critical_path({'a': 1.0, 'fast': 1.0, 'slow': 3.0, 'end': 1.0})
+    assert (path, total) == (['a', 'slow', 'end'], 5.0)
+
+
+def test_external_inputs_do_not_create_dependencies():
+    scheduler = PipelineScheduler([Stage('only', lambda: 'done', inputs=('raw_data',), outputs=('x',))])
+    assert scheduler.dependencies == {'only': []}
+    assert scheduler.critical_path({'only': 2.0}) == (['only'], 2.0)
+    assert scheduler.downstream('only') == set()
+
+
+def test_airflow_tasks_follow_the_graph():
+    pytest.importorskip('airflow')
+    from airflow import DAG
+    from airflow.operators.python import ShortCircuitOperator
+
+    with DAG('scheduler_test', schedule=None) as dag:
+        tasks = PipelineScheduler([
+            Stage('ingest', lambda: None, outputs=('data',)),
+            Stage('gate', lambda: True, inputs=('data',), outputs=('decision',), gate=True),
+            Stage('train', lambda: None, inputs=('decision', 'data'))
+        ]).to_airflow(dag)
+
+    assert isinstance(tasks['gate'], ShortCircuitOperator)
+    assert tasks['train'].upstream_task_ids == {'ingest', 'gate'}
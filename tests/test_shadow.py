@@ -0,0 +1,86 @@
+import json
+import random
+import time
+import numpy as np
+from heartpipeline.serving.shadow import ShadowScorer
+
+
+class ConstantPredictor:
+    def __init__(self, version: str, value: float):
+        self.version = version
+        self.value = value
+
+    def predict(self, df):
+        return np.full(len(df), self.value)
+
+
+def test_jobs_are_scored_by_the_candidate_they_were_queued_with(tmp_path):
+    scorer = ShadowScorer(tmp_path / 'shadow.jsonl', sample_rate=1.0)
+    old, new = ConstantPredictor('c1', 0.2), ConstantPredictor('c2', 0.4)
+    jobs = [(old, 'p1', {'curvature': 0.1}, 0.3, 1.0), (new, 'p1', {'curvature': 0.2}, 0.3, 2.0),
+            (old, 'p1', {'curvature': 0.3}, 0.3, 3.0)]
+
+    scorer.score(jobs)
+
+    with open(tmp_path / 'shadow.jsonl') as f:
+        lines = [json.loads(line) for line in f]
+    assert sorted((line['candidate_version'], line['shadow_prediction']) for line in lines) == \
+        [('c1', 0.2), ('c1', 0.2), ('c2', 0.4)]
+    assert all(line['primary_version'] == 'p1' and line['prediction'] == 0.3 for line in lines)
+    assert scorer.stats()['scored'] == 3
+
+
+def test_nothing_is_queued_when_disabled_or_without_a_candidate(tmp_path):
+    disabled = ShadowScorer(tmp_path / 'shadow.jsonl', sample_rate=0.0)
+    disabled.submit(ConstantPredictor('c1', 0.2), 'p1', {}, 0.3)
+    enabled = ShadowScorer(tmp_path / 'shadow.jsonl', sample_rate=1.0)
+    enabled.submit(None, 'p1', {}, 0.3)
+
+    assert disabled.stats()['submitted'] == enabled.stats()['submitted'] == 0
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    scorer = ShadowScorer(tmp_path / 'shadow.jsonl', sample_rate=1.0, max_queue=1)
+    # A worker that never drains the queue
+    scorer._worker = object()
+    for _ in range(3):
+        scorer.submit(ConstantPredictor('c1', 0.2), 'p1', {'curvature': 0.1}, 0.3)
+
+    assert (scorer.submitted, scorer.dropped) == (1, 2)
+
+
+class FailingPredictor(ConstantPredictor):
+    def predict(self, df):
+        raise RuntimeError("candidate broke")
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_worker_scores_copies_and_counts_failures(tmp_path):
+    scorer = ShadowScorer(tmp_path / 'logs' / 'shadow.jsonl', sample_rate=1.0, batch_size=1)
+    record = {'curvature': 0.1}
+    for _ in range(5):
+        scorer.submit(ConstantPredictor('c1', 0.2), 'p1', record, 0.3)
+    # The queued record is a copy, so later changes by the caller do not leak into the log;
+    # one job per batch, so the failing candidate only fails its own request
+    record['curvature'] = 0.9
+    scorer.submit(FailingPredictor('c2', 0.0), 'p1', {'curvature': 0.5}, 0.3)
+
+    assert wait_for(lambda: scorer.scored + scorer.failed == 6)
+    assert (scorer.scored, scorer.failed) == (5, 1)
+    with open(tmp_path / 'logs' / 'shadow.jsonl') as f:
+        assert {json.loads(line)['input']['curvature'] for line in f} == {0.1}
+
+
+def test_sample_rate_is_a_fraction_of_requests(tmp_path):
+    random.seed(0)
+    scorer = ShadowScorer(tmp_path / 'shadow.jsonl', sample_rate=0.25, max_queue=10000)
+    scorer._worker = object()
+    for _ in range(4000):
+        scorer.submit(ConstantPredictor('c1', 0.2), 'p1', {}, 0.3)
+    assert 800 < scorer.submitted < 1200
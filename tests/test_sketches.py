@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from heartpipeline.monitoring.sketches import DatasetSketch, ErrorTotals, HyperLogLog, KLLSketch, RowSample, compare
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(0).normal(size=100_000)
+    sketch = KLLSketch(k=200, seed=0)
+    sketch.update(values)
+
+    for q in (0.1, 0.5, 0.9):
+        # Rank error, not value error: the estimate's true rank is within ~1% of q
+        assert np.mean(values <= sketch.quantile(q)) == pytest.approx(q, abs=0.02)
+
+
+def test_merged_shards_match_a_single_pass(road_data):
+    df = road_data(3000, seed=1)
+    whole = DatasetSketch().update(df)
+    merged = DatasetSketch().update(df.iloc[:1000]).merge(DatasetSketch().update(df.iloc[1000:]))
+
+    for name in ('curvature', 'speed_limit'):
+        assert merged.columns[name].count == whole.columns[name].count
+        assert merged.columns[name].mean == pytest.approx(whole.columns[name].mean)
+        assert merged.columns[name].std == pytest.approx(whole.columns[name].std)
+        assert merged.columns[name].quantiles.quantile(0.5) == pytest.approx(df[name].median(), abs=0.1 * df[name].std())
+    assert merged.columns['road_type'].frequencies.counts == whole.columns['road_type'].frequencies.counts
+
+
+def test_hyperloglog_estimate():
+    hll = HyperLogLog()
+    hll.update(np.arange(50_000))
+    assert hll.estimate() == pytest.approx(50_000, rel=0.05)
+
+
+def test_round_trip_keeps_edges_and_counts(tmp_path, road_data):
+    sketch = DatasetSketch().update(road_data(500)).set_edges()
+    sketch.save(tmp_path / 'sketch.json')
+    loaded = DatasetSketch.load(tmp_path / 'sketch.json')
+
+    assert loaded.summary() == sketch.summary()
+    assert np.array_equal(loaded.columns['curvature'].histogram.edges, sketch.columns['curvature'].histogram.edges)
+
+
+def test_categorical_drift_uses_chi_square():
+    rng = np.random.default_rng(0)
+    reference = DatasetSketch().update(pd.DataFrame({'weather': rng.choice(['clear', 'rainy', 'foggy'], 5000),
+                                                     'x': rng.normal(size=5000)})).set_edges()
+    current = DatasetSketch.empty_like(reference).update(
+        pd.DataFrame({'weather': rng.choice(['clear', 'rainy', 'foggy'], 5000, p=[0.1, 0.1, 0.8]),
+                      'x': rng.normal(size=5000)}))
+
+    results = compare(reference, current)
+
+    assert results['weather']['test'] == 'chi_square'
+    assert results['weather']['drift'] and results['weather']['p_value'] < 1e-6
+    assert results['x']['test'] == 'ks' and not results['x']['drift']
+
+
+def test_error_totals_match_full_array_metrics():
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    rng = np.random.default_rng(4)
+    y_true = rng.normal(3.0, 2.0, 10_000)
+    y_pred = y_true + rng.normal(0.0, 0.5, 10_000)
+
+    chunked = ErrorTotals()
+    for start in range(0, len(y_true), 777):
+        chunked.update(y_true[start:start + 777], y_pred[start:start + 777])
+    merged = ErrorTotals().update(y_true[:3000], y_pred[:3000]).merge(ErrorTotals().update(y_true[3000:], y_pred[3000:]))
+
+    expected = {'MAE': mean_absolute_error(y_true, y_pred), 'RMSE': np.sqrt(mean_squared_error(y_true, y_pred)),
+                'R2': r2_score(y_true, y_pred)}
+    assert chunked.metrics() == pytest.approx(expected)
+    assert merged.metrics() == pytest.approx(expected)
+
+
+def test_error_totals_edge_cases():
+    empty = ErrorTotals().update([], [])
+    assert empty.count == 0 and all(np.isnan(value) for value in empty.metrics().values())
+    assert ErrorTotals().merge(empty).count == 0
+    # A constant target follows sklearn: R2 is 1 when perfect and 0 otherwise
+    assert ErrorTotals().update([2.0, 2.0], [2.0, 2.0]).metrics()['R2'] == 1.0
+    assert ErrorTotals().update([2.0, 2.0], [1.0, 3.0]).metrics() == {'MAE': 1.0, 'RMSE': 1.0, 'R2': 0.0}
+    assert ErrorTotals().update([1.0], [0.5]).metrics()['MAE'] == 0.5
+
+
+def test_row_sample_is_bounded_and_uniform():
+    frame = pd.DataFrame({'x': np.arange(20_000)})
+    sample = RowSample(500, seed=0)
+    for start in range(0, len(frame), 1_234):
+        sample.update(frame.iloc[start:start + 1_234])
+
+    assert sample.rows == 20_000 and len(sample.sample()) == 500
+    assert sample.sample()['x'].is_unique
+    # Early and late chunks are equally represented
+    assert sample.sample()['x'].mean() == pytest.approx(10_000, rel=0.1)
+    assert len(sample.sample(100)) == 100
+    assert sample.sample(100)['x'].mean() == pytest.approx(10_000, rel=0.25)
+
+
+def test_row_sample_edge_cases():
+    small = RowSample(10).update(pd.DataFrame({'x': [1, 2, 3]})).update(pd.DataFrame({'x': []}))
+    assert sorted(small.sample()['x']) == [1, 2, 3] and small.rows == 3
+    disabled = RowSample(0).update(pd.DataFrame({'x': [1, 2, 3]}))
+    assert disabled.sample().empty and disabled.rows == 3
+    assert RowSample(5).sample().empty
+    # The same seed keeps the same rows
+    frame = pd.DataFrame({'x': np.arange(100)})
+    assert list(RowSample(7, seed=1).update(frame).sample()['x']) == list(RowSample(7, seed=1).update(frame).sample()['x'])
+
@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import types
+from heartpipeline.monitoring.sketches import DatasetSketch
+from heartpipeline.serving.traffic_sketch import TrafficSketcher, remove_worker_sketch, worker_sketch_path
+
+
+def test_flush_writes_this_workers_file(tmp_path):
+    sketcher = TrafficSketcher(tmp_path, flush_interval=60)
+    sketcher._sketch = DatasetSketch()
+    sketcher.record([([{'curvature': 0.2, 'weather': 'rainy'}, {'curvature': 0.4, 'weather': 'clear'}], [0.3, 0.5])])
+    sketcher.flush()
+
+    assert sketcher.path == worker_sketch_path(tmp_path, os.getpid())
+    assert DatasetSketch.load(sketcher.path).rows == 2
+
+
+def test_remove_worker_sketch_only_removes_that_worker(tmp_path):
+    for pid in (101, 102):
+        DatasetSketch().save(worker_sketch_path(tmp_path, pid))
+
+    remove_worker_sketch(tmp_path, 101)
+    remove_worker_sketch(tmp_path, 101)
+
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(worker_sketch_path(tmp_path, 102))]
+
+
+def test_gunicorn_child_exit_removes_the_workers_sketch(tmp_path, monkeypatch, root_dir):
+    monkeypatch.setenv('TRAFFIC_SKETCH_DIR', str(tmp_path))
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(root_dir, 'gunicorn.conf.py'))
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+    DatasetSketch().save(worker_sketch_path(tmp_path, 4242))
+
+    conf.child_exit(server=None, worker=types.SimpleNamespace(pid=4242))
+
+    assert not os.path.exists(worker_sketch_path(tmp_path, 4242))
+
+
+def test_disabled_and_full_queues_drop_without_blocking(tmp_path):
+    disabled = TrafficSketcher(tmp_path, flush_interval=0)
+    disabled.submit([{'curvature': 0.2}], [0.3])
+    assert disabled.stats()['queued'] == 0 and disabled._worker is None
+
+    full = TrafficSketcher(tmp_path, flush_interval=60, max_queue=1)
+    full._pid = os.getpid()
+    full.submit([{'curvature': 0.2}], [0.3])
+    full.submit([{'curvature': 0.4}, {'curvature': 0.6}], [0.5, 0.7])
+    assert (full.stats()['queued'], full.dropped) == (1, 2)
+
+
+def test_empty_batches_and_flushes_write_nothing(tmp_path):
+    sketcher = TrafficSketcher(tmp_path, flush_interval=60)
+    sketcher.flush()
+    sketcher._sketch = DatasetSketch()
+    sketcher.record([])
+    sketcher.record([([], [])])
+    sketcher.flush()
+    assert sketcher.recorded == 0 and list(tmp_path.iterdir()) == []
+
+
+def test_records_with_missing_fields_are_sketched(tmp_path):
+    sketcher = TrafficSketcher(tmp_path, flush_interval=60)
+    sketcher._sketch = DatasetSketch()
+    sketcher.record([([{'curvature': 0.2, 'weather': 'rainy'}, {'curvature': 0.4}], [0.3, 0.5])])
+    sketcher.flush()
+    assert DatasetSketch.load(sketcher.path).rows == 2
+
+
+def test_unreadable_reference_sketch_falls_back_to_fresh_bins(tmp_path):
+    reference = tmp_path / 'reference.json'
+    reference.write_text('{not json')
+    sketcher = TrafficSketcher(tmp_path, reference_path=reference, flush_interval=60)
+    assert sketcher._new_sketch().columns == {}
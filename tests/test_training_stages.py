@@ -0,0 +1,43 @@
+import os
+import pytest
+from heartpipeline.pipeline.scheduler import PipelineScheduler
+
+
+@pytest.fixture(scope='module')
+def pipeline_stages(tmp_path_factory):
+    """The stage declarations, imported with MLflow pointed at a local store instead of DagsHub"""
+    pytest.importorskip('mlflow')
+    pytest.importorskip('xgboost')
+    previous = os.environ.get('MLFLOW_TRACKING_URI')
+    os.environ['MLFLOW_TRACKING_URI'] = f"sqlite:///{tmp_path_factory.mktemp('mlruns') / 'mlflow.db'}"
+    try:
+        from heartpipeline.pipeline.training_stages import pipeline_stages
+        yield pipeline_stages
+    finally:
+        if previous is None:
+            os.environ.pop('MLFLOW_TRACKING_URI', None)
+        else:
+            os.environ['MLFLOW_TRACKING_URI'] = previous
+
+
+def test_training_pipeline_is_gated_after_ingestion(pipeline_stages):
+    scheduler = PipelineScheduler(pipeline_stages())
+
+    assert scheduler.order[0] == 'data_ingestion'
+    assert scheduler.stages['retraining_trigger'].gate
+    assert 'data_validation' not in scheduler.downstream('retraining_trigger')
+    assert {'feature_engineering', 'select_best', 'monitoring', 'risk_lookup', 'model_compression'} <= \
+        scheduler.downstream('retraining_trigger')
+    # The lookup table is rebuilt for every promoted model
+    assert scheduler.dependencies['risk_lookup'] == ['data_transformation', 'select_best']
+
+
+def test_candidates_train_in_parallel_after_transformation(pipeline_stages):
+    scheduler = PipelineScheduler(pipeline_stages())
+    training = [name for name in scheduler.order if name.startswith('train_')]
+
+    assert len(training) == 4
+    assert all(scheduler.dependencies[name] == ['data_transformation'] for name in training)
+    assert set(training) <= set(scheduler.dependencies['select_best'])
+    # Promotion also waits for validation of the same dataset
+    assert 'data_validation' in scheduler.dependencies['select_best']